@@ -1,7 +1,7 @@
 from Models.models import Users, Group
 from database.db import AsyncSession, async_engine
 from sqlmodel import select
-from app.auth import encrypt_password
+from app.passwords import hash_password
 import asyncio
 
 async def main():
@@ -75,7 +75,7 @@ async def CreateAdminUser():
                 lastname    = last_name,
                 email       = user_email,
                 phoneno     = phone_number,
-                password    = encrypt_password(user_password),
+                password    = await hash_password(user_password),
                 group       = user_group_id,
                 is_active   = True,
                 is_admin    = True,
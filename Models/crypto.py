@@ -1,6 +1,6 @@
 from sqlmodel import SQLModel, Field
 from datetime import datetime
-from sqlalchemy import event
+from sqlalchemy import event, Index
 
 
 
@@ -77,7 +77,7 @@ class CryptoSell(SQLModel, table=True):
 class CryptoSwap(SQLModel, table=True):
         id: int | None             = Field(default=None, primary_key=True)
         user_id: int               = Field(foreign_key="users.id", index=True)
-        transaction_id: str        = Field(default='', nullable=True)
+        transaction_id: str        = Field(default='', nullable=True, unique=True)
         from_crypto_wallet_id: int = Field(foreign_key="cryptowallet.id")
         to_crypto_wallet_id: int   = Field(foreign_key="cryptowallet.id")
         swap_quantity: float       = Field(default=0.00)
@@ -87,6 +87,11 @@ class CryptoSwap(SQLModel, table=True):
         is_approved: bool          = Field(default=False, nullable=True)
         fee_value: float           = Field(default=0.00, nullable=True)
 
+        __table_args__ = (
+            # Keyset pagination of the admin swap list
+            Index('ix_cryptoswap_created', 'created_at', 'id'),
+        )
+
 
         def assign_current_datetime(self):
             self.created_at = datetime.now()
@@ -97,7 +102,7 @@ class CryptoSwap(SQLModel, table=True):
 class CryptoExchange(SQLModel, table=True):
     id: int | None                = Field(default=None, primary_key=True)
     user_id: int                  = Field(foreign_key="users.id", index=True)
-    transaction_id: str           = Field(default='', nullable=True)
+    transaction_id: str           = Field(default='', nullable=True, unique=True)
     crypto_wallet: int            = Field(foreign_key="cryptowallet.id")
     fiat_wallet: int              = Field(foreign_key="wallet.id")
     exchange_crypto_amount: float = Field(default=0.0)
@@ -1,8 +1,8 @@
-from sqlmodel import SQLModel, Field, Column
+from sqlmodel import SQLModel, Field, Column, JSON
 from sqlalchemy.sql.sqltypes import Time
 from typing import Optional
 from datetime import datetime, date
-from sqlalchemy import event
+from sqlalchemy import event, Index
 
 
 
@@ -73,6 +73,14 @@ class Currency(SQLModel, table=True):
 
 
 
+# Last known exchange rates of a base currency, used while the rate provider is unavailable
+class FXRateTable(SQLModel, table=True):
+    base: str            = Field(primary_key=True)
+    rates: dict          = Field(sa_column=Column(JSON), default={})
+    fetched_at: datetime = Field(default_factory=datetime.now)
+
+
+
 
 class Wallet(SQLModel, table=True):
     id: int | None         = Field(default=None, primary_key=True)
@@ -84,6 +92,11 @@ class Wallet(SQLModel, table=True):
     created_data: date     = Field(default=date.today(), nullable=True)
     wallet_id: str         = Field(nullable=True)
 
+    __table_args__ = (
+        # Wallets of a user, in one currency or all of them
+        Index('ix_wallet_user_currency', 'user_id', 'currency_id'),
+    )
+
     def assign_wallet_id(self):
         wallet_id_mapping = {
             'USD': '1111-000-2222',
@@ -178,7 +191,7 @@ class ExternalTransection(SQLModel, table=True):
     
 class Kycdetails(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="users.id")
+    user_id: int = Field(foreign_key="users.id", index=True)
     firstname: str
     lastname: str
     dateofbirth: date = Field(default=date.today())
@@ -1,7 +1,7 @@
 from pydantic import validator
 from sqlmodel import SQLModel, Field, Column, JSON
 from datetime import date
-from sqlalchemy import event
+from sqlalchemy import event, Index, UniqueConstraint, text, DDL
 from typing import Optional
 from datetime import datetime
 import json
@@ -149,6 +149,7 @@ class MerchantSandBoxTransaction(SQLModel, table=True):
 
 
 # All the transaction related to Production
+# Partitioned by month on createdAt in PostgreSQL, see migrations/versions/0003_monthly_partitions
 class MerchantProdTransaction(SQLModel, table=True):
     id: int | None               = Field(primary_key=True, default=None)
     merchant_id: int | None      = Field(foreign_key='users.id', default=None, index=True)
@@ -161,7 +162,7 @@ class MerchantProdTransaction(SQLModel, table=True):
     currency: str                = Field(default='', nullable=True)
     status: str                  = Field(default='', index=True) # PAYMENT_SUCCESS, PAYMENT_PENDING, PAYMENT_FAILED, PAYMENT_INITIATE
     amount: float                = Field(default=0.00)
-    createdAt: datetime          = Field(default=datetime.now(), nullable=True)
+    createdAt: datetime          = Field(default_factory=datetime.now, nullable=False) # Partition key, set at every insert
     merchantOrderId: str         = Field(default='')
     merchantRedirectURl: str     = Field(default='', nullable=True)
     merchantRedirectMode: str    = Field(default='', nullable=True)
@@ -175,6 +176,32 @@ class MerchantProdTransaction(SQLModel, table=True):
     pg_settlement_date: datetime = Field(nullable=True)
     balance_status: str          = Field(default='', nullable=True) # Track whether the amount is Mature, Immature, Frozen and Failed
 
+    __table_args__ = (
+        # Rows waiting for the settlement worker
+        Index(
+            'ix_merchantprodtransaction_settlement_due',
+            'pg_settlement_date',
+            postgresql_where=text("balance_status = 'Immature' AND status = 'PAYMENT_SUCCESS'")
+        ),
+        # Keyset pagination of the merchant transaction list
+        Index('ix_merchantprodtransaction_merchant_created', 'merchant_id', 'createdAt', 'id'),
+        # Duplicate merchantOrderId check of the payment API
+        Index('ix_merchantprodtransaction_merchant_order', 'merchant_id', 'merchantOrderId'),
+        # Substring search of the merchant transaction and refund lists
+        Index(
+            'ix_merchantprodtransaction_order_id_trgm', 'merchantOrderId',
+            postgresql_using='gin', postgresql_ops={'merchantOrderId': 'gin_trgm_ops'}
+        ),
+        Index(
+            'ix_merchantprodtransaction_transaction_id_trgm', 'transaction_id',
+            postgresql_using='gin', postgresql_ops={'transaction_id': 'gin_trgm_ops'}
+        ),
+        Index(
+            'ix_merchantprodtransaction_business_name_trgm', 'business_name',
+            postgresql_using='gin', postgresql_ops={'business_name': 'gin_trgm_ops'}
+        ),
+    )
+
 
     def assignTransactionCreatedTime(self):
         current_time   = datetime.now()
@@ -204,6 +231,11 @@ class MerchantAccountBalance(SQLModel, table=True):
     currency: str           = Field(default='', index=True)
     last_updated: datetime  = Field(default=datetime.now(), nullable=True)
 
+    __table_args__ = (
+        # One balance row per merchant and currency, required by the balance ledger upserts
+        UniqueConstraint('merchant_id', 'currency', name='uq_merchantaccountbalance_merchant_currency'),
+    )
+
 
     def update_account_balance(self):
         self.account_balance = self.mature_balance + self.immature_balance + self.frozen_balance
@@ -217,6 +249,26 @@ class CollectedFees(SQLModel, table=True):
     amount: float    = Field(default=0.00)
     currency: str    = Field(default='')
 
+    __table_args__ = (
+        UniqueConstraint('currency', name='uq_collectedfees_currency'),
+    )
+
+
+
+
+# Daily fee revenue per pipe and currency, kept in step with MerchantProdTransaction
+class PipeRevenueDaily(SQLModel, table=True):
+    id: int | None       = Field(primary_key=True, default=None)
+    day: date            = Field(index=True)
+    pipe_id: int         = Field(foreign_key='pipe.id', index=True)
+    currency: str        = Field(default='')
+    revenue: float       = Field(default=0.00)
+    transactions: int    = Field(default=0)
+
+    __table_args__ = (
+        UniqueConstraint('day', 'pipe_id', 'currency', name='uq_piperevenuedaily_day_pipe_currency'),
+    )
+
 
 
 
@@ -246,6 +298,15 @@ def Merchant_sandBox_transaction_date(mapper, connection, target):
 
 
 
+# The trigram search indexes need the pg_trgm extension
+event.listen(
+    MerchantProdTransaction.__table__,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
+
+
+
 # Auto assign created time when row gets inserted into the table
 @event.listens_for(MerchantProdTransaction, 'after_insert')
 def Merchant_sandBox_transaction_time(mapper, connection, target):
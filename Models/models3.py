@@ -1,6 +1,6 @@
 from sqlmodel import SQLModel, Field, Column, JSON
 from datetime import datetime
-from sqlalchemy import event
+from sqlalchemy import event, Index, text
 
 
 
@@ -54,6 +54,15 @@ class MerchantWithdrawals(SQLModel, table=True):
     status: str            = Field(default='Pending', nullable=True) # Pending, Approved, Rejected
     is_completed: bool     = Field(default=False, nullable=True)
     is_active:bool         = Field(default=False) # not in use
+
+    __table_args__ = (
+        # Keyset pagination of the merchant withdrawal list
+        Index('ix_merchantwithdrawals_merchant_created', 'merchant_id', 'createdAt', 'id'),
+        # Pending withdrawals of a merchant
+        Index('ix_merchantwithdrawals_pending', 'merchant_id', 'id', postgresql_where=text("status = 'Pending'")),
+        # Admin withdrawal list filtered by status
+        Index('ix_merchantwithdrawals_status_created', 'status', 'createdAt'),
+    )
     
 
     def AssigncreatedTime(self):
@@ -62,10 +71,11 @@ class MerchantWithdrawals(SQLModel, table=True):
 
 
 # Merchant API Logs Table
+# Partitioned by month on createdAt in PostgreSQL, see migrations/versions/0003_monthly_partitions
 class MerchantAPILogs(SQLModel, table=True):
     id: int | None             = Field(default=None, primary_key=True)
     merchant_id: int           = Field(foreign_key='users.id')
-    createdAt: datetime        = Field(datetime.now())
+    createdAt: datetime        = Field(default_factory=datetime.now) # Partition key
     end_point: str             = Field(default='')
     error: str                 = Field(default='')
     request_header: str        = Field(default='')
@@ -73,6 +83,11 @@ class MerchantAPILogs(SQLModel, table=True):
     response_header: str       = Field(default='')
     response_body: dict | None = Field(sa_column=Column(JSON), default={})
 
+    __table_args__ = (
+        # Merchant API log list, newest first
+        Index('ix_merchantapilogs_merchant_id', 'merchant_id', 'id'),
+    )
+
     def AssigncreatedTime(self):
         self.createdAt = datetime.now()
 
@@ -82,21 +97,63 @@ class MerchantAPILogs(SQLModel, table=True):
 class MerchantRefund(SQLModel, table=True):
     id: int | None               = Field(primary_key=True, default=None)
     merchant_id: int | None      = Field(foreign_key='users.id', default=None)
-    transaction_id: int | None   = Field(foreign_key='merchantprodtransaction.id', default=None)
+    # MerchantProdTransaction id, without a foreign key since that table is partitioned
+    transaction_id: int | None   = Field(default=None, index=True)
     amount: float                = Field(default=0.00)
     currency: int | None         = Field(foreign_key='currency.id')
     comment: str                 = Field(default=str)
     instant_refund: bool         = Field(default=False)
     instant_refund_amount: float = Field(default=0.00)
-    createdAt: datetime          = Field(datetime.now())
+    createdAt: datetime          = Field(default_factory=datetime.now)
     status: str                  = Field(default='Pending', nullable=True) ## Pending, Approved, on Hold, Rejected
     is_completed: bool           = Field(default=False)
 
+    __table_args__ = (
+        # Keyset pagination of the merchant refund list
+        Index('ix_merchantrefund_merchant_created', 'merchant_id', 'createdAt', 'id'),
+    )
+
 
     def AssigncreatedTime(self):
         self.createdAt = datetime.now()
 
 
+# Merchant webhook outbox, written with the transaction update and delivered in the background
+class MerchantWebhook(SQLModel, table=True):
+    id: int | None                = Field(default=None, primary_key=True)
+    merchant_id: int | None       = Field(foreign_key='users.id', default=None, index=True)
+    url: str                      = Field(default='')
+    payload: dict | None          = Field(sa_column=Column(JSON), default={})
+    status: str                   = Field(default='Pending') # Pending, Delivered, Failed
+    attempts: int                 = Field(default=0)
+    next_attempt_at: datetime     = Field(default=datetime.now())
+    last_status_code: int | None  = Field(default=None, nullable=True)
+    last_error: str | None        = Field(default=None, nullable=True)
+    createdAt: datetime           = Field(default=datetime.now())
+    delivered_at: datetime | None = Field(default=None, nullable=True)
+
+    __table_args__ = (
+        # Due deliveries claimed by the dispatcher
+        Index('ix_merchantwebhook_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+
+
+    def AssigncreatedTime(self):
+        self.createdAt       = datetime.now()
+        self.next_attempt_at = self.createdAt
+
+
+
+# Every delivery attempt of a merchant webhook
+class MerchantWebhookAttempt(SQLModel, table=True):
+    id: int | None          = Field(default=None, primary_key=True)
+    webhook_id: int         = Field(foreign_key='merchantwebhook.id', index=True)
+    attempt: int            = Field(default=1)
+    status_code: int | None = Field(default=None, nullable=True)
+    error: str | None       = Field(default=None, nullable=True)
+    duration_ms: float      = Field(default=0.00)
+    createdAt: datetime     = Field(default=datetime.now())
+
 
 
 
@@ -127,3 +184,9 @@ def AssignAPILogTime(mapper, connection, target):
     target.AssigncreatedTime()
 
 
+# Auto assign Current date time when a webhook is queued
+@event.listens_for(MerchantWebhook, 'before_insert')
+def AssignWebhookTime(mapper, connection, target):
+    target.AssigncreatedTime()
+
+
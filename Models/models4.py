@@ -1,6 +1,6 @@
 from sqlmodel import SQLModel, Field
 from datetime import datetime
-from sqlalchemy import event
+from sqlalchemy import event, Index
 
 
 
@@ -21,6 +21,13 @@ class DepositTransaction(SQLModel, table=True):
     credited_currency: str      = Field(nullable=True, default='')
     created_At: datetime        = Field(default=datetime.now())
 
+    __table_args__ = (
+        # Keyset pagination of the admin deposit list
+        Index('ix_deposittransaction_created', 'created_At', 'id'),
+        # Deposits of a user, newest first
+        Index('ix_deposittransaction_user', 'user_id', 'id'),
+    )
+
     def assign_current_datetime(self):
         self.created_At = datetime.now()
 
@@ -47,6 +54,12 @@ class TransferTransaction(SQLModel, table=True):
     is_completed: bool          = Field(default=False, nullable=True)
     created_At: datetime        = Field(default=datetime.now())
 
+    __table_args__ = (
+        # Transfers sent and received by a user, newest first
+        Index('ix_transfertransaction_user', 'user_id', 'id'),
+        Index('ix_transfertransaction_receiver', 'receiver', 'id'),
+    )
+
 
     def assign_current_datetime(self):
         self.created_At = datetime.now()
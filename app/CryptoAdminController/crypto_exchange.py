@@ -26,7 +26,7 @@ class AdminCryptoExchangeController(APIController):
     
     
     ### Get all Crypto Exchange Data
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def get_adminCryptoExchanges(self, request: Request, limit: int = 10, offset: int = 0):
         """
@@ -49,18 +49,6 @@ class AdminCryptoExchangeController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id       = user_identity.claims.get('user_id')
-
-                admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                admin_user = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Unauthorized'}, 401)
-                ## Admin authentication ends
-
                 combined_data = []
 
                 ### Count all availble rows for paginated data
@@ -138,7 +126,7 @@ class AdminCryptoExchangeController(APIController):
 
     
     #### Update Crypto Exchange Transaction
-    @auth('userauth')
+    @auth('admin')
     @put()
     async def update_cryptoExchange(self, request: Request, schema: AdminUpdateCryptoExchange):
         """
@@ -155,18 +143,6 @@ class AdminCryptoExchangeController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id       = user_identity.claims.get('user_id')
-
-                admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                admin_user = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Unauthorized'}, 401)
-                ## Admin authentication ends
-
                 ### Get the payload data
                 exchangeID = schema.exchange_id
                 status     = schema.status
@@ -263,7 +239,7 @@ class ExportCryptoExchangeTransactionsController(APIController):
     
     
     #### Export all crypto exchange transaction
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def export_crypto_exchange(self, request: Request):
         """
@@ -281,18 +257,6 @@ class ExportCryptoExchangeTransactionsController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id       = user_identity.claims.get('user_id')
-
-                admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                admin_user = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Unauthorized'}, 401)
-                ## Admin authentication ends
-
                 combined_data = []
 
                 ## Select the data
@@ -364,7 +328,7 @@ class AdminFilterCryptoExchangeController(APIController):
     
     
     ### Filter Crypto Exchange Transaction
-    @auth('userauth')
+    @auth('admin')
     @post()
     async def filter_cryptoExchange(self, request: Request, schema: AdminFilterCryptoExchangeSchema, limit: int = 10, offset: int = 0):
         """
@@ -388,18 +352,6 @@ class AdminFilterCryptoExchangeController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id       = user_identity.claims.get('user_id')
-
-                admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                admin_user = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Unauthorized'}, 401)
-                ## Admin authentication ends
-
                 ### Get the payload data
                 dateTime    = schema.dateTime
                 user_email  = schema.email
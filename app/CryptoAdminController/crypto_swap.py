@@ -11,6 +11,7 @@ from Models.Crypto.schema import AdminUpdateCryptoSwap
 from Models.Admin.Crypto.schema import AdminFilterCryptoSwapSchema
 from datetime import timedelta, datetime
 from app.dateFormat import get_date_range
+from app.pagination import PageRequest, paginate
 
 
 
@@ -27,9 +28,9 @@ class AdminCryptoSwapController(APIController):
         return '/api/v5/admin/crypto/swap/'
     
      ##### Get Crypto Swap Transaction
-    @auth('userauth')
+    @auth('admin')
     @get()
-    async def get_swapTransactions(self, request: Request, limit: int = 10, offset: int = 0):
+    async def get_swapTransactions(self, request: Request, limit: int = 10, offset: int = 0, cursor: str | None = None, total: str = 'exact'):
         """
         Retrieve and return a paginated list of crypto swap transactions for admin users.<br/>
 
@@ -39,12 +40,15 @@ class AdminCryptoSwapController(APIController):
         Args:<br/>
             request (Request): The incoming HTTP request object containing user identity information.<br/>
             limit (int, optional): The maximum number of records to return. Defaults to 10.<br/>
-            offset (int, optional): The number of records to skip before starting to return. Defaults to 0.<br/><br/>
+            offset (int, optional): The number of records to skip before starting to return. Defaults to 0.<br/>
+            cursor (str, optional): The next_cursor of the previous page, used instead of offset.<br/>
+            total (str, optional): exact, estimated or none. Defaults to exact.<br/><br/>
 
         Returns:<br/>
             JSON: A JSON response containing:<br/>
                 - success (bool): Indicates if the operation was successful.<br/>
                 - pagination_count (float): The total number of pages based on the limit.<br/>
+                - next_cursor (str): Cursor of the next page, null on the last page.<br/>
                 - admin_swap_data (list): A list of dictionaries, each containing details of a swap transaction.<br/>
                 - total_rows (int): The total number of records available for the admin user.<br/><br/>
         Raises:<br/>
@@ -53,32 +57,17 @@ class AdminCryptoSwapController(APIController):
             HTTPException: 500 for any server-side errors.<br/>
         """
         try:
-            async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id       = user_identity.claims.get('user_id')
-
-                #Authenticate Admin
-                admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                admin_user = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Unauthorized Access'}, 401)
-                ##Admin authentication ends
+            page_request = PageRequest(limit, offset, cursor, total)
+        except ValueError as e:
+            return json({'error': 'Bad Request', 'message': str(e)}, 400)
 
+        try:
+            async with AsyncSession(async_engine) as session:
                 fromCryptoWallet = aliased(CryptoWallet)
                 ToCryptoWallet   = aliased(CryptoWallet)
 
                 combined_data = []
 
-                ### Calculate Paginated value
-                row_stmt      = select(func.count(CryptoSwap.id))
-                exec_row_stmt = await session.execute(row_stmt)
-                total_rows    = exec_row_stmt.scalar()
-
-                paginated_value = total_rows / limit
-
                 stmt = select(
                     CryptoSwap.id,
                     CryptoSwap.user_id,
@@ -98,17 +87,15 @@ class AdminCryptoSwapController(APIController):
                     fromCryptoWallet, fromCryptoWallet.id == CryptoSwap.from_crypto_wallet_id
                 ).join(
                     ToCryptoWallet, ToCryptoWallet.id == CryptoSwap.to_crypto_wallet_id
-                ).order_by(
-                    desc(CryptoSwap.id)
-                ).limit(
-                    limit
-                ).offset(
-                    offset
                 )
 
                 ## Get all crypto swap transaction
-                all_crypto_swap_transaction_obj = await session.execute(stmt)
-                all_crypto_swap_transaction     = all_crypto_swap_transaction_obj.fetchall()
+                page = await paginate(
+                    session, stmt, page_request,
+                    CryptoSwap.id, CryptoSwap.created_at,
+                    count_statement = select(CryptoSwap.id)
+                )
+                all_crypto_swap_transaction = page.rows
                 
                 if not all_crypto_swap_transaction:
                     return json({'message': 'No transaction found'}, 404)
@@ -131,8 +118,9 @@ class AdminCryptoSwapController(APIController):
 
                 return json({
                     'success': True,
-                    'pagination_count': paginated_value,
+                    'pagination_count': page.page_count,
                     'admin_swap_data': combined_data,
+                    'next_cursor': page.next_cursor
                 }, 200)
 
         except Exception as e:
@@ -144,7 +132,7 @@ class AdminCryptoSwapController(APIController):
     
 
     #### Update Crypto Swap Transaction by Admin
-    @auth('userauth')
+    @auth('admin')
     @put()
     async def update_cryptoSwap(self, request: Request, schema: AdminUpdateCryptoSwap):
         """
@@ -167,19 +155,6 @@ class AdminCryptoSwapController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id      = user_identity.claims.get('user_id')
-
-                #Authenticate Admin
-                admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                admin_user = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Unauthorized Access'}, 401)
-                ##Admin authentication ends
-
                 ### Get the payload data
                 swap_id = schema.swap_id
                 status  = schema.status
@@ -288,7 +263,7 @@ class AdminExportCryptoSwapTransaction(APIController):
     
     
     ### Export Crypto Swaps
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def export_cryptoSwap(self, request: Request):
         """
@@ -310,19 +285,6 @@ class AdminExportCryptoSwapTransaction(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id       = user_identity.claims.get('user_id')
-
-                #Authenticate Admin
-                admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                admin_user = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Unauthorized Access'}, 401)
-                ##Admin authentication ends
-
                 fromCryptoWallet = aliased(CryptoWallet)
                 ToCryptoWallet   = aliased(CryptoWallet)
 
@@ -396,7 +358,7 @@ class AdminFilterCryptoSwapController(APIController):
         return '/api/v5/admin/filter/crypto/swap/'
     
 
-    @auth('userauth')
+    @auth('admin')
     @post()
     async def filter_cryptoSwap(self, request: Request, schema: AdminFilterCryptoSwapSchema, limit: int = 10, offset: int = 0):
         """
@@ -423,19 +385,6 @@ class AdminFilterCryptoSwapController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id       = user_identity.claims.get('user_id')
-
-                #Authenticate Admin
-                admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                admin_user = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Unauthorized Access'}, 401)
-                ##Admin authentication ends
-
                 ## Get the payload data
                 dateRange   = schema.dateRange
                 user_email  = schema.email
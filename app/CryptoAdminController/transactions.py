@@ -2,12 +2,14 @@ from app.controllers.controllers import get, post, put
 from blacksheep.server.controllers import APIController
 from blacksheep.server.authorization import auth
 from blacksheep import json, Request
-from database.db import AsyncSession, async_engine
+from database.db import AsyncSession, async_engine, session_for
 from Models.models import Users, Wallet, Currency
 from Models.crypto import CryptoBuy, CryptoSell, CryptoWallet
 from sqlmodel import select, desc, and_, func
+from sqlalchemy import literal, union_all
 from Models.Crypto.schema import AdminUpdateCryptoBuySchema, AdminUpdateCryptoSellSchema, AdminFilterCryptoTransactionsSchema
 from app.dateFormat import get_date_range
+from app.export import export_query
 from datetime import datetime, timedelta
 
 
@@ -26,7 +28,7 @@ class CryptoBuyController(APIController):
     
     
     ## Update Crypto Deposites by Admin
-    @auth('userauth')
+    @auth('admin')
     @put()
     async def update_cryptoDeposit(self, request: Request, schema: AdminUpdateCryptoBuySchema):
         """
@@ -49,19 +51,6 @@ class CryptoBuyController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id      = user_identity.claims.get('user_id')
-
-                ## Admin authentication
-                admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                admin_user = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Unauthorized'}, 401)
-                ## Admin authentication ends
-
                 ## Get payload Data
                 cryptoBuyId = schema.crypto_buy_id
                 status      = schema.status
@@ -163,7 +152,7 @@ class CryptoSellController(APIController):
     
    
     ## Update Crypto Sell by Admin
-    @auth('userauth')
+    @auth('admin')
     @put()
     async def update_cryptoSell(self, request: Request, schema: AdminUpdateCryptoSellSchema):
         """
@@ -193,19 +182,6 @@ class CryptoSellController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id       = user_identity.claims.get('user_id')
-
-                ## Admin authentication
-                admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                admin_user = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Unauthorized'}, 401)
-                ## Admin authentication ends
-
                 ## Get payload data
                 cryptoSellId = schema.crypto_sell_id
                 status      = schema.status
@@ -309,7 +285,7 @@ class CryptoTransactionController(APIController):
     
     
     ## Get all crypto transactions
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def get_cryptoTransactions(self, request: Request,  limit: int = 5, offset: int = 0):
         """
@@ -334,19 +310,6 @@ class CryptoTransactionController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id      = user_identity.claims.get('user_id')
-
-                ## Admin authentication
-                admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                admin_user = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Unauthorized'}, 401)
-                ## Admin authentication ends
-
                 combined_transaction = []
 
                  ## Execute Buy Query
@@ -477,7 +440,7 @@ class CryptoTransactionController(APIController):
         
     
     ## Filter Crypto Transactions
-    @auth('userauth')
+    @auth('admin')
     @post()
     async def filter_cryptoTransactions(self, request: Request, schema: AdminFilterCryptoTransactionsSchema, limit: int = 5, offset: int = 0):
         """
@@ -513,19 +476,6 @@ class CryptoTransactionController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id      = user_identity.claims.get('user_id')
-
-                ## Admin authentication
-                admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                admin_user = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Unauthorized'}, 401)
-                ## Admin authentication ends
-
                 combined_transaction = []
                 buy_conditions  = []
                 sell_conditions = []
@@ -778,134 +728,82 @@ class ExportCryptoTransactionDataController(APIController):
     
     
     ## Export all Crypto transactions
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def export_cryptoTransaction(self, request: Request):
         """
             This function exports combined cryptocurrency buy and sell transactions for an authenticated admin user.<br/><br/>
 
             Parameters:<br/>
-            - request (Request): The HTTP request object.<br/><br/>
+            - request (Request): The HTTP request object.<br/>
+            - format (query): json (default), csv or ndjson.<br/>
+            - columns (query): Comma separated columns to export.<br/>
+            - date_from, date_to (query): Inclusive YYYY-MM-DD date range, or date_range (Today, ThisWeek, ThisMonth...).<br/><br/>
             
             Returns:<br/>
               - JSON response: A JSON object containing the combined transaction data for both crypto buy and sell transactions.<br/>
+              - The rows are streamed from the database in chunks, CSV and NDJSON are sent as file attachments.<br/>
               - If the user is not an admin, returns a JSON response with an error message.<br/>
               - If no transactions are found, returns a JSON response with a 'No data found' message.<br/>
               - In case of an error, returns a JSON response with an error message.<br/>
         """
         try:
-            async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id      = user_identity.claims.get('user_id')
-
-                ## Admin authentication
-                admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                admin_user = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Unauthorized'}, 401)
-                ## Admin authentication ends
-
-                combined_transaction = []
-
-                 ## Execute Buy Query
+            async with session_for('export') as session:
+                 ## Buy Query
                 buy_stmt = select(
                     CryptoBuy.id,
-                    CryptoBuy.crypto_quantity,
-                    CryptoBuy.payment_type,
-                    CryptoBuy.buying_currency,
-                    CryptoBuy.buying_amount,
-                    CryptoBuy.fee_value,
-                    CryptoBuy.created_at,
-                    CryptoBuy.status,
-
+                    literal('Buy').label('type'),
                     CryptoWallet.crypto_name,
-
+                    CryptoBuy.crypto_quantity.label('crypto_qty'),
+                    CryptoBuy.payment_type.label('payment_mode'),
+                    CryptoBuy.buying_amount.label('amount'),
+                    CryptoBuy.buying_currency.label('currency'),
+                    CryptoBuy.status,
+                    CryptoBuy.created_at,
                     Users.full_name.label('user_name'),
-                    Users.email.label('user_email')
+                    Users.email.label('user_email'),
+                    CryptoBuy.fee_value.label('fee')
                 ).join(
                     CryptoWallet, CryptoWallet.id == CryptoBuy.crypto_wallet_id
                 ).join(
                     Users, Users.id == CryptoBuy.user_id
-                ).order_by(
-                    desc(CryptoBuy.id)
                 )
 
-                # Execute Sell Query
+                # Sell Query
                 sell_stmt = select(
                     CryptoSell.id,
-                    CryptoSell.crypto_quantity,
-                    CryptoSell.payment_type,
-                    CryptoSell.received_amount,
-                    CryptoSell.fee_value,
-                    CryptoSell.created_at,
-                    CryptoSell.status,
-
+                    literal('Sell').label('type'),
                     CryptoWallet.crypto_name,
-
-                    Wallet.currency.label('wallet_currency'),
-
+                    CryptoSell.crypto_quantity.label('crypto_qty'),
+                    CryptoSell.payment_type.label('payment_mode'),
+                    CryptoSell.received_amount.label('amount'),
+                    Wallet.currency.label('currency'),
+                    CryptoSell.status,
+                    CryptoSell.created_at,
                     Users.full_name.label('user_name'),
-                    Users.email.label('user_email')
-
+                    Users.email.label('user_email'),
+                    CryptoSell.fee_value.label('fee')
                 ).join(
                     CryptoWallet, CryptoWallet.id == CryptoSell.crypto_wallet_id
                 ).join(
                     Wallet, Wallet.id == CryptoSell.wallet_id
                 ).join(
                     Users, Users.id == CryptoSell.user_id
-                ).order_by(
-                    desc(CryptoSell.id)
                 )
 
-                ## Get all cryptoBuy Transactions of user
-                crypto_buy_transaction_obj = await session.execute(buy_stmt)
-                crypto_buy_transaction     = crypto_buy_transaction_obj.all()
-
-                ## Get all cryptoSell Transactions of user
-                crypto_sell_transaction_obj = await session.execute(sell_stmt)
-                crypto_sell_transaction     = crypto_sell_transaction_obj.all()
-
-                combined_transaction = [
-                    {
-                        'id': buyTransaction.id,
-                        'type': 'Buy',
-                        'crypto_name': buyTransaction.crypto_name,
-                        'crypto_qty': buyTransaction.crypto_quantity,
-                        'payment_mode': buyTransaction.payment_type,
-                        'amount': buyTransaction.buying_amount,
-                        'currency': buyTransaction.buying_currency,
-                        'status': buyTransaction.status,
-                        'created_at': buyTransaction.created_at,
-                        'user_name': buyTransaction.user_name,
-                        'user_email': buyTransaction.user_email,
-                        'fee': buyTransaction.fee_value
-
-                    } for buyTransaction in crypto_buy_transaction
-                ] + [
-                    {
-                        'id': sellTransaction.id,
-                        'type': 'Sell',
-                        'payment_mode': sellTransaction.payment_type,
-                        'crypto_name': sellTransaction.crypto_name,
-                        'crypto_qty': sellTransaction.crypto_quantity,
-                        'currency': sellTransaction.wallet_currency,
-                        'amount': sellTransaction.received_amount,
-                        'status': sellTransaction.status,
-                        'created_at': sellTransaction.created_at,
-                        'user_name': sellTransaction.user_name,
-                        'user_email': sellTransaction.user_email,
-                        'fee': sellTransaction.fee_value
+                ## Buy and Sell transactions in one stream, latest first
+                combined_transaction = union_all(buy_stmt, sell_stmt).subquery()
 
-                    } for sellTransaction in crypto_sell_transaction
-                ]
+                stmt = select(*combined_transaction.c).order_by(
+                    desc(combined_transaction.c.created_at)
+                )
 
-                return json({
-                    'success': True,
-                    'export_crypto_transactions_data': combined_transaction
-                }, 200)
+                return await export_query(
+                    request, session, stmt,
+                    root_key    = 'export_crypto_transactions_data',
+                    filename    = 'crypto_transactions',
+                    date_column = combined_transaction.c.created_at
+                )
 
         except Exception as e:
             return json({
@@ -3,12 +3,13 @@ from app.FireBlock import Create_Wallet
 from blacksheep.server.authorization import auth
 from blacksheep.server.controllers import APIController
 from blacksheep import json, Request
-from database.db import AsyncSession, async_engine
+from database.db import AsyncSession, async_engine, session_for
 from sqlmodel import select, and_, desc, func
 from Models.crypto import CryptoWallet
 from Models.models import Users
 from Models.Crypto.schema import UpdateAdminCryptoWalletSchema, AdminFilterUserWalletSchema
 from app.dateFormat import get_date_range
+from app.export import export_query
 
 
 
@@ -25,7 +26,7 @@ class AdminCryptoWalletController(APIController):
         return 'All user Crypto Wallets'
     
     ### Get wallet of all users
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def get_userWallets(self, request: Request, limit: int = 10, offset: int = 0):
         """
@@ -43,17 +44,6 @@ class AdminCryptoWalletController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id       = user_identity.claims.get('user_id')
-
-                # Admin authentication
-                admin_user_obj = await session.execute(select(Users).where(Users.id == admin_id))
-                admin_user     = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Admin authoriztion Failed'}, 401)
-                # Admin authentication ends
-
                 # Count Total availble rows
                 total_row_stmt = select(func.count(CryptoWallet.id))
                 total_row_obj  = await session.execute(total_row_stmt)
@@ -114,7 +104,7 @@ class AdminCryptoWalletController(APIController):
         
     
     ## Update Crypto Wallet by Admin
-    @auth('userauth')
+    @auth('admin')
     @put()
     async def update_cryptoWallet(self, request: Request, schema: UpdateAdminCryptoWalletSchema):
         """
@@ -135,17 +125,6 @@ class AdminCryptoWalletController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id       = user_identity.claims.get('user_id')
-
-                # Admin authentication
-                admin_user_obj = await session.execute(select(Users).where(Users.id == admin_id))
-                admin_user     = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Admin authoriztion Failed'}, 401)
-                # Admin authentication ends
-
                 ## Get the payload data
                 walletID = schema.wallet_id
                 status   = schema.status
@@ -210,7 +189,7 @@ class AdminCryptoWalletController(APIController):
 
 
     ## Filter Wallet Requests
-    @auth('userauth')
+    @auth('admin')
     @post()
     async def filter_wallets(self, request: Request, schema: AdminFilterUserWalletSchema):
         """
@@ -230,17 +209,6 @@ class AdminCryptoWalletController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id       = user_identity.claims.get('user_id')
-
-                # Admin authentication
-                admin_user_obj = await session.execute(select(Users).where(Users.id == admin_id))
-                admin_user     = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Unauthorized'}, 401)
-                # Admin authentication ends
-
                 ## Get payload data
                 dateRange    = schema.date_range
                 email        = schema.email
@@ -361,20 +329,24 @@ class ExportWalletController(APIController):
     
     
     ### Export All wallets
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def export_cryptoWallets(self, request: Request):
         """
             This function exports data related to crypto wallets along with user information.<br/><br/>
 
             Parameters:<br/>
-            - request (Request): The HTTP request object.<br/><br/>
+            - request (Request): The HTTP request object.<br/>
+            - format (query): json (default), csv or ndjson.<br/>
+            - columns (query): Comma separated columns to export.<br/>
+            - date_from, date_to (query): Inclusive YYYY-MM-DD date range, or date_range (Today, ThisWeek, ThisMonth...).<br/><br/>
             
             Returns:<br/>
-            - JSON response with success status and 'export_wallets_data' key containing a list of dictionaries with wallet information.
+            - JSON response with success status and 'export_wallets_data' key containing a list of dictionaries with wallet information.<br/>
+            - The rows are streamed from the database in chunks, CSV and NDJSON are sent as file attachments.
         """
         try:
-            async with AsyncSession(async_engine) as session:
+            async with session_for('export') as session:
                 stmt = select(
                     CryptoWallet.id,
                     CryptoWallet.user_id,
@@ -383,38 +355,22 @@ class ExportWalletController(APIController):
                     CryptoWallet.crypto_name,
                     CryptoWallet.balance,
                     CryptoWallet.status,
-                    CryptoWallet.is_approved,
 
-                    Users.full_name,
-                    Users.email,
+                    Users.full_name.label('user_name'),
+                    Users.email.label('user_email'),
                 ).join(
                     Users, Users.id == CryptoWallet.user_id
                 ).order_by(
                     desc(CryptoWallet.id)
                 )
 
-                user_crypto_wallets_obj = await session.execute(stmt)
-                user_crypto_wallets     = user_crypto_wallets_obj.all()
-
-                combined_data = []
-
-                for wallet in user_crypto_wallets:
-                    combined_data.append({
-                        'id': wallet.id,
-                        'user_id': wallet.user_id,
-                        'wallet_address': wallet.wallet_address,
-                        'created_At': wallet.created_At,
-                        'crypto_name': wallet.crypto_name,
-                        'balance': wallet.balance,
-                        'status': wallet.status,
-                        'user_name': wallet.full_name,
-                        'user_email': wallet.email
-                    })
-
-                return json({
-                    'success': True,
-                    'export_wallets_data': combined_data
-                }, 200)
+                # Stream all the wallets
+                return await export_query(
+                    request, session, stmt,
+                    root_key    = 'export_wallets_data',
+                    filename    = 'crypto_wallets',
+                    date_column = CryptoWallet.created_At
+                )
             
 
         except Exception as e:
@@ -1,5 +1,6 @@
 from Models.fee import FeeStructure
 from database.db import AsyncSession, async_engine
+from app.unit_of_work import use_session
 from sqlmodel import select, and_
 from blacksheep import Request, json
 from blacksheep.server.authorization import auth
@@ -8,9 +9,9 @@ from app.controllers.controllers import get, post
 
 
 
-async def CalculateFee(fee_id: int, amount: float):
+async def CalculateFee(fee_id: int, amount: float, session: AsyncSession | None = None):
 
-    async with AsyncSession(async_engine) as session:
+    async with use_session(session) as session:
         # Get the fee
         fee_structure_obj = await session.execute(select(FeeStructure).where(
             FeeStructure.id == fee_id
@@ -8,7 +8,7 @@ from Models.crypto import CryptoExchange, CryptoWallet
 from Models.models import Wallet
 from Models.fee import FeeStructure
 from Models.Crypto.schema import UserCreateCryptoExchangeSchema, UserFilterCryptoExchangeSchema
-from app.generateID import generate_new_crypto_exchange_transaction_id
+from app.snowflake import new_id
 from app.CryptoController.calculateFee import CalculateFee
 from app.dateFormat import get_date_range
 from datetime import datetime, timedelta
@@ -99,11 +99,11 @@ class UserCryptoExchangeController(APIController):
                 ))
                 crypto_exchange_fee = crypto_exchange_fee_obj.scalar()
 
-                exchange_transaction_id = await generate_new_crypto_exchange_transaction_id()
+                exchange_transaction_id = new_id()
 
                 if crypto_exchange_fee:
                     float_qty      = float(exchangeAmount)
-                    calculated_fee = await CalculateFee(crypto_exchange_fee.id, float_qty)
+                    calculated_fee = await CalculateFee(crypto_exchange_fee.id, float_qty, session)
 
                     create_crypto_exchange_transaction = CryptoExchange(
                             user_id                = user_id,
@@ -1,5 +1,5 @@
 from app.controllers.controllers import get, post, put
-from app.generateID import generate_new_swap_transaction_id
+from app.snowflake import new_id
 from app.CryptoController.calculateFee import CalculateFee
 from app.dateFormat import get_date_range
 from blacksheep.server.authorization import auth
@@ -100,11 +100,11 @@ class UserCryptoSwapController(APIController):
                 crypto_swap_fee = crypto_swap_fee_obj.scalar()
 
                 ## Generate new transaction ID
-                swap_transaction_id = await generate_new_swap_transaction_id()
+                swap_transaction_id = new_id()
 
                 if crypto_swap_fee:
                     float_qty = float(swapAmount)
-                    calculated_amount = await CalculateFee(crypto_swap_fee.id, float_qty)
+                    calculated_amount = await CalculateFee(crypto_swap_fee.id, float_qty, session)
 
                     ### Create Crypto Swap Transaction
                     create_crypto_swap = CryptoSwap(
@@ -108,7 +108,7 @@ class CryptoBuyController(APIController):
                 if buy_crypto_fee:
                     float_amt = float(buyingAmount)
 
-                    calculated_amount = await CalculateFee(buy_crypto_fee.id, float_amt)
+                    calculated_amount = await CalculateFee(buy_crypto_fee.id, float_amt, session)
 
                     crypto_buy = CryptoBuy(
                         user_id          = user_id,
@@ -251,7 +251,7 @@ class CryptoSellController(APIController):
                 if crypto_sell_fee:
                     float_qty = float(sellingQty)
 
-                    calculated_amount = await CalculateFee(crypto_sell_fee.id, float_qty)
+                    calculated_amount = await CalculateFee(crypto_sell_fee.id, float_qty, session)
 
                     unique_id = str(uuid.uuid4())[:30]
 
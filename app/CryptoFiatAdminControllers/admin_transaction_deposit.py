@@ -2,25 +2,20 @@ from blacksheep import json, Request, pretty_json, FromJSON
 from blacksheep.server.authorization import auth
 from blacksheep.server.controllers import APIController
 from app.controllers.controllers import get, put, post
-from database.db import AsyncSession, async_engine
+from database.db import AsyncSession, async_engine, session_for
 from Models.models import Users, Currency, Wallet
 from Models.models4 import DepositTransaction
 from Models.schemas import UpdateTransactionSchema
 from Models.FIAT.Schema import AdminFilterFIATDeposits
 from sqlmodel import select, desc, func, and_
-from decouple import config
-from httpx import AsyncClient
+from app.fx import convert_amount, FXRateError
 from app.dateFormat import get_date_range
+from app.export import export_query
+from app.pagination import PageRequest, paginate
 from datetime import datetime, timedelta
 
 
 
-currency_converter_api = config('CURRENCY_CONVERTER_API')
-RAPID_API_KEY          = config('RAPID_API_KEY')
-RAPID_API_HOST         = config('RAPID_API_HOST')
-
-
-
 
 # Admin will be able to view all the Deposits
 class AllDepositController(APIController):
@@ -33,20 +28,23 @@ class AllDepositController(APIController):
     def class_name(cls) -> str:
         return 'All Deposits'
     
-    @auth('userauth')
+    @auth('admin')
     @get()
-    async def get_deposite_transaction(self, request: Request, limit: int = 10, offset: int = 0):
+    async def get_deposite_transaction(self, request: Request, limit: int = 10, offset: int = 0, cursor: str | None = None, total: str = 'exact'):
         """
             This API Endpoint retrieves all the deposit transactions for the specified admin user.<br/><br/>
 
             Parameters:<br/>
                 - request(Request): The HTTP request object containing user identity and other information.<br/>
                 - limit(int, optional): The number of rows to be returned. Default is 10.<br/>
-                - offset(int, optional): The offset of the rows to be returned. Default is 0.<br/><br/>
+                - offset(int, optional): The offset of the rows to be returned. Default is 0.<br/>
+                - cursor(str, optional): The next_cursor of the previous page, used instead of offset.<br/>
+                - total(str, optional): exact, estimated or none. Default is exact.<br/><br/>
             
             Returns:<br/>
                 - JSON: A JSON response containing the deposit_transactions, success, message, and the total_row_count.<br/>
-                - total_row_count (float): The total number of deposit transactions available.<br/><br/>
+                - total_row_count (float): The total number of deposit transactions available.<br/>
+                - next_cursor (str): Cursor of the next page, null on the last page.<br/><br/>
             
             Error Messages:<br/>
                 - Unauthorized: If the user is not authenticated or is not an admin.<br/>
@@ -62,28 +60,12 @@ class AllDepositController(APIController):
                 - 'error': 'Invalid request data'.<br/>
         """
         try:
-            async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id       = user_identity.claims.get('user_id') if user_identity else None
-
-                limit  = limit
-                offset = offset
-
-                # Admin authentication
-                admin_obj     = await session.execute(select(Users).where(Users.id == admin_id))
-                admin_obj_data = admin_obj.scalar()
-
-                if not admin_obj_data.is_admin:
-                    return json({'msg': 'Admin authorization Failed'}, 401)
-                # Admin authentication ends
-
-                # Count total rows in the table
-                count_stmt          = select(func.count(DepositTransaction.id))
-                total_deposite_obj  = await session.execute(count_stmt)
-                total_deposite_rows = total_deposite_obj.scalar()
-
-                total_deposit_row_count = total_deposite_rows / limit
+            page_request = PageRequest(limit, offset, cursor, total)
+        except ValueError as e:
+            return json({'error': 'Bad Request', 'message': str(e)}, 400)
 
+        try:
+            async with AsyncSession(async_engine) as session:
                 stmt  = select(
                     DepositTransaction.id,
                     DepositTransaction.transaction_id,
@@ -103,17 +85,15 @@ class AllDepositController(APIController):
                         Users,  Users.id == DepositTransaction.user_id
                     ).join(
                         Currency, Currency.id == DepositTransaction.currency
-                    ).order_by(
-                        desc(DepositTransaction.id)
-                    ).limit(
-                        limit
-                    ).offset(
-                        offset
                     )
                 
                 #Get all transaction Data
-                get_all_transaction     = await session.execute(stmt)
-                get_all_transaction_obj = get_all_transaction.all()
+                page = await paginate(
+                    session, stmt, page_request,
+                    DepositTransaction.id, DepositTransaction.created_At,
+                    count_statement = select(DepositTransaction.id)
+                )
+                get_all_transaction_obj = page.rows
                 
                 combined_data = []
 
@@ -141,7 +121,8 @@ class AllDepositController(APIController):
                     'message': 'Deposit Transaction data fetched successfully', 
                     'deposit_transactions': combined_data,
                     'success': True,
-                    'total_row_count': total_deposit_row_count
+                    'total_row_count': page.page_count,
+                    'next_cursor': page.next_cursor
                     }, 200)
 
         except Exception as e:
@@ -162,7 +143,7 @@ class DepositTransactionDetailController(APIController):
         return 'Deposit Transaction Details'
     
 
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def get_deposit_details(self, request: Request, transaction_id: int):
         """
@@ -183,17 +164,6 @@ class DepositTransactionDetailController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                AdminID       = user_identity.claims.get('user_id') if user_identity else None
-
-                # Admin Authentication
-                admin_obj = await session.execute(select(Users).where(Users.id == AdminID))
-                admin_obj_data = admin_obj.scalar()
-
-                if not admin_obj_data or not admin_obj_data.is_admin:
-                    return json({'msg': 'Only admin can view the Transactions'}, 401)
-                # Admin Authentication ends
-
                 combined_data = []
 
                 # Get the transaction
@@ -245,31 +215,13 @@ class DepositTransactionDetailController(APIController):
                     ))
                 selected_wallet_currency_data = selected_wallet_currency.scalar()
 
-                # Call API for currency Conversion
+                # Convert with the cached exchange rates
                 try:
-                    url = f"{currency_converter_api}/convert?from={deposit_currency}&to={selected_wallet_currency_data.name}&amount={deposit_amount}"
-                    headers = {
-                        'X-RapidAPI-Key': f"{RAPID_API_KEY}",
-                        'X-RapidAPI-Host': f"{RAPID_API_HOST}"
-                    }
-                    
-                    async with AsyncClient() as client:
-                        response = await client.get(url, headers=headers)
-
-                        if response.status_code == 200:
-                            api_data = response.json()
+                    converted_amount = await convert_amount(deposit_currency, selected_wallet_currency_data.name, deposit_amount)
 
-                        else:
-                            return json({'msg': 'Error calling external API', 'error': response.text}, 400)
-                        
-                except Exception as e:
+                except FXRateError as e:
                     return json({'msg': 'Currency API Error', 'error': f'{str(e)}'}, 400)
 
-                converted_amount = api_data['result'] if 'result' in api_data else None
-
-                if not converted_amount:
-                    return json({'msg': 'Invalid Curency Converter API response', 'error': 'Conversion result missing'}, 400)
-                
                 combined_data.append({
                     'id': transaction_id_details.id,
                     'transaction_id': transaction_id_details.transaction_id,
@@ -306,7 +258,7 @@ class UpdateDepositController(APIController):
     def route(cls) -> str | None:
         return '/api/v4/admin/update/deposit/transaction/'
     
-    @auth('userauth')
+    @auth('admin')
     @put()
     async def update_deposit(self, request: Request, input: FromJSON[UpdateTransactionSchema]):
         """
@@ -341,15 +293,6 @@ class UpdateDepositController(APIController):
             async with AsyncSession(async_engine) as session:
                 data = input.value
 
-                user_identity = request.identity
-                AdminID       = user_identity.claims.get("user_id") if user_identity else None
-
-                user_obj = await session.execute(select(Users).where(Users.id == AdminID))
-                user_obj_data = user_obj.scalar()
-
-                if not user_obj_data.is_admin:
-                    return json({'msg': 'Admin authorization Failed'}, 401)
-                #Admin authentication ends
 
                 # Get the deposit transaction
                 transaction_obj = await session.execute(select(DepositTransaction).where(
@@ -395,30 +338,10 @@ class UpdateDepositController(APIController):
                     currency_to_convert_name = currency_to_convert_obj.name
 
                     try:
-                        url = f"{currency_converter_api}/convert?from={currency_to_convert_name}&to={selected_wallet_currency_name}&amount={transaction_data.amount}"
-                        headers = {
-                        'X-RapidAPI-Key': f"{RAPID_API_KEY}",
-                        'X-RapidAPI-Host': f"{RAPID_API_HOST}"
-                    }
-                        
-                        async with AsyncClient() as client:
-                            response = await client.get(url, headers=headers)
-                            # print('APi Response', response)
-
-                            if response.status_code == 200:
-                                api_data = response.json()
-                                # print('api data', api_data)
-
-                            else:
-                                return json({'message': 'Error calling external API', 'error': response.text}, 400)
-                            
-                    except Exception as e:
-                        return json({'message': 'Currency API Error', 'error': f'{str(e)}'}, 400)
-
-                    converted_amount = api_data['result'] if 'result' in api_data else None
+                        converted_amount = await convert_amount(currency_to_convert_name, selected_wallet_currency_name, transaction_data.amount)
 
-                    if not converted_amount:
-                        return json({'message': 'Invalid Curency Converter API response', 'error': 'Conversion result missing'}, 400)
+                    except FXRateError as e:
+                        return json({'message': 'Currency API Error', 'error': f'{str(e)}'}, 400)
 
                     sender_wallet_obj.balance += converted_amount
 
@@ -472,7 +395,7 @@ class AdminFiletrFIATDepositController(APIController):
     
     
     ### Filter Fiat Deposits
-    @auth('userauth')
+    @auth('admin')
     @post()
     async def Filter_Fiat_Deposit(self, request: Request, schema: AdminFilterFIATDeposits, limit: int = 10, offset: int = 0):
         """
@@ -499,16 +422,6 @@ class AdminFiletrFIATDepositController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                AdminID       = user_identity.claims.get("user_id") if user_identity else None
-
-                user_obj = await session.execute(select(Users).where(Users.id == AdminID))
-                user_obj_data = user_obj.scalar()
-
-                if not user_obj_data.is_admin:
-                    return json({'msg': 'Admin authorization Failed'}, 401)
-                #Admin authentication ends
-
                 ## Get payload data
                 dateTime   = schema.date_time
                 user_email = schema.email
@@ -672,18 +585,22 @@ class AdminExportDepositTransactionsController(APIController):
         return '/api/v1/admin/export/deposit/transactions/'
     
     ### Export Deposit Transactions
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def export_depositTransaction(self, request: Request):
         """
             This function exports deposit transaction data after verifying admin authorization.<br/><br/>
 
             Parameters:<br/>
-            - request (Request): The HTTP request object received by the `export_depositTransaction` endpoint.<br/><br/>
+            - request (Request): The HTTP request object received by the `export_depositTransaction` endpoint.<br/>
+            - format (query): json (default), csv or ndjson.<br/>
+            - columns (query): Comma separated columns to export.<br/>
+            - date_from, date_to (query): Inclusive YYYY-MM-DD date range, or date_range (Today, ThisWeek, ThisMonth...).<br/><br/>
 
             Returns:<br/>
               - JSON: A JSON response containing the deposit transaction data. If successful, 
                       the response object contains the export transaction data. <br/>
+              - The rows are streamed from the database in chunks, CSV and NDJSON are sent as file attachments.<br/>
               - JSON response. If an error occurs during the process, an error response is returned.
               - Error: An error response is returned if the admin authorization fails or any error occurs during the process.<br/><br/>
 
@@ -691,31 +608,19 @@ class AdminExportDepositTransactionsController(APIController):
             - Exception: If any error occurs during the database operations or processing.
         """
         try:
-            async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                AdminID       = user_identity.claims.get('user_id')
-
-                user_obj = await session.execute(select(Users).where(Users.id == AdminID))
-                user_obj_data = user_obj.scalar()
-
-                if not user_obj_data.is_admin:
-                    return json({'msg': 'Admin authorization Failed'}, 401)
-                #Admin authentication ends
-
+            async with session_for('export') as session:
                 stmt  = select(
                     DepositTransaction.transaction_id,
                     DepositTransaction.created_At,
                     DepositTransaction.amount,
                     DepositTransaction.transaction_fee,
-                    DepositTransaction.payout_amount,
                     DepositTransaction.status,
                     DepositTransaction.payment_mode,
+                    Users.full_name.label('user_name'),
+                    Users.email.label('user_email'),
+                    Currency.name.label('transaction_currency'),
                     DepositTransaction.credited_amount,
-                    DepositTransaction.credited_currency,
-
-                    Users.full_name,
-                    Users.email,
-                    Currency.name.label('currency_name')
+                    DepositTransaction.credited_currency
 
                     ).join(
                         Users,  Users.id == DepositTransaction.user_id
@@ -725,35 +630,15 @@ class AdminExportDepositTransactionsController(APIController):
                         desc(DepositTransaction.id)
                     )
                 
-                #Get all transaction Data
-                get_all_transaction     = await session.execute(stmt)
-                get_all_transaction_obj = get_all_transaction.all()
-
-                combined_data = []
-
-                if not get_all_transaction_obj:
-                    return json({'msg': "No Transaction available"}, 404)
-                
-                for transaction in get_all_transaction_obj:
-                    combined_data.append({
-                        'transaction_id': transaction.transaction_id,
-                        'created_At': transaction.created_At,
-                        'amount': transaction.amount,
-                        'transaction_fee': transaction.transaction_fee,
-                        'status': transaction.status,
-                        'payment_mode': transaction.payment_mode,
-                        'user_name': transaction.full_name,
-                        'user_email': transaction.email,
-                        'transaction_currency': transaction.currency_name,
-                        'credited_amount': transaction.credited_amount,
-                        'credited_currency': transaction.credited_currency
-                    })
-
-                return json({
-                    'message': 'Deposit Transaction data fetched successfully', 
-                    'export_deposit_transactions': combined_data,
-                    'success': True
-                }, 200)
+                # Stream all the transactions
+                return await export_query(
+                    request, session, stmt,
+                    root_key       = 'export_deposit_transactions',
+                    filename       = 'deposit_transactions',
+                    date_column    = DepositTransaction.created_At,
+                    empty_response = json({'msg': "No Transaction available"}, 404),
+                    extra          = {'message': 'Deposit Transaction data fetched successfully'}
+                )
 
         except Exception as e:
             return json({
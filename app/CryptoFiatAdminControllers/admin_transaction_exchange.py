@@ -2,12 +2,14 @@ from app.controllers.controllers import get, post, put
 from blacksheep.server.controllers import APIController
 from blacksheep.server.authorization import auth
 from blacksheep import json, Request
-from database.db import AsyncSession, async_engine
+from database.db import AsyncSession, async_engine, session_for
 from sqlmodel import select, desc, and_, func
+from sqlalchemy.orm import aliased
 from Models.models import Users, Currency, Wallet
 from Models.models4 import FIATExchangeMoney
 from Models.FIAT.Schema import AdminUpdateExchangeMoneySchema, AdminFilterExchangeTransaction
 from app.dateFormat import get_date_range
+from app.export import export_query
 from datetime import datetime, timedelta
 
 
@@ -25,7 +27,7 @@ class AdminFiatExchangeMoneyController(APIController):
     
 
     ## Get all Exchange Money Transactions
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def get_fiat_exchange_requests(self, request: Request, limit: int = 10, offset: int = 0):
         """
@@ -44,17 +46,6 @@ class AdminFiatExchangeMoneyController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity   = request.identity
-                AdminID          = user_identity.claims.get("user_id") if user_identity else None
-
-                # Admin Authentication
-                admin_obj      = await session.execute(select(Users).where(Users.id == AdminID))
-                admin_obj_data = admin_obj.scalar()
-
-                if not admin_obj_data.is_admin:
-                    return json({'msg': 'Only admin can view the Transactions'}, 400)
-                # Admin authentication ends
-
                 combined_data = []
 
                 # Count total available rows
@@ -133,7 +124,7 @@ class AdminFiatExchangeMoneyController(APIController):
         
 
     ## update Exchange Money Transaction
-    @auth('userauth')
+    @auth('admin')
     @put()
     async def update_exchange_money(self, request: Request, schema: AdminUpdateExchangeMoneySchema):
         """
@@ -148,17 +139,6 @@ class AdminFiatExchangeMoneyController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity   = request.identity
-                AdminID          = user_identity.claims.get("user_id") if user_identity else None
-
-                # Admin Authentication
-                admin_obj      = await session.execute(select(Users).where(Users.id == AdminID))
-                admin_obj_data = admin_obj.scalar()
-
-                if not admin_obj_data.is_admin:
-                    return json({'msg': 'Only admin can view the Transactions'}, 400)
-                # Admin authentication ends
-
                 # Get payload data
                 status            = schema.status
                 exchange_money_id = int(schema.exchange_money_id)
@@ -258,7 +238,7 @@ class AdminFilterExchangeMoneyTransaction(APIController):
         return '/api/v6/admin/filter/exchange/money/'
 
     ### Filter Exchange money
-    @auth('userauth')
+    @auth('admin')
     @post()
     async def filter_exchange_money(self, request: Request, schema: AdminFilterExchangeTransaction, limit: int = 10, offset: int = 0):
         """
@@ -279,17 +259,6 @@ class AdminFilterExchangeMoneyTransaction(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                AdminID       = user_identity.claims.get('user_id')
-
-                 # Admin Authentication
-                admin_obj      = await session.execute(select(Users).where(Users.id == AdminID))
-                admin_obj_data = admin_obj.scalar()
-
-                if not admin_obj_data.is_admin:
-                    return json({'msg': 'Only admin can view the Transactions'}, 400)
-                # Admin authentication ends
-
                 ### Get payload data
                 dateTime  = schema.date_time
                 email     = schema.email
@@ -458,7 +427,7 @@ class AdminExportFiatExchangeTransactions(APIController):
     
 
     ### Filter Exchange money
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def export_exchange_money(self, request: Request):
         """
@@ -467,13 +436,17 @@ class AdminExportFiatExchangeTransactions(APIController):
             Parameters:<br/>
                 - `request`- It is used to handle incoming HTTP requests and contains information such as headers,
                             body, and query parameters. In this function, the `request` parameter is used to extract the
-                            user's identity and make decisions.<br/><br/>
+                            user's identity and make decisions.<br/>
+                - format (query): json (default), csv or ndjson.<br/>
+                - columns (query): Comma separated columns to export.<br/>
+                - date_from, date_to (query): Inclusive YYYY-MM-DD date range, or date_range (Today, ThisWeek, ThisMonth...).<br/><br/>
             
             Returns:<br/>
               The code is returning a JSON response with the following structure:<br/>
                 - If the user making the request is not an admin, it returns a message indicating that only
                   admins can view the transactions with a status code of 400.<br/>
                 - If the user making the request is an admin, it retrieves and exports the exchange money.<br/>
+                - The rows are streamed from the database in chunks, CSV and NDJSON are sent as file attachments.<br/>
                 - If there is no data found in the database, it returns a message indicating that no data was
                   found with a status code of 404.<br/>
                 - If there is an error during the database operations, it returns a message indicating
@@ -484,78 +457,39 @@ class AdminExportFiatExchangeTransactions(APIController):
             
         """
         try:
-            async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                AdminID       = user_identity.claims.get('user_id')
-
-                 # Admin Authentication
-                admin_obj      = await session.execute(select(Users).where(Users.id == AdminID))
-                admin_obj_data = admin_obj.scalar()
-
-                if not admin_obj_data.is_admin:
-                    return json({'msg': 'Only admin can view the Transactions'}, 400)
-                # Admin authentication ends
-
-                combined_data = []
+            async with session_for('export') as session:
+                FromCurrency = aliased(Currency)
+                ToCurrency   = aliased(Currency)
 
                 ## Select Rows
                 stmt = select(
-                    FIATExchangeMoney.id,
-                    FIATExchangeMoney.from_currency,
-                    FIATExchangeMoney.to_currency,
-                    FIATExchangeMoney.exchange_amount,
+                    Users.full_name.label('user_name'),
+                    Users.email.label('user_email'),
+                    FromCurrency.name.label('from_currency'),
+                    ToCurrency.name.label('to_currency'),
                     FIATExchangeMoney.converted_amount,
+                    FIATExchangeMoney.exchange_amount,
                     FIATExchangeMoney.transaction_fee,
                     FIATExchangeMoney.created_At,
-                    FIATExchangeMoney.is_completed,
-                    FIATExchangeMoney.user_id,
-                    FIATExchangeMoney.status,
-
-                    Users.full_name.label('user_name'),
-                    Users.email.label('user_email')
+                    FIATExchangeMoney.status
                 ).join(
                     Users, Users.id == FIATExchangeMoney.user_id
+                ).join(
+                    FromCurrency, FromCurrency.id == FIATExchangeMoney.from_currency
+                ).join(
+                    ToCurrency, ToCurrency.id == FIATExchangeMoney.to_currency
                 ).order_by(
                     desc(FIATExchangeMoney.id)
                 )
 
-                ## Execute Query
-                fiat_exchange_money_obj = await session.execute(stmt)
-                fiat_exchange_money     = fiat_exchange_money_obj.fetchall()
-
-                if not fiat_exchange_money:
-                    return json({'message': 'No data found'}, 404)
-                
-                ### Gather all the data
-                for transaction in fiat_exchange_money:
-                    # From Currency
-                    from_currency_obj = await session.execute(select(Currency).where(
-                        Currency.id == transaction.from_currency
-                    ))
-                    from_currency = from_currency_obj.scalar()
-
-                    # To Currency
-                    to_currency_obj = await session.execute(select(Currency).where(
-                        Currency.id == transaction.to_currency
-                    ))
-                    to_currency = to_currency_obj.scalar()
-
-                    combined_data.append({
-                        "user_name": transaction.user_name,
-                        'user_email': transaction.user_email,
-                        "from_currency": from_currency.name,
-                        "to_currency": to_currency.name,
-                        "converted_amount": transaction.converted_amount,
-                        "exchange_amount": transaction.exchange_amount,
-                        "transaction_fee": transaction.transaction_fee,
-                        "created_At": transaction.created_At,
-                        "status": transaction.status
-                    })
-
-                return json({
-                    'success': True,
-                    'export_exchange_money_data': combined_data
-                }, 200)
+                ## Stream all the transactions
+                return await export_query(
+                    request, session, stmt,
+                    root_key       = 'export_exchange_money_data',
+                    filename       = 'exchange_transactions',
+                    date_column    = FIATExchangeMoney.created_At,
+                    empty_response = json({'message': 'No data found'}, 404)
+                )
 
         except Exception as e:
             return json({
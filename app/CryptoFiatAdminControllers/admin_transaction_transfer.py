@@ -2,26 +2,22 @@ from blacksheep import Request, json, pretty_json, FromJSON
 from blacksheep.server.controllers import APIController
 from blacksheep.server.authorization import auth
 from app.controllers.controllers import get, put, post
-from database.db import AsyncSession, async_engine
+from database.db import AsyncSession, async_engine, session_for
 from sqlmodel import select, and_, desc, func
 from sqlalchemy.orm import aliased
 from Models.models import Users, Currency, ReceiverDetails, Wallet
 from Models.models4 import TransferTransaction
 from Models.schemas import UpdateTransactionSchema
 from Models.Admin.Transfer.schemas import AdminFilterTransferTransaction
-from httpx import AsyncClient
-from decouple import config
+from app.fx import convert_amount, FXRateError
 from app.dateFormat import get_date_range
+from app.export import export_query
+from app.enrichment import fetch_users, fetch_currencies, fetch_receiver_details
 from datetime import datetime, timedelta
 
 
 
 
-currency_converter_api = config('CURRENCY_CONVERTER_API')
-RAPID_API_KEY          = config('RAPID_API_KEY')
-RAPID_API_HOST         = config('RAPID_API_HOST')
-
-
 ## View all transfer transactions by Admin
 class AllTransferTransactions(APIController):
 
@@ -34,7 +30,7 @@ class AllTransferTransactions(APIController):
         return '/api/v1/admin/transfer/transactions/'
     
     ### Get all Transfer Transactions
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def get_transfer_transaction(self, request: Request, limit: int = 15, offset: int = 0):
         """
@@ -55,17 +51,6 @@ class AllTransferTransactions(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity   = request.identity
-                AdminID          = user_identity.claims.get("user_id") if user_identity else None
-
-                # Admin Authentication
-                admin_obj      = await session.execute(select(Users).where(Users.id == AdminID))
-                admin_obj_data = admin_obj.scalar()
-
-                if not admin_obj_data.is_admin:
-                    return json({'msg': 'Only admin can view the Transactions'}, 400)
-                # Admin authentication ends
-
                 #Get all transaction Data
                 get_all_transaction = await session.execute(select(TransferTransaction).order_by(
                         desc(TransferTransaction.id)
@@ -79,18 +64,19 @@ class AllTransferTransactions(APIController):
                 if not get_all_transaction_obj:
                     return json({'message': 'No transaction found'}, 404)
                 
-                #Get the Currency
-                currency     = await session.execute(select(Currency))
-                currency_obj = currency.scalars().all()
+                #Get the Currency of the listed transactions
+                currency_dict = await fetch_currencies(session, [transaction.currency for transaction in get_all_transaction_obj])
 
-                if not currency_obj:
+                if not currency_dict:
                     return json({'msg': 'Currency not available'}, 404)
                 
-                #Get the user data
-                user_obj      = await session.execute(select(Users))
-                user_obj_data = user_obj.scalars().all()
+                #Get the senders and receivers of the listed transactions
+                user_dict = await fetch_users(session,
+                    [transaction.user_id for transaction in get_all_transaction_obj] +
+                    [transaction.receiver for transaction in get_all_transaction_obj]
+                )
 
-                if not user_obj_data:
+                if not user_dict:
                     return json({'msg': 'User is not available'}, 404)
                 
                 # Count total rows in the table
@@ -101,10 +87,7 @@ class AllTransferTransactions(APIController):
                 total_transfer_row_count = total_transfer_rows / limit
 
 
-                # Prepare dictionaries for output data
-                currency_dict = {currency.id: currency for currency in currency_obj}
-                user_dict     = {user.id: user for user in user_obj_data}
-                receiver_dict = {receiver.id: receiver for receiver in user_obj_data}
+                receiver_dict = user_dict
 
                 combined_data = []
                 
@@ -161,7 +144,7 @@ class TransferTransactionDetailsController(APIController):
         return '/api/v2/admin/transfer/transaction/details/{transaction_id}/'
 
 
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def get_transfer_transactions(self, request: Request, transaction_id: int):
         """
@@ -192,17 +175,6 @@ class TransferTransactionDetailsController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                AdminID       = user_identity.claims.get('user_id') if user_identity else None
-
-                # Authenticate Admin
-                admin_obj = await session.execute(select(Users).where(Users.id == AdminID))
-                admin_obj_data = admin_obj.scalar()
-
-                if not admin_obj_data.is_admin:
-                    return json({'message': 'Only admin can view the Transactions'}, 401)
-                # Admin Authentication ends
-                
                 # Get the Transaction
                 transaction_id_obj     = await session.execute(select(TransferTransaction).where(
                     TransferTransaction.id == transaction_id
@@ -212,32 +184,27 @@ class TransferTransactionDetailsController(APIController):
                 if not transaction_id_details:
                     return json({'message': 'Transaction does not exist'}, 404)
                 
-                # Get all the users
-                user_obj      = await session.execute(select(Users))
-                user_obj_data = user_obj.scalars().all()
+                # Get the sender and receiver
+                user_dict = await fetch_users(session, [transaction_id_details.user_id, transaction_id_details.receiver])
 
-                if not user_obj_data:
+                if not user_dict:
                     return json({'message': 'User is not available'}, 404)
                 
-                # Get all available currencies
-                currency_obj      = await session.execute(select(Currency))
-                currency_obj_data = currency_obj.scalars().all()
-                
-                if not currency_obj_data:
-                    return json({'message': 'Currency is not available'}, 404)
-                
                 # Get ReceiverDetails
-                receiver_details_obj      = await session.execute(select(ReceiverDetails))
-                receiver_details_obj_data = receiver_details_obj.scalars().all()
+                receiver_details_dict = await fetch_receiver_details(session, [transaction_id_details.receiver_detail])
 
-                if not receiver_details_obj_data:
-                    pass
+                # Get the transaction, receiver and receiver bank currencies
+                currency_dict = await fetch_currencies(session,
+                    [transaction_id_details.currency, transaction_id_details.receiver_currency] +
+                    [details.currency for details in receiver_details_dict.values()]
+                )
+                
+                if not currency_dict:
+                    return json({'message': 'Currency is not available'}, 404)
                 
                 # Store particular id details inside a dict
-                receiver_dict         = {receiver.id: receiver for receiver in user_obj_data}
-                sender_dict           = {sender.id: sender for sender in user_obj_data}
-                currency_dict         = {currency.id: currency for currency in currency_obj_data}
-                receiver_details_dict = {receiver_details.id: receiver_details for receiver_details in receiver_details_obj_data}
+                receiver_dict = user_dict
+                sender_dict   = user_dict
 
                 combined_data = []
 
@@ -275,30 +242,10 @@ class TransferTransactionDetailsController(APIController):
                     receiver_currency_name = receiver_currency_data.name
 
                     try:
-                        url = f"{currency_converter_api}/convert?from={sender_currency}&to={receiver_currency_name}&amount={sender_amount}"
-                        headers = {
-                        'X-RapidAPI-Key': f"{RAPID_API_KEY}",
-                        'X-RapidAPI-Host': f"{RAPID_API_HOST}"
-                    }
-                        
-                        async with AsyncClient() as client:
-                            response = await client.get(url, headers=headers)
-                            # print('APi Response', response)
+                        converted_amount = await convert_amount(sender_currency, receiver_currency_name, sender_amount)
 
-                            if response.status_code == 200:
-                                api_data = response.json()
-                                # print('api data', api_data)
-
-                            else:
-                                return json({'message': 'Error calling external API', 'error': response.text}, 400)
-                            
-                    except Exception as e:
+                    except FXRateError as e:
                         return json({'message': 'Currency API Error', 'error': f'{str(e)}'}, 400)
-
-                    converted_amount = api_data['result'] if 'result' in api_data else None
-
-                    if not converted_amount:
-                        return json({'message': 'Invalid Curency Converter API response', 'error': 'Conversion result missing'}, 400)
             
                 # If Paid to Receiver Wallet
                 elif transaction_id_details.receiver:
@@ -321,30 +268,10 @@ class TransferTransactionDetailsController(APIController):
                     # Call API to convert the Currency value
                     #Call API
                     try:
-                        url = f"{currency_converter_api}/convert?from={sender_currency}&to={receiver_currency_name}&amount={sender_amount}"
-                        headers = {
-                        'X-RapidAPI-Key': f"{RAPID_API_KEY}",
-                        'X-RapidAPI-Host': f"{RAPID_API_HOST}"
-                    }
-                        
-                        async with AsyncClient() as client:
-                            response = await client.get(url, headers=headers)
-                            # print('APi Response', response)
+                        converted_amount = await convert_amount(sender_currency, receiver_currency_name, sender_amount)
 
-                            if response.status_code == 200:
-                                api_data = response.json()
-                                # print('api data', api_data)
-
-                            else:
-                                return json({'message': 'Error calling external API', 'error': response.text}, 400)
-                            
-                    except Exception as e:
+                    except FXRateError as e:
                         return json({'message': 'Currency API Error', 'error': f'{str(e)}'}, 400)
-
-                    converted_amount = api_data['result'] if 'result' in api_data else None
-
-                    if not converted_amount:
-                        return json({'message': 'Invalid Curency Converter API response', 'error': 'Conversion result missing'}, 400)
                     
                 
                 transaction_data = {
@@ -424,7 +351,7 @@ class UpdateTransferTransactionController(APIController):
         return '/api/v4/update/transfer/transactions/'
     
 
-    @auth('userauth')
+    @auth('admin')
     @put()
     async def update_transfer_transaction(self, request: Request, input: FromJSON[UpdateTransactionSchema]):
         """
@@ -465,16 +392,6 @@ class UpdateTransferTransactionController(APIController):
             async with AsyncSession(async_engine) as session:
                 data = input.value
 
-                user_identity = request.identity
-                AdminID       = user_identity.claims.get("user_id") if user_identity else None
-
-                # Admin Authentication
-                user_obj = await session.execute(select(Users).where(Users.id == AdminID))
-                user_obj_data = user_obj.scalar()
-
-                if not user_obj_data.is_admin:
-                    return json({'message': 'Admin authorization Failed'}, 400)
-                # Admin authentication ends
 
                 # Get the transfer transaction
                 transaction_obj = await session.execute(select(TransferTransaction).where(
@@ -544,29 +461,10 @@ class UpdateTransferTransactionController(APIController):
                             if sender_wallet_transfer_obj.balance >= transaction_data.payout_amount:
                                 #Convert currency using API
                                 try:
-                                    url = f"{currency_converter_api}/convert?from={sender_currency_name_obj.name}&to={receiver_currency_obj.name}&amount={transaction_data.amount}"
-                                    headers = {
-                                    'X-RapidAPI-Key': f"{RAPID_API_KEY}",
-                                    'X-RapidAPI-Host': f"{RAPID_API_HOST}"
-                                }
-                                    async with AsyncClient() as client:
-                                        response = await client.get(url, headers=headers)
-                                        # print('APi Response', response)
-
-                                    if response.status_code == 200:
-                                        api_data = response.json()
-                                        # print('api data', api_data)
-
-                                    else:
-                                        return json({'message': 'Error calling external API', 'error': response.text}, 400)
-                            
-                                except Exception as e:
-                                    return json({'message': 'Currency API Error', 'error': f'{str(e)}'}, 400)
-
-                                converted_amount = api_data['result'] if 'result' in api_data else None
+                                    converted_amount = await convert_amount(sender_currency_name_obj.name, receiver_currency_obj.name, transaction_data.amount)
 
-                                if not converted_amount:
-                                    return json({'message': 'Invalid Curency Converter API response', 'error': 'Conversion result missing'}, 400)
+                                except FXRateError as e:
+                                    return json({'message': 'Currency API Error', 'error': f'{str(e)}'}, 400)
                                 
                                 #Update Receiver Received amount
                                 receiver_details_obj.amount = converted_amount
@@ -618,28 +516,10 @@ class UpdateTransferTransactionController(APIController):
                             if sender_wallet_transfer_obj.balance >= transaction_data.payout_amount:
                                 #Convert currency using API
                                 try:
-                                    url = f"{currency_converter_api}/convert?from={sender_currency_name_obj.name}&to={recipient_wallet_obj.currency}&amount={transaction_data.amount}"
-                                    headers = {
-                                    'X-RapidAPI-Key': f"{RAPID_API_KEY}",
-                                    'X-RapidAPI-Host': f"{RAPID_API_HOST}"
-                                }
-                                    async with AsyncClient() as client:
-                                        response = await client.get(url, headers=headers)
-
-                                    if response.status_code == 200:
-                                        api_data = response.json()
-                                        # print('api data', api_data)
-
-                                    else:
-                                        return json({'message': 'Error calling external API', 'error': response.text}, 400)
+                                    converted_amount = await convert_amount(sender_currency_name_obj.name, recipient_wallet_obj.currency, transaction_data.amount)
 
-                                except Exception as e:
+                                except FXRateError as e:
                                     return json({'message': 'Currency API Error', 'error': f'{str(e)}'}, 400)
-
-                                converted_amount = api_data['result'] if 'result' in api_data else None
-
-                                if not converted_amount:
-                                    return json({'message': 'Invalid Curency Converter API response', 'error': 'Conversion result missing'}, 400)
                                 
                                 # Add into Receiver Wallet
                                 recipient_wallet_obj.balance += converted_amount
@@ -688,29 +568,10 @@ class UpdateTransferTransactionController(APIController):
                             if sender_wallet_transfer_obj.balance >= transaction_data.payout_amount:
                                 #Convert currency using API
                                 try:
-                                    url = f"{currency_converter_api}/convert?from={sender_currency_name_obj.name}&to={receiver_currency_obj.name}&amount={transaction_data.amount}"
-                                    headers = {
-                                    'X-RapidAPI-Key': f"{RAPID_API_KEY}",
-                                    'X-RapidAPI-Host': f"{RAPID_API_HOST}"
-                                }
-                                    async with AsyncClient() as client:
-                                        response = await client.get(url, headers=headers)
-                                        # print('APi Response', response)
-
-                                    if response.status_code == 200:
-                                        api_data = response.json()
-                                        # print('api data', api_data)
-
-                                    else:
-                                        return json({'message': 'Error calling external API', 'error': response.text}, 400)
-                            
-                                except Exception as e:
-                                    return json({'message': 'Currency API Error', 'error': f'{str(e)}'}, 400)
-
-                                converted_amount = api_data['result'] if 'result' in api_data else None
+                                    converted_amount = await convert_amount(sender_currency_name_obj.name, receiver_currency_obj.name, transaction_data.amount)
 
-                                if not converted_amount:
-                                    return json({'message': 'Invalid Curency Converter API response', 'error': 'Conversion result missing'}, 400)
+                                except FXRateError as e:
+                                    return json({'message': 'Currency API Error', 'error': f'{str(e)}'}, 400)
                                 
                                 #Update Receiver Received amount
                                 receiver_details_obj.amount = converted_amount
@@ -774,7 +635,7 @@ class FilterTransferTransactionController(APIController):
     
 
     ## Filter all transfer transaction by Admin
-    @auth('userauth')
+    @auth('admin')
     @post()
     async def filter_transferTransaction(self, request: Request, schema: AdminFilterTransferTransaction, limit: int = 10, offset: int = 0):
         """
@@ -794,17 +655,6 @@ class FilterTransferTransactionController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                AdminID       = user_identity.claims.get('user_id')
-
-                # Admin Authentication
-                user_obj = await session.execute(select(Users).where(Users.id == AdminID))
-                user_obj_data = user_obj.scalar()
-
-                if not user_obj_data.is_admin:
-                    return json({'message': 'Admin authorization Failed'}, 400)
-                # Admin authentication ends
-
                 ## Get payload data
                 dateTime  = schema.date_time
                 email     = schema.email
@@ -897,24 +747,22 @@ class FilterTransferTransactionController(APIController):
                 else:
                     return json({'message': 'No transaction found'}, 404)
                 
-                # Get the Currency
-                all_currency_obj = await session.execute(select(Currency))
-                all_currency     = all_currency_obj.scalars().all()
+                # Get the Currency of the listed transactions
+                currency_dict = await fetch_currencies(session, [transaction.currency for transaction in all_transactions])
 
-                if not all_currency:
+                if not currency_dict:
                     return json({'message': 'Currency not available'}, 404)
                 
-                # Get the user data
-                user_obj      = await session.execute(select(Users))
-                user_obj_data = user_obj.scalars().all()
+                # Get the senders and receivers of the listed transactions
+                user_dict = await fetch_users(session,
+                    [transaction.user_id for transaction in all_transactions] +
+                    [transaction.receiver for transaction in all_transactions]
+                )
 
-                if not user_obj_data:
+                if not user_dict:
                     return json({'message': 'User not available'}, 404)
                 
-                # Prepare dictionaries for output data
-                currency_dict = {currency.id: currency for currency in all_currency}
-                user_dict     = {user.id: user for user in user_obj_data}
-                receiver_dict = {receiver.id: receiver for receiver in user_obj_data}
+                receiver_dict = user_dict
 
                 ### Gather all data
                 for transaction in all_transactions:
@@ -972,7 +820,7 @@ class ExportTransferTransactions(APIController):
         return '/api/v4/admin/export/transfer/transaction/'
     
     ## Export Transfer Transaction By Admin
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def export_transferTransaction(self, request: Request):
         """
@@ -980,16 +828,20 @@ class ExportTransferTransactions(APIController):
             retrieving related information from the database.<br/><br/>
 
             Parameters:<br/>
-            - request: This parameter is used to extract the identity of the user making the request.<br/><br/>
+            - request: This parameter is used to extract the identity of the user making the request.<br/>
+            - format (query): json (default), csv or ndjson.<br/>
+            - columns (query): Comma separated columns to export.<br/>
+            - date_from, date_to (query): Inclusive YYYY-MM-DD date range, or date_range (Today, ThisWeek, ThisMonth...).<br/><br/>
            
             Returns:<br/>
             - If successful, it returns a JSON object with a key'success' set to True and another key
               'export_transfer_transaction_data' containing a list of dictionaries with transaction details.<br/>
+            - The rows are streamed from the database in chunks, CSV and NDJSON are sent as file attachments.<br/>
             - If there is an error, it returns a JSON object with an 'error' key set to 'Server Error' and a
               'message' key containing the error message.<br/><br/>
             
             Rasterization:<br/>
-            - This function uses the SQLAlchemy ORM to fetch and process the transfer transaction data.<br/>
+            - This function joins the sender, receiver and currency details into a single streamed query.<br/>
             - The function uses the Blacksheep framework's JSON serialization to convert the data into a JSON
               object.<br/><br/>
             
@@ -998,104 +850,59 @@ class ExportTransferTransactions(APIController):
             - Exception: If there is an error while processing the data or generating the JSON response.<br/>
         """
         try:
-            async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                AdminID       = user_identity.claims.get('user_id')
-
-                # Admin Authentication
-                user_obj = await session.execute(select(Users).where(Users.id == AdminID))
-                user_obj_data = user_obj.scalar()
-
-                if not user_obj_data.is_admin:
-                    return json({'message': 'Admin authorization Failed'}, 400)
-                # Admin authentication end
-
-                combined_data = []
-                #Get all transaction Data
-                get_all_transaction = await session.execute(select(TransferTransaction).order_by(
+            async with session_for('export') as session:
+                Sender           = aliased(Users)
+                Receiver         = aliased(Users)
+                SenderCurrency   = aliased(Currency)
+                ReceiverCurrency = aliased(Currency)
+
+                # Transactions with sender, receiver and currency details joined in
+                stmt = select(
+                    TransferTransaction.id,
+                    Sender.full_name.label('sender_name'),
+                    Sender.email.label('sender_email'),
+                    TransferTransaction.transaction_id,
+                    TransferTransaction.amount.label('transaction_amount'),
+                    TransferTransaction.transaction_fee,
+                    SenderCurrency.name.label('transaction_currency'),
+                    TransferTransaction.massage.label('transaction_purpose'),
+                    TransferTransaction.status,
+                    TransferTransaction.credited_amount,
+                    TransferTransaction.credited_currency,
+
+                    ## Receiver if Receiver payment mode is wallet
+                    Receiver.full_name.label('receiver_user_name'),
+                    ReceiverDetails.email.label('receiver_email'),
+                    TransferTransaction.receiver_payment_mode,
+                    ReceiverCurrency.name.label('receiver_currency'),
+
+                    ## Receiver Bank Details
+                    ReceiverDetails.full_name.label('receiver_name'),
+                    ReceiverDetails.mobile_number.label('receiver_mobile_number'),
+                    ReceiverDetails.bank_name.label('receiver_bank_name'),
+                    ReceiverDetails.acc_number.label('receiver_account_number'),
+                    ReceiverDetails.ifsc_code.label('receiver_ifsc_code')
+                ).join(
+                    SenderCurrency, SenderCurrency.id == TransferTransaction.currency
+                ).outerjoin(
+                    Sender, Sender.id == TransferTransaction.user_id
+                ).outerjoin(
+                    Receiver, Receiver.id == TransferTransaction.receiver
+                ).outerjoin(
+                    ReceiverCurrency, ReceiverCurrency.id == TransferTransaction.receiver_currency
+                ).outerjoin(
+                    ReceiverDetails, ReceiverDetails.id == TransferTransaction.receiver_detail
+                ).order_by(
                     desc(TransferTransaction.id)
-                ))
-                get_all_transaction_obj = get_all_transaction.scalars().all()
-
-                #Get the Currency
-                currency     = await session.execute(select(Currency))
-                currency_obj = currency.scalars().all()
-
-                #Get the user data
-                user_obj      = await session.execute(select(Users))
-                user_obj_data = user_obj.scalars().all()
-
-                ## Receiver details
-                receiver_details_obj = await session.execute(select(ReceiverDetails))
-                receiver_details     = receiver_details_obj.scalars().all()
-
-                # Prepare dictionaries for output data
-                currency_dict          = {currency.id: currency for currency in currency_obj}
-                receiver_currency_dict = {currency.id: currency for currency in currency_obj}
-                user_dict              = {user.id: user for user in user_obj_data}
-                receiver_dict          = {receiver.id: receiver for receiver in user_obj_data}
-                receiver_details_dict  = {details.id: details for details in receiver_details}
-
-
-                for transaction in get_all_transaction_obj:
-                    ## Transaction Currency
-                    currency_id             = transaction.currency
-                    currency_data           = currency_dict.get(currency_id)
-
-                    ## Receiver Currency 
-                    receiver_currency_id  = transaction.receiver_currency
-                    receiver_currency_data = receiver_currency_dict.get(receiver_currency_id)
-
-                    ## Sender data
-                    user_id   = transaction.user_id
-                    user_data = user_dict.get(user_id)
-
-                    ## Receiver Details
-                    receiver_details_id   = transaction.receiver_detail
-                    if receiver_details_id:
-                        receiver_details_data = receiver_details_dict.get(receiver_details_id)
-                    else:
-                        receiver_details_data = None
-
-                    receiver_id   = transaction.receiver
-                    if receiver_id:
-                        receiver_data = receiver_dict.get(receiver_id)
-                    else:
-                        receiver_data = None
-
-
-                    combined_data.append({
-                        'id': transaction.id,
-                       'sender_name': user_data.full_name if user_data else None,
-                       'sender_email': user_data.email if user_data else None,
-                       'transaction_id': transaction.transaction_id,
-                       'transaction_amount': transaction.amount,
-                       'transaction_fee': transaction.transaction_fee,
-                       'transaction_currency': currency_data.name,
-                       'transaction_purpose': transaction.massage,
-                       'status': transaction.status,
-                       'credited_amount': transaction.credited_amount,
-                       'credited_currency': transaction.credited_currency,
-                       
-                       ## Receiver if Receiver payment mode is wallet
-                       'receiver_user_name': receiver_data.full_name if receiver_data else None,
-                       'receiver_email': receiver_data.email if receiver_data else None,
-                       'receiver_payment_mode': transaction.receiver_payment_mode,
-                       'receiver_currency': receiver_currency_data.name,
-
-                       ## Receiver Bank Details
-                       'receiver_name': receiver_details_data.full_name if receiver_details_data else None,
-                       'receiver_email': receiver_details_data.email if receiver_details_data else None,
-                       'receiver_mobile_number': receiver_details_data.mobile_number if receiver_details_data else None,
-                       'receiver_bank_name': receiver_details_data.bank_name if receiver_details_data else None,
-                       'receiver_account_number': receiver_details_data.acc_number if  receiver_details_data else None,
-                       'receiver_ifsc_code': receiver_details_data.ifsc_code if receiver_details_data else None
-                    })
-
-                return json({
-                    'success': True,
-                    'export_transfer_transaction_data': combined_data
-                }, 200)
+                )
+
+                # Stream all the transactions
+                return await export_query(
+                    request, session, stmt,
+                    root_key    = 'export_transfer_transaction_data',
+                    filename    = 'transfer_transactions',
+                    date_column = TransferTransaction.created_At
+                )
 
         except Exception as e:
             return json({
@@ -2,13 +2,15 @@ from app.controllers.controllers import get, put, post
 from blacksheep import json, Request
 from blacksheep.server.authorization import auth
 from blacksheep.server.controllers import APIController
-from database.db import AsyncSession, async_engine
+from database.db import AsyncSession, async_engine, session_for
 from sqlmodel import select, and_, desc, func
+from sqlalchemy.orm import aliased
 from Models.models import Users, Currency, Wallet
 from Models.models4 import FiatWithdrawalTransaction
 from Models.Admin.FiatWithdrawal.schema import UpdateFiatWithdrawalsSchema, AdminFIATWithdrawalFilterSchema
 from decouple import config
 from app.dateFormat import get_date_range
+from app.export import export_query
 from datetime import datetime, timedelta
 
 
@@ -33,7 +35,7 @@ class AdminAllWithdrawalTransactionController(APIController):
     
 
     # Get all Fiat withdrawal requests
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def get_all_user_withdrawals(self, request: Request, limit: int = 10, offset: int = 0):
         """
@@ -50,21 +52,8 @@ class AdminAllWithdrawalTransactionController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id      = user_identity.claims.get('user_id')
-
                 combined_data = []
 
-                #Authenticate Admin
-                admin_user_obj = await session.execute(select(Users).where(
-                        Users.id == admin_id
-                ))
-                admin_user = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Admin authentication Failed'}, 401)
-                # Admin authentication ends
-
                 row_statement     = select(func.count(FiatWithdrawalTransaction.id))
                 exe_row_statement = await session.execute(row_statement)
                 withdrawal_rows   = exe_row_statement.scalar()
@@ -146,7 +135,7 @@ class AdminAllWithdrawalTransactionController(APIController):
 
 
     # Get FIAT Withdrawal Details
-    @auth('userauth')
+    @auth('admin')
     @post()
     async def get__fiat_withdrawals_details(self, request: Request, id: int):
         """
@@ -161,22 +150,9 @@ class AdminAllWithdrawalTransactionController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id      = user_identity.claims.get('user_id')
-
                 combined_data = []
                 withdrawal_id = id
 
-                # Authenticate Admin
-                admin_user_obj = await session.execute(select(Users).where(
-                        Users.id == admin_id
-                ))
-                admin_user = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Admin authentication Failed'}, 401)
-                # Admin authentication ends
-
                 # Select the withdrawal table
                 stmt = select(
                     FiatWithdrawalTransaction.id,
@@ -255,7 +231,7 @@ class AdminAllWithdrawalTransactionController(APIController):
         
 
     # Update FIAT Withdrawal
-    @auth('userauth')
+    @auth('admin')
     @put()
     async def update_fiat_withdrawals(self, request: Request, schema: UpdateFiatWithdrawalsSchema):
         """
@@ -272,19 +248,6 @@ class AdminAllWithdrawalTransactionController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id      = user_identity.claims.get('user_id')
-
-                # Authenticate Admin
-                admin_user_obj = await session.execute(select(Users).where(
-                        Users.id == admin_id
-                ))
-                admin_user = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Admin authentication Failed'}, 401)
-                # Admin authentication ends
-
                 # Get the payload data
                 withdrawal_id    = schema.withdrawal_id
                 status           = schema.status
@@ -380,7 +343,7 @@ class AdminFilterFiatWithdrawal(APIController):
         return '/api/v5/admin/filter/fiat/withdrawal/'
     
     
-    @auth('userauth')
+    @auth('admin')
     @post()
     async def filter_fiat_withdrawal(self, request: Request, schema: AdminFIATWithdrawalFilterSchema, limit: int = 10, offset: int = 0):
         """
@@ -407,19 +370,6 @@ class AdminFilterFiatWithdrawal(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id      = user_identity.claims.get('user_id')
-
-                #Authenticate Admin
-                admin_user_obj = await session.execute(select(Users).where(
-                        Users.id == admin_id
-                ))
-                admin_user = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Admin authentication Failed'}, 401)
-                # Admin authentication ends
-
                 ## Get payload data
                 date_time = schema.date_time
                 email     = schema.email
@@ -600,17 +550,21 @@ class AdminExportFIATWithdrawal(APIController):
     
 
     ## Export all withdrawal data
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def export_fiat_withdrawals(self, request: Request):
         """
             This function exports fiat withdrawals data for admin users after authentication.<br/><br/>
 
             Parameters:<br/>
-            - request (Request): The HTTP request object containing identity and other relevant information.<br/><br/>
+            - request (Request): The HTTP request object containing identity and other relevant information.<br/>
+            - format (query): json (default), csv or ndjson.<br/>
+            - columns (query): Comma separated columns to export.<br/>
+            - date_from, date_to (query): Inclusive YYYY-MM-DD date range, or date_range (Today, ThisWeek, ThisMonth...).<br/><br/>
 
             Returns:<br/>
-            - JSON: A JSON response containing the success status and the exported fiat withdrawals data (export_admin_fiat_withdrawals).<br/><br/>
+            - JSON: A JSON response containing the success status and the exported fiat withdrawals data (export_admin_fiat_withdrawals).<br/>
+            - The rows are streamed from the database in chunks, CSV and NDJSON are sent as file attachments.<br/><br/>
 
             Raises:<br/>
                 - BlackSheepException: If the request is not authorized or if there is an error with the database.<br/>
@@ -619,85 +573,42 @@ class AdminExportFIATWithdrawal(APIController):
                 - Exception: If there is an error with the API response.<br/>
         """
         try:
-            async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id      = user_identity.claims.get('user_id')
-
-                combined_data = []
-
-                #Authenticate Admin
-                admin_user_obj = await session.execute(select(Users).where(
-                        Users.id == admin_id
-                ))
-                admin_user = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Admin authentication Failed'}, 401)
-                # Admin authentication ends
+            async with session_for('export') as session:
+                WalletCurrency     = aliased(Currency)
+                WithdrawalCurrency = aliased(Currency)
 
                 # Select the withdrawal table
                 stmt = select(
-                    FiatWithdrawalTransaction.id,
-                    FiatWithdrawalTransaction.user_id,
+                    Users.email.label('user_email'),
+                    Users.full_name.label('user_name'),
                     FiatWithdrawalTransaction.transaction_id,
                     FiatWithdrawalTransaction.amount,
-                    FiatWithdrawalTransaction.total_amount,
                     FiatWithdrawalTransaction.transaction_fee,
-                    FiatWithdrawalTransaction.withdrawal_currency,
+                    FiatWithdrawalTransaction.total_amount,
+                    WithdrawalCurrency.name.label('withdrawal_currency'),
+                    WalletCurrency.name.label('wallet_currency'),
                     FiatWithdrawalTransaction.status,
-                    FiatWithdrawalTransaction.debit_currency,
-                    FiatWithdrawalTransaction.is_completed,
-                    FiatWithdrawalTransaction.created_At,
                     FiatWithdrawalTransaction.credit_amount,
                     FiatWithdrawalTransaction.credit_currency,
-
-                    Currency.name.label('wallet_currency'),
-
-                    Users.email.label('user_email'),
-                    Users.full_name.label('user_name')
+                    FiatWithdrawalTransaction.created_At
                 ).join(
-                    Currency, Currency.id == FiatWithdrawalTransaction.wallet_currency
+                    WalletCurrency, WalletCurrency.id == FiatWithdrawalTransaction.wallet_currency
+                ).join(
+                    WithdrawalCurrency, WithdrawalCurrency.id == FiatWithdrawalTransaction.withdrawal_currency
                 ).join(
                     Users, Users.id == FiatWithdrawalTransaction.user_id
                 ).order_by(
                     desc(FiatWithdrawalTransaction.id)
                 )
 
-                # Get the withdrdrawlas
-                withdrawals_obj      = await session.execute(stmt)
-                all_fiat_withdrawals = withdrawals_obj.all()
-
-                if not all_fiat_withdrawals:
-                    return json({'message': 'No Withdrawal found'}, 404)
-                
-                # Store all the data inside a combined_data list
-                for withdrawals in all_fiat_withdrawals:
-
-                    withdrawal_currency_obj = await session.execute(select(Currency).where(
-                        Currency.id == withdrawals.withdrawal_currency
-                    ))
-                    withdrawal_currency = withdrawal_currency_obj.scalar()
-
-                    combined_data.append({
-                        'user_email': withdrawals.user_email,
-                        'user_name': withdrawals.user_name,
-                        'transaction_id': withdrawals.transaction_id,
-                        'amount': withdrawals.amount,
-                        'transaction_fee': withdrawals.transaction_fee,
-                        'total_amount': withdrawals.total_amount,
-                        'withdrawal_currency': withdrawal_currency.name,
-                        'wallet_currency': withdrawals.wallet_currency,
-                        'status': withdrawals.status,
-                        'credit_amount': withdrawals.credit_amount,
-                        'credit_currency': withdrawals.credit_currency,
-                        'created_At': withdrawals.created_At
-                    })
-
-                return json({
-                        'success': True,
-                        'export_admin_fiat_withdrawals': combined_data
-                    }, 200)
-            
+                # Stream all the withdrawals
+                return await export_query(
+                    request, session, stmt,
+                    root_key       = 'export_admin_fiat_withdrawals',
+                    filename       = 'fiat_withdrawals',
+                    date_column    = FiatWithdrawalTransaction.created_At,
+                    empty_response = json({'message': 'No Withdrawal found'}, 404)
+                )
 
         except Exception as e:
             return json({
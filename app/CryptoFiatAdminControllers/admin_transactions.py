@@ -3,9 +3,10 @@ from blacksheep.server.controllers import APIController
 from blacksheep.server.authorization import auth
 from blacksheep import Request, json
 from database.db import AsyncSession, async_engine
-from Models.models import Users, Currency
+from Models.models import Currency
 from Models.models4 import TransferTransaction, DepositTransaction
 from sqlmodel import select, desc, func, and_
+from app.enrichment import fetch_users, fetch_currencies
 
 
 
@@ -27,7 +28,7 @@ class AdminFiatAllTransactionsController(APIController):
         return "User wise Transaction"
     
 
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def get_all_userTransaction(self, request: Request, limit: int = 5, offset: int = 0):
         """
@@ -55,20 +56,6 @@ class AdminFiatAllTransactionsController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                # Authenticate user
-                user_identity = request.identity
-                admin_id      = user_identity.claims.get("user_id") if user_identity else None
-
-                # Admin authnetication
-                admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                admin_user = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Admin authorization failed'}, 401)
-                # Admin authentication ends
-
                 # Count Total rows of Deposit transactions
                 deposit_stmt         = select(func.count(DepositTransaction.id))
                 execute_deposit_rows = await session.execute(deposit_stmt)
@@ -105,20 +92,17 @@ class AdminFiatAllTransactionsController(APIController):
                 transfer_transaction = transfer_transaction_obj.scalars().all()
 
 
-                # Fetch all the available Currencies
-                currency     = await session.execute(select(Currency))
-                currency_obj = currency.scalars().all()
-
-
-                # Fetch all the available users
-                all_user_obj      = await session.execute(select(Users))
-                all_user_obj_data = all_user_obj.scalars().all()
-
-
-                # Store inside a Dict
-                currency_dict = {currency.id: currency for currency in currency_obj}
-                user_dict     = {user.id: user         for user     in all_user_obj_data}
-                receiver_dict = {receiver.id: receiver for receiver in all_user_obj_data}
+                # Fetch only the Currencies and Users referenced by the transactions
+                currency_dict = await fetch_currencies(session,
+                    [transaction.currency for transaction in deposit_transaction] +
+                    [transaction.currency for transaction in transfer_transaction]
+                )
+                user_dict = await fetch_users(session,
+                    [transaction.user_id for transaction in deposit_transaction] +
+                    [transaction.user_id for transaction in transfer_transaction] +
+                    [transaction.receiver for transaction in transfer_transaction]
+                )
+                receiver_dict = user_dict
 
 
                 # Deposit data
@@ -4,8 +4,9 @@ from blacksheep.server.authorization import auth
 from blacksheep import json, Request
 from database.db import AsyncSession, async_engine
 from sqlmodel import select, and_, desc, func
+from app.enrichment import fetch_users, fetch_currencies
 from Models.models4 import DepositTransaction, TransferTransaction
-from Models.models import Currency, Users
+from Models.models import Currency
 
 
 
@@ -25,7 +26,7 @@ class AdminUserFiatTransactionController(APIController):
         return "User Wise All FIAT Transaction in Admin"
 
 
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def get_Admin_UserFIATTransaction(self, request: Request, query: int, limit: int = 5, offset: int = 0):
         """
@@ -52,22 +53,8 @@ class AdminUserFiatTransactionController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                # Authenticate user
-                admin_identity = request.identity
-                admin_id       = admin_identity.claims.get("user_id") if admin_identity else None
-
                 user_id = query
 
-                # Admin authnetication
-                admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                admin_user = admin_user_obj.scalar()
-
-                if not admin_user.is_admin:
-                    return json({'message': 'Admin authorization failed'}, 401)
-                # Admin authentication ends
-
                 # Get all deposit Transaction
                 deposit_transaction_obj = await session.execute(select(DepositTransaction).where(
                     DepositTransaction.user_id == user_id
@@ -106,18 +93,17 @@ class AdminUserFiatTransactionController(APIController):
 
                 total_row_count = total_rows / (limit * 2)
 
-                # Fetch all the available Currencies
-                currency     = await session.execute(select(Currency))
-                currency_obj = currency.scalars().all()
-
-                # Fetch all the available users
-                all_user_obj      = await session.execute(select(Users))
-                all_user_obj_data = all_user_obj.scalars().all()
-
-                # Store inside a Dict
-                currency_dict = {currency.id: currency for currency in currency_obj}
-                user_dict     = {user.id: user         for user     in all_user_obj_data}
-                receiver_dict = {receiver.id: receiver for receiver in all_user_obj_data}
+                # Fetch only the Currencies and Users referenced by the transactions
+                currency_dict = await fetch_currencies(session,
+                    [transaction.currency for transaction in deposit_transaction] +
+                    [transaction.currency for transaction in transfer_transaction]
+                )
+                user_dict = await fetch_users(session,
+                    [transaction.user_id for transaction in deposit_transaction] +
+                    [transaction.user_id for transaction in transfer_transaction] +
+                    [transaction.receiver for transaction in transfer_transaction]
+                )
+                receiver_dict = user_dict
 
                 # Deposit data
                 deposit_currency_data = (currency_dict.get(transaction.currency) for transaction in deposit_transaction)
@@ -78,7 +78,7 @@ class CryptoUserKYCController(APIController):
     
     
     #Get all applied KYC of user(Non Merchant)
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def get_UserKyc(self, request: Request, limit: int = 10, offset: int = 0):
         """
@@ -108,22 +108,6 @@ class CryptoUserKYCController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                user_id       = user_identity.claims.get('user_id') if user_identity else None
-                
-                # Admin Authnetication
-                try:
-                    user_object      = select(Users).where(Users.id == user_id)
-                    save_to_db       = await session.execute(user_object)
-                    user_object_data = save_to_db.scalar()
-
-                    if user_object_data.is_admin == False:
-                        return json({'msg': 'Unauthorized'}, 401)
-                    
-                except Exception as e:
-                    return json({'msg': 'Unable to get Admin detail','error': f'{str(e)}'}, 400)
-                #Authentication ends
-
                 count_stmt = select(func.count(Users.id)).where(and_(Users.is_merchent == False, Users.is_admin == False))
                 execute_statement = await session.execute(count_stmt)
                 total_available_user_row_obj = execute_statement.scalar()
@@ -231,7 +215,7 @@ class SearchCryptoUserController(APIController):
     def class_name(cls) -> str:
         return 'Search Crypto/Fiat User Controller'
     
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def seacrh_crypto_user(request: Request, query: str = ''):
         """
@@ -251,17 +235,6 @@ class SearchCryptoUserController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity    = request.identity
-                adminID          = user_identity.claims.get("user_id") if user_identity else None
-
-                # Admin authentication
-                user_obj = await session.execute(select(Users).where(Users.id == adminID))
-                user_obj_data = user_obj.scalar()
-
-                if not user_obj_data.is_admin:
-                    return json({'msg': 'Admin authorization failed'}, 400)
-                # Authentication Ends here
-
                 data = query
                 conditions = []
 
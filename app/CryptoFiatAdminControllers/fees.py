@@ -3,7 +3,6 @@ from blacksheep.server.controllers import APIController
 from blacksheep.server.authorization import auth
 from blacksheep import json, Request
 from database.db import AsyncSession, async_engine
-from Models.models import Users
 from Models.fee import FeeStructure
 from Models.FIAT.Schema import AdminAddFeeSchema, AdminUpdateFeeSchema
 from sqlmodel import select, desc, func, and_
@@ -23,7 +22,7 @@ class AdminFeeController(APIController):
     def route(cls) -> str | None:
         return '/api/v3/admin/fees/'
     
-    @auth('userauth')
+    @auth('admin')
     @post()
     async def add_fee(self, request: Request, schema: AdminAddFeeSchema):
         """
@@ -42,18 +41,6 @@ class AdminFeeController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                    user_identity = request.identity
-                    admin_id       = user_identity.claims.get('user_id') if user_identity else None
-                    
-                    ## Admin Authnetication
-                    user_object      = select(Users).where(Users.id == admin_id)
-                    save_to_db       = await session.execute(user_object)
-                    user_object_data = save_to_db.scalar()
-
-                    if user_object_data.is_admin == False:
-                        return json({'message': 'Unauthorized'}, 401)
-                    ## Admin authentication ends
-
                     ## Get payload data
                     feeName     = schema.fee_name
                     feeType     = schema.fee_type
@@ -96,7 +83,7 @@ class AdminFeeController(APIController):
         
 
     ## Update Fees
-    @auth('userauth')
+    @auth('admin')
     @put()
     async def update_fee(self, request: Request, schema: AdminUpdateFeeSchema):
         """
@@ -119,18 +106,6 @@ class AdminFeeController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id      = user_identity.claims.get('user_id')
-                
-                ## Admin Authnetication
-                user_object      = select(Users).where(Users.id == admin_id)
-                save_to_db       = await session.execute(user_object)
-                user_object_data = save_to_db.scalar()
-
-                if user_object_data.is_admin == False:
-                    return json({'message': 'Unauthorized'}, 401)
-                ## Admin authentication ends
-
                 ## Get payload data
                 feeName     = schema.fee_name
                 feeType     = schema.fee_type
@@ -185,7 +160,7 @@ class AdminFeeController(APIController):
 
 
     ## Get all available fees
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def get_fees(self, request: Request):
         """
@@ -201,18 +176,6 @@ class AdminFeeController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id      = user_identity.claims.get('user_id')
-
-                ## Admin Authnetication
-                user_object      = select(Users).where(Users.id == admin_id)
-                save_to_db       = await session.execute(user_object)
-                user_object_data = save_to_db.scalar()
-
-                if user_object_data.is_admin == False:
-                    return json({'msg': 'Unauthorized'}, 401)
-                ## Admin authentication ends
-
                 ## Get all available fees
                 fee_structure_obj = await session.execute(select(FeeStructure))
                 fee_structure     = fee_structure_obj.scalars().all()
@@ -230,7 +193,7 @@ class AdminFeeController(APIController):
         
 
     ## Delete a fee structure
-    @auth('userauth')
+    @auth('admin')
     @delete()
     async def delete_fees(self, request: Request):
         """
@@ -247,18 +210,6 @@ class AdminFeeController(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id      = user_identity.claims.get('user_id')
-
-                ## Admin Authnetication
-                user_object      = select(Users).where(Users.id == admin_id)
-                save_to_db       = await session.execute(user_object)
-                user_object_data = save_to_db.scalar()
-
-                if user_object_data.is_admin == False:
-                    return json({'msg': 'Unauthorized'}, 401)
-                ## Admin authentication ends
-
                 request_data = await request.json()
 
                 fee_id = request_data['fee_id']
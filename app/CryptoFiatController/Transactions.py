@@ -11,6 +11,7 @@ from blacksheep.server.authorization import auth
 from sqlmodel import select, and_, desc, func
 from datetime import datetime, timedelta
 from app.dateFormat import get_date_range
+from app.enrichment import fetch_users, fetch_currencies
 from sqlalchemy.orm import aliased
 
 
@@ -173,18 +174,17 @@ class UserFiatTransactionController(APIController):
                 crypto_sell_transaction_obj = await session.execute(crypto_sell_stmt)
                 crypto_sell_transaction = crypto_sell_transaction_obj.fetchall()
 
-                # Fetch all the available Currencies
-                currency     = await session.execute(select(Currency))
-                currency_obj = currency.scalars().all()
-
-                # Fetch all the available users
-                all_user_obj      = await session.execute(select(Users))
-                all_user_obj_data = all_user_obj.scalars().all()
-
-                # Store inside a Dict
-                currency_dict = {currency.id: currency for currency in currency_obj}
-                user_dict     = {user.id: user         for user     in all_user_obj_data}
-                receiver_dict = {receiver.id: receiver for receiver in all_user_obj_data}
+                # Fetch only the Currencies and Users referenced by the transactions
+                currency_dict = await fetch_currencies(session,
+                    [transaction.currency for transaction in deposit_transaction] +
+                    [transaction.currency for transaction in transfer_transaction]
+                )
+                user_dict = await fetch_users(session,
+                    [transaction.user_id for transaction in deposit_transaction] +
+                    [transaction.user_id for transaction in transfer_transaction] +
+                    [transaction.receiver for transaction in transfer_transaction]
+                )
+                receiver_dict = user_dict
 
                 # Deposit data
                 deposit_currency_data = (currency_dict.get(transaction.currency) for transaction in deposit_transaction)
@@ -350,18 +350,17 @@ class UserFiatRecentTransactionController(APIController):
                 ))
                 transfer_transaction = transfer_transaction_obj.scalars().all()
 
-                # Fetch all the available Currencies
-                currency     = await session.execute(select(Currency))
-                currency_obj = currency.scalars().all()
-
-                # Fetch all the available users
-                all_user_obj      = await session.execute(select(Users))
-                all_user_obj_data = all_user_obj.scalars().all()
-
-                # Store inside a Dict
-                currency_dict = {currency.id: currency for currency in currency_obj}
-                user_dict     = {user.id: user         for user     in all_user_obj_data}
-                receiver_dict = {receiver.id: receiver for receiver in all_user_obj_data}
+                # Fetch only the Currencies and Users referenced by the transactions
+                currency_dict = await fetch_currencies(session,
+                    [transaction.currency for transaction in deposit_transaction] +
+                    [transaction.currency for transaction in transfer_transaction]
+                )
+                user_dict = await fetch_users(session,
+                    [transaction.user_id for transaction in deposit_transaction] +
+                    [transaction.user_id for transaction in transfer_transaction] +
+                    [transaction.receiver for transaction in transfer_transaction]
+                )
+                receiver_dict = user_dict
 
                 
                 # Deposit data
@@ -806,10 +805,7 @@ class UserFiatTransactionFilterController(APIController):
                 paginated_count = total_deposit_transfer_count / (limit * 4) if limit > 0 else 1
 
                 ### Get Receiver Data
-                all_user_obj      = await session.execute(select(Users))
-                all_user_obj_data = all_user_obj.scalars().all()
-
-                receiver_dict = { receiver.id: receiver for receiver in all_user_obj_data }
+                receiver_dict = await fetch_users(session, [transfer.receiver for transfer in user_transfer_transaction])
 
                 ### Append all data inside a list
                 combined_transactions = [
@@ -5,9 +5,11 @@ from database.db import AsyncSession, async_engine
 from sqlmodel import select, desc, and_
 from app.auth import (
     send_welcome_email, generate_merchant_secret_key, generate_access_token,
-    generate_merchant_unique_public_key, encrypt_password,check_password,
     generate_refresh_token
 )
+from app.generateID import generate_public_token
+from app.passwords import hash_password, verify_user_password
+from app.mail import render_template
 from Models.schemas import UserCreateSchema, UserLoginSchema
 from Models.models import Users, Group, Wallet, Currency, UserKeys, Kycdetails
 from datetime import datetime
@@ -116,7 +118,7 @@ class CryptoFiatUserRegisterController(APIController):
                         lastname    = user.lastname,
                         email       = user.email,
                         phoneno     = user.phoneno,
-                        password    = encrypt_password(user.password),
+                        password    = await hash_password(user.password),
                         group       = user_group_id,
                         is_merchent = user.is_merchent,
                     )
@@ -128,7 +130,7 @@ class CryptoFiatUserRegisterController(APIController):
                     # If user is a Merchant then assign Public and secret key
                     if user.is_merchent:
                         _secret_key = await generate_merchant_secret_key(user_instance.id)
-                        public_key_ = await generate_merchant_unique_public_key()
+                        public_key_ = generate_public_token()
 
                         merchant_secret_key = UserKeys(
                             user_id    = user_instance.id,
@@ -170,22 +172,7 @@ class CryptoFiatUserRegisterController(APIController):
 
                         link=f"{signup_mail_sent_url}/signin/"
 
-                        body = f"""
-                              <html>
-                                <body>
-                                    <b>Dear {user_first_name} {user_last_name},</b>
-                                    <p>Welcome aboard! We are thrilled to have you join our community at Itio Innovex Pvt. Ltd.!</p>
-                                    <p>To complete your registration and activate your account, please verify your email address by clicking the link below:</p>
-                                    <a href="{link}">Verify Your Email Address</a>
-                                    <p>If the button above doesn’t work, you can copy and paste the following URL into your web browser:</p>
-                                    <p><a href="{link}">{link}</a></p>
-                                    <p>Thank you for choosing Itio Innovex Pvt. Ltd. We look forward to providing you with the best possible experience.</p>
-
-                                    <p><b>Best Regards,</b><br>
-                                    <b>Itio Innovex Pvt. Ltd.</b></p>
-                                </body>
-                                </html>
-                                """
+                        body = render_template('welcome.html', first_name=user_first_name, last_name=user_last_name, link=link)
                         
                         # Send mail
                         send_welcome_email(user.email,"Welcome! Please Verify Your Email Address", body)
@@ -243,7 +230,7 @@ class CryptoFiatUserLoginController(APIController):
                 existing_user     = existing_user_obj.scalars().first()
 
                 # Password validation
-                if existing_user and check_password(user.password,existing_user.password):
+                if existing_user and await verify_user_password(session, existing_user, user.password):
 
                     if existing_user.is_merchent:
                         return json({'message': 'Only crypto user allowed'}, 400)
@@ -293,7 +280,7 @@ class CryptoFiatUserLoginController(APIController):
                         response = json({
                             'is_merchant': existing_user.is_merchent,
                             'user_name': existing_user.full_name,
-                            'access_token': generate_access_token(existing_user.id),
+                            'access_token': generate_access_token(existing_user.id, existing_user),
                             'refresh_token': generate_refresh_token(existing_user.id)
                         },200)
 
@@ -6,7 +6,7 @@ from Models.schemas import DepositMoneySchema
 from database.db import AsyncSession, async_engine
 from Models.models import Currency, Wallet, Users
 from Models.models4 import DepositTransaction
-from app.CryptoFiatController.uniqueID import UniqueDepositTransactionID
+from app.snowflake import new_id
 from sqlmodel import select, and_
 
 
@@ -117,7 +117,7 @@ class DepositController(APIController):
                     return json({'msg': 'Your account has been suspended please contact admin for Approval'}, 400)
                 
                 # Get the unique transaction Id
-                unique_id = await UniqueDepositTransactionID()
+                unique_id = new_id()
 
                 # Create a new transaction record
                 new_transaction = DepositTransaction(
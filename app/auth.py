@@ -2,15 +2,14 @@ from blacksheep import Application
 from app.settings import Settings
 from Models.models import Users
 from sqlmodel import select, and_
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
 import jwt
 import datetime
 from database.db import async_engine, AsyncSession
-import bcrypt
-import smtplib
 from decouple import config
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from app.mail import send_mail
+from app.unit_of_work import use_session
 from blacksheep import json
 from blacksheep import Request
 from guardpost import AuthenticationHandler, Identity
@@ -24,6 +23,8 @@ from decouple import config
 from cryptography.fernet import Fernet
 import zlib
 from Models.models import HashValue, UserKeys
+from app.cache import TTLCache
+from itertools import chain
 import time
 import random
 import string
@@ -31,17 +32,37 @@ import string
 
 
 # from database.db import engine
-EMAIL_HOST=config('EMAIL_HOST')
-EMAIL_PORT =config('EMAIL_PORT')
-EMAIL_USERNAME=config('EMAIL_USERNAME')
-EMAIL_PASSWORD=config('EMAIL_PASSWORD')
 reset_token_secret_key = config('RESET_TOKEN_SECRET_KEY')
 
 
 # Merchant Secret Key
 merchant_secret_key = config('SECRET_KEY_MERCHANT')
 cipher_suite        = Fernet(merchant_secret_key)
-hash_map            = {}
+
+# Merchant key material used on every payment request
+# public key -> UserKeys row, short hash -> merchant id
+MERCHANT_KEY_CACHE_SIZE = 10000
+MERCHANT_KEY_CACHE_TTL  = 300
+
+merchant_public_key_cache = TTLCache(MERCHANT_KEY_CACHE_SIZE, MERCHANT_KEY_CACHE_TTL)
+merchant_hash_cache       = TTLCache(MERCHANT_KEY_CACHE_SIZE, MERCHANT_KEY_CACHE_TTL)
+
+
+# Role and suspension of the users behind the access tokens,
+# user id -> {'role': ..., 'is_suspended': ...}
+USER_IDENTITY_CACHE_SIZE = 10000
+USER_IDENTITY_CACHE_TTL  = 60
+
+user_identity_cache = TTLCache(USER_IDENTITY_CACHE_SIZE, USER_IDENTITY_CACHE_TTL)
+
+# user id -> time.time() of the last role or suspension change made by this process,
+# tokens issued before it no longer vouch for the user
+_identity_changed_at = TTLCache(USER_IDENTITY_CACHE_SIZE, USER_IDENTITY_CACHE_TTL)
+
+# Columns of Users the identity is made of
+IDENTITY_COLUMNS = ('is_admin', 'is_merchent', 'is_suspended')
+
+CHANGED_IDENTITIES = 'changed_user_identities'
 
 
 SECRET_KEY = config('SECRET_KEY')
@@ -50,13 +71,20 @@ SECRET_KEY = config('SECRET_KEY')
 PASSWORD_RESET_SALT = config('PASSWORD_RESET_SALT')
 
 ## Generate Access token while login
-def generate_access_token(user_id):
+# With the user row the token also carries the role and suspension of the user
+def generate_access_token(user_id, user: Users | None = None):
     payload = {
         "user_id": user_id,
         "exp": datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=96),
         "iat": datetime.datetime.now(datetime.timezone.utc),
         "type": "access"
     }
+
+    if user is not None:
+        identity = user_identity(user)
+        payload.update(identity)
+        user_identity_cache.set(user_id, identity)
+
     token = jwt.encode(payload, SECRET_KEY, algorithm="HS256")
     return token
 
@@ -108,19 +136,6 @@ async def is_authenticated(id):
             return False
 
 
-# Encrypt Users password into Hash
-def encrypt_password(password: str) -> str:
-    
-    salt = bcrypt.gensalt()
-    hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed_password.decode('utf-8')
-
-
-# Validate password while Loging in
-def check_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
-
-
 ### Excryption whiile reseting password
 def encrypt_password_reset_token(user_id):
     payload = {
@@ -144,59 +159,20 @@ def decrypt_password_reset_token(token):
 
 
 
+# Emails are queued and delivered in the background by app.mail.MailQueue
 def send_password_reset_email(recipient_email, subject, body):
-    smtp_server = EMAIL_HOST
-    smtp_port = int(EMAIL_PORT)  # For TLS
-   
-    msg = MIMEMultipart()
-    msg['From'] = EMAIL_USERNAME
-    msg['To'] = recipient_email
-    msg['Subject'] = subject
-
-    msg.attach(MIMEText(body, 'html'))
-
-    with smtplib.SMTP(smtp_server, smtp_port) as server:
-        server.starttls()  
-        server.login(EMAIL_USERNAME, EMAIL_PASSWORD)
-        server.sendmail(EMAIL_USERNAME, recipient_email, msg.as_string())
+    send_mail(recipient_email, subject, body)
 
 
 
 ### Send mail while login and update user
 def send_welcome_email(recipient_email, subject, body):
-    smtp_server = EMAIL_HOST
-    smtp_port = int(EMAIL_PORT)  # For TLS
-   
-    msg = MIMEMultipart()
-    msg['From'] = EMAIL_USERNAME
-    msg['To'] = recipient_email
-    msg['Subject'] = subject
-
-    msg.attach(MIMEText(body, 'html'))
-
-    with smtplib.SMTP(smtp_server, smtp_port) as server:
-        server.starttls()  
-        server.login(EMAIL_USERNAME, EMAIL_PASSWORD)
-        server.sendmail(EMAIL_USERNAME, recipient_email, msg.as_string())
-        
-
+    send_mail(recipient_email, subject, body)
 
-async def send_email(recipient_email, subject, body):
-    smtp_server = EMAIL_HOST
-    smtp_port = int(EMAIL_PORT)  # For TLS
-   
-    msg = MIMEMultipart()
-    msg['From'] = EMAIL_USERNAME
-    msg['To'] = recipient_email
-    msg['Subject'] = subject
 
-    msg.attach(MIMEText(body, 'html'))
 
-    with smtplib.SMTP(smtp_server, smtp_port) as server:
-        
-        server.starttls()  
-        server.login(EMAIL_USERNAME, EMAIL_PASSWORD)
-        server.sendmail(EMAIL_USERNAME, recipient_email, msg.as_string())
+async def send_email(recipient_email, subject, body):
+    send_mail(recipient_email, subject, body)
 
 
 # Encrypt Password Reset Token
@@ -228,22 +204,6 @@ def verify_password_reset_token(token: str, max_age: int = 900):
         raise ValueError("Invalid or expired token") from e
 
 
-# Generate Unique Merchant Public Key
-async def generate_merchant_unique_public_key():
-    while True:
-        async with AsyncSession(async_engine) as session:
-            timestamp    = str(int(time.time()))
-            random_chars = ''.join(random.choices(string.ascii_uppercase + string.digits, k=12))
-            unique_key   =  f"{timestamp}-{random_chars}"
-
-            statement = select(UserKeys).where(UserKeys.public_key == unique_key)
-            result    = (await session.execute(statement)).scalar()
-
-            if not result:
-                return unique_key
-                   
-                
-
 # Generate Merchant Secret Key
 async def generate_merchant_secret_key(merchant_id):
     try:
@@ -296,6 +256,9 @@ async def update_merchant_secret_key(merchant_id, secret_key):
             ))
             exist_hash = exist_hash_obj.scalar()
 
+            # The old secret key must stop resolving immediately
+            invalidate_merchant_keys(secret_key=secret_key)
+
             if exist_hash:
                 exist_hash.hash_value  = short_hash
                 exist_hash.encode_data = encoded_data
@@ -322,13 +285,16 @@ async def update_merchant_secret_key(merchant_id, secret_key):
 
 
 #Decrypt Merchant Secret Key
-async def decrypt_merchant_secret_key(short_hash):
+async def decrypt_merchant_secret_key(short_hash, session: AsyncSession | None = None):
+
+    cached_merchant_id = merchant_hash_cache.get(short_hash)
+
+    if cached_merchant_id is not None:
+        return cached_merchant_id
 
     try: 
-        async with AsyncSession(async_engine) as session:
+        async with use_session(session) as session:
 
-            # encoded_data = hash_map.get(short_hash, None)
-            # print(type(short_hash))
             encoded_obj   = await session.execute(select(HashValue).where(HashValue.hash_value == short_hash))
             encoded_value = encoded_obj.scalar()
 
@@ -344,13 +310,134 @@ async def decrypt_merchant_secret_key(short_hash):
             encrypted_data     = zlib.decompress(compressed_data)
             decrypted_model_id = cipher_suite.decrypt(encrypted_data).decode()
 
-            return int(decrypted_model_id)
+            merchant_id = int(decrypted_model_id)
+            merchant_hash_cache.set(short_hash, merchant_id)
+
+            return merchant_id
         
     except Exception as e:
         return f'Decrypt error {str(e)}'
+
+
+
+# Get the merchant keys by public key, served from cache when possible
+async def get_merchant_key_by_public_key(session, public_key: str) -> UserKeys | None:
+    cached_key = merchant_public_key_cache.get(public_key)
+
+    if cached_key is not None:
+        return cached_key
+
+    merchant_key_obj = await session.execute(select(UserKeys).where(
+        UserKeys.public_key == public_key
+    ))
+    merchant_key = merchant_key_obj.scalar()
+
+    if not merchant_key:
+        return None
+
+    # Cache a detached copy, so it never expires with the request session
+    cached_key = UserKeys(**merchant_key.model_dump())
+    merchant_public_key_cache.set(public_key, cached_key)
+
+    return cached_key
+
+
+
+# Drop cached merchant key material after the keys have been changed
+def invalidate_merchant_keys(public_key: str | None = None, secret_key: str | None = None) -> None:
+    if public_key:
+        merchant_public_key_cache.pop(public_key)
+
+    if secret_key:
+        merchant_hash_cache.pop(secret_key)
+
+
+
+def merchant_key_cache_stats() -> dict:
+    return {
+        'public_keys': merchant_public_key_cache.stats(),
+        'secret_hashes': merchant_hash_cache.stats(),
+    }
     
                 
 
+def user_role(is_admin: bool | None, is_merchent: bool | None) -> str:
+    if is_admin:
+        return 'admin'
+
+    return 'merchant' if is_merchent else 'user'
+
+
+def user_identity(user) -> dict:
+    return {
+        'role': user_role(user.is_admin, user.is_merchent),
+        'is_suspended': bool(user.is_suspended),
+    }
+
+
+def invalidate_user_identity(user_id: int) -> None:
+    user_identity_cache.pop(user_id)
+    _identity_changed_at.set(user_id, time.time())
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changed_identities(session: Session, flush_context) -> None:
+    for instance in chain(session.dirty, session.deleted):
+        if not isinstance(instance, Users) or instance.id is None:
+            continue
+
+        state = inspect(instance)
+
+        if instance in session.deleted or any(state.attrs[column].history.has_changes() for column in IDENTITY_COLUMNS):
+            session.info.setdefault(CHANGED_IDENTITIES, set()).add(instance.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_changed_identities(session: Session) -> None:
+    for user_id in session.info.pop(CHANGED_IDENTITIES, ()):
+        invalidate_user_identity(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_changed_identities(session: Session) -> None:
+    session.info.pop(CHANGED_IDENTITIES, None)
+
+
+# Role and suspension of the user of an access token.
+# Served from the cache, else from the claims of a token issued less than
+# USER_IDENTITY_CACHE_TTL seconds ago, else loaded from the database.
+# None when the user does not exist anymore.
+async def get_user_identity(claims: dict, session: AsyncSession | None = None) -> dict | None:
+    user_id  = claims["user_id"]
+    identity = user_identity_cache.get(user_id)
+
+    if identity is not None:
+        return identity
+
+    issued_at  = claims.get("iat", 0)
+    changed_at = _identity_changed_at.get(user_id, 0)
+
+    if "role" in claims and time.time() - issued_at < USER_IDENTITY_CACHE_TTL and issued_at > changed_at:
+        identity = {'role': claims["role"], 'is_suspended': bool(claims.get("is_suspended"))}
+
+    else:
+        async with use_session(session) as session:
+            user_obj = await session.execute(select(
+                Users.is_admin, Users.is_merchent, Users.is_suspended
+            ).where(Users.id == user_id))
+            user = user_obj.first()
+
+        if not user:
+            return None
+
+        identity = user_identity(user)
+
+    user_identity_cache.set(user_id, identity)
+
+    return identity
+
+
+
 def configure_authentication(app: Application, settings: Settings):
     """
     Configure authentication as desired. For reference:
@@ -382,8 +469,13 @@ class UserAuthHandler(AuthenticationHandler):
                 elif user_data == 'Invalid token':
                     context.identity = None
                 else:
-                    user_id = user_data["user_id"]
-                    context.identity = Identity({"user_id": user_id, "claims": user_data}, "JWT")
+                    user_id  = user_data["user_id"]
+                    identity = await get_user_identity(user_data)
+
+                    if identity is None:
+                        context.identity = None
+                    else:
+                        context.identity = Identity({"user_id": user_id, **identity, "claims": user_data}, "JWT")
             else:
                 context.identity = None
         else:
@@ -399,7 +491,8 @@ class AdminRequirement(Requirement):
     def handle(self, context: AuthorizationContext):
         identity = context.identity
 
-        if identity is not None and identity.claims.get("role") == "admin":
+        # Suspended admins keep their role but lose the access
+        if identity is not None and identity.claims.get("role") == "admin" and not identity.claims.get("is_suspended"):
             context.succeed(self)
 
 
@@ -1,20 +1,157 @@
 from Models.models3 import MerchantAPILogs
 from database.db import AsyncSession, async_engine
+from app.settings import APILogs
+from sqlalchemy import insert
+from sqlalchemy.exc import InterfaceError, OperationalError
+from datetime import datetime
+import asyncio
+import logging
+
+
+
+logger = logging.getLogger(__name__)
+
+
+
+# Background writer for Merchant API Logs
+class APILogSink:
+    """
+        Collects merchant API logs in a bounded queue and writes them with one multi-row
+        INSERT every `batch_size` records or `flush_interval_ms` milliseconds, whichever comes first.
+        When the queue is full new logs are dropped (counted in `dropped`) or, with the
+        `block` overflow policy, the caller waits for room. A batch the database rejects is
+        split until the records it rejects are alone, only those are lost (counted in `failed`).
+    """
+    # The running sink used by createNewAPILogs
+    current: 'APILogSink | None' = None
+
+    def __init__(self, settings: APILogs) -> None:
+        self.settings = settings
+        self.written  = 0
+        self.dropped  = 0
+        self.failed   = 0
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None   = None
+
+
+    def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.settings.max_queue_size)
+            self._task  = asyncio.create_task(self.run())
+            APILogSink.current = self
+
+
+    async def submit(self, record: dict) -> None:
+        if self.settings.overflow_policy == 'block':
+            await self._queue.put(record)
+            return
+
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+
+    # A None record tells the writer to flush what it has and exit
+    async def run(self) -> None:
+        flush_interval = self.settings.flush_interval_ms / 1000
+        closing        = False
+
+        while not closing:
+            # Wait for the first record of the batch
+            record = await self._queue.get()
+
+            if record is None:
+                break
+
+            batch    = [record]
+            deadline = asyncio.get_running_loop().time() + flush_interval
+
+            while len(batch) < self.settings.batch_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+
+                if timeout <= 0:
+                    break
+
+                try:
+                    record = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+
+                if record is None:
+                    closing = True
+                    break
+
+                batch.append(record)
+
+            await self.flush(batch)
+
+
+    async def write(self, batch: list[dict]) -> None:
+        async with AsyncSession(async_engine) as session:
+            await session.execute(insert(MerchantAPILogs.__table__).values(batch))
+            await session.commit()
+
+
+    async def flush(self, batch: list[dict]) -> None:
+        try:
+            await self.write(batch)
+            self.written += len(batch)
+
+        # The database is unreachable, the records would fail one by one as well
+        except (OperationalError, InterfaceError):
+            self.failed += len(batch)
+            logger.exception('Failed to write %s merchant API logs', len(batch))
+
+        # A bad record (foreign key, value) fails the whole INSERT, write the halves apart
+        except Exception:
+            if len(batch) == 1:
+                self.failed += 1
+                logger.exception(
+                    'Dropped the merchant API log of merchant %s for %s', batch[0].get('merchant_id'), batch[0].get('end_point')
+                )
+                return
+
+            middle = len(batch) // 2
+
+            await self.flush(batch[:middle])
+            await self.flush(batch[middle:])
+
+
+    # Stop accepting logs and write everything still queued
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        APILogSink.current = None
+
+        # Queued after every pending log, so the writer drains the queue first
+        await self._queue.put(None)
+        await self._task
+
+        self._task = None
+
 
 
 # Create New API Log for any payment error
 async def createNewAPILogs(merchant_id, error, end_point, request_header, request_body, response_header, response_body):
+    record = {
+        'merchant_id':     merchant_id,
+        'createdAt':       datetime.now(),
+        'error':           error,
+        'end_point':       end_point,
+        'request_header':  request_header,
+        'request_body':    request_body,
+        'response_header': response_header,
+        'response_body':   response_body
+    }
+
+    # Queue the log, the request does not wait for the database
+    if APILogSink.current is not None:
+        await APILogSink.current.submit(record)
+        return
+
+    # No running sink (scripts, tests), write directly
     async with AsyncSession(async_engine) as session:
-        api_log_obj = MerchantAPILogs(
-            merchant_id      = merchant_id,
-            error            = error,
-            end_point        = end_point,
-            request_header   = request_header,
-            request_body     = request_body,
-            response_header  = response_header,
-            response_body    = response_body
-            )
-        
-        session.add(api_log_obj)
+        session.add(MerchantAPILogs(**record))
         await session.commit()
-        await session.refresh(api_log_obj)
\ No newline at end of file
@@ -1,6 +1,8 @@
 from decouple import config
-import json
-import requests
+from app.settings import Mastercard
+from app.controllers.PG.webhook import WebhookPayload, send_webhook_response
+import asyncio
+import random
 import httpx
 
 
@@ -25,51 +27,142 @@ base64_encoded_authorization_header = 'bWVyY2hhbnQuR0xBRENPUklHS0VOOjRkM2Y4ZTA3Y
 
 
 
-# Create Session
-def Create_Session():
-    create_session_url = f'https://ap-gateway.mastercard.com/api/rest/version/78/merchant/{MERCHANT_ID}/session'
-    headers = {
-        'Content-Type': 'application/json',
-        'accept': 'application/json',
-        'Authorization': f'Basic {base64_encoded_authorization_header}'
-    }
-
-    payload = json.dumps({
-        "session": {
-            "authenticationLimit": 25
+# HTTP status codes worth retrying for idempotent calls
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+
+# Async Mastercard gateway client
+class MastercardClient:
+    """
+        Non blocking client for the Mastercard gateway REST API.
+        A single instance is registered in the service container so every card payment
+        shares one keep-alive connection pool. In-flight gateway calls are bounded by
+        `max_concurrency` and every operation has its own timeout.
+
+        Only idempotent calls (update session, transaction status) are retried on
+        timeouts and 5xx responses. Non idempotent calls (create session, initiate
+        authentication, pay) are retried only when the connection could not be
+        established, i.e. the request never reached the gateway.
+    """
+    def __init__(self, settings: Mastercard, merchant_id: str = MERCHANT_ID,
+                 authorization: str = base64_encoded_authorization_header,
+                 transport: httpx.AsyncBaseTransport | None = None) -> None:
+        self.settings    = settings
+        self.transport   = transport
+        self.merchant_id = merchant_id
+        self.base_url    = f'{settings.base_url.rstrip("/")}/api/rest/version/{settings.api_version}/merchant/{merchant_id}'
+        self.headers     = {
+            'Content-Type': 'application/json',
+            'accept': 'application/json',
+            'Authorization': f'Basic {authorization}'
         }
-    })
 
-    response = requests.request("POST", url=create_session_url, headers=headers, data = payload)
+        self._client: httpx.AsyncClient | None  = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers   = self.headers,
+                transport = self.transport,
+                limits    = httpx.Limits(
+                    max_connections           = self.settings.max_connections,
+                    max_keepalive_connections = self.settings.max_keepalive_connections,
+                    keepalive_expiry          = self.settings.keepalive_expiry
+                ),
+                timeout   = httpx.Timeout(self.settings.session_timeout, connect=self.settings.connect_timeout)
+            )
+
+        return self._client
+
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.settings.max_concurrency)
+
+        return self._semaphore
+
+
+    def _timeout(self, seconds: float) -> httpx.Timeout:
+        return httpx.Timeout(seconds, connect=self.settings.connect_timeout)
+
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.settings.max_backoff, self.settings.backoff_factor * (2 ** attempt))
+        return random.uniform(delay / 2, delay)
+
+
+    # Send the request to the gateway with retry
+    async def _request(self, method: str, path: str, timeout: float, idempotent: bool, payload: dict | None = None) -> httpx.Response:
+        client  = self._get_client()
+        attempt = 0
+
+        while True:
+            try:
+                async with self._get_semaphore():
+                    response = await client.request(
+                        method,
+                        url     = f'{self.base_url}{path}',
+                        json    = payload,
+                        timeout = self._timeout(timeout)
+                    )
+
+                if idempotent and response.status_code in RETRYABLE_STATUS_CODES and attempt < self.settings.max_retries:
+                    await response.aclose()
+                else:
+                    return response
+
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+                # The request never reached the gateway
+                if attempt >= self.settings.max_retries:
+                    raise
+
+            except httpx.TransportError:
+                if not idempotent or attempt >= self.settings.max_retries:
+                    raise
+
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+
+    @staticmethod
+    def _result(response: httpx.Response, success_status: int) -> dict:
+        try:
+            response_data = response.json()
+        except ValueError:
+            response_data = response.text
+
+        if response.status_code == success_status:
+            return response_data
 
-    if response.status_code == 201:
-        return response.json()
-    
-    else:
         return {
             'status_code': response.status_code,
-            'error': response.json()
+            'error': response_data
         }
 
 
+    # Create Session
+    async def create_session(self) -> dict:
+        payload = {
+            "session": {
+                "authenticationLimit": 25
+            }
+        }
 
+        response = await self._request('POST', '/session', self.settings.session_timeout, False, payload)
 
+        return self._result(response, 201)
 
-# Update Session
-def Update_Session(sessionID, transaction_id, card_no, card_cvv, card_expiry, currency, amount, redirect_url):
-    update_session_url = f'https://ap-gateway.mastercard.com/api/rest/version/78/merchant/{MERCHANT_ID}/session/{sessionID}'
-
-    exact_amount = amount/100
 
-    month, year = card_expiry.split('/')
+    # Update Session
+    async def update_session(self, sessionID, transaction_id, card_no, card_cvv, card_expiry, currency, amount, redirect_url) -> dict:
+        exact_amount = amount/100
 
-    headers = {
-        'Content-Type': 'application/json',
-        'accept': 'application/json',
-        'Authorization': f'Basic {base64_encoded_authorization_header}'
-    }
+        month, year = card_expiry.split('/')
 
-    payload = json.dumps({
+        payload = {
                 "order": {
                     "currency": currency,
                     "amount": exact_amount,
@@ -97,32 +190,16 @@ def Update_Session(sessionID, transaction_id, card_no, card_cvv, card_expiry, cu
                 },
                 "type": "CARD"
             }
-    })
-
-    response = requests.request("PUT", url=update_session_url, headers=headers, data = payload)
-
-    if response.status_code == 200:
-        return response.json()
-    
-    else:
-        return {
-            'status_code': response.status_code,
-            'error':response.json()
-            }
-
+        }
 
+        response = await self._request('PUT', f'/session/{sessionID}', self.settings.session_timeout, True, payload)
 
-# Initiate Authentication
-def Initiate_Authentication(transaction_id, sessionID, currency):
-    initiate_auth_url = f'https://ap-gateway.mastercard.com/api/rest/version/78/merchant/{MERCHANT_ID}/order/{transaction_id}/transaction/{transaction_id}'
+        return self._result(response, 200)
 
-    headers = {
-        'Content-Type': 'application/json',
-        'accept': 'application/json',
-        'Authorization': f'Basic {base64_encoded_authorization_header}'
-    }
 
-    payload = json.dumps({
+    # Initiate Authentication
+    async def initiate_authentication(self, transaction_id, sessionID, currency) -> dict:
+        payload = {
             "apiOperation": "INITIATE_AUTHENTICATION",
             "authentication": {
                 "purpose": "PAYMENT_TRANSACTION",
@@ -139,116 +216,62 @@ def Initiate_Authentication(transaction_id, sessionID, currency):
             "transaction": {
                 "reference": transaction_id
             }
-        })
-    
-    response = requests.request("PUT", url=initiate_auth_url, headers=headers, data = payload)
-
-    if response.status_code == 201:
-        return response.json()
-    
-    else:
-        return {
-            'error': response.json(),
-            'status_code ': response.status_code
         }
 
+        response = await self._request(
+            'PUT', f'/order/{transaction_id}/transaction/{transaction_id}',
+            self.settings.authentication_timeout, False, payload
+        )
 
+        return self._result(response, 201)
 
-def deduct_amount(transaction_id, sessionID):
-    url = f'https://ap-gateway.mastercard.com/api/rest/version/78/merchant/{MERCHANT_ID}/order/{transaction_id}/transaction/{transaction_id}A'
-
-    headers = {
-        'Content-Type': 'application/json',
-        'accept': 'application/json',
-        'Authorization': f'Basic {base64_encoded_authorization_header}'
-    }
 
-    payload = json.dumps({
-                "apiOperation": "PAY",
-                "authentication": {
-                    "transactionId": transaction_id
-                },
-                "session": {
-                    "id": sessionID
-                },
-                "transaction": {
-                    "reference": transaction_id
-                }
-            })
-    
-    response = requests.request("PUT", url=url, headers=headers, data = payload)
-
-    if response.status_code == 200:
-        return response.json()
-    
-    else:
-        return {
-            'error': response.json(),
-            'status_code ': response.status_code
-        }
-    
-
-
-
-# Transaction Status
-def Mastercard_Transaction_Status(transactionID):
-    transaction_status_url = f'https://ap-gateway.mastercard.com/api/rest/version/78/merchant/{MERCHANT_ID}/order/{transactionID}/transaction/{transactionID}'
-
-    headers = {
-        'Content-Type': 'application/json',
-        'accept': 'application/json',
-        'Authorization': f'Basic {base64_encoded_authorization_header}'
-    }
-
-    response = requests.request("GET", url=transaction_status_url, headers=headers)
-
-    if response.status_code == 200:
-        return response.json()
-    else:
-        return {
-            'error': response.json()
+    # Deduct the amount after successful authentication
+    async def deduct_amount(self, transaction_id, sessionID) -> dict:
+        payload = {
+            "apiOperation": "PAY",
+            "authentication": {
+                "transactionId": transaction_id
+            },
+            "session": {
+                "id": sessionID
+            },
+            "transaction": {
+                "reference": transaction_id
+            }
         }
 
+        response = await self._request(
+            'PUT', f'/order/{transaction_id}/transaction/{transaction_id}A',
+            self.settings.pay_timeout, False, payload
+        )
 
+        return self._result(response, 200)
 
 
+    # Transaction Status
+    async def transaction_status(self, transactionID) -> dict:
+        response = await self._request(
+            'GET', f'/order/{transactionID}/transaction/{transactionID}',
+            self.settings.status_timeout, True
+        )
 
+        return self._result(response, 200)
 
-# Webhook Payload
-class MasterCardWebhookPayload:
-    def __init__(self, success: bool, status: str, message: str, data: dict) -> None:
-        self.success = success
-        self.status  = status
-        self.message = message
-        self.data    = data
 
+    # Release the pooled connections on application shutdown
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
-# Send Master card Webhook Response to Client
-async def send_mastercard_webhook(url: str, payload: MasterCardWebhookPayload):
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, json={
-            "success": payload.success,
-            "status":  payload.status,
-            "message": payload.message,
-            "data": payload.data
-        })
 
-        return response
 
 
-# @post('/api/send-webhook/')
-async def send_webhook_response(payload: MasterCardWebhookPayload, url: str):
 
-    try:
-        response = await send_mastercard_webhook(url, payload)
 
-        if response.status_code == 200:
-            return {"message": "Webhook sent successfully"}
-        else:
-            return {"message": "Failed to send webhook", "status_code": response.status_code}
-        
-    except Exception as e:
-        return {"message": "An error occurred while sending the webhook", "error": str(e)}
+# Webhook Payload, delivered through the merchant webhook outbox
+MasterCardWebhookPayload = WebhookPayload
     
 
 
@@ -0,0 +1,63 @@
+from Models.models2 import MerchantAccountBalance, CollectedFees
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dashboard import merchant_changed
+from datetime import datetime
+
+
+
+# Balance ledger
+# Every credit is a single INSERT ... ON CONFLICT DO UPDATE SET x = x + :delta statement,
+# so concurrent payments for the same merchant never read-modify-write in Python and
+# never lose updates. None of the functions commit, the caller commits once per payment.
+
+
+
+# Credit the immature balance of a merchant, create the balance row if it does not exist
+async def credit_merchant_immature_balance(session: AsyncSession, merchant_id: int, currency: str, amount: float) -> None:
+    balance_table = MerchantAccountBalance.__table__
+    current_time  = datetime.now()
+
+    statement = insert(balance_table).values(
+        merchant_id      = merchant_id,
+        currency         = currency,
+        immature_balance = amount,
+        mature_balance   = 0,
+        frozen_balance   = 0,
+        account_balance  = amount,
+        last_updated     = current_time
+    )
+
+    statement = statement.on_conflict_do_update(
+        constraint = 'uq_merchantaccountbalance_merchant_currency',
+        set_ = {
+            'immature_balance': balance_table.c.immature_balance + statement.excluded.immature_balance,
+            'account_balance':  balance_table.c.account_balance + statement.excluded.account_balance,
+            'last_updated':     statement.excluded.last_updated
+        }
+    )
+
+    await session.execute(statement)
+
+    # Drop the cached dashboard of the merchant once the payment commits
+    merchant_changed(session, merchant_id)
+
+
+
+# Add the fee charged on a transaction to the collected fees of the currency
+async def credit_collected_fees(session: AsyncSession, currency: str, amount: float) -> None:
+    fees_table = CollectedFees.__table__
+
+    statement = insert(fees_table).values(
+        currency = currency,
+        amount   = amount
+    )
+
+    statement = statement.on_conflict_do_update(
+        constraint = 'uq_collectedfees_currency',
+        set_ = {
+            'amount': fees_table.c.amount + statement.excluded.amount
+        }
+    )
+
+    await session.execute(statement)
@@ -1,62 +1,23 @@
-from database.db import AsyncSession, async_engine
-from Models.models2 import MerchantAccountBalance, CollectedFees, MerchantPIPE
-from sqlmodel import select, and_
+from database.db import AsyncSession
+from app.unit_of_work import use_session
+from app.controllers.PG.balanceLedger import credit_merchant_immature_balance, credit_collected_fees
 
 
 # Update merchant Account Balance
-async def CalculateMerchantAccountBalance(transactionAmount, currency, merchantPipeFee, merchantID):
+async def CalculateMerchantAccountBalance(transactionAmount, currency, merchantPipeFee, merchantID, session: AsyncSession | None = None):
     try:
-        async with AsyncSession(async_engine) as session:
+        # Committed together with the transaction update of the caller
+        async with use_session(session, commit=True) as session:
             merchant_pipe_fee_amount = merchantPipeFee
 
             charged_fee              = (transactionAmount / 100) * merchant_pipe_fee_amount
             merchant_account_balance = transactionAmount - charged_fee
 
-            # # Save the Fees chanrged during the transaction
-            existing_collected_fees = await session.execute(
-                select(CollectedFees).where(CollectedFees.currency == currency)
-            )
-            existing_collected_fees = existing_collected_fees.scalar_one_or_none()
+            # Save the Fees charged during the transaction
+            await credit_collected_fees(session, currency, charged_fee)
 
-            if existing_collected_fees:
-                # Add the charged fee to the existing amount
-                existing_collected_fees.amount += charged_fee
-            else:
-                # Create a new entry if no existing record is found
-                existing_collected_fees = CollectedFees(
-                    amount   = charged_fee,
-                    currency = currency
-                )
-
-            # Get the Account balance of the merchant if exists or Create one
-            merchantAccountBalanceObj = await session.execute(select(MerchantAccountBalance).where(
-                and_(
-                    MerchantAccountBalance.merchant_id == merchantID,
-                    MerchantAccountBalance.currency    == currency
-                    )
-                ))
-            merchantAccountBalance = merchantAccountBalanceObj.scalar()
-
-            # If Account does not exists then create one
-            if not merchantAccountBalance:
-                merchantAccountBalance = MerchantAccountBalance(
-                    immature_balance  = merchant_account_balance,
-                    merchant_id       = merchantID,
-                    currency          = currency
-                )
-
-                session.add(merchantAccountBalance)
-                await session.commit()
-                await session.refresh(merchantAccountBalance)
-            else:
-                # Update Merchant Account Balance If Exists
-                merchantAccountBalance.immature_balance  += merchant_account_balance
-
-            session.add(merchantAccountBalance)
-            session.add(existing_collected_fees)
-            await session.commit()
-            await session.refresh(merchantAccountBalance)
-            await session.refresh(existing_collected_fees)
+            # Credit the Account balance of the merchant, Create one if does not exists
+            await credit_merchant_immature_balance(session, merchantID, currency, merchant_account_balance)
 
     except Exception as e:
         return f'Server Error {str(e)}'
\ No newline at end of file
@@ -1,11 +1,11 @@
 from blacksheep import pretty_json
-from app.auth import decrypt_merchant_secret_key
+from app.auth import decrypt_merchant_secret_key, get_merchant_key_by_public_key
 from app.generateID import calculate_sha256_string, generate_base64_encode, generate_unique_id
 from app.controllers.PG.APILogs import createNewAPILogs
-from Models.models import UserKeys
-from Models.models2 import MerchantPIPE, MerchantProdTransaction
-from database.db import AsyncSession, async_engine
-from sqlmodel import select, and_
+from Models.models2 import MerchantProdTransaction
+from database.db import AsyncSession
+from app.unit_of_work import use_session
+from app.pipe_routing import pick_route
 from decouple import config
 
 
@@ -24,19 +24,16 @@ else:
 # Process payment form transactions
 async def ProcessPaymentFormTransaction(header_value, merchant_public_key, amount, payload_dict,
                         payload, currency, payment_type, mobile_number, merchant_secret_key, 
-                        merchant_order_id, redirect_url, business_name):
+                        merchant_order_id, redirect_url, business_name, session: AsyncSession | None = None):
     try:
-        async with AsyncSession(async_engine) as session:
+        async with use_session(session) as session:
             INDEX = '1'
 
             # Specify checkout url according to the environment
             checkout_url = url
 
             # Get the Secrect key and public key data of the merchant
-            merchant_key_obj = await session.execute(select(UserKeys).where(
-                UserKeys.public_key == merchant_public_key
-            ))
-            merchant_key = merchant_key_obj.scalar()
+            merchant_key = await get_merchant_key_by_public_key(session, merchant_public_key)
 
             if not merchant_key:
                 return pretty_json({'error': {
@@ -47,7 +44,7 @@ async def ProcessPaymentFormTransaction(header_value, merchant_public_key, amoun
             
             
             # Decrypt Merchant secret key
-            merchant_secret_key = await decrypt_merchant_secret_key(merchant_secret_key)
+            merchant_secret_key = await decrypt_merchant_secret_key(merchant_secret_key, session)
             
              # Public Key & Merchant ID
             merchant_public_key = merchant_key.public_key
@@ -132,10 +129,7 @@ async def ProcessPaymentFormTransaction(header_value, merchant_public_key, amoun
 
             
             # Check Merchant pipe
-            merchant_pipe_assigned_obj = await session.execute(select(MerchantPIPE).where(
-                and_(MerchantPIPE.merchant == merchant_key.user_id, MerchantPIPE.is_active == True)
-            ))
-            merchant_pipe_assigned = merchant_pipe_assigned_obj.scalars().all()
+            merchant_pipe_assigned = await pick_route(session, merchant_key.user_id, amount / 100, currency)
 
 
             if not merchant_pipe_assigned:
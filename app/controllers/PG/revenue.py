@@ -0,0 +1,196 @@
+from Models.models2 import MerchantProdTransaction, PIPE, PipeRevenueDaily
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect, select, delete, func, case, and_
+from collections import defaultdict
+
+
+
+# Pipe revenue
+# Revenue is the fee of every completed successful transaction, refunded transactions count negative.
+# It is computed either with one GROUP BY over MerchantProdTransaction or, when the rollup is enabled,
+# from the PipeRevenueDaily table which is updated in the same transaction as every ORM change
+# to a merchant transaction, from the stored and the new values of the flushed transactions.
+
+
+
+# Fee of a transaction as counted in the revenue, refunds netted
+transaction_revenue = case(
+    (MerchantProdTransaction.is_refunded.is_(True), -func.coalesce(MerchantProdTransaction.fee_amount, 0)),
+    else_ = func.coalesce(MerchantProdTransaction.fee_amount, 0)
+)
+
+revenue_transaction_filter = and_(
+    MerchantProdTransaction.status      == 'PAYMENT_SUCCESS',
+    MerchantProdTransaction.is_completd == True
+)
+
+
+
+# Group the rows of (pipe_id, pipe_name, currency, total_amount) by pipe
+def group_pipe_revenues(rows) -> list[dict]:
+    pipe_revenue_data = {}
+
+    for pipe_id, pipe_name, currency, total_amount in rows:
+        pipe = pipe_revenue_data.setdefault(pipe_id, {
+            'pipe_id': pipe_id,
+            'pipe_name': pipe_name,
+            'total_transaction_amount': []
+        })
+
+        # Pipes without any transaction only have the outer joined row
+        if currency is not None:
+            pipe['total_transaction_amount'].append({'currency': currency, 'total_amount': total_amount})
+
+    return list(pipe_revenue_data.values())
+
+
+
+# Revenue of every pipe per currency
+async def get_pipe_revenues(session: AsyncSession, use_rollup: bool = False) -> list[dict]:
+    if use_rollup:
+        statement = select(
+            PIPE.id, PIPE.name, PipeRevenueDaily.currency, func.sum(PipeRevenueDaily.revenue)
+        ).select_from(PIPE).outerjoin(
+            PipeRevenueDaily, PipeRevenueDaily.pipe_id == PIPE.id
+        )
+        group_by = (PIPE.id, PIPE.name, PipeRevenueDaily.currency)
+    else:
+        statement = select(
+            PIPE.id, PIPE.name, MerchantProdTransaction.currency, func.sum(transaction_revenue)
+        ).select_from(PIPE).outerjoin(
+            MerchantProdTransaction, and_(MerchantProdTransaction.pipe_id == PIPE.id, revenue_transaction_filter)
+        )
+        group_by = (PIPE.id, PIPE.name, MerchantProdTransaction.currency)
+
+    result = await session.execute(statement.group_by(*group_by).order_by(PIPE.id))
+
+    return group_pipe_revenues(result.all())
+
+
+
+# Recalculate the whole rollup table from the transactions, used to backfill it
+async def rebuild_revenue_rollup(session: AsyncSession) -> None:
+    day = func.date(MerchantProdTransaction.createdAt)
+
+    aggregated = select(
+        day,
+        MerchantProdTransaction.pipe_id,
+        MerchantProdTransaction.currency,
+        func.sum(transaction_revenue),
+        func.count()
+    ).where(
+        and_(revenue_transaction_filter,
+             MerchantProdTransaction.pipe_id != None,
+             MerchantProdTransaction.createdAt != None
+        )
+    ).group_by(day, MerchantProdTransaction.pipe_id, MerchantProdTransaction.currency)
+
+    await session.execute(delete(PipeRevenueDaily))
+    await session.execute(PipeRevenueDaily.__table__.insert().from_select(
+        ['day', 'pipe_id', 'currency', 'revenue', 'transactions'], aggregated
+    ))
+
+
+
+# Rollup bucket and revenue of a transaction from its attribute values
+def _revenue_entry(values: dict) -> tuple[tuple, float] | None:
+    if values['status'] != 'PAYMENT_SUCCESS' or not values['is_completd']:
+        return None
+
+    if values['pipe_id'] is None or values['createdAt'] is None:
+        return None
+
+    fee = values['fee_amount'] or 0
+
+    return (values['createdAt'].date(), values['pipe_id'], values['currency']), -fee if values['is_refunded'] else fee
+
+
+_tracked_attributes = ('status', 'is_completd', 'is_refunded', 'fee_amount', 'pipe_id', 'currency', 'createdAt')
+
+
+def _tracked_values(state, stored: dict | None = None) -> dict:
+    # Expired attributes which were not assigned keep their stored value
+    if stored is not None:
+        return {name: state.dict.get(name, stored[name]) for name in _tracked_attributes}
+
+    return {name: state.attrs[name].value for name in _tracked_attributes}
+
+
+# Tracked columns of the transactions as stored, before the flush writes them.
+# The attribute history cannot tell: an expired attribute assigned without being loaded first
+# has no previous value.
+def _stored_values(session: Session, ids: list[int]) -> dict[int, dict]:
+    if not ids:
+        return {}
+
+    columns = [getattr(MerchantProdTransaction, name) for name in _tracked_attributes]
+    rows    = session.connection().execute(
+        select(MerchantProdTransaction.id, *columns).where(MerchantProdTransaction.id.in_(ids))
+    )
+
+    return {row[0]: dict(zip(_tracked_attributes, row[1:])) for row in rows}
+
+
+
+# Apply the revenue change of the merchant transactions about to be flushed to the rollup
+def track_revenue_changes(session: Session, flush_context, instances) -> None:
+    deltas = defaultdict(lambda: [0.0, 0])
+
+    def apply(entry, sign):
+        if entry:
+            bucket, revenue = entry
+            deltas[bucket][0] += sign * revenue
+            deltas[bucket][1] += sign
+
+    def changed(state) -> bool:
+        return any(state.attrs[name].history.has_changes() for name in _tracked_attributes)
+
+    new     = [inspect(obj) for obj in session.new if isinstance(obj, MerchantProdTransaction)]
+    dirty   = [inspect(obj) for obj in session.dirty if isinstance(obj, MerchantProdTransaction) and changed(inspect(obj))]
+    deleted = [inspect(obj) for obj in session.deleted if isinstance(obj, MerchantProdTransaction)]
+    stored  = _stored_values(session, [state.identity[0] for state in dirty + deleted])
+
+    for state in new:
+        apply(_revenue_entry(_tracked_values(state)), 1)
+
+    for state in dirty:
+        apply(_revenue_entry(stored[state.identity[0]]), -1)
+        apply(_revenue_entry(_tracked_values(state, stored[state.identity[0]])), 1)
+
+    for state in deleted:
+        apply(_revenue_entry(stored[state.identity[0]]), -1)
+
+    rollup_table = PipeRevenueDaily.__table__
+    connection   = session.connection()
+    insert       = postgresql.insert if connection.dialect.name == 'postgresql' else sqlite.insert
+
+    for (day, pipe_id, currency), (revenue, transactions) in deltas.items():
+        if revenue == 0 and transactions == 0:
+            continue
+
+        statement = insert(rollup_table).values(
+            day          = day,
+            pipe_id      = pipe_id,
+            currency     = currency,
+            revenue      = revenue,
+            transactions = transactions
+        )
+
+        statement = statement.on_conflict_do_update(
+            index_elements = ['day', 'pipe_id', 'currency'],
+            set_ = {
+                'revenue':      rollup_table.c.revenue + statement.excluded.revenue,
+                'transactions': rollup_table.c.transactions + statement.excluded.transactions
+            }
+        )
+
+        connection.execute(statement)
+
+
+
+# Keep PipeRevenueDaily up to date on every session flush
+def enable_revenue_rollup() -> None:
+    if not event.contains(Session, 'before_flush', track_revenue_changes):
+        event.listen(Session, 'before_flush', track_revenue_changes)
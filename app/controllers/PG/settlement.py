@@ -0,0 +1,119 @@
+from database.db import AsyncSession, async_engine
+from Models.models2 import MerchantProdTransaction, MerchantAccountBalance
+from app.settings import Settlement
+from sqlalchemy import text
+from datetime import datetime
+import asyncio
+import logging
+
+
+
+logger = logging.getLogger(__name__)
+
+
+TRANSACTION_TABLE = MerchantProdTransaction.__tablename__
+BALANCE_TABLE     = MerchantAccountBalance.__tablename__
+
+
+# Move one batch of due transactions from Immature to Mature.
+# Due rows are claimed with SKIP LOCKED so several workers never settle the same row,
+# aggregated per merchant and currency, and applied to the balances in one UPDATE.
+SETTLE_BATCH_STATEMENT = text(f'''
+    WITH due AS (
+        SELECT t.id, t.merchant_id, t.currency,
+               t.amount - (t.amount / 100) * COALESCE(t.transaction_fee, 0) AS net_amount
+        FROM {TRANSACTION_TABLE} t
+        WHERE t.status = 'PAYMENT_SUCCESS'
+          AND t.balance_status = 'Immature'
+          AND t.pg_settlement_date < :now
+          AND EXISTS (
+              SELECT 1 FROM {BALANCE_TABLE} b
+              WHERE b.merchant_id = t.merchant_id AND b.currency = t.currency
+          )
+        ORDER BY t.pg_settlement_date
+        LIMIT :batch_size
+        FOR UPDATE OF t SKIP LOCKED
+    ),
+    matured AS (
+        UPDATE {TRANSACTION_TABLE} t
+        SET balance_status = 'Mature'
+        FROM due
+        WHERE t.id = due.id
+        RETURNING due.merchant_id, due.currency, due.net_amount
+    ),
+    totals AS (
+        SELECT merchant_id, currency, SUM(net_amount) AS net_amount, COUNT(*) AS settled
+        FROM matured
+        GROUP BY merchant_id, currency
+    ),
+    balances AS (
+        UPDATE {BALANCE_TABLE} b
+        SET immature_balance = CASE WHEN b.immature_balance > 0 THEN b.immature_balance - totals.net_amount ELSE b.immature_balance END,
+            mature_balance   = CASE WHEN b.immature_balance > 0 THEN b.mature_balance + totals.net_amount ELSE b.mature_balance END,
+            last_updated     = :now
+        FROM totals
+        WHERE b.merchant_id = totals.merchant_id AND b.currency = totals.currency
+        RETURNING totals.settled
+    )
+    SELECT COALESCE(SUM(settled), 0) FROM balances
+''')
+
+
+
+# Settle all the due transactions, one committed batch at a time
+async def settle_due_transactions(batch_size: int = 1000) -> int:
+    total_settled = 0
+
+    while True:
+        async with AsyncSession(async_engine) as session:
+            result  = await session.execute(SETTLE_BATCH_STATEMENT, {'now': datetime.now(), 'batch_size': batch_size})
+            settled = int(result.scalar() or 0)
+
+            await session.commit()
+
+        total_settled += settled
+
+        if settled < batch_size:
+            return total_settled
+
+
+
+# Background worker which runs the settlement on an interval
+class SettlementWorker:
+    def __init__(self, settings: Settlement) -> None:
+        self.settings = settings
+        self._task: asyncio.Task | None = None
+
+
+    async def run(self) -> None:
+        while True:
+            try:
+                settled = await settle_due_transactions(self.settings.batch_size)
+
+                if settled:
+                    logger.info('Settled %s merchant transactions', settled)
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception:
+                logger.exception('Merchant balance settlement failed')
+
+            await asyncio.sleep(self.settings.interval_seconds)
+
+
+    def start(self) -> None:
+        if self.settings.enabled and self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+            self._task = None
@@ -1,9 +1,30 @@
+from Models.models3 import MerchantWebhook, MerchantWebhookAttempt
+from database.db import AsyncSession, async_engine
+from app.settings import Webhooks
+from app.unit_of_work import use_session
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import random
+import time
 import httpx
 
 
 
+logger = logging.getLogger(__name__)
 
-# Send Master card Webhook Response to Client
+# Set on a session which queued webhooks, its commit wakes the dispatcher
+WEBHOOKS_QUEUED = 'webhooks_queued'
+
+
+
+# Webhook Payload sent to the merchant callback url
 class WebhookPayload:
     def __init__(self, success: bool, status: str, message: str, data: dict) -> None:
         self.success = success
@@ -12,29 +33,348 @@ class WebhookPayload:
         self.data    = data
 
 
+    def as_dict(self) -> dict:
+        return {
+            "success": self.success,
+            "status":  self.status,
+            "message": self.message,
+            "data":    self.data
+        }
+
+
+
+# Signature of the X-Webhook-Signature header, merchants verify it with the same secret
+def sign_webhook(secret: str, timestamp: str, body: bytes) -> str:
+    digest = hmac.new(secret.encode(), f'{timestamp}.'.encode() + body, hashlib.sha256).hexdigest()
+
+    return f'sha256={digest}'
 
-async def send_pg_webhook(url: str, payload: WebhookPayload):
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, json={
-            "success": payload.success,
-            "status":  payload.status,
-            "message": payload.message,
-            "data":    payload.data
-        })
 
-        return response
+
+# Queue a webhook in the outbox.
+# The row is written with the session of the caller, so it is committed together with the
+# transaction update it reports, and delivered by the WebhookDispatcher once committed.
+async def queue_webhook(url: str, payload: dict, merchant_id: int | None = None, session: AsyncSession | None = None) -> None:
+    async with use_session(session, commit=True) as session:
+        session.add(MerchantWebhook(merchant_id=merchant_id, url=url, payload=payload))
+        session.info[WEBHOOKS_QUEUED] = True
 
 
 # @post('/api/send-webhook/')
-async def send_webhook_response(payload: WebhookPayload, url: str):
+async def send_webhook_response(payload: WebhookPayload, url: str, session: AsyncSession | None = None, merchant_id: int | None = None):
 
     try:
-        response = await send_pg_webhook(url, payload)
+        await queue_webhook(url, payload.as_dict(), merchant_id, session)
+
+        return {"message": "Webhook queued"}
 
-        if response.status_code == 200:
-            return {"message": "Webhook sent successfully"}
-        else:
-            return {"message": "Failed to send webhook", "status_code": response.status_code}
-        
     except Exception as e:
-        return {"message": "An error occurred while sending the webhook", "error": str(e)}
\ No newline at end of file
+        return {"message": "An error occurred while queueing the webhook", "error": str(e)}
+
+
+
+@event.listens_for(Session, 'after_commit')
+def _wake_dispatcher(session: Session) -> None:
+    if session.info.pop(WEBHOOKS_QUEUED, False) and WebhookDispatcher.current is not None:
+        WebhookDispatcher.current.wake()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_queued_webhooks(session: Session) -> None:
+    session.info.pop(WEBHOOKS_QUEUED, None)
+
+
+
+# A claimed outbox row
+class WebhookJob:
+    def __init__(self, id: int, url: str, payload: dict, attempts: int, leased_until: datetime | None = None) -> None:
+        self.id           = id
+        self.url          = url
+        self.payload      = payload
+        self.attempts     = attempts
+        # next_attempt_at written by the claim, the lease is only ours while it is unchanged
+        self.leased_until = leased_until
+
+
+    @property
+    def host(self) -> str:
+        return urlsplit(self.url).netloc
+
+
+
+class DeliveryResult:
+    def __init__(self, job: WebhookJob, status_code: int | None, error: str | None, duration_ms: float) -> None:
+        self.job         = job
+        self.status_code = status_code
+        self.error       = error
+        self.duration_ms = duration_ms
+
+
+    @property
+    def delivered(self) -> bool:
+        return self.status_code is not None and 200 <= self.status_code < 300
+
+
+
+# Background delivery of the webhook outbox
+class WebhookDispatcher:
+    """
+        Claims due webhooks from the MerchantWebhook outbox and posts them to the merchants.
+        Claimed rows are leased for `lease_seconds` with SKIP LOCKED, so several processes
+        can run a dispatcher without delivering a webhook twice, and a row claimed by a
+        process that died is picked up again once the lease expires. The lease is renewed
+        when the delivery gets its host slot, and the delivery is dropped if the row was
+        claimed again while it waited, so `lease_seconds` only has to cover one delivery.
+
+        Every delivery goes through one pooled client, at most `max_in_flight` at a time and
+        `per_host_concurrency` per merchant host, so a slow merchant only delays its own
+        webhooks. Each attempt is recorded in MerchantWebhookAttempt. Non 2xx answers and
+        network errors are retried with exponential backoff and jitter until `max_attempts`.
+    """
+    # The running dispatcher, woken when a session queueing webhooks commits
+    current: 'WebhookDispatcher | None' = None
+
+    def __init__(self, settings: Webhooks, transport: httpx.AsyncBaseTransport | None = None) -> None:
+        self.settings  = settings
+        self.transport = transport
+        self.delivered = 0
+        self.failed    = 0
+        self._client: httpx.AsyncClient | None = None
+        self._task: asyncio.Task | None        = None
+        self._wake: asyncio.Event | None       = None
+        self._in_flight: set[asyncio.Task]     = set()
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                transport = self.transport,
+                limits    = httpx.Limits(
+                    max_connections           = self.settings.max_connections,
+                    max_keepalive_connections = self.settings.max_keepalive_connections,
+                    keepalive_expiry          = self.settings.keepalive_expiry
+                ),
+                timeout   = httpx.Timeout(self.settings.timeout, connect=self.settings.connect_timeout)
+            )
+
+        return self._client
+
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.settings.per_host_concurrency)
+
+        return self._hosts[host]
+
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.settings.max_backoff, self.settings.backoff_factor * (2 ** attempts))
+        return random.uniform(delay / 2, delay)
+
+
+    def start(self) -> None:
+        if self.settings.enabled and self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self.run())
+            WebhookDispatcher.current = self
+
+
+    def wake(self) -> None:
+        if self._wake is not None:
+            self._wake.set()
+
+
+    async def run(self) -> None:
+        while True:
+            try:
+                claimed = await self.dispatch_due()
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception:
+                logger.exception('Merchant webhook dispatch failed')
+                claimed = 0
+
+            # Keep claiming while there is a backlog, else wait for a commit or the next poll
+            if not claimed:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.settings.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+                self._wake.clear()
+
+
+    # Claim as many due webhooks as there is room for and deliver them in the background
+    async def dispatch_due(self) -> int:
+        if len(self._in_flight) >= self.settings.max_in_flight:
+            await asyncio.wait(self._in_flight, return_when=asyncio.FIRST_COMPLETED)
+
+        room = min(self.settings.batch_size, self.settings.max_in_flight - len(self._in_flight))
+
+        if room <= 0:
+            return 0
+
+        jobs = await self.claim_due(room)
+
+        for job in jobs:
+            task = asyncio.create_task(self.deliver_and_record(job))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+        return len(jobs)
+
+
+    async def claim_due(self, limit: int) -> list[WebhookJob]:
+        now = datetime.now()
+
+        due = select(MerchantWebhook.id).where(
+            MerchantWebhook.status          == 'Pending',
+            MerchantWebhook.next_attempt_at <= now
+        ).order_by(MerchantWebhook.next_attempt_at).limit(limit).with_for_update(skip_locked=True)
+
+        statement = update(MerchantWebhook).where(MerchantWebhook.id.in_(due.scalar_subquery())).values(
+            next_attempt_at = now + timedelta(seconds=self.settings.lease_seconds)
+        ).returning(
+            MerchantWebhook.id, MerchantWebhook.url, MerchantWebhook.payload, MerchantWebhook.attempts, MerchantWebhook.next_attempt_at
+        )
+
+        async with AsyncSession(async_engine) as session:
+            rows = (await session.execute(statement)).all()
+            await session.commit()
+
+        return [WebhookJob(*row) for row in rows]
+
+
+    # Restart the lease of a claimed webhook, False when it expired and the row was claimed again
+    async def renew_lease(self, job: WebhookJob) -> bool:
+        leased_until = datetime.now() + timedelta(seconds=self.settings.lease_seconds)
+
+        statement = update(MerchantWebhook).where(
+            MerchantWebhook.id              == job.id,
+            MerchantWebhook.status          == 'Pending',
+            MerchantWebhook.next_attempt_at == job.leased_until
+        ).values(next_attempt_at=leased_until)
+
+        async with AsyncSession(async_engine) as session:
+            renewed = (await session.execute(statement)).rowcount == 1
+            await session.commit()
+
+        if renewed:
+            job.leased_until = leased_until
+
+        return renewed
+
+
+    async def deliver_and_record(self, job: WebhookJob) -> None:
+        result = await self.deliver(job)
+
+        # Delivered by whoever claimed it again
+        if result is None:
+            return
+
+        try:
+            await self.record(result)
+        except Exception:
+            # The lease expires and the webhook is delivered again
+            logger.exception('Could not record the delivery of merchant webhook %s', job.id)
+
+
+    async def deliver(self, job: WebhookJob) -> DeliveryResult | None:
+        body = json.dumps(job.payload, separators=(',', ':'), default=str).encode()
+
+        async with self._host_semaphore(job.host):
+            # Waiting for the host slot may have outlasted the lease
+            if not await self.renew_lease(job):
+                logger.info('Lease of merchant webhook %s expired before its delivery', job.id)
+                return None
+
+            timestamp = str(int(time.time()))
+            headers   = {
+                'Content-Type': 'application/json',
+                'X-Webhook-Id': str(job.id),
+                'X-Webhook-Timestamp': timestamp,
+            }
+
+            if self.settings.signing_secret:
+                headers['X-Webhook-Signature'] = sign_webhook(self.settings.signing_secret, timestamp, body)
+
+            started = time.perf_counter()
+
+            try:
+                response = await self._get_client().post(job.url, content=body, headers=headers)
+                await response.aclose()
+                status_code, error = response.status_code, None
+
+            except httpx.HTTPError as e:
+                status_code, error = None, f'{type(e).__name__}: {e}'
+
+        return DeliveryResult(job, status_code, error, (time.perf_counter() - started) * 1000)
+
+
+    # New values of the outbox row after a delivery attempt
+    def outcome(self, result: DeliveryResult, now: datetime) -> dict:
+        job      = result.job
+        attempts = job.attempts + 1
+        values   = {'attempts': attempts, 'last_status_code': result.status_code, 'last_error': result.error}
+
+        if result.delivered:
+            values.update(status='Delivered', delivered_at=now)
+
+        elif attempts >= self.settings.max_attempts:
+            values.update(status='Failed')
+            logger.warning('Merchant webhook %s to %s failed after %s attempts', job.id, job.url, attempts)
+
+        else:
+            values.update(next_attempt_at=now + timedelta(seconds=self._backoff(attempts)))
+
+        return values
+
+
+    # Update the outbox row and add the attempt to the history
+    async def record(self, result: DeliveryResult) -> None:
+        now    = datetime.now()
+        values = self.outcome(result, now)
+
+        async with AsyncSession(async_engine) as session:
+            await session.execute(insert(MerchantWebhookAttempt).values(
+                webhook_id  = result.job.id,
+                attempt     = values['attempts'],
+                status_code = result.status_code,
+                error       = result.error,
+                duration_ms = result.duration_ms,
+                createdAt   = now
+            ))
+            await session.execute(update(MerchantWebhook).where(MerchantWebhook.id == result.job.id).values(**values))
+            await session.commit()
+
+        if values.get('status') == 'Delivered':
+            self.delivered += 1
+        elif values.get('status') == 'Failed':
+            self.failed += 1
+
+
+    # Let the running deliveries finish, unfinished ones are retried after their lease
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+            self._task = None
+            WebhookDispatcher.current = None
+
+        if self._in_flight:
+            await asyncio.wait(self._in_flight, timeout=self.settings.timeout)
+
+            for task in list(self._in_flight):
+                task.cancel()
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
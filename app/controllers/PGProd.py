@@ -1,12 +1,12 @@
 from decouple import config
 from blacksheep.server.controllers import APIController
 from blacksheep import pretty_json, Request, Response, redirect
-from database.db import AsyncSession, async_engine
+from app.unit_of_work import use_session
 from Models.models import UserKeys
-from Models.models2 import MerchantPIPE, MerchantProdTransaction, PIPE, MerchantPIPE, MerchantAccountBalance
-from Models.models3 import MerchantAPILogs
+from Models.models2 import MerchantProdTransaction, MerchantAccountBalance
 from Models.PG.schema import PGProdSchema, PGProdMasterCardSchema
-from app.auth import decrypt_merchant_secret_key
+from app.auth import decrypt_merchant_secret_key, get_merchant_key_by_public_key
+from app.pipe_routing import pick_route
 from app.generateID import (
             base64_decode, calculate_sha256_string, 
             generate_base64_encode, generate_unique_id
@@ -15,9 +15,8 @@ from app.controllers.PG.paymentFormProcess import ProcessPaymentFormTransaction
 from app.controllers.PG.APILogs import createNewAPILogs
 from app.controllers.controllers import post, get
 from app.controllers.PG.Mastercard.mastercard import (
-    Create_Session, Update_Session, 
-    Initiate_Authentication, send_webhook_response,
-    MasterCardWebhookPayload, deduct_amount, Mastercard_Transaction_Status)
+    MastercardClient, send_webhook_response, MasterCardWebhookPayload
+    )
 from app.controllers.PG.merchantTransaction import CalculateMerchantAccountBalance
 from sqlmodel import select, and_
 from datetime import timedelta
@@ -87,7 +86,7 @@ class PaymentGatewayProductionAPI(APIController):
             - Duplicate merchantOrderId - If the provided merchant order id is duplicated.<br/>
         """
         try:
-            async with AsyncSession(async_engine) as session:
+            async with use_session() as session:
                 header        = request.headers.get_first(b"X-AUTH")
 
                 if not header:
@@ -123,10 +122,7 @@ class PaymentGatewayProductionAPI(APIController):
                     business_name = ''
 
                 # Get the Secrect key and public key data of the merchant
-                merchant_key_obj = await session.execute(select(UserKeys).where(
-                    UserKeys.public_key == merchant_public_key
-                ))
-                merchant_key = merchant_key_obj.scalar()
+                merchant_key = await get_merchant_key_by_public_key(session, merchant_public_key)
 
                 if not merchant_key:
 
@@ -140,23 +136,19 @@ class PaymentGatewayProductionAPI(APIController):
                 # If transaction amount is 0
                 if amount == 0 or amount == 0.00:
                     # Create API Log for the Error
-                    api_log_obj = MerchantAPILogs(
-                        merchant_id      = merchant_key.user_id,
-                        error            = 'Wrong Amount entered, Should be greater than 0 and +ve Integer',
-                        end_point        = '/api/pg/prod/v1/pay/',
-                        request_header   = header_value,
-                        request_body     = payload,
-                        response_header  = '',
-                        response_body    = {'error': {
-                                'success': False,
-                                'status': 'PAYMENT_PROCESSING',
-                                "message": "Amount should be greater than 0"
-                            }}
-                        )
-                    
-                    session.add(api_log_obj)
-                    await session.commit()
-                    await session.refresh(api_log_obj)
+                    await createNewAPILogs(
+                        merchant_key.user_id,
+                        'Wrong Amount entered, Should be greater than 0 and +ve Integer',
+                        '/api/pg/prod/v1/pay/',
+                        header_value,
+                        payload,
+                        '',
+                        {'error': {
+                            'success': False,
+                            'status': 'PAYMENT_PROCESSING',
+                            "message": "Amount should be greater than 0"
+                        }}
+                    )
                     
                     return pretty_json({'error': {
                         'success': False,
@@ -283,11 +275,11 @@ class PaymentGatewayProductionAPI(APIController):
                     return await ProcessPaymentFormTransaction(
                         header_value, merchant_public_key, amount, payload_dict,
                         payload, currency, payment_type, mobile_number, merchant_secret_key, 
-                        merchant_order_id, redirect_url, business_name
+                        merchant_order_id, redirect_url, business_name, session
                     )
                 
                 # Decrypt Merchant secret key
-                merchant_secret_key = await decrypt_merchant_secret_key(merchant_secret_key)
+                merchant_secret_key = await decrypt_merchant_secret_key(merchant_secret_key, session)
 
                 
                 # Public Key & Merchant ID
@@ -371,10 +363,7 @@ class PaymentGatewayProductionAPI(APIController):
                 
 
                 # Check Merchant pipe
-                merchant_pipe_assigned_obj = await session.execute(select(MerchantPIPE).where(
-                    and_(MerchantPIPE.merchant == merchant_key.user_id, MerchantPIPE.is_active == True)
-                ))
-                merchant_pipe_assigned = merchant_pipe_assigned_obj.scalars().all()
+                merchant_pipe_assigned = await pick_route(session, merchant_key.user_id, amount / 100, currency)
 
                 if not merchant_pipe_assigned:
                     # Create log for the error
@@ -504,7 +493,7 @@ class MasterCardTransaction(APIController):
     
 
     @post()
-    async def create_mastercard_transaction(request: Request, schema: PGProdMasterCardSchema):
+    async def create_mastercard_transaction(request: Request, schema: PGProdMasterCardSchema, mastercard: MastercardClient):
         """
             This API Endpoint handles the creation of a Mastercard transaction, including decoding card
             details, checking transaction status, initiating authentication, and handling various error
@@ -512,7 +501,8 @@ class MasterCardTransaction(APIController):
 
             Parameters:<br/>
                 - request(Request): The request object to be used to create a Mastercard transaction.<br/>
-                - schema(PGProdMasterCardSchema): The schema object to be used to validate and extract data from the request payload.<br/><br/>
+                - schema(PGProdMasterCardSchema): The schema object to be used to validate and extract data from the request payload.<br/>
+                - mastercard(MastercardClient): The pooled async Mastercard gateway client.<br/><br/>
 
             Procedures:<br/>
                 1. Decode the card details from the request payload.<br/>
@@ -535,7 +525,7 @@ class MasterCardTransaction(APIController):
                 3. Error message if the transaction has already been completed.<br/>
         """
         try:
-            async with AsyncSession(async_engine) as session:
+            async with use_session() as session:
                 request_payload = schema.request
                 redirect_url    = redirectURL
 
@@ -616,22 +606,13 @@ class MasterCardTransaction(APIController):
                 # else:
 
                 # Get the pipe assigned to the merchant
-                merchant_assigned_pipe_obj = await session.execute(select(MerchantPIPE).where(
-                    and_(
-                        MerchantPIPE.merchant == merchant_prod_transaction.merchant_id,
-                        MerchantPIPE.is_active == True,
-                        )
-                    ))
-                merchant_assigned_pipe = merchant_assigned_pipe_obj.scalar()
+                merchant_assigned_pipe = await pick_route(session, merchant_prod_transaction.merchant_id, amount, currency)
 
-                ## Get The settlement period of the assigned pipe
-                pipe_id_obj = await session.execute(select(PIPE).where(
-                    PIPE.id == merchant_assigned_pipe.pipe
-                ))
-                pipe_id = pipe_id_obj.scalar()
+                if not merchant_assigned_pipe:
+                    return pretty_json({'error': 'No Active Acquirer available, Please contact administration'}, 400)
 
                 # Calculate settlement date
-                pipe_settlement_period  = pipe_id.settlement_period
+                pipe_settlement_period  = merchant_assigned_pipe.settlement_period
                 numeric_period          = re.findall(r'\d+', pipe_settlement_period)
 
                 if numeric_period:
@@ -650,14 +631,14 @@ class MasterCardTransaction(APIController):
 
                 ## Master card Transaction started
                 ## Create session
-                mastercard_session = Create_Session()
+                mastercard_session = await mastercard.create_session()
                 session_result     = mastercard_session.get('result')
 
                 if session_result == 'SUCCESS':
                     sessionID = mastercard_session.get('session')['id']
 
                     ### Update session
-                    update_session = Update_Session(sessionID, transaction_id, card_no, card_cvv, card_expiry, currency, amount, redirect_url)
+                    update_session = await mastercard.update_session(sessionID, transaction_id, card_no, card_cvv, card_expiry, currency, amount, redirect_url)
 
                     if update_session.get('session')['updateStatus'] == 'SUCCESS':
 
@@ -667,7 +648,7 @@ class MasterCardTransaction(APIController):
                         # Store json response in transaction
                         merchant_prod_transaction.gateway_res          = update_session
                         merchant_prod_transaction.payment_mode         = 'Card'
-                        merchant_prod_transaction.pipe_id              = merchant_assigned_pipe.pipe if merchant_assigned_pipe.pipe else 0
+                        merchant_prod_transaction.pipe_id              = merchant_assigned_pipe.pipe_id
                         merchant_prod_transaction.transaction_fee      = merchant_assigned_pipe.fee if merchant_assigned_pipe.fee else 0
                         merchant_prod_transaction.fee_amount           = transaction_fee_amount
                         merchant_prod_transaction.pg_settlement_period = pipe_settlement_period
@@ -680,7 +661,7 @@ class MasterCardTransaction(APIController):
                         await session.refresh(merchant_prod_transaction)
 
                         # Initiate Authentication
-                        initiate_auth = Initiate_Authentication(transaction_id, sessionID, currency)
+                        initiate_auth = await mastercard.initiate_authentication(transaction_id, sessionID, currency)
 
                         if initiate_auth.get('result') == 'SUCCESS' and initiate_auth.get('response')['gatewayCode'] == 'AUTHENTICATION_IN_PROGRESS':
 
@@ -720,7 +701,7 @@ class MasterCardTransaction(APIController):
                                     data    = webhook_payload_dict["data"]
                                 )
 
-                                await send_webhook_response(webhook_payload, merchantCallBackURL)
+                                await send_webhook_response(webhook_payload, merchantCallBackURL, session, merchant_prod_transaction.merchant_id)
 
                             # Update the merchant transaction status
                             merchant_prod_transaction.status       = 'PAYMENT_FAILED'
@@ -768,7 +749,7 @@ class MasterCardTransaction(APIController):
                                     data    = webhook_payload_dict["data"]
                                 )
 
-                                await send_webhook_response(webhook_payload, merchantCallBackURL)
+                                await send_webhook_response(webhook_payload, merchantCallBackURL, session, merchant_prod_transaction.merchant_id)
 
                             # Update the merchant transaction status
                             merchant_prod_transaction.status       = 'PAYMENT_FAILED'
@@ -817,7 +798,7 @@ class MasterCardTransaction(APIController):
                                 data    = webhook_payload_dict["data"]
                             )
 
-                            await send_webhook_response(webhook_payload, merchantCallBackURL)
+                            await send_webhook_response(webhook_payload, merchantCallBackURL, session, merchant_prod_transaction.merchant_id)
 
                         # Update the merchant transaction status
                         merchant_prod_transaction.status      = 'PAYMENT_FAILED'
@@ -863,12 +844,12 @@ class MasterCardTransaction(APIController):
                             data    = webhook_payload_dict["data"]
                         )
 
-                        await send_webhook_response(webhook_payload, merchantCallBackURL)
+                        await send_webhook_response(webhook_payload, merchantCallBackURL, session, merchant_prod_transaction.merchant_id)
                         
                     # Update the merchant transaction status
                     merchant_prod_transaction.status       = 'PAYMENT_FAILED'
                     merchant_prod_transaction.payment_mode = 'Card'
-                    merchant_prod_transaction.pipe_id      = merchant_assigned_pipe.pipe
+                    merchant_prod_transaction.pipe_id      = merchant_assigned_pipe.pipe_id
                     
                     session.add(merchant_prod_transaction)
                     await session.commit()
@@ -909,18 +890,19 @@ class ReceiveMasterCardWebhook(APIController):
         return '/api/v1/prod/mastercard/webhook/'
     
     @post()
-    async def mastercard_webhook(request: Request):
+    async def mastercard_webhook(request: Request, mastercard: MastercardClient):
         """
             The API Endpoint processes webhook data for Mastercard transactions and updates the status of the transaction accordingly.<br/><br/>
 
             Parameters:<br/>
                 - request (Request): The incoming POST request containing webhook data from Mastercard.<br/>
                 - redirectURL (str): The URL to redirect the user after processing the response.<br/>
+                - mastercard (MastercardClient): The pooled async Mastercard gateway client.<br/>
             
             Includes:<br/>
-                - send_webhook_response: A function that sends a webhook response to the specified URL.<br/>
+                - send_webhook_response: A function that queues a webhook response to the specified URL in the merchant webhook outbox.<br/>
                 - MasterCardWebhookPayload: A class representing the structure of the webhook data from Mastercard.<br/>
-                - deduct_amount: A function that deducts the amount from the user's account.<br/>
+                - mastercard.deduct_amount: A function that deducts the amount from the user's account.<br/>
                 - CalculateMerchantAccountBalance: A function that calculates the new balance for the merchant's account.<br/>
                 - UserKeys: The database model representing the user keys.<br/>
                 - MerchantProdTransaction: The database model representing the merchant transactions.<br/>
@@ -947,7 +929,7 @@ class ReceiveMasterCardWebhook(APIController):
             - 500: If there is a server error during the webhook response process.<br/>
         """
         try:
-            async with AsyncSession(async_engine) as session:
+            async with use_session() as session:
                 json_data = await request.json()
 
                 response_data = json_data.get('response', {})
@@ -1007,7 +989,7 @@ class ReceiveMasterCardWebhook(APIController):
                         sessionID         = gateway_data_dict["session"]["id"]
 
                         # Last process to deduct the amount
-                        deduct = deduct_amount(transaction_id, sessionID)
+                        deduct = await mastercard.deduct_amount(transaction_id, sessionID)
 
                         response     = deduct.get('response', {})
                         gateway_code = response.get('gatewayCode')
@@ -1017,7 +999,7 @@ class ReceiveMasterCardWebhook(APIController):
                             
                             # Account balance update for merchant
                             if not merchant_transaction.is_completd:
-                                await CalculateMerchantAccountBalance(transactionAmount, transactionCurrency, merchantPipeFee, merchantID)
+                                await CalculateMerchantAccountBalance(transactionAmount, transactionCurrency, merchantPipeFee, merchantID, session)
 
                             merchant_transaction.status      = 'PAYMENT_SUCCESS'
                             merchant_transaction.is_completd = True
@@ -1047,7 +1029,7 @@ class ReceiveMasterCardWebhook(APIController):
                                 )
 
                                 # Send webhook
-                                await send_webhook_response(webhook_payload, merchant_webhook_url)
+                                await send_webhook_response(webhook_payload, merchant_webhook_url, session, merchantID)
 
 
                             # Calculate Payout balance of the Merchant
@@ -1123,7 +1105,7 @@ class ReceiveMasterCardWebhook(APIController):
                         )
 
                         # Send webhook
-                        await send_webhook_response(webhook_payload, merchant_webhook_url)
+                        await send_webhook_response(webhook_payload, merchant_webhook_url, session, merchantID)
 
                     merchant_transaction.status      = 'PAYMENT_PENDING'
                     merchant_transaction.gateway_res = json_data
@@ -1176,7 +1158,7 @@ class ReceiveMasterCardWebhook(APIController):
                             data          = webhook_payload_dict["data"]
                         )
 
-                        await send_webhook_response(webhook_payload, merchant_webhook_url)
+                        await send_webhook_response(webhook_payload, merchant_webhook_url, session, merchantID)
                     
                     merchant_transaction.status      = 'PAYMENT_FAILED'
                     merchant_transaction.is_completd = True
@@ -1229,7 +1211,7 @@ class ReceiveMasterCardWebhook(APIController):
                         )
 
                         # Send webhook response
-                        await send_webhook_response(webhook_payload, merchant_webhook_url)
+                        await send_webhook_response(webhook_payload, merchant_webhook_url, session, merchantID)
 
                     # Update the database
                     merchant_transaction.status      = 'PAYMENT_SUCCESS'
@@ -1263,14 +1245,15 @@ class MastercardTransactionStatus(APIController):
         return '/api/v1/prod/mastercard/validate/{id}/'
 
     @get()
-    async def mastercard_transaction_status(request: Request, id: str):
+    async def mastercard_transaction_status(request: Request, id: str, mastercard: MastercardClient):
         """
             This API Endpoint retrieves the status of PG production transaction based on the provided transaction ID and includes error handling
             for various scenarios.<br/><br/>
 
             Parameters:<br/>
                - request: The HTTP request object.<br/>
-               - id: The unique identifier of the PG transaction,for which the transaction status needs to be retrieved.<br/><br/>
+               - id: The unique identifier of the PG transaction,for which the transaction status needs to be retrieved.<br/>
+               - mastercard: The pooled async Mastercard gateway client.<br/><br/>
 
             Returns:<br/>
             - JSON: A JSON response containing the transaction status, error message, and merchant redirect URL if available.<br/>
@@ -1280,7 +1263,7 @@ class MastercardTransactionStatus(APIController):
             - Exception: If any error occurs during the database query or response generation.<br/>
         """
         try:
-            async with AsyncSession(async_engine) as session:
+            async with use_session() as session:
                 transaction_id = id
 
                 # Get merchant production transaction
@@ -1304,7 +1287,7 @@ class MastercardTransactionStatus(APIController):
                     return pretty_json({'error': 'Please provide Transaction ID'}, 400)
                 
                 elif transaction_id:
-                    transaction_status = Mastercard_Transaction_Status(transaction_id)
+                    transaction_status = await mastercard.transaction_status(transaction_id)
 
                     result           = transaction_status['result']
                     gateway_response = transaction_status['response']['gatewayCode']
@@ -1355,15 +1338,12 @@ class MerchantTransactionStatus(APIController):
              - Error 500: 'error': 'Server Error'.<br/>
         """
         try:
-            async with AsyncSession(async_engine) as session:
+            async with use_session() as session:
                 merchantPublicKey = merchant_public_key
                 merchantOrderID   = merchant_order_id
 
                 # Validate the merchant public
-                user_key_obj = await session.execute(select(UserKeys).where(
-                    UserKeys.public_key == merchantPublicKey
-                ))
-                user_key = user_key_obj.scalar()
+                user_key = await get_merchant_key_by_public_key(session, merchantPublicKey)
 
                 if not user_key:
                     return pretty_json({"error": {
@@ -1482,7 +1462,7 @@ class MasterCardRedirectResponse(APIController):
                   to 'PAYMENT_SUCCESS' and redirects to a success URL. If the result is neither 'FAILURE' nor 'SUCCESS it redirect to the failure URL.<br/>
         """
         try:
-            async with AsyncSession(async_engine) as session:
+            async with use_session() as session:
                 form_data = await request.form()
 
                 transaction_id = form_data['transaction.id']
@@ -1,7 +1,7 @@
 from app.controllers.controllers import get,post
 from blacksheep import Request, pretty_json, Response, redirect
 from blacksheep.server.controllers import APIController
-from database.db import AsyncSession, async_engine
+from app.unit_of_work import use_session
 from Models.PG.schema import (
     PGSandBoxSchema, PGSandboxTransactionProcessSchema
     )
@@ -12,7 +12,7 @@ from app.generateID import (
           generate_unique_id, generate_base64_encode
         )
 from sqlmodel import select, and_
-from app.auth import decrypt_merchant_secret_key
+from app.auth import decrypt_merchant_secret_key, get_merchant_key_by_public_key
 from app.controllers.PG.webhook import send_webhook_response, WebhookPayload
 from decouple import config
 import json
@@ -72,7 +72,7 @@ class PaymentGatewaySandboxAPI(APIController):
             - Duplicate merchantOrderId - If the provided merchant order id is duplicated.<br/>
         """
         try:
-            async with AsyncSession(async_engine) as session:
+            async with use_session() as session:
                 header        = request.headers.get_first(b"X-AUTH")
 
                 if not header:
@@ -177,13 +177,10 @@ class PaymentGatewaySandboxAPI(APIController):
                     }, 400)
                 
                 # Decrypt Merchant secret key
-                merchant_secret_key = await decrypt_merchant_secret_key(merchant_secret_key)
+                merchant_secret_key = await decrypt_merchant_secret_key(merchant_secret_key, session)
 
                 # Get the Secrect key and public key data of the merchant
-                merchant_key_obj = await session.execute(select(UserKeys).where(
-                    UserKeys.public_key == merchant_public_key
-                ))
-                merchant_key = merchant_key_obj.scalar()
+                merchant_key = await get_merchant_key_by_public_key(session, merchant_public_key)
 
                 if not merchant_key:
                     return pretty_json({'error': {
@@ -380,7 +377,7 @@ class MerchantProcessTransactionController(APIController):
             - 'error': ''Merchant Public key not found' if the public key is not valid.<br/>
         """
         try:
-            async with AsyncSession(async_engine) as session:
+            async with use_session() as session:
                 request_payload = schema.request
 
                 # Decode the card details
@@ -464,7 +461,7 @@ class MerchantProcessTransactionController(APIController):
                         data    = webhook_payload_dict["data"]
                     )
 
-                    await send_webhook_response(webhook_payload, merchantCallBackURL)
+                    await send_webhook_response(webhook_payload, merchantCallBackURL, session, merchant_sandbox_transaction.merchant_id)
 
                 # Update the merchant transaction status
                 merchant_sandbox_transaction.status       = 'PAYMENT_SUCCESS'
@@ -518,15 +515,12 @@ class MerchantSandboxTransactionStatus(APIController):
             - Exception: If any error occurs during the database query or response generation.<br/>
         """
         try:
-            async with AsyncSession(async_engine) as session:
+            async with use_session() as session:
                 merchantPublicKey = merchant_public_key
                 merchantOrderID   = merchant_order_id
 
                 # Validate the merchant public
-                user_key_obj = await session.execute(select(UserKeys).where(
-                    UserKeys.public_key == merchantPublicKey
-                ))
-                user_key = user_key_obj.scalar()
+                user_key = await get_merchant_key_by_public_key(session, merchantPublicKey)
 
                 if not user_key:
                     return pretty_json({'error': {
@@ -627,7 +621,7 @@ class MerchantSandboxTransactionStatus(APIController):
     
 #     async def process_transaction(request: Request, schema: PGSandboxTransactionProcessSchema):
 #         try:
-#             async with AsyncSession(async_engine) as session:
+#             async with use_session() as session:
 #                 payload = schema.request
 
 #                  # Decod the payload
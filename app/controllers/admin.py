@@ -5,7 +5,7 @@ from database.db import async_engine, AsyncSession
 from Models.models import Users, Admin
 from blacksheep import Request, json
 from sqlalchemy.exc import SQLAlchemyError
-from app.auth import encrypt_password
+from app.passwords import hash_password
 from app.controllers.controllers import get, post
 
 
@@ -55,7 +55,7 @@ class AdminController(APIController):
                     first_name    = admin.firstname,
                     lastname      = admin.lastname,
                     email         = admin.email,
-                    password      = encrypt_password(admin.password),
+                    password      = await hash_password(admin.password),
                     is_verified   = True,
                     is_active     = True,
                     is_admin      = True,
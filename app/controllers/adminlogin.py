@@ -6,7 +6,7 @@ from Models.models import Admin, Users
 from blacksheep import Request, json
 from sqlalchemy.exc import SQLAlchemyError
 from app.auth import generate_access_token, generate_refresh_token
-from app.auth import check_password
+from app.passwords import verify_user_password
 from app.controllers.controllers import post
 
 
@@ -56,9 +56,9 @@ class AdminLoginController(APIController):
                     return json({'msg': 'Please provide admin credentials'}, 403)
   
                 # If the user is admin and credentials are valid, generate access and refresh tokens#+
-                if first_user and check_password(user.password, first_user.password):#+
+                if first_user and await verify_user_password(session, first_user, user.password):
                     return json({
-                        'access_token': generate_access_token(first_user.id),
+                        'access_token': generate_access_token(first_user.id, first_user),
                         'refresh_token': generate_refresh_token(first_user.id)
                     },200)
                 else:
@@ -3,7 +3,7 @@ from blacksheep.server.authorization import auth
 from blacksheep.server.controllers import APIController
 from database.db import AsyncSession, async_engine
 from app.controllers.controllers import post
-from app.auth import encrypt_password
+from app.passwords import hash_password
 from Models.Merchant.schema import ChangePasswordSchema
 from Models.models import Users
 from sqlmodel import select
@@ -63,7 +63,7 @@ class UserChangePasswordController(APIController):
                 
                 if user_obj:
                     # Change password
-                    encrypted_password = encrypt_password(password1)
+                    encrypted_password = await hash_password(password1)
                     user_obj.password  = encrypted_password
 
                     session.add(user_obj)
@@ -1,12 +1,13 @@
 from blacksheep.server.controllers import APIController
 from database.db import AsyncSession, async_engine
 from blacksheep import pretty_json, Request
-from Models.models2 import MerchantPIPE, PIPE, MerchantProdTransaction
-from Models.models import UserKeys, Currency
+from Models.models2 import MerchantProdTransaction
+from Models.models import UserKeys
 from sqlmodel import select, and_
 from Models.PG.schema import PGMerchantPipeCheckoutSchema
 from app.controllers.controllers import post
 from app.generateID import base64_decode
+from app.pipe_routing import merchant_routes
 import json
 
 
@@ -53,7 +54,6 @@ class MerchantPipes(APIController):
                 # merchant_public_key = base64_decode(merchant_public_key_schema)
                 merchant_public_key = json.loads(merchant_public_key_decode)
 
-                combined_data       = []
                
                 try:
                     merchant_key_obj = await session.execute(select(UserKeys).where(
@@ -90,49 +90,15 @@ class MerchantPipes(APIController):
                 
                 ########################################################################
 
-                # Check for active Merchant assigned pipes
+                # Active pipes of the merchant with their currency, from the routing table
                 try:
-                    mechant_assigned_pipe = await session.execute(select(MerchantPIPE).where(
-                        and_(MerchantPIPE.merchant == merchant_id, MerchantPIPE.is_active ==  True)
-                    ))
-                    merchant_assigned_pipe = mechant_assigned_pipe.scalars().all()
+                    merchant_assigned_pipe = await merchant_routes(session, merchant_id)
 
                     if not merchant_assigned_pipe:
                         return pretty_json({'msg': 'No available merchant pipe'}, 404)
-                    
-                except Exception as e:
-                    return pretty_json({'Merchant assigned pipe error'}, 400)
 
+                    combined_data = [route.as_checkout() for route in merchant_assigned_pipe]
 
-                if not merchant_assigned_pipe:
-                    return pretty_json({'error': 'No assigned pipe'}, 400)
-                
-                # Check those pipes are active or not 
-                try:
-                    for merchant_pipes in merchant_assigned_pipe:
-                        pipe_obj = await session.execute(select(PIPE).where(
-                            and_(PIPE.id == merchant_pipes.pipe, PIPE.is_active == True)
-                        ))
-                        pipes = pipe_obj.scalars().all()
-
-                        if not pipes:
-                            return pretty_json({'error': 'No active pipe available'}, 400)
-                        
-                        for pipe_data in pipes:
-                            # Get the related currency
-                            currency_obj = await session.execute(select(Currency).where(
-                                Currency.id == pipe_data.process_curr
-                            ))
-                            currency = currency_obj.scalar()
-
-                            # for type in pipe_types:
-                            combined_data.append({
-                                'pipe_name': pipe_data.name,
-                                'payment_medium': pipe_data.payment_medium,
-                                'payment_currency': currency.name,
-                                # 'pipe_type': type.name
-                            })
-                        
                 except Exception as e:
                     return pretty_json({'msg': 'Merchant data fetch error', 'error': f'{str(e)}'}, 400)
                 
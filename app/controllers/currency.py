@@ -7,14 +7,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import select
 from Models.schemas import CurrencySchemas, UpdateCurrencySchema
 from app.controllers.controllers import get, post, put, delete
-from decouple import config
-from httpx import AsyncClient
-
-
-
-currency_converter_api = config('CURRENCY_CONVERTER_API')
-RAPID_API_KEY          = config('RAPID_API_KEY')
-RAPID_API_HOST         = config('RAPID_API_HOST')
+from app.fx import convert_amount, convert_amounts, FXRateError
 
 
 
@@ -210,50 +203,39 @@ class CurrencyConverterController(APIController):
     @post()
     async def convert_currency(self, request: Request):
         """
-            This function converts currency using an external API and returns the converted amount.<br/><br/>
+            This function converts currency using the cached exchange rates and returns the converted amount.<br/><br/>
 
             Parameters:<br/>
             from_currency (str): The currency to be converted from.<br/>
             to_currency (str): The currency to be converted to.<br/>
-            amount (float): The amount to be converted.<br/><br/>
+            amount (float): The amount to be converted.<br/>
+            conversions (list): Optional, several {from_currency, to_currency, amount} to convert at once.<br/><br/>
             
             Returns:<br/>
-            - A JSON response containing the converted amount if the currency conversion is successful.<br/>
+            - A JSON response containing the converted amount, or converted_amounts in the order of conversions, if the currency conversion is successful.<br/>
             - If there are any errors during the currency conversion process or while calling the external API, appropriate error messages are returned along with the
                 corresponding HTTP status codes.<br/>
         """
         request_body = await request.json()
-        
-        from_currency = request_body['from_currency']
-        to_currency   = request_body['to_currency']
-        amount        = request_body['amount']
 
         try:
-            url = f"{currency_converter_api}/convert?from={from_currency}&to={to_currency}&amount={amount}"
-            headers = {
-            'X-RapidAPI-Key': f"{RAPID_API_KEY}",
-            'X-RapidAPI-Host': f"{RAPID_API_HOST}"
-        }
-                                
-            async with AsyncClient() as client:
-                response = await client.get(url, headers=headers)
-                # print('APi Response', response)
-
-                if response.status_code == 200:
-                    api_data = response.json()
-                    # print('api data', api_data)
-
-                else:
-                    return json({'message': 'Error calling external API', 'error': response.text}, 400)
-                                    
-        except Exception as e:
-            return json({'message': 'Currency API Error', 'error': f'{str(e)}'}, 400)
+            # Several amounts at once, sharing the cached rate tables
+            if 'conversions' in request_body:
+                converted_amounts = await convert_amounts([
+                    (conversion['from_currency'], conversion['to_currency'], conversion['amount'])
+                    for conversion in request_body['conversions']
+                ])
 
-        converted_amount = api_data['result'] if 'result' in api_data else None
+                return json({'converted_amounts': converted_amounts}, 200)
 
-        if not converted_amount:
-            return json({'message': 'Invalid Curency Converter API response', 'error': 'Conversion result missing'}, 400)
-        
+            from_currency = request_body['from_currency']
+            to_currency   = request_body['to_currency']
+            amount        = request_body['amount']
+
+            converted_amount = await convert_amount(from_currency, to_currency, amount)
+
+        except FXRateError as e:
+            return json({'message': 'Currency API Error', 'error': f'{str(e)}'}, 400)
 
         return json({'converted_amount': converted_amount}, 200)
         
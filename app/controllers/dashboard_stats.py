@@ -1,10 +1,9 @@
 from blacksheep import json, get, Request
 from blacksheep.server.authorization import auth
-from database.db import AsyncSession, async_engine
-from Models.models import Currency
-from Models.models2 import MerchantAccountBalance, MerchantProdTransaction
-from Models.models3 import MerchantWithdrawals, MerchantRefund
-from sqlmodel import select, and_, desc
+from database.db import session_for
+from Models.models2 import MerchantProdTransaction
+from app.dashboard import BUCKETS, merchant_stats, merchant_chart
+from sqlmodel import select, desc
 
 
 
@@ -35,95 +34,44 @@ async def get_merchantDashStats(request: Request, currency: str):
             - Error 500: Server Error<br/>
     """
     try:
-        async with AsyncSession(async_engine) as session:
+        async with session_for('dashboard') as session:
             #Authenticate user
             user_identity = request.identity
             user_id       = user_identity.claims.get('user_id') if user_identity else None
 
-            # Get currency id
-            currency_obj =  await session.execute(select(Currency).where(
-                Currency.name == currency
-            ))
-            currency_name = currency_obj.scalar()
+            # Refund, balance and withdrawal totals in one statement
+            stats = await merchant_stats(session, user_id, currency)
 
-            if not currency_name:
+            if not stats:
                 return json({'message': 'Invalid Currency'}, 400)
 
-
-            # Get the merchant account balance
-            merchant_account_balance_obj = await session.execute(select(MerchantAccountBalance).where(
-                and_(MerchantAccountBalance.merchant_id == user_id,
-                     MerchantAccountBalance.currency    == currency
-                     )
-            ))
-            merchant_account_balance = merchant_account_balance_obj.scalars().all()
-
-            # Get merchant withdrawals
-            merchant_withdrawal_requests_obj = await session.execute(select(MerchantWithdrawals).where(
-                and_(
-                    MerchantWithdrawals.merchant_id == user_id,
-                    MerchantWithdrawals.currency    == currency_name.id,
-                    MerchantWithdrawals.is_completed == True
-                    )
-                ))
-            merchant_withdrawal_requests = merchant_withdrawal_requests_obj.scalars().all()
-
-
-            # Get merchant pending withdrawals
-            merchant_pending_withdrawal_requests_obj = await session.execute(select(MerchantWithdrawals).where(
-                and_(
-                    MerchantWithdrawals.merchant_id == user_id,
-                    MerchantWithdrawals.currency    == currency_name.id,
-                    MerchantWithdrawals.status      == 'Pending'
-                    )
-            ))
-            merchant_pending_withdrawal_requests = merchant_pending_withdrawal_requests_obj.scalars().all()
-
-            # Get merchant Refunds
-            merchant_refund_requests_obj = await session.execute(select(MerchantRefund).where(
-                and_(
-                    MerchantRefund.merchant_id == user_id,
-                    MerchantRefund.currency == currency_name.id
-                 )
-            ))
-            merchant_refund_requests = merchant_refund_requests_obj.scalars().all()
-
-
-            # Count total amount for all the requests
-            total_merchant_withdrawals               = sum(withdrawals.amount for withdrawals in merchant_withdrawal_requests)
-            total_merchant_refunds                   = sum(refunds.amount for refunds in merchant_refund_requests)
-            total_merchant_account_balance           = sum(balance.account_balance for balance in merchant_account_balance if balance.account_balance is not None)
-            total_merchant_mature_balance            = sum(balance.mature_balance for balance in merchant_account_balance if balance.mature_balance is not None)
-            total_merchant_immature_balance          = sum(balance.immature_balance for balance in merchant_account_balance if balance.immature_balance is not None)
-            total_merchant_pending_withdrawal_amount = sum(pending.amount for pending in merchant_pending_withdrawal_requests)
-
             combined_data = []
 
             # Store data inside a list
             combined_data.append({
                 'merchant_refunds': [{
-                    'currency': currency_name.name,
-                    'amount':   total_merchant_refunds
+                    'currency': currency,
+                    'amount':   stats['merchant_refunds']
                 }],
                 'merchant_account_balance': [{
-                    'currency': currency_name.name,
-                    'amount':   total_merchant_account_balance
+                    'currency': currency,
+                    'amount':   stats['merchant_account_balance']
                 }],
                 'merchant_mature_balance': [{
-                    'currency': currency_name.name,
-                    'amount':   total_merchant_mature_balance
+                    'currency': currency,
+                    'amount':   stats['merchant_mature_balance']
                 }],
                 'merchant_immature_balance': [{
-                    'currency': currency_name.name,
-                    'amount':   total_merchant_immature_balance
+                    'currency': currency,
+                    'amount':   stats['merchant_immature_balance']
                 }],
                 'merchant_withdrawals': [{
-                    'currency': currency_name.name,
-                    'amount':   total_merchant_withdrawals
+                    'currency': currency,
+                    'amount':   stats['merchant_withdrawals']
                 }],
                 'merchant_pending_withdrawals': [{
-                    'currency': currency_name.name,
-                    'amount':   total_merchant_pending_withdrawal_amount
+                    'currency': currency,
+                    'amount':   stats['merchant_pending_withdrawals']
                 }],
             })
             
@@ -162,7 +110,7 @@ async def get_merchantRecentTransactions(request: Request):
             - HTTPStatus: 500 Internal Server Error if an error occurs.<br/>
     """
     try:
-        async with AsyncSession(async_engine) as session:
+        async with session_for('dashboard') as session:
             user_identity = request.identity
             user_id       = user_identity.claims.get('user_id') if user_identity else None
 
@@ -201,14 +149,16 @@ async def get_merchantRecentTransactions(request: Request):
 # Merchant dashboard success transaction and withdrawal transaction chart
 @auth('userauth')
 @get('/api/v6/merchant/dash/transaction/withdrawal/refund/chart/')
-async def merchant_dashboardTransactionWithdrawalChart(request: Request, currency: str = None):
+async def merchant_dashboardTransactionWithdrawalChart(request: Request, currency: str = None, bucket: str = None, periods: int = 12):
     """
         This function retrieves and calculates the total amounts of success transactions, withdrawals, and refunds for a merchant.
         It can filter the results based on a specified currency.<br/><br/>
 
         Parameters:<br/>
             - request (Request): The request object containing user identity and other relevant information.<br/>
-            - currency (str, optional): The currency for which the transactions need to be filtered. If not provided, all currencies are considered.<br/><br/>
+            - currency (str, optional): The currency for which the transactions need to be filtered. If not provided, all currencies are considered.<br/>
+            - bucket (str, optional): day, week or month, adds the amounts and counts per bucket(series).<br/>
+            - periods (int, optional): Number of buckets in the series. Default is 12.<br/><br/>
 
         Returns:<br/>
             - JSON response containing the total amounts of success transactions, withdrawals, and refunds.<br/>
@@ -216,93 +166,24 @@ async def merchant_dashboardTransactionWithdrawalChart(request: Request, currenc
 
         Error Messages:<br/>
             Error response status 500 - 'error': 'Server error'.<br/>
-            Error response status 400 - 'error': 'Invalid request data'.<br/><br/>
+            Error response status 400 - 'message': 'Invalid bucket'.<br/><br/>
 
         Raises:<br/>
             - Exception: If any error occurs during the database operations or processing.<br/>
     """
     try:
-        async with AsyncSession(async_engine) as session:
+        async with session_for('dashboard') as session:
             # Authenticate user
             user_identity = request.identity
             user_id       = user_identity.claims.get('user_id')
 
-            if currency:
-                # Get the Currency ID
-                currency_obj = await session.execute(select(Currency).where(
-                    Currency.name == currency
-                ))
-                req_currency = currency_obj.scalar()
-
-                # Get all the merchant success transactions
-                merchant_success_transactions_obj = await session.execute(select(MerchantProdTransaction).where(
-                    and_(
-                        MerchantProdTransaction.merchant_id == user_id,
-                        MerchantProdTransaction.status      == 'PAYMENT_SUCCESS',
-                        MerchantProdTransaction.currency    == req_currency.name
-                    )
-                ))
-                merchant_success_transaction = merchant_success_transactions_obj.scalars().all()
-
-                # Get all the merchant withdrawals
-                merchant_success_withdrawals_obj = await session.execute(select(MerchantWithdrawals).where(
-                    and_(
-                        MerchantWithdrawals.merchant_id == user_id,
-                        MerchantWithdrawals.status == 'Approved',
-                        MerchantWithdrawals.currency == req_currency.id
-                    )
-                ))
-                merchant_success_withdrawals = merchant_success_withdrawals_obj.scalars().all()
-
-                # Get all the merchant success Refunds
-                merchant_success_refund_obj = await session.execute(select(MerchantRefund).where(
-                    and_(
-                        MerchantRefund.merchant_id == user_id,
-                        MerchantRefund.is_completed == True,
-                        MerchantRefund.currency     == req_currency.id
-                    )
-                ))
-                merchant_success_refunds = merchant_success_refund_obj.scalars().all()
-
-            else:
-                # Get all the merchant success transactions
-                merchant_success_transactions_obj = await session.execute(select(MerchantProdTransaction).where(
-                    and_(
-                        MerchantProdTransaction.merchant_id == user_id,
-                        MerchantProdTransaction.status      == 'PAYMENT_SUCCESS'
-                    )
-                ))
-                merchant_success_transaction = merchant_success_transactions_obj.scalars().all()
-
-                # Get all the merchant withdrawals
-                merchant_success_withdrawals_obj = await session.execute(select(MerchantWithdrawals).where(
-                    and_(
-                        MerchantWithdrawals.merchant_id == user_id,
-                        MerchantWithdrawals.status == 'Approved'
-                    )
-                ))
-                merchant_success_withdrawals = merchant_success_withdrawals_obj.scalars().all()
-
-                # Get all the merchant success Refunds
-                merchant_success_refund_obj = await session.execute(select(MerchantRefund).where(
-                    and_(
-                        MerchantRefund.merchant_id == user_id,
-                        MerchantRefund.is_completed == True
-                    )
-                ))
-                merchant_success_refunds = merchant_success_refund_obj.scalars().all()
-
-
-            total_success_transaction_amount    = sum(transaction.amount for transaction in merchant_success_transaction)
-            total_withdrawal_transaction_amount = sum(withdrawal.amount for withdrawal in merchant_success_withdrawals)
-            total_refund_transaction_amount     = sum(refund.amount for refund in merchant_success_refunds)
-
-
-            return json({
-                'success_transaction': total_success_transaction_amount,
-                'withdrawal_amount': total_withdrawal_transaction_amount,
-                'refund_amount': total_refund_transaction_amount
-            }, 200)
+            if bucket and bucket not in BUCKETS:
+                return json({'message': 'Invalid bucket'}, 400)
+
+            # Totals, and amounts per bucket when asked, in one statement
+            chart_data = await merchant_chart(session, user_id, currency, bucket, max(1, min(periods, 366)))
+
+            return json(chart_data, 200)
 
     except Exception as e:
         return json({'error': 'Server error', 'message': f'{str(e)}'}, 500)
@@ -2,7 +2,8 @@ from blacksheep import json, Request, FromJSON
 from blacksheep.server.controllers import APIController
 from blacksheep.server.authorization import auth
 from database.db import AsyncSession, async_engine
-from app.auth import update_merchant_secret_key, generate_merchant_unique_public_key
+from app.auth import update_merchant_secret_key, invalidate_merchant_keys
+from app.generateID import generate_public_token
 from app.controllers.controllers import get
 from sqlmodel import select, and_
 from Models.models import HashValue, UserKeys, Users
@@ -83,10 +84,11 @@ class GenerateMerchantSecretKey(APIController):
                 
                 #Get The secret key
                 secret_key = merchant_key.secret_key
+                public_key = merchant_key.public_key
 
                 #Generate new public and secret key
                 new_secret_key = await update_merchant_secret_key(merchant_key.user_id, secret_key)
-                new_public_key = await generate_merchant_unique_public_key()
+                new_public_key = generate_public_token()
 
                 merchant_key.secret_key = new_secret_key
                 merchant_key.public_key = new_public_key
@@ -96,6 +98,9 @@ class GenerateMerchantSecretKey(APIController):
                 await session.commit()
                 await session.refresh(merchant_key)
 
+                # Old keys must stop resolving from the payment cache
+                invalidate_merchant_keys(public_key=public_key, secret_key=secret_key)
+
                 return json({'msg': 'Key generated successfully', 'data': merchant_key}, 200)
 
         except Exception as e:
@@ -8,10 +8,11 @@ from Models.models import Users,Kycdetails, Group
 from Models.schemas import UpdateKycSchema
 from app.controllers.controllers import get, post, put, delete
 from sqlalchemy.exc import SQLAlchemyError
-from sqlmodel import select, desc, func
+from sqlmodel import select
 from decouple import config
 from datetime import datetime
 from pathlib import Path
+from app.pagination import PageRequest, paginate
 import uuid
 
 
@@ -70,9 +71,9 @@ class MerchantKYCController(APIController):
     
     
     #Get all user data by Admin
-    @auth('userauth')
+    @auth('admin')
     @get()
-    async def get_Merchantkyc(self, request: Request, limit: int = 15, offset: int = 0):
+    async def get_Merchantkyc(self, request: Request, limit: int = 15, offset: int = 0, cursor: str | None = None, total: str = 'exact'):
         """
             This API Endpoint retrieves merchant KYC data and user details, with admin authentication and
             error handling.<br/><br/>
@@ -80,11 +81,14 @@ class MerchantKYCController(APIController):
             Parameter:<br/>
                 - request(Request): The HTTP request object.<br/>
                 - limit(int, optional): The maximum number of results to return in a single request.<br/>
-                - offset(int, optional): The starting point from where the data should be retrieved.<br/><br/>
+                - offset(int, optional): The starting point from where the data should be retrieved.<br/>
+                - cursor(str, optional): The next_cursor of the previous page, used instead of offset.<br/>
+                - total(str, optional): exact, estimated or none. Default is exact.<br/><br/>
 
             Returns:<br/>
                 - JSON response containing all the KYC details and user details for the merchants.<br/>
                 - 'total_row_count': The total number of available KYC details and user details for the merchants.<br/>
+                - 'next_cursor': Cursor of the next page, null on the last page.<br/>
                 - 'all_Kyc': List of KYC details for all merchant users.<br/>
                 - 'all_users': List of details for all merchant users.<br/><br/>
 
@@ -94,40 +98,23 @@ class MerchantKYCController(APIController):
                 - Unauthorized: If the user is not authenticated.<br/>
         """
         try:
-            async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                user_id       = user_identity.claims.get('user_id') if user_identity else None
-                
-                # Admin Authnetication
-                try:
-                    user_object      = select(Users).where(Users.id == user_id)
-                    save_to_db       = await session.execute(user_object)
-                    user_object_data = save_to_db.scalar()
-
-                    if user_object_data.is_admin == False:
-                        return json({'msg': 'Only admin can view all the KYC'}, 400)
-                    
-                except Exception as e:
-                    return json({'msg': 'Unable to get Admin detail','error': f'{str(e)}'}, 400)
-                #Authentication ends
-
-                # Count all available rows
-                count_stmt = select(func.count(Users.id)).where(Users.is_merchent == True)
-                execute_statement = await session.execute(count_stmt)
-                total_available_user_row_obj = execute_statement.scalar()
-
-                total_user_row_count = total_available_user_row_obj / limit
+            page_request = PageRequest(limit, offset, cursor, total)
+        except ValueError as e:
+            return json({'msg': 'Invalid pagination', 'error': str(e)}, 400)
 
+        try:
+            async with AsyncSession(async_engine) as session:
                 user_data = []
                 kyc_data  = []
 
-                # Get all Merchant Data
-                all_merchant_user_obj = await session.execute(select(Users).where(
-                    Users.is_merchent == True
-                ).order_by(
-                    desc(Users.id)).limit(limit).offset(offset)
+                # Get all Merchant Data, users have no creation time so the cursor is the id
+                page = await paginate(
+                    session,
+                    select(Users).where(Users.is_merchent == True),
+                    page_request,
+                    Users.id
                 )
-                all_merchant_user_ = all_merchant_user_obj.scalars().all()
+                all_merchant_user_ = page.scalars()
 
                 if not all_merchant_user_:
                     return json({
@@ -197,7 +184,8 @@ class MerchantKYCController(APIController):
                 return json({
                     'all_Kyc': kyc_data if kyc_data else [],
                     'all_users': user_data if user_data else [],
-                    'total_row_count': total_user_row_count
+                    'total_row_count': page.page_count,
+                    'next_cursor': page.next_cursor
                     }, 200)
             
         except Exception as e:
@@ -333,7 +321,7 @@ class MerchantKYCController(APIController):
 
         
     # Update Kyc data by Admin
-    @auth('userauth')
+    @auth('admin')
     @put()
     async def update_kyc(self, request: Request, update_kyc: UpdateKycSchema):
         """
@@ -365,20 +353,6 @@ class MerchantKYCController(APIController):
                 user_identity = request.identity
                 user_id       = user_identity.claims.get('user_id') if user_identity else None
 
-                # Admin authentication ends here
-                try:
-                    user_object      = select(Users).where(Users.id == user_id)
-                    save_to_db       = await session.execute(user_object)
-
-                    user_object_data = save_to_db.scalar()
-
-                    if user_object_data.is_admin == False:
-                        return json({'msg': 'Only Admin can update the Kyc'}, 400)
-                    
-                except Exception as e:
-                    return json({'msg': f'{str(e)}'})
-                #Authentication ends here
-
                 try:
                     stmt       = select(Kycdetails).where(Kycdetails.id == update_kyc.kyc_id)
                     result     = await session.execute(stmt)
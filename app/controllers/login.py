@@ -5,7 +5,8 @@ from database.db import async_engine, AsyncSession
 from Models.models import Users, Kycdetails
 from blacksheep import Request, json
 from sqlalchemy.exc import SQLAlchemyError
-from app.auth import generate_access_token, generate_refresh_token, decode_token ,check_password ,encrypt_password
+from app.auth import generate_access_token, generate_refresh_token, decode_token
+from app.passwords import verify_user_password
 from datetime import datetime
 from app.controllers.controllers import get, post, put, delete
 
@@ -50,7 +51,7 @@ class UserLoginController(APIController):
                 first_user = existing_user.scalars().first()
                 
                 # Password validation
-                if first_user and check_password(user.password,first_user.password):
+                if first_user and await verify_user_password(session, first_user, user.password):
 
                     if not first_user.is_merchent:
                         return json({'message': 'Only PG users allowed'}, 400)
@@ -100,7 +101,7 @@ class UserLoginController(APIController):
                         response = json({
                             'is_merchant': first_user.is_merchent,
                             'user_name': first_user.full_name,
-                            'access_token': generate_access_token(first_user.id),
+                            'access_token': generate_access_token(first_user.id, first_user),
                             'refresh_token': generate_refresh_token(first_user.id)
                         },200)
 
@@ -2,14 +2,18 @@ from app.controllers.controllers import get, post
 from blacksheep.server.controllers import APIController
 from blacksheep import Request, json
 from blacksheep.server.authorization import auth
-from database.db import AsyncSession, async_engine
+from database.db import AsyncSession, async_engine, session_for
 from Models.models3 import MerchantRefund
 from Models.models2 import MerchantProdTransaction
 from Models.models import Currency
 from Models.PG.schema import MerchantCreateRefundSchema, FilterMerchantRefundSchema
-from sqlmodel import select, and_, desc, func, cast, Date, Time, or_
+from sqlmodel import select, and_, desc, func
 from blacksheep import get as GET
 from datetime import datetime, timedelta
+from app.export import export_query
+from app.pagination import PageRequest, paginate
+from app.search import SearchTerms, merchant_refund_predicates, search
+from app.dashboard import BUCKETS, merchant_refund_chart
 import calendar
 
 
@@ -151,19 +155,22 @@ class MerchantRaiseRefund(APIController):
     # Get all the Merchant Refunds
     @auth('userauth')
     @get()
-    async def get_merchantRefunds(self, request: Request, limit: int = 10, offset: int = 0):
+    async def get_merchantRefunds(self, request: Request, limit: int = 10, offset: int = 0, cursor: str | None = None, total: str = 'exact'):
         """
             This API Endpoint retrieves merchant refunds based on the user's identity, with pagination support and error handling.<br/><br/>
 
             Parameters:<br/>
                - request: The HTTP Request object.<br/>
                - limit(int, optional): The maximum number of refund requests to retrieve in a single query. Defaults to 10.<br/>
-               - offset(int, optional): The starting point from which to retrieve data. Defaults to 0.<br/><br/>
+               - offset(int, optional): The starting point from which to retrieve data. Defaults to 0.<br/>
+               - cursor(str, optional): The next_cursor of the previous page, used instead of offset.<br/>
+               - total(str, optional): exact, estimated or none. Defaults to exact.<br/><br/>
 
             Returns:<br/>
                 JSON: A JSON response containing the following keys and values:<br/>
                 - 'total_count': The total number of refund requests retrieved based on the limit and offset.<br/>
                 - 'merchant_refunds': A list of dictionaries, each containing details of a refund request.<br/>
+                - 'next_cursor': Cursor of the next page, null on the last page.<br/>
                 -'success': A boolean indicating whether the operation was successful.<br/><br/>
 
             Raise:<br/>
@@ -172,24 +179,17 @@ class MerchantRaiseRefund(APIController):
                 HTTPException: 500 for any server-side errors.<br/>
                 HTTPException: 404 if the refund transaction does not exist.<br/>
         """
+        try:
+            page_request = PageRequest(limit, offset, cursor, total)
+        except ValueError as e:
+            return json({"message": str(e)}, 400)
+
         try:
             async with AsyncSession(async_engine) as session:
                 user_identity = request.identity
                 user_id = user_identity.claims.get('user_id')
 
                 combined_data = []
-
-                if limit < 0 or offset < 0:
-                    return json({"message": "limit and offset value can not be negative"}, 400)
-                
-                # Count total rows
-                count_stmt = select(func.count(MerchantRefund.id)).where(
-                    MerchantRefund.merchant_id == user_id
-                )
-                total_rows_obj = await session.execute(count_stmt)
-                total_rows = total_rows_obj.scalar()
-
-                total_rows_count = total_rows / limit
                 
                 # Get all the refund made by the merchant
                 stmt = select(MerchantRefund.id,
@@ -213,12 +213,14 @@ class MerchantRaiseRefund(APIController):
                                   MerchantProdTransaction, MerchantProdTransaction.id == MerchantRefund.transaction_id
                               ).where(
                                   MerchantRefund.merchant_id == user_id
-                              ).order_by(
-                                  desc(MerchantRefund.id)
-                              ).limit(limit).offset(offset)
+                              )
                 
-                merchant_refunds_obj = await session.execute(stmt)
-                merchant_refunds = merchant_refunds_obj.fetchall()
+                page = await paginate(
+                    session, stmt, page_request,
+                    MerchantRefund.id, MerchantRefund.createdAt,
+                    count_statement = select(MerchantRefund.id).where(MerchantRefund.merchant_id == user_id)
+                )
+                merchant_refunds = page.rows
 
                 if not merchant_refunds:
                     return json({'message': 'No refund requests available'}, 404)
@@ -240,7 +242,7 @@ class MerchantRaiseRefund(APIController):
                         'status': refunds.status
                     })
 
-                return json({'success': True, 'total_count': total_rows_count, 'merchant_refunds': combined_data}, 200)
+                return json({'success': True, 'total_count': page.page_count, 'merchant_refunds': combined_data, 'next_cursor': page.next_cursor}, 200)
 
         except Exception as e:
             return json({'error': 'Server Error', 'message': f'{str(e)}'}, 500)
@@ -256,10 +258,14 @@ async def download_refunds(self, request: Request):
         Admin authentication is required to access this endpoint.<br/><br/>
 
         Parameters:<br/>
-            - request (Request): The incoming HTTP request.<br/><br/>
+            - request (Request): The incoming HTTP request.<br/>
+            - format (query): json (default), csv or ndjson.<br/>
+            - columns (query): Comma separated columns to export.<br/>
+            - date_from, date_to (query): Inclusive YYYY-MM-DD date range, or date_range (Today, ThisWeek, ThisMonth...).<br/><br/>
 
         Returns:<br/>
            JSON: A JSON response containing the list of Merchant Refund Transactions.<br/>
+           The rows are streamed from the database in chunks, CSV and NDJSON are sent as file attachments.<br/>
             - `success`(boolean): The transaction succuess status.<br/>
             - `export_merchant_refunds`(list): The list of Merchant Refund Transactions.<br/><br/>
 
@@ -275,51 +281,37 @@ async def download_refunds(self, request: Request):
             - Error 404: 'error': 'No refund requests available'.<br/>
     """
     try:
-        async with AsyncSession(async_engine) as session:
+        async with session_for('export') as session:
             # Authenticate user
             user_identity = request.identity
             user_id       = user_identity.claims.get('user_id') if user_identity else None
 
-            combined_data = []
-
             # Get all the refund made by the merchant
-            stmt = select(MerchantRefund.id,
-                            MerchantRefund.instant_refund,
-                            MerchantRefund.instant_refund_amount,
-                            MerchantRefund.amount,
-                            MerchantRefund.comment,
-                            MerchantRefund.createdAt,
-                            MerchantRefund.status,
-                            Currency.name.label('currency_name'),
-                            MerchantProdTransaction.transaction_id,
-                            MerchantProdTransaction.currency.label('transaction_currency'),
-                            MerchantProdTransaction.amount.label('transaction_amount'),
-                            ).join(
-                                Currency, Currency.id == MerchantRefund.currency
-                            ).join(
-                                MerchantProdTransaction, MerchantProdTransaction.id == MerchantRefund.transaction_id
-                            ).where(
-                                MerchantRefund.merchant_id == user_id
-                            )
-            
-            merchant_refunds_obj = await session.execute(stmt)
-            merchant_refunds = merchant_refunds_obj.fetchall()
-
-            if not merchant_refunds:
-                return json({'message': 'No refund requests available'}, 404)
-            
-            for refunds in merchant_refunds:
-                combined_data.append({
-                    'refund_amount': refunds.amount,
-                    "refund_currency": refunds.currency_name,
-                    'transaction_amount': refunds.transaction_amount,
-                    "transaction_currency": refunds.transaction_currency,
-                    'transaction_id': refunds.transaction_id,
-                    'time': refunds.createdAt,
-                    'status': refunds.status
-                })
+            stmt = select(
+                MerchantRefund.amount.label('refund_amount'),
+                Currency.name.label('refund_currency'),
+                MerchantProdTransaction.amount.label('transaction_amount'),
+                MerchantProdTransaction.currency.label('transaction_currency'),
+                MerchantProdTransaction.transaction_id,
+                MerchantRefund.createdAt.label('time'),
+                MerchantRefund.status
+            ).join(
+                Currency, Currency.id == MerchantRefund.currency
+            ).join(
+                MerchantProdTransaction, MerchantProdTransaction.id == MerchantRefund.transaction_id
+            ).where(
+                MerchantRefund.merchant_id == user_id
+            ).order_by(
+                desc(MerchantRefund.id)
+            )
 
-            return json({'success': True, 'export_merchant_refunds': combined_data}, 200)
+            return await export_query(
+                request, session, stmt,
+                root_key       = 'export_merchant_refunds',
+                filename       = 'merchant_refunds',
+                date_column    = MerchantRefund.createdAt,
+                empty_response = json({'message': 'No refund requests available'}, 404)
+            )
         
     except Exception as e:
         return json({'error': 'Server Error', 'message': f'{str(e)}'}, 500)
@@ -330,13 +322,18 @@ async def download_refunds(self, request: Request):
 # Search Merchant Refunds
 @auth('userauth')
 @GET('/api/v6/merchant/search/refunds/')
-async def search_merchant_refunds(request: Request, query: str):
+async def search_merchant_refunds(request: Request, query: str, limit: int = 10, offset: int = 0, total: str = 'exact'):
     """
-        Search Merchant Refund Transactions.<br/><br/>
+        Search Merchant Refund Transactions.<br/>
+        The query is matched against the transaction id, amount, currency, status, date and time
+        in one query, best matches first.<br/><br/>
 
         Parameters:<br/>
             query (str): Search query for refund details.<br/>
-            request (Request): HTTP request object.<br/><br/>
+            request (Request): HTTP request object.<br/>
+            limit (int, optional): The maximum number of refunds to return. Defaults to 10.<br/>
+            offset (int, optional): The number of refunds to skip. Defaults to 0.<br/>
+            total (str, optional): exact, estimated or none. Defaults to exact.<br/><br/>
 
         Returns:<br/>
             JSON: A JSON response containing the following keys:<br/>
@@ -359,76 +356,12 @@ async def search_merchant_refunds(request: Request, query: str):
     user_id       = user_identity.claims.get('user_id')
 
     try:
-        async with AsyncSession(async_engine) as session:
-
-            search_query = query
-            conditions = []
-            query_date = None
-            query_time = None
-
-            try:
-                query_date = datetime.strptime(search_query, "%d %B %Y").date()
-            except ValueError:
-                pass
-
-            try:
-                query_time = datetime.strptime(search_query, "%H:%M:%S.%f").time()
-            except ValueError:
-                pass
-
-            try:
-                query_as_float = float(query)  # If query is a number, try to convert
-            except ValueError:
-                query_as_float = None
-
-            # Search transaction Id wise
-            merchant_transaction_obj = await session.execute(select(MerchantProdTransaction).where(
-                and_(
-                    MerchantProdTransaction.transaction_id == search_query,
-                    MerchantProdTransaction.merchant_id == user_id
-                    )
-            ))
-            merchant_transaction = merchant_transaction_obj.scalars().all()
-
-            # Search Transaction Amount wise
-            merchant_refund_amount_obj = await session.execute(select(MerchantRefund).where(
-                and_(
-                    MerchantRefund.amount == query_as_float,
-                    MerchantRefund.merchant_id == user_id
-                    )
-                ))
-            merchant_refund_amount = merchant_refund_amount_obj.scalars().all()
-
-            # Search currency wise
-            currency_obj = await session.execute(select(Currency).where(
-                Currency.name == search_query
-            ))
-            currency = currency_obj.scalar()
-
-
-            # Search transaction status wise
-            merchant_refund_status_obj = await session.execute(select(MerchantRefund).where(
-                and_(
-                    MerchantRefund.status == search_query,
-                    MerchantRefund.merchant_id == user_id
-                    )
-                ))
-            merchant_refund_status = merchant_refund_status_obj.scalars().all()
-
-
-            # # Search Transaction by Date
-            # merchant_refund_date_obj = await session.execute(select(MerchantProdTransaction).where(
-            #     cast(MerchantRefund.createdAt, Date) == query_date
-            #         ))
-            # merchant_refund_date = merchant_refund_date_obj.scalars().all()
-
-
-            # Search Transaction by Time
-            # merchant_refund_time_obj = await session.execute(select(MerchantProdTransaction).where(
-            #         cast(MerchantRefund.createdAt, Time) == query_time
-            #     ))
-            # merchant_refund_time = merchant_refund_time_obj.scalars().all()
+        page_request = PageRequest(limit, offset, total=total)
+    except ValueError as e:
+        return json({'error': 'Bad Request', 'message': str(e)}, 400)
 
+    try:
+        async with session_for('search') as session:
 
             # Build the main query with joins
             stmt = select(
@@ -452,34 +385,16 @@ async def search_merchant_refunds(request: Request, query: str):
                 MerchantProdTransaction, MerchantProdTransaction.id == MerchantRefund.transaction_id
             ).where(
                 MerchantRefund.merchant_id == user_id
-            ).order_by(
-                desc(MerchantRefund.id)
             )
 
-            # Add conditions
-            if merchant_transaction:
-                conditions.append(MerchantRefund.transaction_id.in_([transaction.id for transaction in merchant_transaction]))
-
-            elif merchant_refund_amount:
-                conditions.append(MerchantRefund.amount == query_as_float)
-
-            elif currency:
-                conditions.append(MerchantRefund.currency == currency.id)
-
-            elif merchant_refund_status:
-                conditions.append(MerchantRefund.status == search_query)
-
-            elif query_date:
-                conditions.append(cast(MerchantRefund.createdAt, Date) == query_date)
-
-            elif query_time:
-                conditions.append(cast(MerchantRefund.createdAt, Time) == query_time)
-
-            if conditions:
-                stmt = stmt.where(or_(*conditions))
-
-            merchant_refunds_object = await session.execute(stmt)
-            merchant_refunds        = merchant_refunds_object.all()
+            # Search every field in one query
+            page = await search(
+                session, stmt,
+                merchant_refund_predicates(SearchTerms(query)),
+                page_request,
+                [MerchantRefund.createdAt, MerchantRefund.id]
+            )
+            merchant_refunds = page.rows
 
             merchant_refunds_data = []
 
@@ -497,7 +412,7 @@ async def search_merchant_refunds(request: Request, query: str):
                     'status': refunds.status
                 })
 
-            return json({'success': True, 'searched_merchant_refunds': merchant_refunds_data}, 200)
+            return json({'success': True, 'searched_merchant_refunds': merchant_refunds_data, 'total_refunds': page.total}, 200)
         
     except Exception as e:
         return json({'error': 'Server Error', 'messsage': f'{str(e)}'}, 500)
@@ -510,15 +425,16 @@ async def search_merchant_refunds(request: Request, query: str):
 # Show all success refunds on Merchant dashboard chart
 @auth('userauth')
 @GET('/api/merchant/dash/refund/chart/')
-async def MerchantSuccessRefundChart(request: Request):
+async def MerchantSuccessRefundChart(request: Request, bucket: str = 'day'):
     """
-        Get all success refund transactions of merchant of current month.<br/><br/>
+        Get the success refund transactions of merchant of current month, summed per day, week or month.<br/><br/>
 
         Parameters:<br/>
-             - request (Request): The request object containing user identity and other relevant information.<br/><br/>
+             - request (Request): The request object containing user identity and other relevant information.<br/>
+             - bucket (str, optional): day, week or month. Default is day.<br/><br/>
 
         Returns:<br/>
-             - JSON: A JSON response containing the success status and the list of refund transactions(merchant_refunds).<br/>
+             - JSON: A JSON response containing the success status and the refund amount and count per bucket(merchant_refunds).<br/>
              - JSON: A JSON response containing error status and error message if any.<br/><br/>
 
         Raises:<br/>
@@ -529,24 +445,20 @@ async def MerchantSuccessRefundChart(request: Request):
             - Server Error: If an error occurs during the database operations.<br/>
     """
     try:
-        async with AsyncSession(async_engine) as session:
+        async with session_for('dashboard') as session:
             # Authnticate users
             user_identity = request.identity
             user_id       = user_identity.claims.get('user_id')
 
+            if bucket not in BUCKETS:
+                return json({'message': 'Invalid bucket'}, 400)
+
             now = datetime.now()
             start_of_month = datetime(now.year, now.month, 1)
             end_of_month = (start_of_month + timedelta(days=31)).replace(day=1) - timedelta(seconds=1)
 
-            # Get all the refunds of the user
-            merchantSuccessRefundsObject = await session.execute(select(MerchantRefund).where(
-                and_(MerchantRefund.merchant_id == user_id,
-                     MerchantRefund.is_completed == True,
-                     MerchantRefund.createdAt >= start_of_month,
-                     MerchantRefund.createdAt <= end_of_month
-                     )
-                ))
-            merchantSuccessRefunds = merchantSuccessRefundsObject.scalars().all()
+            # Sum the refunds of the user per bucket
+            merchantSuccessRefunds = await merchant_refund_chart(session, user_id, bucket, start_of_month, end_of_month)
 
             return json({'success': True, 'merchant_refunds': merchantSuccessRefunds}, 200)
 
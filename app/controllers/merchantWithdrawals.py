@@ -2,12 +2,16 @@ from blacksheep import Request, json, get as GET
 from blacksheep.server.controllers import APIController
 from blacksheep.server.authorization import auth
 from app.controllers.controllers import get, post
-from database.db import AsyncSession, async_engine
+from database.db import AsyncSession, async_engine, session_for
 from Models.models import MerchantBankAccount, Currency, Users
 from Models.models3 import MerchantWithdrawals
 from Models.models2 import MerchantAccountBalance
 from Models.PG.schema import CreateMerchantWithdrawlSchma, FilterWithdrawalTransactionSchema
 from sqlmodel import select, and_, desc, func
+from sqlalchemy.orm import aliased
+from app.export import export_query
+from app.pagination import PageRequest, paginate
+from app.enrichment import fetch_by_ids, fetch_currencies, fetch_users
 from datetime import timedelta, datetime
 import calendar
 
@@ -132,24 +136,32 @@ class MerchantWithdrawalController(APIController):
     # Get all the withdrawals
     @auth('userauth')
     @get()
-    async def get_merchantWithdrawals(self, request: Request, limit: int = 10, offset: int = 0):
+    async def get_merchantWithdrawals(self, request: Request, limit: int = 10, offset: int = 0, cursor: str | None = None, total: str = 'exact'):
         """
             This API Endpoint retrieve all the withdrawals raised by the merchant.<br/><br/>
             
             Parameters:<br/>
             request (Request): The request object containing user identity and other information.<br/>
             limit (int, optional): The number of withdrawals to retrieve per page. Default is 10.<br/>
-            offset (int, optional): The number of withdrawals to skip before starting to retrieve. Default is 0.<br/><br/>
+            offset (int, optional): The number of withdrawals to skip before starting to retrieve. Default is 0.<br/>
+            cursor (str, optional): The next_cursor of the previous page, used instead of offset.<br/>
+            total (str, optional): exact, estimated or none. Default is exact.<br/><br/>
             
             Returns:<br/>
                 JSON: A JSON response containing the success status, a list of withdrawal data(merchantWithdrawalRequests).<br/>
-                total_row_count (int): The total number of withdrawals available for the merchant.<br/><br/>    
+                total_row_count (int): The total number of withdrawals available for the merchant.<br/>
+                next_cursor (str): Cursor of the next page, null on the last page.<br/><br/>    
             
             Raises:<br/>
             - Exception: If any error occurs during the database query or response generation.<br/>
             - Error 404: 'error': 'error': 'No withdrawal request found' <br/>
             - Error 500: 'error': 'Server Error'.<br/>
         """
+        try:
+            page_request = PageRequest(limit, offset, cursor, total)
+        except ValueError as e:
+            return json({'error': 'Bad Request', 'message': str(e)}, 400)
+
         try:
             async with AsyncSession(async_engine) as session:
                 # Authenticate User
@@ -159,46 +171,28 @@ class MerchantWithdrawalController(APIController):
                 combined_data = []
 
                 # Get all the Withdrawal request raise by the merchant
-                merchantWithdrawalRequests = await session.execute(select(MerchantWithdrawals).where(
-                    MerchantWithdrawals.merchant_id == user_id
-                ).order_by(desc(MerchantWithdrawals.id)))
-                merchantWithdrawal = merchantWithdrawalRequests.scalars().all()
+                page = await paginate(
+                    session,
+                    select(MerchantWithdrawals).where(MerchantWithdrawals.merchant_id == user_id),
+                    page_request,
+                    MerchantWithdrawals.id, MerchantWithdrawals.createdAt
+                )
+                merchantWithdrawal = page.scalars()
 
                 if not merchantWithdrawal:
                     return json({'error': 'No withdrawal request found'}, 404)
-                
-                # Count total Rows
-                count_stmt            = select(func.count(MerchantWithdrawals.id)).where(MerchantWithdrawals.merchant_id == user_id)
-                total_withdrawals_obj = await session.execute(count_stmt)
-                total_withdrawal_rows = total_withdrawals_obj.scalar()
 
-                total_withdrawal_rows_count = total_withdrawal_rows / limit
+                # Bank accounts, currencies and merchant of the page
+                bank_accounts = await fetch_by_ids(session, MerchantBankAccount, [withdrawal.bank_id for withdrawal in merchantWithdrawal])
+                currencies    = await fetch_currencies(session, [id for withdrawal in merchantWithdrawal for id in (withdrawal.currency, withdrawal.bank_currency)])
+                users         = await fetch_users(session, [withdrawal.merchant_id for withdrawal in merchantWithdrawal])
 
 
                 for withdrawals in merchantWithdrawal:
-                    # Get the bank account linked to the merchant
-                    merchant_bank_account_obj = await session.execute(select(MerchantBankAccount).where(
-                        MerchantBankAccount.id == withdrawals.bank_id
-                    ))
-                    merchant_bank_account = merchant_bank_account_obj.scalar()
-
-                    # Get the withdrawal currency and Bank Currecy
-                    merchant_withdrawal_currency_obj = await session.execute(select(Currency).where(
-                        Currency.id == withdrawals.currency
-                    ))
-                    merchant_withdrawal_currency = merchant_withdrawal_currency_obj.scalar()
-
-                    # Get the merchant Bank Currency
-                    merchant_bank_currency_obj = await session.execute(select(Currency).where(
-                        Currency.id == withdrawals.bank_currency
-                    ))
-                    merchant_bank_currency = merchant_bank_currency_obj.scalar()
-
-                    # Get user Details
-                    merchant_user_obj = await session.execute(select(Users).where(
-                        Users.id == withdrawals.merchant_id
-                    ))
-                    merchant_user = merchant_user_obj.scalar()
+                    merchant_bank_account        = bank_accounts.get(withdrawals.bank_id)
+                    merchant_withdrawal_currency = currencies.get(withdrawals.currency)
+                    merchant_bank_currency       = currencies.get(withdrawals.bank_currency)
+                    merchant_user                = users.get(withdrawals.merchant_id)
 
 
                     combined_data.append({
@@ -216,7 +210,7 @@ class MerchantWithdrawalController(APIController):
                         'is_completed': withdrawals.is_completed
                     })
 
-                return json({'success': True,'total_row_count': total_withdrawal_rows_count, 'merchantWithdrawalRequests': combined_data}, 200)
+                return json({'success': True,'total_row_count': page.page_count, 'merchantWithdrawalRequests': combined_data, 'next_cursor': page.next_cursor}, 200)
 
         except Exception as e:
             return json({'error': 'Server Error', 'message': f'{str(e)}'}, 500)
@@ -327,10 +321,14 @@ async def ExportWithDrawals(request: Request):
         This API endpoint exports all the merchant withdrawal transactions by an authenticated user.<br/><br/>
 
         Parameters:<br/>
-            - request (Request): The HTTP request object containing identity and other relevant information.<br/><br/>
+            - request (Request): The HTTP request object containing identity and other relevant information.<br/>
+            - format (query): json (default), csv or ndjson.<br/>
+            - columns (query): Comma separated columns to export.<br/>
+            - date_from, date_to (query): Inclusive YYYY-MM-DD date range, or date_range (Today, ThisWeek, ThisMonth...).<br/><br/>
 
         Returns:<br/>
             - JSON: A JSON response containing the success status and the exported withdrawals data.<br/>
+            - The rows are streamed from the database in chunks, CSV and NDJSON are sent as file attachments.<br/>
             - JSON: A JSON response containing error status and error message if any.<br/><br/>
 
         Raises:<br/>
@@ -353,59 +351,43 @@ async def ExportWithDrawals(request: Request):
     user_id       = user_identity.claims.get('user_id')
 
     try:
-        async with AsyncSession(async_engine) as session:
+        async with session_for('export') as session:
+
+            MerchantCurrency = aliased(Currency)
+            BankCurrency     = aliased(Currency)
 
             # Get all the Withdrawal request raise by the merchant
-            merchantWithdrawalRequests = await session.execute(select(MerchantWithdrawals).where(
+            stmt = select(
+                Users.full_name.label('merchant_name'),
+                Users.email.label('merchant_email'),
+                MerchantBankAccount.bank_name.label('bank_account'),
+                MerchantBankAccount.acc_no.label('bank_account_number'),
+                BankCurrency.name.label('bankCurrency'),
+                MerchantWithdrawals.amount.label('withdrawalAmount'),
+                MerchantCurrency.name.label('withdrawalCurrency'),
+                MerchantWithdrawals.createdAt.label('time'),
+                MerchantWithdrawals.status
+            ).join(
+                Users, Users.id == MerchantWithdrawals.merchant_id
+            ).join(
+                MerchantBankAccount, MerchantBankAccount.id == MerchantWithdrawals.bank_id
+            ).join(
+                MerchantCurrency, MerchantCurrency.id == MerchantWithdrawals.currency
+            ).join(
+                BankCurrency, BankCurrency.id == MerchantWithdrawals.bank_currency
+            ).where(
                 MerchantWithdrawals.merchant_id == user_id
-            ).order_by(desc(MerchantWithdrawals.id)))
-            merchantWithdrawal = merchantWithdrawalRequests.scalars().all()
-
-            if not merchantWithdrawal:
-                return json({'error': 'No withdrawal request found'}, 404)
-            
-            combined_data = []
-
-
-            for withdrawals in merchantWithdrawal:
-                # Get the bank account linked to the merchant
-                merchant_bank_account_obj = await session.execute(select(MerchantBankAccount).where(
-                    MerchantBankAccount.id == withdrawals.bank_id
-                ))
-                merchant_bank_account = merchant_bank_account_obj.scalar()
-
-                # Get the withdrawal currency and Bank Currecy
-                merchant_withdrawal_currency_obj = await session.execute(select(Currency).where(
-                    Currency.id == withdrawals.currency
-                ))
-                merchant_withdrawal_currency = merchant_withdrawal_currency_obj.scalar()
-
-                # Get the merchant Bank Currency
-                merchant_bank_currency_obj = await session.execute(select(Currency).where(
-                    Currency.id == withdrawals.bank_currency
-                ))
-                merchant_bank_currency = merchant_bank_currency_obj.scalar()
-
-                # Get user Details
-                merchant_user_obj = await session.execute(select(Users).where(
-                    Users.id == withdrawals.merchant_id
-                ))
-                merchant_user = merchant_user_obj.scalar()
-
-
-                combined_data.append({
-                    'merchant_name': merchant_user.full_name,
-                    'merchant_email': merchant_user.email,
-                    'bank_account': merchant_bank_account.bank_name,
-                    'bank_account_number': merchant_bank_account.acc_no,
-                    'bankCurrency': merchant_bank_currency.name,
-                    'withdrawalAmount': withdrawals.amount,
-                    'withdrawalCurrency': merchant_withdrawal_currency.name,
-                    'time': withdrawals.createdAt,
-                    'status':   withdrawals.status,
-                })
-
-            return json({'success': True,'ExportmerchantWithdrawalRequests': combined_data}, 200)
+            ).order_by(
+                desc(MerchantWithdrawals.id)
+            )
+
+            return await export_query(
+                request, session, stmt,
+                root_key       = 'ExportmerchantWithdrawalRequests',
+                filename       = 'merchant_withdrawals',
+                date_column    = MerchantWithdrawals.createdAt,
+                empty_response = json({'error': 'No withdrawal request found'}, 404)
+            )
                         
     except Exception as e:
         return json({'error': 'Server Error', 'message': f'{str(e)}'}, 500)
@@ -6,6 +6,7 @@ from database.db import AsyncSession, async_engine
 from Models.models2 import MerchantSandBoxSteps
 from Models.models import BusinessProfile, MerchantBankAccount, UserKeys
 from sqlmodel import select
+from app.auth import invalidate_merchant_keys
 
 
 
@@ -104,6 +105,8 @@ class MerchantSandBoxCompletionSteps(APIController):
                             await session.commit()
                             await session.refresh(user_keys)
 
+                            invalidate_merchant_keys(public_key=user_keys.public_key)
+
                         
                     # Save into DB
                     session.add(merchant_sb_step)
@@ -164,6 +167,8 @@ class MerchantSandBoxCompletionSteps(APIController):
                             session.add(user_keys)
                             await session.commit()
                             await session.refresh(user_keys)
+
+                            invalidate_merchant_keys(public_key=user_keys.public_key)
                     else: 
                         merchant_steps.is_completed = False
 
@@ -1,13 +1,16 @@
 from blacksheep.server.controllers import APIController
 from blacksheep import Request, json
 from blacksheep.server.authorization import auth
-from database.db import AsyncSession, async_engine
+from database.db import AsyncSession, async_engine, session_for
 from app.controllers.controllers import get, post
 from Models.models2 import MerchantProdTransaction, MerchantSandBoxTransaction
-from sqlmodel import select, and_, desc, cast, Time, Date, func, extract
+from sqlmodel import select, and_, desc, func
 from datetime import datetime, timedelta
 import calendar
 from Models.PG.schema import FilterTransactionSchema
+from app.export import export_query
+from app.pagination import PageRequest, paginate
+from app.search import SearchTerms, merchant_transaction_predicates, search
 
 
 
@@ -26,7 +29,7 @@ class MerchantProductionTransactions(APIController):
    
     @auth('userauth')
     @get()
-    async def get_transactions(self, request: Request, limit: int = 10, offset: int = 0):
+    async def get_transactions(self, request: Request, limit: int = 10, offset: int = 0, cursor: str | None = None, total: str = 'exact'):
         """
             This API Endpoint retrieves PG transactions for a specific merchant and returns them in a
             paginated format.<br/><br/>
@@ -34,13 +37,16 @@ class MerchantProductionTransactions(APIController):
             Parameters:<br/>
                  - request(Request): The HTTP request object containing identity and other relevant information.<br/>
                  - limit(int, optional): The maximum number of transactions to retrieve per page. Default is 10.<br/>
-                 - offset(int, optional): The number of transactions to skip before starting to retrieve logs. Default is 0.<br/><br/>
+                 - offset(int, optional): The number of transactions to skip before starting to retrieve logs. Default is 0.<br/>
+                 - cursor(str, optional): The next_cursor of the previous page, used instead of offset.<br/>
+                 - total(str, optional): exact, estimated or none. Default is exact.<br/><br/>
 
             Returns:<br/>
                 - JSON response containing the following keys:<br/>
                 - success(bool): A boolean indicating whether the operation was successful.<br/>
                 - merchant_prod_trasactions(list): A list of dictionaries, each representing a transaction.<br/>
-                - total_rows(int): The total number of transactions available for the merchant.<br/><br/>
+                - total_rows(int): The total number of transactions available for the merchant.<br/>
+                - next_cursor(str): Cursor of the next page, null on the last page.<br/><br/>
 
             Raises:<br/>
                 - Exception: If any error occurs during the database query or response generation.<br/>
@@ -50,29 +56,27 @@ class MerchantProductionTransactions(APIController):
         user_identity = request.identity
         user_id       = user_identity.claims.get('user_id') if user_identity else None
 
+        try:
+            page_request = PageRequest(limit, offset, cursor, total)
+        except ValueError as e:
+            return json({'error': 'Bad Request', 'msg': str(e)}, 400)
+
         try:
             async with AsyncSession(async_engine) as session:
 
                 combined_data = []
 
                 # fetch all the transactions
-                merchant_transactions_object = await session.execute(select(MerchantProdTransaction).where(
-                    MerchantProdTransaction.merchant_id == user_id
-                ).order_by(desc(MerchantProdTransaction.id)).limit(limit).offset(offset)
-            )
-                merchant_transactions = merchant_transactions_object.scalars().all()
+                page = await paginate(
+                    session,
+                    select(MerchantProdTransaction).where(MerchantProdTransaction.merchant_id == user_id),
+                    page_request,
+                    MerchantProdTransaction.id, MerchantProdTransaction.createdAt
+                )
+                merchant_transactions = page.scalars()
 
                 if not merchant_transactions:
                     return json({'error': 'No transaction available'}, 404)
-                
-                # Count total rows
-                count_stmt = select(func.count(MerchantProdTransaction.id)).where(
-                    MerchantProdTransaction.merchant_id == user_id
-                    )
-                total_rows_obj = await session.execute(count_stmt)
-                total_rows     = total_rows_obj.scalar()
-
-                total_rows_count = total_rows / limit
 
 
                 for transaction in merchant_transactions:
@@ -100,7 +104,7 @@ class MerchantProductionTransactions(APIController):
                         "business_name": transaction.business_name
                     })
 
-                return json({'msg': 'Success','total_rows': total_rows_count ,'merchant_prod_trasactions': combined_data}, 200)
+                return json({'msg': 'Success','total_rows': page.page_count ,'merchant_prod_trasactions': combined_data, 'next_cursor': page.next_cursor}, 200)
 
         except Exception as e:
             return json({'error': 'Server Error', 'msg': f'{str(e)}'}, 500)
@@ -289,50 +293,52 @@ class ExportMerchantTransactions(APIController):
             returns the data in a JSON format.<br/><br/>
             
             Parameters:<br/>
-                - request(Request): Request object<br/><br/>
+                - request(Request): Request object<br/>
+                - format (query): json (default), csv or ndjson.<br/>
+                - columns (query): Comma separated columns to export.<br/>
+                - date_from, date_to (query): Inclusive YYYY-MM-DD date range, or date_range (Today, ThisWeek, ThisMonth...).<br/><br/>
             
             Returns:<br/>
             - JSON: A JSON response containing the following keys:<br/>
             - success (bool): A boolean indicating the success of the operation.<br/>
             - export_merchant_all_prod_trasactions (list): A list of dictionaries, each representing a transaction.<br/>
+            - The rows are streamed from the database in chunks, CSV and NDJSON are sent as file attachments.<br/>
             - error (str): An error message in case of any exceptions.<br/><br/>
 
             Raise:<br/>
             - Exception: If any error occurs during the database query or response generation.<br/>
         """
         try:
-            async with AsyncSession(async_engine) as session:
+            async with session_for('export') as session:
                 # Authenticate users
                 user_identity = request.identity
                 user_id       = user_identity.claims.get('user_id') if user_identity else None
 
                 # Fetch Transactions
-                merchant_transactions_object = await session.execute(select(MerchantProdTransaction).where(
+                stmt = select(
+                    MerchantProdTransaction.amount.label('transaction_amount'),
+                    MerchantProdTransaction.currency.label('transaction_currency'),
+                    MerchantProdTransaction.fee_amount.label('transaction_fee'),
+                    MerchantProdTransaction.merchantRedirectURl.label('redirectUrl'),
+                    MerchantProdTransaction.payment_mode,
+                    MerchantProdTransaction.transaction_id,
+                    MerchantProdTransaction.merchantCallBackURL.label('callbackUrl'),
+                    MerchantProdTransaction.status.label('transaction_status'),
+                    MerchantProdTransaction.createdAt.label('time'),
+                    MerchantProdTransaction.merchantOrderId.label('merchant_order_id')
+                ).where(
                     MerchantProdTransaction.merchant_id == user_id
-                    )
+                ).order_by(
+                    desc(MerchantProdTransaction.id)
                 )
-                merchant_transactions = merchant_transactions_object.scalars().all()
 
-                if not merchant_transactions:
-                    return json({'error': 'No transaction available'}, 404)
-                
-                combined_data = []
-                
-                for transaction in merchant_transactions:
-                    combined_data.append({
-                        'transaction_amount': transaction.amount,
-                        'transaction_currency': transaction.currency,
-                        'transaction_fee': transaction.fee_amount,
-                        'redirectUrl': transaction.merchantRedirectURl,
-                        'payment_mode': transaction.payment_mode,
-                        'transaction_id': transaction.transaction_id,
-                        'callbackUrl': transaction.merchantCallBackURL,
-                        'transaction_status': transaction.status,
-                        'time': transaction.createdAt,
-                        'merchant_order_id': transaction.merchantOrderId
-                    })
-                
-                return json({'success': True, 'export_merchant_all_prod_trasactions': combined_data}, 200)
+                return await export_query(
+                    request, session, stmt,
+                    root_key       = 'export_merchant_all_prod_trasactions',
+                    filename       = 'merchant_transactions',
+                    date_column    = MerchantProdTransaction.createdAt,
+                    empty_response = json({'error': 'No transaction available'}, 404)
+                )
             
         except Exception as e:
             return json({'error': 'Server Error', 'message': f'{str(e)}'}, 500)
@@ -354,18 +360,24 @@ class SearchMerchantProductionTransactions(APIController):
 
     @auth('userauth')
     @get()
-    async def SearchMerchantProdTransactions(self, request: Request, query: str):
+    async def SearchMerchantProdTransactions(self, request: Request, query: str, limit: int = 10, offset: int = 0, total: str = 'exact'):
         """
-           This function searches for merchant PG production transactions based on the user's authentication and query.<br/><br/>
+           This function searches for merchant PG production transactions based on the user's authentication and query.<br/>
+           The query is matched against the order id, transaction id, business name, MOP, amount, currency,
+           status, date, time and month in one query, best matches first.<br/><br/>
             
             Parameters:<br/>
                 - request(Request): Request object<br/>
-                - query(str): The query string for search<br/><br/>
+                - query(str): The query string for search<br/>
+                - limit(int, optional): The maximum number of transactions to return. Default is 10.<br/>
+                - offset(int, optional): The number of transactions to skip. Default is 0.<br/>
+                - total(str, optional): exact, estimated or none. Default is exact.<br/><br/>
             
             Returns:<br/>
                 - JSON: A JSON response containing the following keys:<br/>
                 - success (bool): A boolean indicating the success of the operation.<br/>
                 - merchant_searched_transactions (list): A list of dictionaries, each representing a transaction.<br/>
+                - total_rows (float): The number of pages of matching transactions.<br/>
                 - error (str): An error message in case of any exceptions.<br/><br/>
 
             Error Messages:
@@ -376,157 +388,26 @@ class SearchMerchantProductionTransactions(APIController):
                 - HTTPError: If the HTTP request returns an error status code.
         """
         try:
-            async with AsyncSession(async_engine) as session:
+            page_request = PageRequest(limit, offset, total=total)
+        except ValueError as e:
+            return json({'error': 'Bad Request', 'message': str(e)}, 400)
+
+        try:
+            async with session_for('search') as session:
                 user_identity = request.identity
                 user_id = user_identity.claims.get('user_id')
 
-                search_query = query
                 combined_data = []
-                query_date = None
-                query_time = None
-                query_status = None
-
-                if search_query == 'PAYMENT SUCCESS':
-                    query_status = 'PAYMENT_SUCCESS'
-                elif search_query == 'PAYMENT INITIATED':
-                    query_status = 'PAYMENT_INITIATED'
-                elif search_query == 'PAYMENT FAILED':
-                    query_status = 'PAYMENT_FAILED'
-
-
-                try:
-                    query_date = datetime.strptime(search_query, "%d %B %Y").date()
-                except ValueError:
-                    pass
-
-                try:
-                    query_time = datetime.strptime(search_query, "%H:%M:%S.%f").time()
-                except ValueError:
-                    pass
-
-                try:
-                    query_as_float = float(query)  # If query is a number, try to convert
-                except ValueError:
-                    query_as_float = None
-                
-                # For Month Search
-                try:
-                    query_month = datetime.strptime(search_query, "%B").month
-                except ValueError:
-                    query_month = None
-
-                if query_month:
-                    merchant_month_obj = await session.execute(select(MerchantProdTransaction).where(
-                        and_(extract('month', MerchantProdTransaction.createdAt) == query_month,
-                            MerchantProdTransaction.merchant_id == user_id)
-                    ))
-                    merchant_month = merchant_month_obj.scalars().all()
-
-
-                # Search transaction order wise
-                merchant_order_obj = await session.execute(select(MerchantProdTransaction).where(
-                    and_(MerchantProdTransaction.merchantOrderId == search_query,
-                         MerchantProdTransaction.merchant_id == user_id
-                         )
-                ))
-                merchant_order = merchant_order_obj.scalars().all()
-
-                # Search transaction transaction id wise
-                merchant_transactionID_obj = await session.execute(select(MerchantProdTransaction).where(
-                    and_(MerchantProdTransaction.transaction_id == search_query,
-                     MerchantProdTransaction.merchant_id == user_id
-                     )
-                ))
-                merchant_transactionID = merchant_transactionID_obj.scalars().all()
-
-                # Search transaction Business Name wise
-                merchant_business_obj = await session.execute(select(MerchantProdTransaction).where(
-                    and_(MerchantProdTransaction.business_name == search_query,
-                        MerchantProdTransaction.merchant_id == user_id
-                     )
-                ))
-                merchant_business = merchant_business_obj.scalars().all()
-
-                # Search transaction in MOP wise
-                merchant_mop_obj = await session.execute(select(MerchantProdTransaction).where(
-                    and_(MerchantProdTransaction.payment_mode == search_query,
-                     MerchantProdTransaction.merchant_id == user_id
-                     )
-                ))
-                merchant_mop = merchant_mop_obj.scalars().all()
-
-                # Search Transaction Amount wise
-                merchant_amount_obj = await session.execute(select(MerchantProdTransaction).where(
-                    and_(MerchantProdTransaction.amount == query_as_float,
-                         MerchantProdTransaction.merchant_id == user_id
-                         )
-                ))
-                merchant_amount = merchant_amount_obj.scalars().all()
-
-                # Search Transaction currency wise
-                merchant_currency_obj = await session.execute(select(MerchantProdTransaction).where(
-                    and_(MerchantProdTransaction.currency == search_query,
-                         MerchantProdTransaction.merchant_id == user_id
-                         )
-                ))
-                merchant_currency = merchant_currency_obj.scalars().all()
-
-                # Search transaction status wise
-                merchant_status_obj = await session.execute(select(MerchantProdTransaction).where(
-                    and_(MerchantProdTransaction.status == query_status,
-                         MerchantProdTransaction.merchant_id == user_id
-                         )
-                    ))
-                merchant_status = merchant_status_obj.scalars().all()
-
-                # Search Transaction by Date
-                merchant_date_obj = await session.execute(select(MerchantProdTransaction).where(
-                    and_(cast(MerchantProdTransaction.createdAt, Date) == query_date,
-                            MerchantProdTransaction.merchant_id == user_id
-                        )))
-                merchant_date = merchant_date_obj.scalars().all()
-
-                # Search Transaction by Time
-                merchant_time_obj = await session.execute(select(MerchantProdTransaction).where(
-                        and_(cast(MerchantProdTransaction.createdAt, Time) == query_time,
-                            MerchantProdTransaction.merchant_id == user_id
-                            )
-                    ))
-                merchant_time = merchant_time_obj.scalars().all()
-
-                # Execute conditions
-                if merchant_order:
-                    merchant_prod_transactions_obj = merchant_order
-
-                elif merchant_transactionID:
-                    merchant_prod_transactions_obj = merchant_transactionID
-
-                elif merchant_business:
-                    merchant_prod_transactions_obj = merchant_business
-
-                elif merchant_mop:
-                    merchant_prod_transactions_obj = merchant_mop
-
-                elif merchant_amount:
-                    merchant_prod_transactions_obj = merchant_amount
-
-                elif merchant_currency:
-                    merchant_prod_transactions_obj = merchant_currency
 
-                elif merchant_status:
-                    merchant_prod_transactions_obj = merchant_status
-
-                elif merchant_date:
-                    merchant_prod_transactions_obj = merchant_date
-
-                elif merchant_time:
-                    merchant_prod_transactions_obj = merchant_time
-
-                elif merchant_month:
-                    merchant_prod_transactions_obj = merchant_month
-
-                else:
-                    merchant_prod_transactions_obj = []
+                # Search every field in one query
+                page = await search(
+                    session,
+                    select(MerchantProdTransaction).where(MerchantProdTransaction.merchant_id == user_id),
+                    merchant_transaction_predicates(SearchTerms(query)),
+                    page_request,
+                    [MerchantProdTransaction.createdAt, MerchantProdTransaction.id]
+                )
+                merchant_prod_transactions_obj = page.scalars()
 
 
                 for transaction in merchant_prod_transactions_obj:
@@ -552,7 +433,7 @@ class SearchMerchantProductionTransactions(APIController):
                         'business_name': transaction.business_name
                     })
 
-                return json({'success': True, 'merchant_searched_transactions': combined_data}, 200)
+                return json({'success': True, 'merchant_searched_transactions': combined_data, 'total_rows': page.page_count}, 200)
 
         except Exception as e:
             return json({'error': 'Server Error', 'message': f'{str(e)}'}, 500)
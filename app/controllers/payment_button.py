@@ -2,7 +2,7 @@ from blacksheep import Request, json
 from blacksheep.server.controllers import APIController
 from blacksheep.server.authorization import auth
 from app.controllers.controllers import get, post
-from app.generateID import generate_new_button_id
+from app.generateID import generate_public_token
 from Models.PG.schema import CreateNewPaymentButtonSchema
 from Models.models3 import MerchantPaymentButtonStyles, MerchantPaymentButton
 from Models.models import UserKeys
@@ -161,7 +161,7 @@ class CreateMerchantPaymentButton(APIController):
                 customerPhoneLabel  = schema.customerPhoneLabel
 
                 # Generate new unique ID
-                uniqueButtonID = await generate_new_button_id()
+                uniqueButtonID = generate_public_token('button_')
 
                 merchantButton = MerchantPaymentButton(
                     merchant_id         = user_id,
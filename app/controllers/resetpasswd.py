@@ -5,7 +5,9 @@ from database.db import async_engine, AsyncSession
 from Models.models import Users
 from blacksheep import Request, json
 from sqlalchemy.exc import SQLAlchemyError
-from app.auth import encrypt_password_reset, verify_password_reset_token, decode_token ,check_password ,encrypt_password ,send_password_reset_email,encrypt_password_reset_token ,decrypt_password_reset_token
+from app.auth import encrypt_password_reset, verify_password_reset_token, decode_token ,send_password_reset_email,encrypt_password_reset_token ,decrypt_password_reset_token
+from app.passwords import hash_password
+from app.mail import render_template
 import time
 from app.controllers.controllers import get, post, put, delete
 from decouple import config
@@ -69,22 +71,7 @@ class UserResetPasswdMailSendController(APIController):
 
                 reseturl = f"{mail_send_url}reset/password/?token={password_reset_token}"
 
-                body = f"""
-                        <html>
-                        <body>
-                            <b>Dear</b>
-
-                            <p>Click the link below to Reset your forgot password, The link will remain valid for 15 minutes.</p>
-                            <a href="{reseturl}">Reset your password</a>
-
-                            <p>Thank you for choosing Itio Innovex Pvt. Ltd. We look forward to providing you with the best possible experience.</p>
-
-                            <p><b>Best Regards,</b><br>
-                            <b>Itio Innovex Pvt. Ltd.</b></p>
-                            
-                        </body>
-                        </html>
-                        """
+                body = render_template('password_reset.html', link=reseturl)
 
                 send_password_reset_email(first_user.email, "Reset Your Password", body)
 
@@ -150,22 +137,7 @@ class CryptoFiatForgotPasswordMainSend(APIController):
 
                 reseturl = f"{uat_mail_send_url}reset/password/?token={password_reset_token}"
 
-                body = f"""
-                        <html>
-                        <body>
-                            <b>Dear</b>
-
-                            <p>Click the link below to Reset your forgot password, The link will remain valid for 15 minutes.</p>
-                            <a href="{reseturl}">Reset your password</a>
-
-                            <p>Thank you for choosing Itio Innovex Pvt. Ltd. We look forward to providing you with the best possible experience.</p>
-
-                            <p><b>Best Regards,</b><br>
-                            <b>Itio Innovex Pvt. Ltd.</b></p>
-                            
-                        </body>
-                        </html>
-                        """
+                body = render_template('password_reset.html', link=reseturl)
                 try:
                     send_password_reset_email(first_user.email, "Reset Your Password", body)
                 except Exception as e:
@@ -236,7 +208,7 @@ class UserResetPasswdController(APIController):
                 if password1 != password2:
                     return json({'msg': 'Password did not match'}, 400)
             
-                first_user.password = encrypt_password(schema.password1)
+                first_user.password = await hash_password(schema.password1)
 
                 session.add(first_user)
                 await session.commit()
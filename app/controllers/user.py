@@ -8,9 +8,11 @@ from Models.models import Users ,Currency ,Wallet, Group, UserKeys, Kycdetails
 from Models.models2 import MerchantProdTransaction
 from sqlmodel import select, and_
 from ..settings import CRYPTO_CONFIG, SECURITIES_CODE
+from app.passwords import hash_password
+from app.mail import render_template
 from app.auth import (
-    encrypt_password ,decrypt_password_reset_token, 
-    send_welcome_email, generate_merchant_secret_key, generate_merchant_unique_public_key
+    decrypt_password_reset_token, 
+    send_welcome_email, generate_merchant_secret_key
     )
 from decouple import config
 from app.controllers.controllers import get, post
@@ -158,7 +160,7 @@ class UserController(APIController):
                         lastname    = user.lastname,
                         email       = user.email,
                         phoneno     = user.phoneno,
-                        password    = encrypt_password(user.password),
+                        password    = await hash_password(user.password),
                         group       = user_group_id,
                         is_merchent = user.is_merchent,
                     )
@@ -175,7 +177,7 @@ class UserController(APIController):
                 #      # If user is a Merchant then assign Public and secret key
                 #     if user.is_merchent:
                 #         _secret_key = await generate_merchant_secret_key(user_instance.id)
-                #         public_key_ = await generate_merchant_unique_public_key()
+                #         public_key_ = generate_public_token()
 
                 #         merchant_secret_key = UserKeys(
                 #             user_id    = user_instance.id,
@@ -197,22 +199,7 @@ class UserController(APIController):
 
                 link=f"{signup_mail_sent_url}/signin/"
 
-                body = f"""
-                        <html>
-                        <body>
-                            <b>Dear {user_first_name} {user_last_name},</b>
-                            <p>Welcome aboard! We are thrilled to have you join our community at Itio Innovex Pvt. Ltd.!</p>
-                            <p>To complete your registration and activate your account, please verify your email address by clicking the link below:</p>
-                            <a href="{link}">Verify Your Email Address</a>
-                            <p>If the button above doesn’t work, you can copy and paste the following URL into your web browser:</p>
-                            <p><a href="{link}">{link}</a></p>
-                            <p>Thank you for choosing Itio Innovex Pvt. Ltd. We look forward to providing you with the best possible experience.</p>
-
-                            <p><b>Best Regards,</b><br>
-                            <b>Itio Innovex Pvt. Ltd.</b></p>
-                        </body>
-                        </html>
-                        """
+                body = render_template('welcome.html', first_name=user_first_name, last_name=user_last_name, link=link)
                 
                 # Send mail
                 send_welcome_email(user.email,"Welcome! Please Verify Your Email Address", body)
@@ -333,7 +320,7 @@ class CountAvailableUser(APIController):
     def class_name(cls):
         return "Count Users"
     
-    @auth('userauth')
+    @auth('admin')
     @get()
     async def count_users(self, request: Request):
         """
@@ -358,16 +345,6 @@ class CountAvailableUser(APIController):
         """
         try:
             async with AsyncSession(async_engine) as session:
-                user_identity = request.identity
-                admin_id      = user_identity.claims.get('user_id') if user_identity else None
-
-                # Admin authentication
-                user_obj = await session.execute(select(Users).where(Users.id == admin_id))
-                user_obj_data = user_obj.scalar()
-
-                if not user_obj_data.is_admin:
-                    return json({'msg': 'Only admin can view the Transactions'}, 400)
-                
                 # Get all the users
                 user_kyc_obj = await session.execute(select(Users))
                 user_kyc_obj_data = user_kyc_obj.scalars().all()
@@ -407,7 +384,7 @@ class CountAvailableUser(APIController):
 
 
 # Update user profile by admin
-@auth('userauth')
+@auth('admin')
 @PUT('/api/v1/admin/update/user/profile/')
 async def update_userProfile(request: Request, schema: UppdateUserProfileSchema):
     """
@@ -433,19 +410,6 @@ async def update_userProfile(request: Request, schema: UppdateUserProfileSchema)
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity = request.identity
-            admin_id       = user_identity.claims.get('user_id')
-
-            # Admin authentication
-            admin_user_obj = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            admin_user = admin_user_obj.scalar()
-
-            if not admin_user.is_admin:
-                return json({'message': 'Admin authorization failed'}, 401)
-            # Admin authentication ends here
-
             # Get the request Payload Data
             user_id        = schema.user_id
             first_name     = schema.first_name
@@ -1,5 +1,6 @@
 from blacksheep import json, Request, get
 from app.auth import send_welcome_email
+from app.mail import render_template
 import random
 
 
@@ -25,18 +26,7 @@ async def SendVerificationMailToUser(email: str):
         random_number   = random.randint(1000, 9999)
         receipient_mail = email
 
-        body = f"""
-                <html>
-                <body>
-                    <b>Your One-Time Password (OTP) is:</b><span>{random_number}</span>
-
-                    <p>Please enter the above OTP in signup page to complete the email verification process.</p>
-                    
-                    <p><b>Best Regards,</b><br>
-                    <b>Itio Innovex Pvt. Ltd.</b></p>
-                </body>
-                </html>
-                """
+        body = render_template('email_otp.html', otp=random_number)
         send_welcome_email(receipient_mail, "Verify Email Address", body)
 
         return json({
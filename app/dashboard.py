@@ -0,0 +1,283 @@
+"""
+Merchant dashboard figures aggregated by the database.
+
+The dashboard endpoints used to load every withdrawal, refund and transaction of a merchant
+and add them up in Python. Here every endpoint runs one statement of SUM/COUNT aggregates,
+grouped by `date_trunc` for the charts, so loading the dashboard takes one round trip per
+figure whatever the history of the merchant.
+
+Results are cached per merchant for `DASHBOARD_CACHE_TTL` seconds. Committing a session that
+wrote a transaction, refund, withdrawal or balance of a merchant drops the cached results of
+that merchant.
+"""
+from datetime import datetime, timedelta
+from itertools import chain
+from typing import Any, Awaitable, Callable, Hashable
+from sqlalchemy import and_, event, func, literal, literal_column, null, select, union_all
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from Models.models import Currency
+from Models.models2 import MerchantAccountBalance, MerchantProdTransaction
+from Models.models3 import MerchantRefund, MerchantWithdrawals
+from app.cache import TTLCache
+
+
+
+BUCKETS = ('day', 'week', 'month')
+
+DASHBOARD_CACHE_SIZE = 10000
+DASHBOARD_CACHE_TTL  = 30
+
+dashboard_cache = TTLCache(DASHBOARD_CACHE_SIZE, DASHBOARD_CACHE_TTL)
+
+# Generation of the cached results of every merchant, bumping it drops them all at once
+_generations: dict[int, int] = {}
+
+# Writes to these tables change the dashboard of the merchant_id of the row
+DASHBOARD_MODELS = (MerchantProdTransaction, MerchantRefund, MerchantWithdrawals, MerchantAccountBalance)
+
+CHANGED_MERCHANTS = 'dashboard_changed_merchants'
+
+
+
+def invalidate_merchant_dashboard(merchant_id: int) -> None:
+    _generations[merchant_id] = _generations.get(merchant_id, 0) + 1
+
+
+# Drop the cached results of the merchant once the session commits,
+# for writes the ORM does not see like the balance ledger upserts
+def merchant_changed(session: Session | AsyncSession, merchant_id: int) -> None:
+    session.info.setdefault(CHANGED_MERCHANTS, set()).add(merchant_id)
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changed_merchants(session: Session, flush_context) -> None:
+    for instance in chain(session.new, session.dirty, session.deleted):
+        if isinstance(instance, DASHBOARD_MODELS) and instance.merchant_id is not None:
+            merchant_changed(session, instance.merchant_id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_changed_merchants(session: Session) -> None:
+    for merchant_id in session.info.pop(CHANGED_MERCHANTS, ()):
+        invalidate_merchant_dashboard(merchant_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_changed_merchants(session: Session) -> None:
+    session.info.pop(CHANGED_MERCHANTS, None)
+
+
+
+async def cached(merchant_id: int, key: tuple[Hashable, ...], compute: Callable[[], Awaitable[Any]]) -> Any:
+    # The generation is read before computing, a result computed while the merchant
+    # changed is stored under the old generation and never served
+    cache_key = (merchant_id, _generations.get(merchant_id, 0), *key)
+    result    = dashboard_cache.get(cache_key)
+
+    if result is None:
+        result = await compute()
+        dashboard_cache.set(cache_key, result)
+
+    return result
+
+
+
+# Start of the oldest of the last `periods` buckets, matching date_trunc (weeks start on Monday)
+def window_start(bucket: str, periods: int, now: datetime) -> datetime:
+    day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    if bucket == 'day':
+        return day - timedelta(days=periods - 1)
+
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday(), weeks=periods - 1)
+
+    months = day.year * 12 + day.month - 1 - (periods - 1)
+
+    return day.replace(year=months // 12, month=months % 12 + 1, day=1)
+
+
+def bucket_starts(bucket: str, since: datetime, now: datetime) -> list[datetime]:
+    starts = []
+    start  = since
+
+    while start <= now:
+        starts.append(start)
+
+        if bucket == 'day':
+            start = start + timedelta(days=1)
+        elif bucket == 'week':
+            start = start + timedelta(weeks=1)
+        else:
+            start = start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+
+    return starts
+
+
+def truncate(bucket: str, column):
+    if bucket not in BUCKETS:
+        raise ValueError(f'Unsupported bucket {bucket}')
+
+    # Inlined rather than bound, so the GROUP BY expression matches the selected one
+    return func.date_trunc(literal_column(f"'{bucket}'"), column)
+
+
+def currency_id(currency: str):
+    return select(Currency.id).where(Currency.name == currency).scalar_subquery()
+
+
+def _total(column, *criteria):
+    return select(func.coalesce(func.sum(column), 0)).where(*criteria).scalar_subquery()
+
+
+
+def merchant_stats_statement(merchant_id: int, currency: str):
+    currency_ = currency_id(currency)
+    balance   = and_(MerchantAccountBalance.merchant_id == merchant_id, MerchantAccountBalance.currency == currency)
+
+    return select(
+        currency_.label('currency_id'),
+        _total(MerchantRefund.amount,
+               MerchantRefund.merchant_id == merchant_id,
+               MerchantRefund.currency == currency_).label('merchant_refunds'),
+        _total(MerchantAccountBalance.account_balance, balance).label('merchant_account_balance'),
+        _total(MerchantAccountBalance.mature_balance, balance).label('merchant_mature_balance'),
+        _total(MerchantAccountBalance.immature_balance, balance).label('merchant_immature_balance'),
+        _total(MerchantWithdrawals.amount,
+               MerchantWithdrawals.merchant_id == merchant_id,
+               MerchantWithdrawals.currency == currency_,
+               MerchantWithdrawals.is_completed == True).label('merchant_withdrawals'),
+        _total(MerchantWithdrawals.amount,
+               MerchantWithdrawals.merchant_id == merchant_id,
+               MerchantWithdrawals.currency == currency_,
+               MerchantWithdrawals.status == 'Pending').label('merchant_pending_withdrawals'),
+    )
+
+
+async def merchant_stats(session: AsyncSession, merchant_id: int, currency: str) -> dict | None:
+    """
+    Refund, balance and withdrawal totals of the merchant in `currency`,
+    None when the currency does not exist.
+    """
+    async def compute():
+        row = (await session.execute(merchant_stats_statement(merchant_id, currency))).one()._asdict()
+
+        return row if row.pop('currency_id') is not None else None
+
+    return await cached(merchant_id, ('stats', currency), compute)
+
+
+
+# Figures of the transaction chart, name -> (model, criteria of the counted rows)
+def chart_sources(merchant_id: int, currency: str | None) -> dict:
+    sources = {
+        'success_transaction': (MerchantProdTransaction, [
+            MerchantProdTransaction.merchant_id == merchant_id,
+            MerchantProdTransaction.status      == 'PAYMENT_SUCCESS',
+        ]),
+        'withdrawal_amount': (MerchantWithdrawals, [
+            MerchantWithdrawals.merchant_id == merchant_id,
+            MerchantWithdrawals.status      == 'Approved',
+        ]),
+        'refund_amount': (MerchantRefund, [
+            MerchantRefund.merchant_id  == merchant_id,
+            MerchantRefund.is_completed == True,
+        ]),
+    }
+
+    if currency:
+        currency_ = currency_id(currency)
+
+        sources['success_transaction'][1].append(MerchantProdTransaction.currency == currency)
+        sources['withdrawal_amount'][1].append(MerchantWithdrawals.currency == currency_)
+        sources['refund_amount'][1].append(MerchantRefund.currency == currency_)
+
+    return sources
+
+
+def merchant_chart_statement(merchant_id: int, currency: str | None, bucket: str | None, since: datetime | None):
+    selects = []
+
+    for name, (model, criteria) in chart_sources(merchant_id, currency).items():
+        amount = func.coalesce(func.sum(model.amount), 0).label('amount')
+
+        # All time total
+        selects.append(
+            select(literal(name).label('name'), null().label('bucket'), amount, func.count().label('count'))
+            .where(*criteria)
+        )
+
+        if bucket:
+            bucket_ = truncate(bucket, model.createdAt)
+
+            selects.append(
+                select(literal(name).label('name'), bucket_.label('bucket'), amount, func.count().label('count'))
+                .where(*criteria, model.createdAt >= since)
+                .group_by(bucket_)
+            )
+
+    return union_all(*selects)
+
+
+async def merchant_chart(session: AsyncSession, merchant_id: int, currency: str | None = None,
+                         bucket: str | None = None, periods: int = 12) -> dict:
+    """
+    All time totals of the successful transactions, approved withdrawals and completed
+    refunds of the merchant and, with `bucket`, their amounts and counts per day, week or
+    month over the last `periods` buckets.
+    """
+    async def compute():
+        now   = datetime.now()
+        since = window_start(bucket, periods, now) if bucket else None
+        rows  = (await session.execute(merchant_chart_statement(merchant_id, currency, bucket, since))).all()
+
+        names  = chart_sources(merchant_id, currency).keys()
+        totals = {name: 0 for name in names}
+        series = {}
+
+        if bucket:
+            series = {start: {'bucket': start, **{name: 0 for name in names}, **{f'{name}_count': 0 for name in names}}
+                      for start in bucket_starts(bucket, since, now)}
+
+        for name, bucket_, amount, count in rows:
+            if bucket_ is None:
+                totals[name] = amount
+            elif bucket_ in series:
+                series[bucket_][name]            = amount
+                series[bucket_][f'{name}_count'] = count
+
+        if bucket:
+            totals['series'] = list(series.values())
+
+        return totals
+
+    return await cached(merchant_id, ('chart', currency, bucket, periods), compute)
+
+
+
+def merchant_refund_chart_statement(merchant_id: int, bucket: str, start: datetime, end: datetime):
+    bucket_ = truncate(bucket, MerchantRefund.createdAt)
+
+    return select(
+        bucket_.label('createdAt'),
+        func.sum(MerchantRefund.amount).label('amount'),
+        func.count().label('count'),
+    ).where(
+        MerchantRefund.merchant_id  == merchant_id,
+        MerchantRefund.is_completed == True,
+        MerchantRefund.createdAt    >= start,
+        MerchantRefund.createdAt    <= end,
+    ).group_by(bucket_).order_by(bucket_)
+
+
+async def merchant_refund_chart(session: AsyncSession, merchant_id: int, bucket: str, start: datetime, end: datetime) -> list[dict]:
+    """
+    Completed refunds of the merchant between `start` and `end`, summed per bucket.
+    """
+    async def compute():
+        rows = await session.execute(merchant_refund_chart_statement(merchant_id, bucket, start, end))
+
+        return [row._asdict() for row in rows]
+
+    return await cached(merchant_id, ('refund_chart', bucket, start, end), compute)
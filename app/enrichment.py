@@ -0,0 +1,44 @@
+"""
+Batched lookups of the rows referenced by a page of results.
+
+Listings used to load the whole Users or Currency table to build id lookup dicts. These
+helpers only load the referenced ids, with one `IN (...)` query per chunk of ids.
+"""
+from Models.models import Currency, Users, ReceiverDetails
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+from typing import Any, Iterable
+
+
+
+IN_CHUNK_SIZE = 1000
+
+
+async def fetch_by_ids(session: AsyncSession, model: Any, ids: Iterable[int | None]) -> dict[int, Any]:
+    """
+    Return {id: row} for the rows of `model` whose id is in `ids`. None ids are ignored.
+    """
+    wanted = sorted({id for id in ids if id is not None})
+    rows   = {}
+
+    for start in range(0, len(wanted), IN_CHUNK_SIZE):
+        result = await session.execute(select(model).where(
+            model.id.in_(wanted[start:start + IN_CHUNK_SIZE])
+        ))
+
+        for row in result.scalars():
+            rows[row.id] = row
+
+    return rows
+
+
+async def fetch_users(session: AsyncSession, ids: Iterable[int | None]) -> dict[int, Users]:
+    return await fetch_by_ids(session, Users, ids)
+
+
+async def fetch_currencies(session: AsyncSession, ids: Iterable[int | None]) -> dict[int, Currency]:
+    return await fetch_by_ids(session, Currency, ids)
+
+
+async def fetch_receiver_details(session: AsyncSession, ids: Iterable[int | None]) -> dict[int, ReceiverDetails]:
+    return await fetch_by_ids(session, ReceiverDetails, ids)
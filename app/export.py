@@ -0,0 +1,226 @@
+"""
+Streaming exports of large tables as JSON, CSV or NDJSON.
+
+Rows are read through a server-side cursor in chunks and written to the response as
+they arrive, so an export keeps a constant memory footprint whatever the table size.
+"""
+from blacksheep import Request, Response, StreamedContent, json
+from blacksheep.settings.json import json_settings
+from database.db import AsyncSession, session_for
+from sqlalchemy import Select, select
+from sqlalchemy.sql import ColumnElement
+from datetime import date, datetime, time, timedelta
+from typing import AsyncIterable, AsyncIterator, Sequence
+from app.dateFormat import get_date_range
+import csv
+import io
+
+
+
+EXPORT_CHUNK_SIZE = 1000
+
+CONTENT_TYPES = {
+    'json': b'application/json',
+    'csv': b'text/csv; charset=utf-8',
+    'ndjson': b'application/x-ndjson',
+}
+
+
+class ExportParams:
+    """
+    Query parameters shared by every export endpoint.
+
+    - format: json (default, same body as before), csv or ndjson
+    - columns: comma separated subset of the exported columns
+    - date_from, date_to: YYYY-MM-DD, both inclusive
+    - date_range: Today, Yesterday, ThisWeek, ThisMonth or PreviousMonth
+    """
+
+    def __init__(
+        self,
+        format: str = 'json',
+        columns: list[str] | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None
+    ) -> None:
+        self.format  = format
+        self.columns = columns
+        self.start   = start
+        self.end     = end
+
+    @classmethod
+    def from_request(cls, request: Request, available_columns: Sequence[str]) -> 'ExportParams':
+        query = request.query
+
+        def param(name: str) -> str | None:
+            values = query.get(name)
+            return values[0] if values else None
+
+        export_format = (param('format') or 'json').lower()
+
+        if export_format not in CONTENT_TYPES:
+            raise ValueError(f'Unsupported export format {export_format}')
+
+        columns = None
+        if param('columns'):
+            columns = [column.strip() for column in param('columns').split(',') if column.strip()]
+            unknown = [column for column in columns if column not in available_columns]
+
+            if unknown:
+                raise ValueError(f'Unknown columns: {", ".join(unknown)}')
+
+        start = end = None
+
+        if param('date_range'):
+            start, end = get_date_range(param('date_range'))
+
+        if param('date_from'):
+            start = datetime.combine(date.fromisoformat(param('date_from')), time.min)
+
+        if param('date_to'):
+            end = datetime.combine(date.fromisoformat(param('date_to')) + timedelta(days=1), time.min)
+
+        return cls(export_format, columns, start, end)
+
+
+    # Apply the column selection and date range to the export query
+    def apply(self, statement: Select, date_column: ColumnElement | None) -> Select:
+        if self.columns:
+            selected  = statement.selected_columns
+            statement = statement.with_only_columns(*[selected[column] for column in self.columns])
+
+        if date_column is not None and self.start is not None:
+            statement = statement.where(date_column >= self.start)
+
+        if date_column is not None and self.end is not None:
+            statement = statement.where(date_column < self.end)
+
+        return statement
+
+
+
+# Read the rows of a query in chunks through a server-side cursor, on the replica when there is one
+async def stream_partitions(statement: Select, chunk_size: int = EXPORT_CHUNK_SIZE) -> AsyncIterator[Sequence]:
+    async with session_for('export') as session:
+        result = await session.stream(statement.execution_options(yield_per=chunk_size))
+
+        try:
+            async for partition in result.partitions():
+                yield partition
+        finally:
+            await result.close()
+
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+
+    return value
+
+
+
+# Encoders turn chunks of rows into chunks of response bytes
+async def encode_json(partitions: AsyncIterable[Sequence], columns: list[str], root_key: str, extra: dict) -> AsyncIterator[bytes]:
+    head = ''.join(f'{json_settings.dumps(key)}:{json_settings.dumps(value)},' for key, value in extra.items())
+    yield f'{{{head}{json_settings.dumps(root_key)}:['.encode()
+
+    first = True
+
+    async for partition in partitions:
+        # One dumps call per chunk, without the surrounding brackets
+        body = json_settings.dumps([dict(zip(columns, row)) for row in partition])[1:-1]
+
+        if body:
+            yield (body if first else ',' + body).encode()
+            first = False
+
+    yield b']}'
+
+
+async def encode_ndjson(partitions: AsyncIterable[Sequence], columns: list[str]) -> AsyncIterator[bytes]:
+    async for partition in partitions:
+        yield ''.join(f'{json_settings.dumps(dict(zip(columns, row)))}\n' for row in partition).encode()
+
+
+async def encode_csv(partitions: AsyncIterable[Sequence], columns: list[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(columns)
+    yield buffer.getvalue().encode()
+
+    async for partition in partitions:
+        buffer.seek(0)
+        buffer.truncate()
+
+        writer.writerows([_csv_value(value) for value in row] for row in partition)
+        yield buffer.getvalue().encode()
+
+
+
+# Streamed response for an export in the requested format
+def export_response(
+    partitions: AsyncIterable[Sequence],
+    columns: list[str],
+    params: ExportParams,
+    root_key: str,
+    filename: str,
+    extra: dict | None = None
+) -> Response:
+    if params.format == 'csv':
+        chunks = encode_csv(partitions, columns)
+    elif params.format == 'ndjson':
+        chunks = encode_ndjson(partitions, columns)
+    else:
+        chunks = encode_json(partitions, columns, root_key, {'success': True, **(extra or {})})
+
+    async def provider():
+        async for chunk in chunks:
+            yield chunk
+
+    headers = []
+    if params.format != 'json':
+        headers.append((b'Content-Disposition', f'attachment; filename="{filename}.{params.format}"'.encode()))
+
+    return Response(200, headers, StreamedContent(CONTENT_TYPES[params.format], provider))
+
+
+
+async def export_query(
+    request: Request,
+    session: AsyncSession,
+    statement: Select,
+    root_key: str,
+    filename: str,
+    date_column: ColumnElement | None = None,
+    empty_response: Response | None = None,
+    extra: dict | None = None
+) -> Response:
+    """
+    Export the rows of `statement` as requested by the query parameters of `request`.
+
+    The labels of the selected columns are the keys of the exported rows. `session` is only
+    used to check whether there is anything to export, the rows themselves are streamed on
+    a connection of their own once the response starts. Returns `empty_response` when the
+    query has no rows and it is given.
+    """
+    try:
+        params = ExportParams.from_request(request, list(statement.selected_columns.keys()))
+    except ValueError as e:
+        return json({'error': 'Bad Request', 'message': str(e)}, 400)
+
+    statement = params.apply(statement, date_column)
+
+    if empty_response is not None:
+        has_rows = await session.scalar(select(statement.order_by(None).exists()))
+
+        if not has_rows:
+            return empty_response
+
+    columns = list(statement.selected_columns.keys())
+
+    return export_response(stream_partitions(statement), columns, params, root_key, filename, extra)
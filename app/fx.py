@@ -0,0 +1,223 @@
+"""
+Currency conversion from cached exchange rate tables.
+
+Instead of calling the provider once per converted amount, the full rate table of a base
+currency is fetched at most once every `ttl` seconds and conversions are computed locally.
+Concurrent lookups of an expired table share a single fetch. Every fetched table is stored
+in FXRateTable, so conversions keep working on the last known rates for up to `max_stale`
+seconds while the provider is slow or unavailable.
+"""
+from typing import Iterable
+from datetime import datetime
+from database.db import AsyncSession, async_engine
+from Models.models import FXRateTable
+from app.settings import FX
+import asyncio
+import httpx
+import logging
+
+
+
+logger = logging.getLogger(__name__)
+
+
+
+class FXRateError(Exception):
+    pass
+
+
+
+class RateTable:
+    def __init__(self, base: str, rates: dict, fetched_at: datetime) -> None:
+        self.base       = base
+        self.rates      = rates
+        self.fetched_at = fetched_at
+
+
+    def age(self) -> float:
+        return (datetime.now() - self.fetched_at).total_seconds()
+
+
+    def rate(self, quote: str) -> float:
+        if quote == self.base:
+            return 1.0
+
+        try:
+            return float(self.rates[quote])
+        except KeyError:
+            raise FXRateError(f'No {self.base} to {quote} exchange rate available')
+
+
+
+class FXRates:
+    """
+    Exchange rate tables per base currency, fetched from the provider over one pooled
+    client. Lookups of an expired table wait at most `wait_timeout` seconds for the fetch
+    and then fall back to the last known table (counted in `fallbacks`).
+    """
+    # The running service used by convert_amount and convert_amounts
+    current: 'FXRates | None' = None
+
+    def __init__(self, settings: FX, transport: httpx.AsyncBaseTransport | None = None) -> None:
+        self.settings  = settings
+        self.transport = transport
+        self.fetched   = 0
+        self.fallbacks = 0
+        self._tables: dict[str, RateTable] = {}
+        self._refreshing: dict[str, asyncio.Task] = {}
+        self._client: httpx.AsyncClient | None = None
+
+
+    def start(self) -> None:
+        FXRates.current = self
+
+
+    async def stop(self) -> None:
+        if FXRates.current is self:
+            FXRates.current = None
+
+        for task in list(self._refreshing.values()):
+            task.cancel()
+
+        await asyncio.gather(*self._refreshing.values(), return_exceptions=True)
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url  = self.settings.api_url,
+                headers   = {
+                    'X-RapidAPI-Key': self.settings.api_key,
+                    'X-RapidAPI-Host': self.settings.api_host
+                },
+                transport = self.transport,
+                timeout   = self.settings.fetch_timeout
+            )
+
+        return self._client
+
+
+    async def fetch(self, base: str) -> RateTable:
+        response = await self._get_client().get(self.settings.rates_path, params={'from': base})
+        response.raise_for_status()
+
+        rates = response.json().get('rates')
+
+        if not rates:
+            raise FXRateError(f'Invalid exchange rate response for {base}')
+
+        return RateTable(base, rates, datetime.now())
+
+
+    async def load(self, base: str) -> RateTable | None:
+        async with AsyncSession(async_engine) as session:
+            stored = await session.get(FXRateTable, base)
+
+        return RateTable(stored.base, stored.rates, stored.fetched_at) if stored else None
+
+
+    async def store(self, table: RateTable) -> None:
+        async with AsyncSession(async_engine) as session:
+            await session.merge(FXRateTable(base=table.base, rates=table.rates, fetched_at=table.fetched_at))
+            await session.commit()
+
+
+    async def _refresh(self, base: str) -> RateTable:
+        table = await self.fetch(base)
+
+        self.fetched      += 1
+        self._tables[base] = table
+
+        try:
+            await self.store(table)
+        except Exception as e:
+            logger.warning('Unable to store the %s exchange rates: %s', base, e)
+
+        return table
+
+
+    def _refresh_done(self, base: str, task: asyncio.Task) -> None:
+        self._refreshing.pop(base, None)
+
+        # Callers may have stopped waiting, log the failure here
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning('Unable to fetch the %s exchange rates: %s', base, task.exception())
+
+
+    # One fetch per base currency at a time, later callers join the running one
+    def refresh(self, base: str) -> asyncio.Task:
+        task = self._refreshing.get(base)
+
+        if task is None:
+            task = asyncio.ensure_future(self._refresh(base))
+            task.add_done_callback(lambda task: self._refresh_done(base, task))
+            self._refreshing[base] = task
+
+        return task
+
+
+    async def table(self, base: str) -> RateTable:
+        table = self._tables.get(base)
+
+        if table is not None and table.age() < self.settings.ttl:
+            return table
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(self.refresh(base)), self.settings.wait_timeout)
+        except Exception as e:
+            error = e
+
+        if table is None:
+            try:
+                table = await self.load(base)
+            except Exception as e:
+                logger.warning('Unable to load the stored %s exchange rates: %s', base, e)
+
+        if table is None or table.age() >= self.settings.max_stale:
+            raise FXRateError(f'{base} exchange rates are unavailable: {error!r}')
+
+        self.fallbacks += 1
+        self._tables.setdefault(base, table)
+
+        return table
+
+
+    async def convert_many(self, conversions: Iterable[tuple[str, str, float]]) -> list[float]:
+        """
+        Convert every `(from_currency, to_currency, amount)` in `conversions`, fetching each
+        base currency table at most once. Returns the converted amounts in the same order.
+        """
+        conversions = [(source.upper(), quote.upper(), float(amount)) for source, quote, amount in conversions]
+        bases       = list({source for source, quote, _ in conversions if source != quote})
+        tables      = dict(zip(bases, await asyncio.gather(*[self.table(base) for base in bases])))
+
+        return [
+            amount if source == quote else amount * tables[source].rate(quote)
+            for source, quote, amount in conversions
+        ]
+
+
+
+async def convert_amounts(conversions: Iterable[tuple[str, str, float]]) -> list[float]:
+    """
+    Convert `(from_currency, to_currency, amount)` triples with the running rate service.
+    Raises FXRateError when a rate is unavailable.
+    """
+    if FXRates.current is not None:
+        return await FXRates.current.convert_many(conversions)
+
+    # Outside of the application (scripts) use a service of our own
+    rates = FXRates(FX())
+
+    try:
+        return await rates.convert_many(conversions)
+    finally:
+        await rates.stop()
+
+
+async def convert_amount(from_currency: str, to_currency: str, amount: float) -> float:
+    return (await convert_amounts([(from_currency, to_currency, amount)]))[0]
@@ -1,7 +1,3 @@
-from database.db import AsyncSession, async_engine
-from sqlmodel import select
-from Models.models3 import MerchantPaymentButton
-from Models.crypto import CryptoSwap, CryptoExchange
 from Models.card import FiatCard
 import uuid
 import time
@@ -9,9 +5,16 @@ import json
 import base64
 import hashlib
 import random
+import secrets
 import string
 
 
+# Unguessable public identifier, for merchant public keys and payment button IDs.
+# Unlike the Snowflake transaction IDs, one of them tells nothing about the others.
+def generate_public_token(prefix: str = '') -> str:
+    return f'{prefix}{secrets.token_urlsafe(24)}'
+
+
 # Generate unique ID
 def generate_unique_id():
     unique_uuid = uuid.uuid4().hex
@@ -43,54 +46,6 @@ def calculate_sha256_string(data):
     return sha256_hash.hexdigest()
 
 
-# Generate new unique Button ID 
-async def generate_new_button_id():
-    while True:
-        unique_id = str(uuid.uuid4())[:30]
-        async with AsyncSession(async_engine) as session:
-                unique_button_id_obj = await session.execute(select(MerchantPaymentButton).where(
-                    MerchantPaymentButton.button_id == unique_id
-                ))
-                unique_button_id = unique_button_id_obj.scalar()
-
-                if not unique_button_id:
-                    return f"button_{unique_id}"
-
-
-
-### Generate new transaction ID for CryptoSwap Transaction
-async def generate_new_swap_transaction_id():
-    while True:
-        unique_id = str(uuid.uuid4())[:30]
-
-        async with AsyncSession(async_engine) as session:
-                unique_transaction_id_obj = await session.execute(select(CryptoSwap).where(
-                    CryptoSwap.transaction_id == unique_id
-                ))
-                unique_transaction_id = unique_transaction_id_obj.scalar()
-
-                if not unique_transaction_id:
-                    return unique_id
-    
-
-
-### Generate new transaction ID for CryptoExchange Transaction
-async def generate_new_crypto_exchange_transaction_id():
-    while True:
-        unique_id = str(uuid.uuid4())[:30]
-
-        async with AsyncSession(async_engine) as session:
-                unique_transaction_id_obj = await session.execute(select(CryptoExchange).where(
-                    CryptoExchange.transaction_id == unique_id
-                ))
-                unique_transaction_id = unique_transaction_id_obj.scalar()
-
-                if not unique_transaction_id:
-                    return unique_id
-
-
-
-
 def generate_random_capital_word():
     letters = list(string.ascii_uppercase)
 
@@ -0,0 +1,247 @@
+"""
+Outbound email delivery.
+
+Handlers only put messages on an in-process queue. `pool_size` background workers each
+keep one authenticated SMTP connection open and deliver the queued messages over it, so
+the connect, STARTTLS and login handshake is paid once per connection instead of once per
+message. Temporary failures are retried with exponential backoff.
+
+Email bodies are `string.Template` files under app/templates/mail, loaded and compiled
+once and rendered with HTML escaped values.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+from app.settings import Mail
+import asyncio
+import html
+import logging
+import smtplib
+import time
+
+
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = Path(__file__).parent / 'templates' / 'mail'
+
+
+
+@lru_cache(maxsize=None)
+def load_template(name: str) -> Template:
+    return Template((TEMPLATES_DIR / name).read_text(encoding='utf-8'))
+
+
+def render_template(name: str, **context) -> str:
+    return load_template(name).substitute({key: html.escape(str(value)) for key, value in context.items()})
+
+
+
+class MailMessage:
+    def __init__(self, recipient: str, subject: str, body: str) -> None:
+        self.recipient = recipient
+        self.subject   = subject
+        self.body      = body
+        self.attempts  = 0
+
+
+    def as_mime(self, sender: str) -> MIMEMultipart:
+        msg = MIMEMultipart()
+        msg['From']    = sender
+        msg['To']      = self.recipient
+        msg['Subject'] = self.subject
+
+        msg.attach(MIMEText(self.body, 'html'))
+
+        return msg
+
+
+
+class SMTPConnection:
+    """
+    One persistent SMTP session, opened on first use and reopened after a failure.
+    Only ever used from one worker at a time.
+    """
+
+    def __init__(self, settings: Mail) -> None:
+        self.settings  = settings
+        self.smtp: smtplib.SMTP | None = None
+        self.last_used = 0.0
+        self.opened    = 0
+
+
+    def open(self) -> None:
+        self.close()
+
+        smtp = smtplib.SMTP(self.settings.host, self.settings.port, timeout=self.settings.timeout)
+
+        if self.settings.starttls:
+            smtp.starttls()
+
+        if self.settings.username:
+            smtp.login(self.settings.username, self.settings.password)
+
+        self.smtp      = smtp
+        self.last_used = time.monotonic()
+        self.opened   += 1
+
+
+    def close(self) -> None:
+        if self.smtp is not None:
+            try:
+                self.smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                self.smtp.close()
+
+            self.smtp = None
+
+
+    # Reuse the open session unless it sat idle long enough to have been dropped
+    def ensure_open(self) -> None:
+        if self.smtp is None:
+            self.open()
+
+        elif time.monotonic() - self.last_used > self.settings.idle_timeout:
+            try:
+                if self.smtp.noop()[0] != 250:
+                    self.open()
+            except (smtplib.SMTPException, OSError):
+                self.open()
+
+
+    def send(self, message: MailMessage) -> None:
+        self.ensure_open()
+
+        try:
+            self.smtp.send_message(message.as_mime(self.settings.username), self.settings.username, [message.recipient])
+        except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+            # The server answered, the session is still usable
+            raise
+        except OSError:
+            # Connection lost, force a new session for the retry
+            self.close()
+            raise
+
+        self.last_used = time.monotonic()
+
+
+
+def is_permanent(error: Exception) -> bool:
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+
+    return False
+
+
+
+class MailQueue:
+    """
+    Bounded queue of outbound messages delivered by `pool_size` workers. Messages are
+    dropped (counted in `dropped`) while the queue is full and given up after
+    `max_retries` temporary failures or one permanent failure (counted in `failed`).
+    """
+    # The running queue used by send_mail
+    current: 'MailQueue | None' = None
+
+    def __init__(self, settings: Mail) -> None:
+        self.settings    = settings
+        self.sent        = 0
+        self.failed      = 0
+        self.retried     = 0
+        self.dropped     = 0
+        self.connections = [SMTPConnection(settings) for _ in range(settings.pool_size)]
+        self._queue: asyncio.Queue | None = None
+        self._workers: list[asyncio.Task] = []
+        self._executor: ThreadPoolExecutor | None = None
+
+
+    def start(self) -> None:
+        if not self._workers:
+            self._queue    = asyncio.Queue(maxsize=self.settings.max_queue_size)
+            self._executor = ThreadPoolExecutor(self.settings.pool_size, thread_name_prefix='smtp')
+            self._workers  = [asyncio.create_task(self.run(connection)) for connection in self.connections]
+            MailQueue.current = self
+
+
+    def enqueue(self, message: MailMessage) -> bool:
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning('Mail queue full, dropped email to %s', message.recipient)
+            return False
+
+
+    # Each worker exits at its None message, after delivering what was queued before it
+    async def run(self, connection: SMTPConnection) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            message = await self._queue.get()
+
+            if message is None:
+                break
+
+            while True:
+                try:
+                    await loop.run_in_executor(self._executor, connection.send, message)
+                    self.sent += 1
+                    break
+
+                except Exception as e:
+                    message.attempts += 1
+
+                    if is_permanent(e) or message.attempts > self.settings.max_retries:
+                        self.failed += 1
+                        logger.error('Unable to deliver email to %s: %s', message.recipient, e)
+                        break
+
+                    self.retried += 1
+                    await asyncio.sleep(min(
+                        self.settings.max_backoff,
+                        self.settings.backoff_factor * 2 ** (message.attempts - 1)
+                    ))
+
+        await loop.run_in_executor(self._executor, connection.close)
+
+
+    async def stop(self) -> None:
+        if MailQueue.current is self:
+            MailQueue.current = None
+
+        if self._workers:
+            for _ in self._workers:
+                await self._queue.put(None)
+
+            await asyncio.gather(*self._workers)
+            self._workers = []
+
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+
+def send_mail(recipient: str, subject: str, body: str) -> None:
+    """
+    Queue an email for delivery. Outside of the application (scripts) the email is sent
+    right away on a connection of its own.
+    """
+    message = MailMessage(recipient, subject, body)
+
+    if MailQueue.current is not None:
+        MailQueue.current.enqueue(message)
+        return
+
+    connection = SMTPConnection(Mail())
+
+    try:
+        connection.send(message)
+    finally:
+        connection.close()
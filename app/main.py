@@ -10,6 +10,18 @@ from blacksheep.server.authorization import Policy
 from guardpost.common import AuthenticatedRequirement
 from app.auth import AdminsPolicy
 from app.controllers.controllers import controller_router
+from app.controllers.PG.Mastercard.mastercard import MastercardClient
+from app.controllers.PG.settlement import SettlementWorker
+from app.controllers.PG.APILogs import APILogSink
+from app.controllers.PG.webhook import WebhookDispatcher
+from app.passwords import PasswordHasher
+from app.mail import MailQueue
+from app.fx import FXRates
+from app.metrics import Metrics, metrics_endpoint
+from app.snowflake import WorkerIdLease
+from database.db import dispose_engines, async_engine, async_read_engine
+from database.partitions import PartitionMaintenance
+from app.unit_of_work import unit_of_work_middleware
 from blacksheep.server.env import is_development
 from blacksheep.server.security.hsts import HSTSMiddleware
 from blacksheep.server.compression import use_gzip_compression
@@ -73,6 +85,22 @@ def configure_application(
 
     if not is_development:
         app.middlewares.append(HSTSMiddleware())
+
+    # Commit or roll back the session of the request once the handler is done
+    app.middlewares.append(unit_of_work_middleware)
+
+    # Per route latency, in flight, response size and database metrics.
+    # Route handlers are wrapped after start, outside of every middleware.
+    if settings.monitoring.enabled:
+        app.router.add_get(settings.monitoring.metrics_path, metrics_endpoint)
+
+        async def instrument_application(application: Application) -> None:
+            metrics = application.services.resolve(Metrics)
+            metrics.instrument_engine(async_engine)
+            metrics.instrument_engine(async_read_engine)
+            metrics.instrument_routes(application)
+
+        app.after_start += instrument_application
     
     
     # docs.bind_app(app)
@@ -83,6 +111,104 @@ def configure_application(
     allow_credentials=True,
     max_age=900,
     )
+
+    # Lease the worker id of the ID generator before any ID is issued
+    async def lease_worker_id(application: Application) -> None:
+        await application.services.resolve(WorkerIdLease).acquire()
+
+    app.on_start += lease_worker_id
+
+    # Start background workers
+    async def start_settlement_worker(application: Application) -> None:
+        application.services.resolve(SettlementWorker).start()
+
+    app.on_start += start_settlement_worker
+
+    async def start_api_log_sink(application: Application) -> None:
+        application.services.resolve(APILogSink).start()
+
+    app.on_start += start_api_log_sink
+
+    async def start_webhook_dispatcher(application: Application) -> None:
+        application.services.resolve(WebhookDispatcher).start()
+
+    app.on_start += start_webhook_dispatcher
+
+    async def start_password_hasher(application: Application) -> None:
+        application.services.resolve(PasswordHasher).start()
+
+    app.on_start += start_password_hasher
+
+    async def start_mail_queue(application: Application) -> None:
+        application.services.resolve(MailQueue).start()
+
+    app.on_start += start_mail_queue
+
+    async def start_fx_rates(application: Application) -> None:
+        application.services.resolve(FXRates).start()
+
+    app.on_start += start_fx_rates
+
+    async def start_partition_maintenance(application: Application) -> None:
+        application.services.resolve(PartitionMaintenance).start()
+
+    app.on_start += start_partition_maintenance
+
+    # Stop background workers
+    async def stop_settlement_worker(application: Application) -> None:
+        await application.services.resolve(SettlementWorker).stop()
+
+    app.on_stop += stop_settlement_worker
+
+    # Write the queued merchant API logs before shutting down
+    async def stop_api_log_sink(application: Application) -> None:
+        await application.services.resolve(APILogSink).stop()
+
+    app.on_stop += stop_api_log_sink
+
+    # Finish the running webhook deliveries, the rest stays in the outbox
+    async def stop_webhook_dispatcher(application: Application) -> None:
+        await application.services.resolve(WebhookDispatcher).stop()
+
+    app.on_stop += stop_webhook_dispatcher
+
+    async def stop_password_hasher(application: Application) -> None:
+        application.services.resolve(PasswordHasher).stop()
+
+    app.on_stop += stop_password_hasher
+
+    # Deliver the queued emails before shutting down
+    async def stop_mail_queue(application: Application) -> None:
+        await application.services.resolve(MailQueue).stop()
+
+    app.on_stop += stop_mail_queue
+
+    async def stop_fx_rates(application: Application) -> None:
+        await application.services.resolve(FXRates).stop()
+
+    app.on_stop += stop_fx_rates
+
+    async def stop_partition_maintenance(application: Application) -> None:
+        await application.services.resolve(PartitionMaintenance).stop()
+
+    app.on_stop += stop_partition_maintenance
+
+    # Close pooled outbound connections
+    async def close_mastercard_client(application: Application) -> None:
+        await application.services.resolve(MastercardClient).close()
+
+    app.on_stop += close_mastercard_client
+
+    async def release_worker_id(application: Application) -> None:
+        await application.services.resolve(WorkerIdLease).release()
+
+    app.on_stop += release_worker_id
+
+    # Close the database connection pools last
+    async def dispose_database_engines(application: Application) -> None:
+        await dispose_engines()
+
+    app.on_stop += dispose_database_engines
   
 
     return app
@@ -0,0 +1,267 @@
+"""
+Request and database metrics in the Prometheus text format.
+
+Every route handler is wrapped once the application has started, outside of all the
+middlewares, and records per route (method and pattern, not the requested path):
+the requests per status, the requests in flight, and histograms of the latency, the
+response size, and the SQL statements run and time spent in the database by the request.
+
+Statements are timed by `before/after_cursor_execute` listeners on the engines and added
+to the request running them through a context variable. The application runs on one
+event loop and the listeners run on its thread, so the counters are plain integers and
+floats updated without locks.
+"""
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterable
+from blacksheep import Application, Request, Response
+from blacksheep.contents import Content
+from blacksheep.exceptions import HTTPException
+from guardpost.authorization import AuthorizationError, UnauthorizedError
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+import hmac
+import time
+
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS    = (100, 1000, 10000, 100000, 1000000, 10000000)
+QUERY_BUCKETS   = (0, 1, 2, 5, 10, 20, 50, 100)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+QUERY_STARTED = 'metrics_query_started'
+
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: tuple) -> None:
+        self.buckets = buckets
+        # The last count is the +Inf bucket
+        self.counts  = [0] * (len(buckets) + 1)
+        self.sum     = 0.0
+        self.count   = 0
+
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum   += value
+        self.count += 1
+
+
+    def samples(self, name: str, labels: str) -> Iterable[str]:
+        cumulative = 0
+
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+
+        yield f'{name}_bucket{{{labels},le="+Inf"}} {self.count}'
+        yield f'{name}_sum{{{labels}}} {self.sum}'
+        yield f'{name}_count{{{labels}}} {self.count}'
+
+
+
+class RouteStats:
+    __slots__ = ('labels', 'in_flight', 'statuses', 'latency', 'response_size', 'queries', 'db_time')
+
+    def __init__(self, method: str, route: str) -> None:
+        self.labels        = f'method="{escape(method)}",route="{escape(route)}"'
+        self.in_flight     = 0
+        self.statuses: dict[int, int] = {}
+        self.latency       = Histogram(LATENCY_BUCKETS)
+        self.response_size = Histogram(SIZE_BUCKETS)
+        self.queries       = Histogram(QUERY_BUCKETS)
+        self.db_time       = Histogram(LATENCY_BUCKETS)
+
+
+
+# SQL statements of the running request
+class RequestQueries:
+    __slots__ = ('count', 'duration')
+
+    def __init__(self) -> None:
+        self.count    = 0
+        self.duration = 0.0
+
+
+
+def escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def response_size(response: Response | None) -> int | None:
+    content: Content | None = response.content if response is not None else None
+
+    if content is None:
+        return 0
+
+    # Streamed contents do not know their length
+    return content.length if content.length >= 0 else None
+
+
+
+class Metrics:
+    current_queries: ContextVar[RequestQueries | None] = ContextVar('current_queries', default=None)
+
+    def __init__(self, scrape_token: str = '') -> None:
+        self.scrape_token = scrape_token
+        self.routes: dict[tuple[str, str], RouteStats] = {}
+        self.queries  = 0
+        self.db_time  = 0.0
+        self._engines = set()
+
+
+    def route(self, method: str, route: str) -> RouteStats:
+        key = (method, route)
+
+        if key not in self.routes:
+            self.routes[key] = RouteStats(method, route)
+
+        return self.routes[key]
+
+
+    def instrument(self, method: str, route: str, handler: Callable[[Request], Awaitable[Response]]):
+        stats   = self.route(method, route)
+        queries = self.current_queries
+
+        async def instrumented(request: Request) -> Response:
+            request_queries = RequestQueries()
+            token           = queries.set(request_queries)
+            status          = 500
+            response        = None
+
+            stats.in_flight += 1
+            started = time.perf_counter()
+
+            try:
+                response = await handler(request)
+                status   = response.status if response is not None else 204
+
+                return response
+
+            # Turned into responses by the application, outside of this wrapper
+            except HTTPException as e:
+                status = e.status
+                raise
+
+            except UnauthorizedError:
+                status = 401
+                raise
+
+            except AuthorizationError:
+                status = 403
+                raise
+
+            finally:
+                stats.latency.observe(time.perf_counter() - started)
+                stats.in_flight -= 1
+                stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+                size = response_size(response)
+
+                if size is not None:
+                    stats.response_size.observe(size)
+
+                stats.queries.observe(request_queries.count)
+                stats.db_time.observe(request_queries.duration)
+                queries.reset(token)
+
+        return instrumented
+
+
+    # Wrap the handlers of every route, the application must be started
+    def instrument_routes(self, app: Application) -> None:
+        for method, routes in app.router.routes.items():
+            for route in routes:
+                route.handler = self.instrument(method.decode(), route.pattern.decode(), route.handler)
+
+
+    def instrument_engine(self, engine: AsyncEngine) -> None:
+        sync_engine = engine.sync_engine
+
+        if sync_engine in self._engines:
+            return
+
+        self._engines.add(sync_engine)
+
+        event.listen(sync_engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(sync_engine, 'after_cursor_execute', self._after_cursor_execute)
+
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault(QUERY_STARTED, []).append(time.perf_counter())
+
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info.get(QUERY_STARTED)
+
+        if not started:
+            return
+
+        duration = time.perf_counter() - started.pop()
+
+        self.queries += 1
+        self.db_time += duration
+
+        request_queries = self.current_queries.get()
+
+        if request_queries is not None:
+            request_queries.count    += 1
+            request_queries.duration += duration
+
+
+    def render(self) -> str:
+        routes = list(self.routes.values())
+        lines  = []
+
+        def family(name: str, kind: str, help: str) -> None:
+            lines.append(f'# HELP {name} {help}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        family('http_requests_total', 'counter', 'Requests handled, per route and status.')
+        for stats in routes:
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(f'http_requests_total{{{stats.labels},status="{status}"}} {count}')
+
+        family('http_requests_in_flight', 'gauge', 'Requests being handled, per route.')
+        for stats in routes:
+            lines.append(f'http_requests_in_flight{{{stats.labels}}} {stats.in_flight}')
+
+        histograms = (
+            ('http_request_duration_seconds', 'latency', 'Time to handle a request, per route.'),
+            ('http_response_size_bytes', 'response_size', 'Size of the response bodies, per route.'),
+            ('http_request_db_queries', 'queries', 'SQL statements run by a request, per route.'),
+            ('http_request_db_seconds', 'db_time', 'Time spent in the database by a request, per route.'),
+        )
+
+        for name, attribute, help in histograms:
+            family(name, 'histogram', help)
+
+            for stats in routes:
+                lines.extend(getattr(stats, attribute).samples(name, stats.labels))
+
+        family('db_queries_total', 'counter', 'SQL statements run, requests and background tasks.')
+        lines.append(f'db_queries_total {self.queries}')
+
+        family('db_query_seconds_total', 'counter', 'Time spent running SQL statements.')
+        lines.append(f'db_query_seconds_total {self.db_time}')
+
+        lines.append('')
+
+        return '\n'.join(lines)
+
+
+
+# @get('/metrics'), with the scrape token as bearer token when one is set
+async def metrics_endpoint(request: Request, metrics: Metrics) -> Response:
+    if metrics.scrape_token:
+        authorization = request.get_first_header(b'Authorization') or b''
+
+        if not hmac.compare_digest(authorization, f'Bearer {metrics.scrape_token}'.encode()):
+            return Response(401)
+
+    return Response(200, content=Content(CONTENT_TYPE.encode(), metrics.render().encode()))
@@ -0,0 +1,179 @@
+"""
+Keyset pagination for the list endpoints.
+
+Pages are ordered by `(created, id)` newest first. The first page returns an opaque
+`next_cursor` and the following pages are read with `created, id < cursor`, which stays
+an index range scan however deep the page is. `limit`/`offset` keep working as before.
+
+Totals are optional: `exact` runs a `count(*)` whose result is cached for a few seconds,
+`estimated` reads the planner row estimate through EXPLAIN and `none` skips counting.
+"""
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import ColumnElement
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from datetime import datetime
+from typing import Sequence
+from app.cache import TTLCache
+import base64
+import json
+
+
+
+TOTAL_MODES = ('exact', 'estimated', 'none')
+
+# Exact totals per (query, parameters)
+PAGE_TOTAL_CACHE_SIZE = 1000
+PAGE_TOTAL_CACHE_TTL  = 30
+
+page_total_cache = TTLCache(PAGE_TOTAL_CACHE_SIZE, PAGE_TOTAL_CACHE_TTL)
+
+
+
+def encode_cursor(created_at: datetime | None, id: int) -> str:
+    payload = json.dumps([created_at.isoformat() if created_at else None, id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime | None, int]:
+    try:
+        payload        = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, id = json.loads(payload)
+
+        if not isinstance(id, int) or isinstance(id, bool):
+            raise ValueError
+
+        return (datetime.fromisoformat(created_at) if created_at is not None else None), id
+
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+
+
+class PageRequest:
+    """
+    Pagination query parameters of a list endpoint.
+
+    - limit: rows per page
+    - offset: rows to skip, ignored when a cursor is given
+    - cursor: `next_cursor` of the previous page
+    - total: exact (default), estimated or none
+    """
+
+    def __init__(self, limit: int, offset: int = 0, cursor: str | None = None, total: str = 'exact') -> None:
+        if limit <= 0 or offset < 0:
+            raise ValueError('limit must be positive and offset can not be negative')
+
+        if total not in TOTAL_MODES:
+            raise ValueError(f'total must be one of {", ".join(TOTAL_MODES)}')
+
+        self.limit  = limit
+        self.offset = offset
+        self.cursor = decode_cursor(cursor) if cursor else None
+        self.total  = total
+
+
+
+class Page:
+    def __init__(self, rows: Sequence, limit: int, next_cursor: str | None, total: int | None) -> None:
+        self.rows        = rows
+        self.limit       = limit
+        self.next_cursor = next_cursor
+        self.total       = total
+
+    # Entities of a `select(Model)` page
+    def scalars(self) -> list:
+        return [row[0] for row in self.rows]
+
+    # Number of pages as the endpoints report it, None without a total
+    @property
+    def page_count(self) -> float | None:
+        return self.total / self.limit if self.total is not None else None
+
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: Select) -> None:
+        self.statement = statement
+
+
+@compiles(Explain, 'postgresql')
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return 'EXPLAIN (FORMAT JSON) ' + compiler.process(element.statement, **kw)
+
+
+
+async def count_rows(session: AsyncSession, statement: Select, mode: str = 'exact') -> int | None:
+    """
+    Total rows of `statement` as requested by `mode`.
+    """
+    if mode == 'none':
+        return None
+
+    statement = statement.order_by(None).limit(None).offset(None)
+
+    if mode == 'estimated':
+        plan = (await session.execute(Explain(statement))).scalar()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    compiled = statement.compile()
+    key      = (str(compiled), repr(sorted(compiled.params.items())))
+    total    = page_total_cache.get(key)
+
+    if total is None:
+        total = await session.scalar(select(func.count()).select_from(statement.subquery()))
+        page_total_cache.set(key, total)
+
+    return total
+
+
+
+async def paginate(
+    session: AsyncSession,
+    statement: Select,
+    page: PageRequest,
+    id_column: ColumnElement,
+    created_column: ColumnElement | None = None,
+    count_statement: Select | None = None
+) -> Page:
+    """
+    Read one page of `statement` newest first.
+
+    Without `created_column` the cursor only covers the id. `count_statement` selects the
+    same rows as `statement` with fewer joins and is used for the total instead. Rows whose
+    created value is NULL can not be reached through a cursor.
+    """
+    keys = [created_column, id_column] if created_column is not None else [id_column]
+
+    query = statement.add_columns(
+        *[key.label(f'_cursor_{i}') for i, key in enumerate(keys)]
+    ).order_by(None).order_by(
+        *[key.desc() for key in keys]
+    ).limit(page.limit + 1)
+
+    if page.cursor:
+        created_at, id = page.cursor
+
+        if created_column is not None:
+            query = query.where(tuple_(created_column, id_column) < tuple_(created_at, id))
+        else:
+            query = query.where(id_column < id)
+
+    elif page.offset:
+        query = query.offset(page.offset)
+
+    rows = (await session.execute(query)).all()
+
+    next_cursor = None
+    if len(rows) > page.limit:
+        *created_at, id = rows[page.limit - 1][-len(keys):]
+        next_cursor     = encode_cursor(created_at[0] if created_at else None, id)
+
+    total = await count_rows(session, count_statement if count_statement is not None else statement, page.total)
+
+    return Page(rows[:page.limit], page.limit, next_cursor, total)
@@ -0,0 +1,104 @@
+"""
+Password hashing off the event loop.
+
+bcrypt takes 100-300 ms per hash at the default cost and releases the GIL while it
+works, so hashes run on a small dedicated thread pool and the loop keeps serving other
+requests meanwhile. Hashes made with another cost than the configured one are replaced
+the next time their user logs in.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.settings import Passwords
+import asyncio
+import bcrypt
+
+
+
+class PasswordHasher:
+    """
+    Hashes and verifies bcrypt passwords on at most `max_workers` threads. Calls beyond
+    that wait in the pool queue without blocking the event loop.
+    """
+    # The running hasher used by hash_password and verify_password
+    current: 'PasswordHasher | None' = None
+
+    def __init__(self, settings: Passwords) -> None:
+        self.settings  = settings
+        self._executor: ThreadPoolExecutor | None = None
+
+
+    def start(self) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.settings.max_workers, thread_name_prefix='bcrypt')
+            PasswordHasher.current = self
+
+
+    def stop(self) -> None:
+        if PasswordHasher.current is self:
+            PasswordHasher.current = None
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+    def hash_sync(self, password: str) -> str:
+        salt = bcrypt.gensalt(self.settings.bcrypt_rounds)
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        try:
+            return int(hashed_password.split('$')[2]) != self.settings.bcrypt_rounds
+        except (IndexError, ValueError):
+            return False
+
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.hash_sync, password)
+
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, bcrypt.checkpw, password.encode('utf-8'), hashed_password.encode('utf-8')
+        )
+
+
+
+def _hasher() -> PasswordHasher:
+    # Outside of the application (scripts, tests) hash on the default executor
+    return PasswordHasher.current or PasswordHasher(Passwords())
+
+
+async def hash_password(password: str) -> str:
+    return await _hasher().hash(password)
+
+
+async def verify_password(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Check `password` against `hashed_password`. Returns whether it matches and, when it
+    does and the hash uses another cost than the configured one, a new hash to store.
+    """
+    hasher = _hasher()
+
+    if not await hasher.verify(password, hashed_password):
+        return False, None
+
+    if hasher.needs_rehash(hashed_password):
+        return True, await hasher.hash(password)
+
+    return True, None
+
+
+async def verify_user_password(session: AsyncSession, user, password: str) -> bool:
+    """
+    Check the login password of `user` and store a rehashed password when needed.
+    """
+    valid, new_hash = await verify_password(password, user.password)
+
+    if new_hash:
+        user.password = new_hash
+        await session.commit()
+        await session.refresh(user)
+
+    return valid
@@ -0,0 +1,163 @@
+"""
+Routing table of the pipes a merchant can take payments through.
+
+Checkout listed the pipes of a merchant with one query for the MerchantPIPE rows, one per
+pipe and one per currency, and payment creation loaded the assigned pipes again. Here the
+active pipes of a merchant, with their currency, medium, limits and fee, are loaded by one
+joined statement and kept in memory, so checkout and payment creation pick a pipe without
+a round trip.
+
+Committing a session that wrote a MerchantPIPE row drops the table of that merchant,
+writing a PIPE or Currency row drops every table, as any merchant may route through it.
+"""
+from itertools import chain
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from Models.models import Currency
+from Models.models2 import MerchantPIPE, PIPE
+from app.cache import TTLCache
+
+
+
+PIPE_ROUTES_CACHE_SIZE = 10000
+PIPE_ROUTES_CACHE_TTL  = 300
+
+pipe_routes_cache = TTLCache(PIPE_ROUTES_CACHE_SIZE, PIPE_ROUTES_CACHE_TTL)
+
+# Version of every table and generation of the table of each merchant,
+# bumping them drops the cached tables
+_version = 0
+_generations: dict[int, int] = {}
+
+CHANGED_PIPE_ROUTES = 'pipe_routes_changed'
+
+# Written to the session info instead of a merchant id when every table changed
+ALL_MERCHANTS = None
+
+
+
+# An active pipe assigned to a merchant
+class PipeRoute:
+    def __init__(self, merchant_pipe_id: int, pipe_id: int, name: str, payment_medium: str | None,
+                 currency: str | None, fee: float | None, settlement_period: str | None,
+                 min_amount: int | None, max_amount: int | None) -> None:
+        self.merchant_pipe_id  = merchant_pipe_id
+        self.pipe_id           = pipe_id
+        self.name              = name
+        self.payment_medium    = payment_medium
+        self.currency          = currency
+        self.fee               = fee or 0
+        self.settlement_period = settlement_period or ''
+        self.min_amount        = min_amount or 0
+        self.max_amount        = max_amount or 0
+
+
+    # Limits of 0 are not enforced
+    def accepts(self, amount: float | None = None, currency: str | None = None, payment_medium: str | None = None) -> bool:
+        if currency and self.currency and currency != self.currency:
+            return False
+
+        if payment_medium and self.payment_medium and payment_medium.lower() != self.payment_medium.lower():
+            return False
+
+        if amount is not None:
+            if self.min_amount and amount < self.min_amount:
+                return False
+
+            if self.max_amount and amount > self.max_amount:
+                return False
+
+        return True
+
+
+    def as_checkout(self) -> dict:
+        return {
+            'pipe_name': self.name,
+            'payment_medium': self.payment_medium,
+            'payment_currency': self.currency,
+        }
+
+
+
+def invalidate_pipe_routes(merchant_id: int | None = ALL_MERCHANTS) -> None:
+    global _version
+
+    if merchant_id is ALL_MERCHANTS:
+        _version += 1
+    else:
+        _generations[merchant_id] = _generations.get(merchant_id, 0) + 1
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changed_pipe_routes(session: Session, flush_context) -> None:
+    for instance in chain(session.new, session.dirty, session.deleted):
+        if isinstance(instance, MerchantPIPE):
+            session.info.setdefault(CHANGED_PIPE_ROUTES, set()).add(instance.merchant)
+
+        elif isinstance(instance, (PIPE, Currency)):
+            session.info.setdefault(CHANGED_PIPE_ROUTES, set()).add(ALL_MERCHANTS)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_changed_pipe_routes(session: Session) -> None:
+    for merchant_id in session.info.pop(CHANGED_PIPE_ROUTES, ()):
+        invalidate_pipe_routes(merchant_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_changed_pipe_routes(session: Session) -> None:
+    session.info.pop(CHANGED_PIPE_ROUTES, None)
+
+
+
+def merchant_routes_statement(merchant_id: int):
+    return select(
+        MerchantPIPE.id,
+        MerchantPIPE.pipe,
+        PIPE.name,
+        PIPE.payment_medium,
+        Currency.name,
+        MerchantPIPE.fee,
+        PIPE.settlement_period,
+        PIPE.bank_min_trans_limit,
+        PIPE.bank_max_trans_limit,
+    ).join(
+        PIPE, PIPE.id == MerchantPIPE.pipe
+    ).outerjoin(
+        Currency, Currency.id == PIPE.process_curr
+    ).where(
+        MerchantPIPE.merchant  == merchant_id,
+        MerchantPIPE.is_active == True,
+        PIPE.is_active         == True,
+    ).order_by(MerchantPIPE.id)
+
+
+async def merchant_routes(session: AsyncSession, merchant_id: int) -> list[PipeRoute]:
+    """
+    Active pipes assigned to the merchant, in the order they were assigned.
+    """
+    # Read before loading, a table loaded while it changed is stored under the old key
+    key    = (merchant_id, _version, _generations.get(merchant_id, 0))
+    routes = pipe_routes_cache.get(key)
+
+    if routes is None:
+        rows   = await session.execute(merchant_routes_statement(merchant_id))
+        routes = [PipeRoute(*row) for row in rows.all()]
+
+        pipe_routes_cache.set(key, routes)
+
+    return routes
+
+
+async def pick_route(session: AsyncSession, merchant_id: int, amount: float | None = None,
+                     currency: str | None = None, payment_medium: str | None = None) -> PipeRoute | None:
+    """
+    First active pipe of the merchant accepting the amount, currency and payment medium,
+    None when there is none.
+    """
+    for route in await merchant_routes(session, merchant_id):
+        if route.accepts(amount, currency, payment_medium):
+            return route
+
+    return None
@@ -13,7 +13,7 @@ from app.dateFormat import get_date_range
 
 
 # Get all merchant withdrawals
-@auth('userauth')
+@auth('admin')
 @get('/api/v4/admin/merchant/pg/withdrawals/')
 async def AdminMerchantWithdrawalRequests(request: Request, limit: int = 10, offset: int = 0):
     """
@@ -39,23 +39,8 @@ async def AdminMerchantWithdrawalRequests(request: Request, limit: int = 10, off
     """
     try:
         async with AsyncSession(async_engine) as session:
-            # Authenticate Admin
-            user_identity = request.identity
-            user_id       = user_identity.claims.get('user_id') if user_identity else None
-
             combined_data = []
 
-            admin_user_obj = await session.execute(select(Users).where(
-                Users.id == user_id
-            ))
-            admin_user = admin_user_obj.scalar()
-
-            is_admin_user = admin_user.is_admin
-
-            if not is_admin_user:
-                return json({'error': 'Admin authentication failed'}, 401)
-            # Admin authentication Ends
-
             # Get all the merchant withdrawals
             stmt = select(MerchantWithdrawals.id, 
                           MerchantWithdrawals.merchant_id,
@@ -146,7 +131,7 @@ async def AdminMerchantWithdrawalRequests(request: Request, limit: int = 10, off
 
 
 # Update Merchant withdrawals by Admin
-@auth('userauth')
+@auth('admin')
 @put('/api/v4/admin/merchant/withdrawal/update/')
 async def MerchantWithdrawalTransactionUpdate(request: Request, schema: AdminWithdrawalUpdateSchema):
      """
@@ -176,19 +161,6 @@ async def MerchantWithdrawalTransactionUpdate(request: Request, schema: AdminWit
      """
      try:
           async with AsyncSession(async_engine) as session:
-               # Admin Authentication
-               user_identity = request.identity
-               user_id       = user_identity.claims.get('user_id') if user_identity else None
-
-               admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == user_id
-               ))
-               admin_user = admin_user_obj.scalar()
-
-               if not admin_user.is_admin:
-                    return json({'error': 'Admin authentication failed'}, 401)
-               # Admin authentication ends here
-
                # Payload data
                status        = schema.status
                withdrawal_id = schema.withdrawal_id
@@ -253,7 +225,7 @@ async def MerchantWithdrawalTransactionUpdate(request: Request, schema: AdminWit
 
 
 # Search Withdrawal transactions by Admin
-@auth('userauth')
+@auth('admin')
 @get('/api/v4/admin/merchant/withdrawal/search/')
 async def MerchantWithdrawalTransactionSearch(request: Request, query: str):
      """
@@ -279,19 +251,6 @@ async def MerchantWithdrawalTransactionSearch(request: Request, query: str):
      """
      try:
           async with AsyncSession(async_engine) as session:
-               # Admin Authentication
-               user_identity = request.identity
-               user_id       = user_identity.claims.get('user_id') if user_identity else None
-
-               admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == user_id
-               ))
-               admin_user = admin_user_obj.scalar()
-
-               if not admin_user.is_admin:
-                    return json({'error': 'Admin authentication failed'}, 401)
-               # Admin authentication ends here
-
                query_date = None
                query_time = None
 
@@ -443,7 +402,7 @@ async def MerchantWithdrawalTransactionSearch(request: Request, query: str):
 
 
 # Export all merchant withdrawals by Admin
-@auth('userauth')
+@auth('admin')
 @get('/api/v4/admin/merchant/pg/export/withdrawals/')
 async def AdminMerchantExportWithdrawalRequests(request: Request):
     """
@@ -462,23 +421,8 @@ async def AdminMerchantExportWithdrawalRequests(request: Request):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            # Authenticate Admin
-            user_identity = request.identity
-            user_id       = user_identity.claims.get('user_id') if user_identity else None
-
             combined_data = []
 
-            admin_user_obj = await session.execute(select(Users).where(
-                Users.id == user_id
-            ))
-            admin_user = admin_user_obj.scalar()
-
-            is_admin_user = admin_user.is_admin
-
-            if not is_admin_user:
-                return json({'error': 'Admin authentication failed'}, 401)
-            # Admin authentication Ends
-
             # Get all the merchant withdrawals
             stmt = select(MerchantWithdrawals.id, 
                           MerchantWithdrawals.merchant_id,
@@ -553,7 +497,7 @@ async def AdminMerchantExportWithdrawalRequests(request: Request):
 
 
 ## Filter Merchant Withdrawals by Admin
-@auth('userauth')
+@auth('admin')
 @post('/api/v4/admin/filter/merchant/withdrawals/')
 async def filter_merchant_withdrawals(request: Request, schema: FilterMerchantWithdrawalsSchema, limit: int = 10, offset: int = 0):
      """
@@ -587,19 +531,6 @@ async def filter_merchant_withdrawals(request: Request, schema: FilterMerchantWi
      """
      try:
           async with AsyncSession(async_engine) as session:
-               user_identity = request.identity
-               user_id       = user_identity.claims.get('user_id')
-
-               # Admin authentication
-               admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == user_id
-               ))
-               admin_user = admin_user_obj.scalar()
-
-               if not admin_user.is_admin:
-                    return json({'message': 'Admin authorization failed'}, 401)
-               # Admin authentication ends
-
                combined_data = []
 
                ## Get The payload data
@@ -9,7 +9,7 @@ from typing import List
 
 
 # Get all the Admin users
-@auth('userauth')
+@auth('admin')
 @get('/api/v2/admin/users/')
 async def AdminUsers(request: Request, limit: int = 10, offset: int = 0):
     """
@@ -34,21 +34,8 @@ async def AdminUsers(request: Request, limit: int = 10, offset: int = 0):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            # Authenticate Admin
-            user_identity = request.identity
-            user_id       = user_identity.claims.get('user_id')
-
             combined_data = []
 
-            adminUserObj = await session.execute(select(Users).where(
-                Users.id == user_id
-            ))
-            adminUser = adminUserObj.scalar()
-
-            if not adminUser.is_admin:
-                return json({'message': 'Admin authorization failed'}, 401)
-            # Admin authentication ends here
-
             count_stmt     = select(func.count(Users.id)).select_from(Users).where(Users.is_admin == True)
             total_rows_obj = await session.execute(count_stmt)
             total_rows     = total_rows_obj.scalar()
@@ -103,7 +90,7 @@ async def AdminUsers(request: Request, limit: int = 10, offset: int = 0):
 
 
 # Export all AdMin user data
-@auth('userauth')
+@auth('admin')
 @get('/api/v2/export/admin/users/')
 async def ExportAdminUsers(request: Request):
     """
@@ -125,21 +112,8 @@ async def ExportAdminUsers(request: Request):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            # Authenticate Admin
-            user_identity = request.identity
-            user_id       = user_identity.claims.get('user_id')
-
             combined_data = []
 
-            adminUserObj = await session.execute(select(Users).where(
-                Users.id == user_id
-            ))
-            adminUser = adminUserObj.scalar()
-
-            if not adminUser.is_admin:
-                return json({'message': 'Admin authorization failed'}, 401)
-            # Admin authentication ends here
-
             # Execute Join query to get admin data
             stmt = select(
                 Users.id,
@@ -176,7 +150,7 @@ async def ExportAdminUsers(request: Request):
 
 
 # Search Admin users
-@auth('userauth')
+@auth('admin')
 @get('/api/v2/search/admin/users/')
 async def SearchAdminUsers(request: Request, query: str = ''):
     """
@@ -202,21 +176,8 @@ async def SearchAdminUsers(request: Request, query: str = ''):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            # Authenticate Admin
-            user_identity = request.identity
-            user_id       = user_identity.claims.get('user_id')
-
             combined_data = []
 
-            adminUserObj = await session.execute(select(Users).where(
-                Users.id == user_id
-            ))
-            adminUser = adminUserObj.scalar()
-
-            if not adminUser.is_admin:
-                return json({'message': 'Admin authorization failed'}, 401)
-            # Admin authentication ends here
-
             # Search Active status wise
             if query.lower() == 'active':
                 searched_user_obj = await session.execute(select(Users).where(
@@ -13,7 +13,7 @@ import re
 
 
 ## Get all the available balances of the merchant
-@auth('userauth')
+@auth('admin')
 @get('/api/v7/admin/merchant/account/balance/')
 async def merchant_account_balance(self, request: Request, id: int, currency: str):
     """
@@ -39,21 +39,8 @@ async def merchant_account_balance(self, request: Request, id: int, currency: st
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity = request.identity
-            admin_id      = user_identity.claims.get('user_id')
-
             merchantID = id
 
-            # Admin Authentication
-            admin_user_obj = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            admin_user = admin_user_obj.scalar()
-
-            if not admin_user.is_admin:
-                return json({"message": 'Admin authentication failed'}, 401)
-            # Admin authentication ends
-
             ## Get available mature balance of the merchant
             merchant__balance_obj = await session.execute(select(MerchantAccountBalance).where(
                 and_(
@@ -78,7 +65,7 @@ async def merchant_account_balance(self, request: Request, id: int, currency: st
 
 
 # Update Merchant settlement periods
-@auth('userauth')
+@auth('admin')
 @put('/api/v7/admin/merchant/update/period/')
 async def merchant_update_settlement_period(self, request: Request, schema: MerchantBalancePeriodUpdateSchema):
     """
@@ -106,19 +93,6 @@ async def merchant_update_settlement_period(self, request: Request, schema: Merc
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity = request.identity
-            admin_id      = user_identity.claims.get('user_id')
-
-            # # Admin Authentication
-            admin_user_obj = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            admin_user = admin_user_obj.scalar()
-
-            if not admin_user.is_admin:
-                return json({"message": 'Admin authentication failed'}, 401)
-            # Admin authentication ends
-
             # Get payload data
             merchantID             = schema.merchant_id
             settlement_period      = schema.settlement_period
@@ -156,7 +130,7 @@ async def merchant_update_settlement_period(self, request: Request, schema: Merc
 
 
 ## Get settlement period, Frozen balance by Admin
-@auth('userauth')
+@auth('admin')
 @get('/api/v7/admin/merchant/balance/period/{user_id}/')
 async def merchant_balance_period(self, request: Request, user_id: int):
     """
@@ -187,19 +161,6 @@ async def merchant_balance_period(self, request: Request, user_id: int):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity = request.identity
-            admin_id      = user_identity.claims.get('user_id')
-
-            # # Admin Authentication
-            admin_user_obj = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            admin_user = admin_user_obj.scalar()
-
-            if not admin_user.is_admin:
-                return json({"message": 'Admin authentication failed'}, 401)
-            # Admin authentication ends
-
             # Get minimum withdrawal amount of the merchant
             merchant_user_obj = await session.execute(select(Users).where(
                 Users.id == user_id
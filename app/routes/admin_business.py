@@ -60,7 +60,7 @@ async def save_business_logo(request: Request):
 
 
 #Update Business by Admin
-@auth('userauth')
+@auth('admin')
 @put('/api/admin/merchant/update/')
 async def business_update(self, request: Request, query: str = ''):
     """
@@ -103,9 +103,6 @@ async def business_update(self, request: Request, query: str = ''):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity = request.identity
-            AdminID       = user_identity.claims.get('user_id') if user_identity else None
-
             request_body = await request.form()
 
             #Request Payload Validation##
@@ -134,18 +131,6 @@ async def business_update(self, request: Request, query: str = ''):
             merchant_id  = int(merchant_id)
             fee          = float(fee)
 
-            #Check the user is Admin or not
-            try:
-                admin_obj      = await session.execute(select(Users).where(Users.id == AdminID))
-                admin_obj_data = admin_obj.scalar()
-
-                if not admin_obj_data.is_admin:
-                    return json({'msg': 'Only admin can update the Merchant details'}, 401)
-                
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            #Admin Check Finish
-
             #Get the merchant with requested merchant ID
             try:
                 merchant_obj      = await session.execute(select(BusinessProfile).where(BusinessProfile.id == merchant_id))
@@ -259,7 +244,7 @@ async def business_update(self, request: Request, query: str = ''):
 
 #View all Businesses by Admin
 ##############################
-@auth('userauth')
+@auth('admin')
 @get('/api/admin/all/merchant/')
 async def view_all_business(request: Request, limit: int = 15, offset: int = 0):
     """
@@ -291,21 +276,6 @@ async def view_all_business(request: Request, limit: int = 15, offset: int = 0):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity = request.identity
-            AdminID       = user_identity.claims.get('user_id') if user_identity else None
-
-            #Check the user is Admin or not
-            try:
-                admin_obj      = await session.execute(select(Users).where(Users.id == AdminID))
-                admin_obj_data = admin_obj.scalar()
-
-                if not admin_obj_data.is_admin:
-                    return json({'msg': 'Only admin can update the Merchant details'}, 401)
-                
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            #Admin Verification Complete
-
             try:
                 merchant_obj = await session.execute(select(BusinessProfile).order_by(desc(BusinessProfile.id)).limit(limit).offset(offset))
                 merchant_obj_data = merchant_obj.scalars().all()
@@ -407,7 +377,7 @@ async def view_all_business(request: Request, limit: int = 15, offset: int = 0):
 
 
 # Search Business Data
-@auth('userauth')
+@auth('admin')
 @get('/api/v2/admin/search/merchant/')
 async def search_business(self, request: Request, query: str):
     """
@@ -433,22 +403,12 @@ async def search_business(self, request: Request, query: str):
             - Error 400: 'error': 'No result found'.<br/>
             - Error 500: 'error': 'Server Error'.<br/>
     """
-    user_identity   = request.identity
-    AdminID         = user_identity.claims.get("user_id") if user_identity else None
 
     searched_text = query
 
     try:
         async with AsyncSession(async_engine) as session:
 
-            # Admin Authentication
-            user_obj = await session.execute(select(Users).where(Users.id == AdminID))
-            user_obj_data = user_obj.scalar()
-
-            if not user_obj_data.is_admin:
-                return json({'msg': 'Only admin can view the Transactions'}, 400)
-            # Admin Authentication ends
-            
             # Convert to int if starts with integer
             if re.fullmatch(r'\d+', searched_text):
                 parsed_value = int(searched_text)
@@ -620,7 +580,7 @@ async def search_business(self, request: Request, query: str):
 
 
 # Export All Business by Admin
-@auth('userauth')
+@auth('admin')
 @get('/api/v2/admin/export/business/')
 async def exportMerchantBusiness(request: Request):
     """
@@ -642,19 +602,8 @@ async def exportMerchantBusiness(request: Request):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity = request.identity
-            admin_id       = user_identity.claims.get('user_id') if user_identity else None
-            
             combined_data = []
 
-            # Admin Authentication
-            admin_obj = await session.execute(select(Users).where(Users.id == admin_id))
-            admin_obj_data = admin_obj.scalar()
-
-            if not admin_obj_data.is_admin:
-                return json({'msg': 'Admin authorization failed'}, 401)
-            # Admin Authentication ends
-
             # Execute join query
             stmt = select(
                 BusinessProfile.id,
@@ -704,7 +653,7 @@ async def exportMerchantBusiness(request: Request):
 
 
 ## Filter business by Admin
-@auth('userauth')
+@auth('admin')
 @post('/api/v2/admin/filter/merchant/business/')
 async def filter_business(request: Request, schema: FilterBusinsessPage, limit: int = 10, offset: int = 0):
     """
@@ -735,19 +684,6 @@ async def filter_business(request: Request, schema: FilterBusinsessPage, limit:
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity = request.identity
-            admin_id       = user_identity.claims.get('user_id')
-
-            # Authenticate admin
-            admin_user_obj = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            admin_user = admin_user_obj.scalar()
-
-            if not admin_user.is_admin:
-                return json({'message': 'Admin authorization failed'}, 401)
-            # Admin authentication failed
-
             # get payload data
             date_time     = schema.date
             merchant_name = schema.merchant_name
@@ -2,7 +2,6 @@ from blacksheep import Request, json, get
 from blacksheep.server.authorization import auth
 from database.db import AsyncSession, async_engine
 from Models.models2 import MerchantProdTransaction
-from Models.models import Users
 from sqlmodel import select, and_
 
 
@@ -10,7 +9,7 @@ from sqlmodel import select, and_
 
 
 # Get All the success Transaction Amount  
-@auth('userauth')
+@auth('admin')
 @get('/api/v3/admin/merchant/success/transactions/')
 async def AdminDashTransactionAmount(self, request: Request):
     """
@@ -38,21 +37,6 @@ async def AdminDashTransactionAmount(self, request: Request):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity = request.identity
-            user_id       = user_identity.claims.get('user_id') if user_identity else None
-
-            #Admin Authentication
-            admin_user_obj = await session.execute(select(Users).where(
-                Users.id == user_id
-            ))
-            admin_user = admin_user_obj.scalar()
-
-            is_admin_user = admin_user.is_admin
-
-            # If not admin user
-            if not is_admin_user:
-                return json({'message': 'Only Admin users'}, 400)
-            
             # fetch all the transactions
             merchant_transactions_object = await session.execute(select(MerchantProdTransaction).where(
                     MerchantProdTransaction.is_completd == True
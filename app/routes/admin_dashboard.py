@@ -1,7 +1,6 @@
 from blacksheep import json, Request, get
 from blacksheep.server.authorization import auth
-from database.db import AsyncSession, async_engine
-from Models.models import Users
+from database.db import session_for
 from Models.models2 import MerchantProdTransaction, PIPE
 from Models.models3 import MerchantWithdrawals
 from sqlmodel import select, and_, func
@@ -11,7 +10,7 @@ from datetime import datetime, timedelta
 
 
 # Pipe transactions in Admin dashboard  
-@auth('userauth')
+@auth('admin')
 @get('/api/v6/admin/dash/pipe/transactions/')
 async def Admin_dashPipeTransactions(self, request: Request, currency: str = 'USD'):
     """
@@ -36,20 +35,7 @@ async def Admin_dashPipeTransactions(self, request: Request, currency: str = 'US
             - Error 404: No Transaction Found<br/>
     """
     try:
-        async with AsyncSession(async_engine) as session:
-            user_identity = request.identity
-            admin_id       = user_identity.claims.get('user_id')
-
-            # Admin authentication
-            admin_user_obj = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            admin_user = admin_user_obj.scalar()
-
-            if not admin_user.is_admin:
-                return json({'message': 'Admin authorization failed'}, 401)
-            # Admin authentication ends here
-
+        async with session_for('dashboard') as session:
             # Get Transactions for every pipe
             stmt = select(
                 MerchantProdTransaction.currency,
@@ -86,7 +72,7 @@ async def Admin_dashPipeTransactions(self, request: Request, currency: str = 'US
 
 
 # Dashboard Income and Outcome
-@auth('userauth')
+@auth('admin')
 @get('/api/v6/admin/dash/income/stats/')
 async def Dashboard_Income_Outcome(request: Request):
     """
@@ -109,20 +95,7 @@ async def Dashboard_Income_Outcome(request: Request):
                 - Error 500: 'error': 'Server Error'<br/>
     """
     try:
-        async with AsyncSession(async_engine) as session:
-            # Authenticate user as admin
-            user_identity = request.identity
-            user_id       = user_identity.claims.get('user_id')
-
-            admin_user_obj = await session.execute(select(Users).where(
-                Users.id == user_id
-            ))
-            admin_user = admin_user_obj.scalar()
-
-            if not admin_user.is_admin:
-                return json({'message': 'Admin authentication failed'}, 401)
-            # Admin authentication ends here
-
+        async with session_for('dashboard') as session:
             # Get the start (Sunday) and end (Saturday) of the current week
             today = datetime.now()
             start_of_week = today - timedelta(days=today.weekday() + 1)
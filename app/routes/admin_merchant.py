@@ -2,7 +2,9 @@ from blacksheep.server.controllers import APIController
 from Models.schemas import UserDeleteSchema, AdminUpdateUserSchema, AdminUserCreateSchema
 from blacksheep import FromJSON, Request, json, delete, put, get, post
 from database.db import AsyncSession, async_engine
-from app.auth import encrypt_password, send_email
+from app.auth import send_email
+from app.passwords import hash_password
+from app.mail import render_template
 from Models.models import Users, Kycdetails, Wallet, Currency, TestModel, Group
 from blacksheep.server.authorization import auth
 from sqlmodel import select, and_, desc
@@ -35,7 +37,7 @@ else:
 
 #Delete User by Admin
 @docs(responses={200: 'All the data related to user (Transactions, Wallet, Kyc) will be deleted'})
-@auth('userauth')
+@auth('admin')
 @post('/api/v1/admin/del/user/')
 async def delete_user(self, request: Request, delete_user: FromJSON[UserDeleteSchema]):
     """
@@ -57,24 +59,8 @@ async def delete_user(self, request: Request, delete_user: FromJSON[UserDeleteSc
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity   = request.identity
-            adminID          = user_identity.claims.get("user_id") if user_identity else None
-
             user      = delete_user.value
             user_id   = user.user_id
-        
-            #Check the user is admin or Not
-            try:
-                user_obj = await session.execute(select(Users).where(Users.id == adminID))
-                user_obj_data = user_obj.scalar()
-
-                if not user_obj_data.is_admin:
-                    return json({'msg': 'Only admin can create users'}, 400)
-
-            except Exception as e:
-                return json({'msg': 'Unable to get Admin detail', 'error': f'{str(e)}'}, 400)
-            #Autnentication ends here
-
 
             try:
                 user_obj = await session.execute(select(Users).where(Users.id == user_id))
@@ -150,7 +136,7 @@ async def delete_user(self, request: Request, delete_user: FromJSON[UserDeleteSc
 
 # Update user kyc by Admin
 @docs(responses={200: 'Update user profile and kyc status'})
-@auth('userauth')
+@auth('admin')
 @put('/api/v1/admin/update/user/')
 async def update_user(self, request: Request, user_update_schema: FromJSON[AdminUpdateUserSchema]):
     """
@@ -158,24 +144,8 @@ async def update_user(self, request: Request, user_update_schema: FromJSON[Admin
     """
     try:
         async with AsyncSession(async_engine) as session:
-            # Authenticate user as Admin
-            user_identity    = request.identity  
-            adminID          = user_identity.claims.get("user_id") if user_identity else None
-
             mail_sent = True  ## Mail send status
 
-            # Admin authentication
-            try:
-                user_obj      = await session.execute(select(Users).where(Users.id == adminID))
-                user_obj_data = user_obj.scalar()
-
-                if not user_obj_data.is_admin:
-                    return json({'msg': 'Only admin can create users'}, 400)
-
-            except Exception as e:
-                return json({'msg': 'Unable to get Admin detail', 'error': f'{str(e)}'}, 400)
-            #Autnentication ends here
-
             # Get the payload values
             value = user_update_schema.value
 
@@ -293,24 +263,7 @@ async def update_user(self, request: Request, user_update_schema: FromJSON[Admin
 
                         link = f'{url}/signin/'
 
-                        body = f"""
-                              <html>
-                                <body>
-                                    <b>Dear {user_data_obj.first_name} {user_data_obj.lastname},</b>
-
-                                    <p>We are pleased to inform you that your KYC verification has been successfully completed. 
-                                    Your details have been authenticated, and your account is now active</p>
-                                    <p>You can now <a href="{link}">Login</a> to our system using your credentials. 
-                                    Please note that your login details are confidential, and we advise you to keep them secure.</p>
-
-                                    <p>If you have any questions or need assistance, feel free to reach out to us.</p>
-                                    <p>Thank you for choosing Itio Innovex Pvt. Ltd. We look forward to providing you with the best possible experience.</p>
-
-                                    <p><b>Best Regards,</b><br>
-                                    <b>Itio Innovex Pvt. Ltd.</b></p>
-                                </body>
-                                </html>
-                                """
+                        body = render_template('kyc_approved.html', first_name=user_data_obj.first_name, last_name=user_data_obj.lastname, link=link)
                         try:
                             await send_email(user_data_obj.email, "KYC Verification Successful - Login Credentials Activated", body)
                         except Exception as e:
@@ -428,7 +381,7 @@ async def update_user(self, request: Request, user_update_schema: FromJSON[Admin
 
 #Search Merchant users
 @docs(responses={200: 'Search Merchantss'})
-@auth('userauth')
+@auth('admin')
 @get('/api/v1/admin/user/search/')
 async def get_searchedeusers(request: Request, query: str = ''):
     """
@@ -453,17 +406,6 @@ async def get_searchedeusers(request: Request, query: str = ''):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity    = request.identity
-            adminID          = user_identity.claims.get("user_id") if user_identity else None
-
-            # Admin authentication
-            user_obj = await session.execute(select(Users).where(Users.id == adminID))
-            user_obj_data = user_obj.scalar()
-
-            if not user_obj_data.is_admin:
-                return json({'msg': 'Admin authorization failed'}, 400)
-            # Authentication Ends here
-
             data = query
 
             # # If search contain group data
@@ -587,7 +529,7 @@ async def get_searchedeusers(request: Request, query: str = ''):
 
 #Add new user by Admin
 @docs(responses={200: 'Create new user, Only for Admin'})
-@auth('userauth')
+@auth('admin')
 @post('/api/v1/admin/add/user/')
 async def create_newuser(self, request: Request, user_create_schema: FromJSON[AdminUserCreateSchema]):
     """
@@ -595,23 +537,8 @@ async def create_newuser(self, request: Request, user_create_schema: FromJSON[Ad
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity    = request.identity
-            adminID          = user_identity.claims.get("user_id") if user_identity else None
-
             data = user_create_schema.value
         
-            # Admin authentication
-            try:
-                user_obj = await session.execute(select(Users).where(Users.id == adminID))
-                user_obj_data = user_obj.scalar()
-
-                if not user_obj_data.is_admin:
-                    return json({'msg': 'Only admin can create users'}, 400)
-
-            except Exception as e:
-                return json({'msg': 'Unable to get Admin detail', 'error': f'{str(e)}'}, 400)
-            # Admin authentication ends here.
-
             #Check the user is Default user or merchant
             if data.group == 'Default User':
                 try:
@@ -643,7 +570,7 @@ async def create_newuser(self, request: Request, user_create_schema: FromJSON[Ad
                             lastname     = data.last_name,
                             email        = data.email,
                             phoneno      = data.phoneno,
-                            password     = encrypt_password(data.password),
+                            password     = await hash_password(data.password),
                             is_verified  = True,
                             is_active    = True
                             )
@@ -696,7 +623,7 @@ async def create_newuser(self, request: Request, user_create_schema: FromJSON[Ad
                             lastname     = data.last_name,
                             email        = data.email,
                             phoneno      = data.phoneno,
-                            password     = encrypt_password(data.password),
+                            password     = await hash_password(data.password),
                             is_verified  = False,
                             is_active    = False
                             )
@@ -791,7 +718,7 @@ async def get_groups(self, request: Request):
 
 
 # Export all merchant user data
-@auth('userauth')
+@auth('admin')
 @get('/api/v1/admin/export/merchants/')
 async def export_merchant_data(request: Request):
     """
@@ -816,16 +743,6 @@ async def export_merchant_data(request: Request):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity = request.identity
-            adminID = user_identity.claims.get('user_id')
-
-            user_obj = await session.execute(select(Users).where(Users.id == adminID))
-            user_obj_data = user_obj.scalar()
-
-            if not user_obj_data.is_admin:
-                return json({'msg': 'Admin authorization failed'}, 401)
-            # Admin authentication ends here
-
             user_data = []
             kyc_data  = []
 
@@ -2,14 +2,13 @@ from blacksheep import json, get, Request
 from blacksheep.server.authorization import auth
 from database.db import AsyncSession, async_engine
 from sqlmodel import select, and_
-from Models.models import Users
 from Models.models2 import MerchantAccountBalance
 
 
 
 
 # Get merchant Account balance by Admin
-@auth('userauth')
+@auth('admin')
 @get('/api/v4/admin/merchant/account/balance/{user_id}/')
 async def merchant_account_balance(request: Request, user_id: int, currency: str = None):
     """
@@ -35,19 +34,8 @@ async def merchant_account_balance(request: Request, user_id: int, currency: str
     """
     try:
         async with AsyncSession(async_engine) as session:
-            admin_identity = request.identity
-            admin_id       = admin_identity.claims.get('user_id')\
-            
             user_id = user_id
 
-            admin_user_obj = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            admin_user = admin_user_obj.scalar()
-
-            if not admin_user.is_admin:
-                return json({'message': 'Admin authorization Failed'}, 401)
-            # Admin authentication ends
             # Get the account balance of the user
             if currency:
                 merchant_account_balance_obj = await session.execute(select(MerchantAccountBalance).where(
@@ -79,7 +67,7 @@ async def merchant_account_balance(request: Request, user_id: int, currency: str
 
 
 # Get matured balance by Admin
-@auth('userauth')
+@auth('admin')
 @get('/api/v4/admin/merchant/mature/account/balance/{user_id}/')
 async def merchant_mature_account_balance(request: Request, user_id: int, currency: str):
     """
@@ -104,20 +92,8 @@ async def merchant_mature_account_balance(request: Request, user_id: int, curren
     """
     try:
         async with AsyncSession(async_engine) as session:
-            admin_identity = request.identity
-            admin_id       = admin_identity.claims.get('user_id')
-            
             user_id = user_id
 
-            admin_user_obj = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            admin_user = admin_user_obj.scalar()
-
-            if not admin_user.is_admin:
-                return json({'message': 'Admin authorization Failed'}, 401)
-            # Admin authentication ends
-
             # Get the account balance of the user
             merchant_account_balance_obj = await session.execute(select(MerchantAccountBalance).where(
                 and_(
@@ -145,7 +121,7 @@ async def merchant_mature_account_balance(request: Request, user_id: int, curren
 
 
 
-@auth('userauth')
+@auth('admin')
 @get('/api/v4/admin/merchant/frozen/account/balance/{user_id}/')
 async def merchant_frozen_account_balance(request: Request, user_id: int, currency: str):
     """
@@ -171,20 +147,8 @@ async def merchant_frozen_account_balance(request: Request, user_id: int, curren
     """
     try:
         async with AsyncSession(async_engine) as session:
-            admin_identity = request.identity
-            admin_id       = admin_identity.claims.get('user_id')
-            
             user_id = user_id
 
-            admin_user_obj = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            admin_user = admin_user_obj.scalar()
-
-            if not admin_user.is_admin:
-                return json({'message': 'Admin authorization Failed'}, 401)
-            # Admin authentication ends
-
             # Get the account balance of the user
             merchant_account_balance_obj = await session.execute(select(MerchantAccountBalance).where(
                 and_(
@@ -213,7 +177,7 @@ async def merchant_frozen_account_balance(request: Request, user_id: int, curren
 
 
 # Get immatured balance by Admin
-@auth('userauth')
+@auth('admin')
 @get('/api/v4/admin/merchant/immature/account/balance/{user_id}/')
 async def merchant_immature_account_balance(request: Request, user_id: int, currency: str):
     """
@@ -239,20 +203,8 @@ async def merchant_immature_account_balance(request: Request, user_id: int, curr
     """
     try:
         async with AsyncSession(async_engine) as session:
-            admin_identity = request.identity
-            admin_id       = admin_identity.claims.get('user_id')
-            
             user_id = user_id
 
-            admin_user_obj = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            admin_user = admin_user_obj.scalar()
-
-            if not admin_user.is_admin:
-                return json({'message': 'Admin authorization Failed'}, 401)
-            # Admin authentication ends
-
             # Get the account balance of the user
             merchant_account_balance_obj = await session.execute(select(MerchantAccountBalance).where(
                 and_(
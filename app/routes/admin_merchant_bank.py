@@ -12,7 +12,7 @@ from .environment import media_url
 
 
 #Admin will be able to Approve Merchant bank accounts
-@auth('userauth')
+@auth('admin')
 @put('/api/v3/admin/merchant/bank/update/')
 async def ApproveMerchantBank(self, request: Request, schema: FromJSON[AdminMerchantBankApproveSchema]):
     """
@@ -42,26 +42,11 @@ async def ApproveMerchantBank(self, request: Request, schema: FromJSON[AdminMerc
     """
     try:
         async with AsyncSession(async_engine) as session:
-            admin_identity = request.identity
-            admin_id       = admin_identity.claims.get('user_id')
-
             values          = schema.value
             merchant_bnk_id = values.mrc_bnk_id
             user_id         = values.user_id
             status          = values.status
 
-            try:
-                is_admin_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                is_admin_obj_data = is_admin_obj.scalar()
-
-                if not is_admin_obj_data.is_admin:
-                    return json({'msg': 'Admin authorization failed'}, 401)
-
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            
             #Get the Merchant Bank Account
             try:
                 merchant_bank_account_obj = await session.execute(select(MerchantBankAccount).where(
@@ -115,7 +100,7 @@ async def ApproveMerchantBank(self, request: Request, schema: FromJSON[AdminMerc
 
 
 #Get a users specific bank account details
-@auth('userauth')
+@auth('admin')
 @get('/api/v4/admin/merchant/bank/')
 async def GetMerchantBankDetails(self, request: Request, query: int):
     """
@@ -141,28 +126,11 @@ async def GetMerchantBankDetails(self, request: Request, query: int):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            admin_identity = request.identity
-            admin_id       = admin_identity.claims.get('user_id')
-
             if not query:
                 return json({'msg': 'Unrecognized data'}, 403)
             
             merchant_bank_acc = query
 
-            #Authenticate as Admin
-            try:
-                is_admin_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                is_admin_obj_data = is_admin_obj.scalar()
-
-                if not is_admin_obj_data.is_admin:
-                    return json({'msg': 'Admin authorization failed'}, 401)
-
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            
-             #Get the Merchant Bank Account
             try:
                 merchant_bank_account_obj = await session.execute(select(MerchantBankAccount).where(
                    MerchantBankAccount.id == merchant_bank_acc
@@ -184,7 +152,7 @@ async def GetMerchantBankDetails(self, request: Request, query: int):
 
 
 #Get a Merchants all available bank accounts 
-@auth('userauth')
+@auth('admin')
 @get('/api/v4/admin/all/merchant/bank/')
 async def GetMerchantBanks(self, request: Request, query: int):
     """
@@ -208,24 +176,8 @@ async def GetMerchantBanks(self, request: Request, query: int):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            admin_identity = request.identity
-            admin_id       = admin_identity.claims.get('user_id')
-            
             mer_bank_user_id = query
 
-            #Authenticate as Admin
-            try:
-                is_admin_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                is_admin_obj_data = is_admin_obj.scalar()
-
-                if not is_admin_obj_data.is_admin:
-                    return json({'msg': 'Admin authorization failed'}, 401)
-
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            
             #Get the Merchant Bank Account
             try:
                 merchant_bank_account_obj = await session.execute(select(MerchantBankAccount).where(
@@ -292,31 +244,14 @@ async def GetMerchantBanks(self, request: Request, query: int):
 
 
 #Admin will be able to delete the bank account
-@auth('userauth')
+@auth('admin')
 @delete()
 async def delete_merchantAccount(self, request: Request, query: int):
 
     try:
         async with AsyncSession(async_engine) as session:
-            admin_identity = request.identity
-            admin_id       = admin_identity.claims.get('user_id')
-
             merchant_bank_id = query
 
-            #Authenticate as Admin
-            try:
-                is_admin_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                is_admin_obj_data = is_admin_obj.scalar()
-
-                if not is_admin_obj_data.is_admin:
-                    return json({'msg': 'Admin authorization failed'}, 401)
-
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            
-
             #Get the Merchant Bank Account
             try:
                 merchant_bank_account_obj = await session.execute(select(MerchantBankAccount).where(
@@ -1,7 +1,11 @@
-from blacksheep import Request, json, get
+from blacksheep import Request, json, get, delete
 from blacksheep.server.authorization import auth
 from database.db import AsyncSession, async_engine
-from Models.models import UserKeys, Users
+from Models.models import UserKeys
+from app.auth import (
+    invalidate_merchant_keys, merchant_key_cache_stats,
+    merchant_public_key_cache, merchant_hash_cache
+    )
 from sqlmodel import select
 
 
@@ -9,7 +13,7 @@ from sqlmodel import select
 
 
 # Get Merchant Keys by Admin
-@auth('userauth')
+@auth('admin')
 @get('/api/v4/admin/merchant/keys/')
 async def merchantKeys(self, request: Request, merchant_id: int):
     """
@@ -33,19 +37,76 @@ async def merchantKeys(self, request: Request, merchant_id: int):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            # Authenticate admin
-            user_identity = request.identity
-            user_id       = user_identity.claims.get('user_id')
-
-            adminUserObj = await session.execute(select(Users).where(
-                Users.id == user_id
+            # Get the keys of the merchant
+            merchantKeysobj = await session.execute(select(UserKeys).where(
+                UserKeys.user_id == merchant_id
             ))
-            adminUser = adminUserObj.scalar()
-            
-            if not adminUser.is_admin:
-                return json({'message': 'Unauthorized Access'}, 401)
-            
-            # Admin authentication ends
+            merchantKeys = merchantKeysobj.scalar()
+
+            return json({'success': True, 'admin_merchant_keys': merchantKeys}, 200)
+
+    except Exception as e:
+        return json({'error': 'Server Error', 'message': f'{str(e)}'}, 500)
+
+
+
+
+# Merchant key cache statistics by Admin
+@auth('admin')
+@get('/api/v4/admin/merchant/keys/cache/')
+async def merchantKeysCacheStats(self, request: Request):
+    """
+        This function returns the hit/miss counters of the merchant key cache used by the payment API.<br/><br/>
+
+        Parameters:<br/>
+        - request (Request): The request object containing identity and other information.<br/><br/>
+
+        Returns:<br/>
+        - JSON response with the following structure:<br/>
+        - 'success': A boolean indicating the success of the operation.<br/>
+        - 'merchant_key_cache': Size, hits, misses and evictions of the public key and secret hash caches.<br/><br/>
+
+        Raises:<br/>
+        - Error 401: Unauthorized Access.<br/>
+        - Error 500: Server Error.<br/>
+    """
+    try:
+        return json({'success': True, 'merchant_key_cache': merchant_key_cache_stats()}, 200)
+
+    except Exception as e:
+        return json({'error': 'Server Error', 'message': f'{str(e)}'}, 500)
+
+
+
+
+# Invalidate cached merchant keys by Admin
+@auth('admin')
+@delete('/api/v4/admin/merchant/keys/cache/')
+async def invalidateMerchantKeysCache(self, request: Request, merchant_id: int | None = None):
+    """
+        This function drops the cached key material of a merchant, or of every merchant if no merchant_id is provided.<br/><br/>
+
+        Parameters:<br/>
+        - request (Request): The request object containing identity and other information.<br/>
+        - merchant_id (int): Optional, the unique identifier of the merchant whose cached keys are to be dropped.<br/><br/>
+
+        Returns:<br/>
+        - JSON response with the following structure:<br/>
+        - 'success': A boolean indicating the success of the operation.<br/>
+        - 'message': Success or error message.<br/><br/>
+
+        Raises:<br/>
+        - Error 401: Unauthorized Access.<br/>
+        - Error 404: Merchant keys not found.<br/>
+        - Error 500: Server Error.<br/>
+    """
+    try:
+        async with AsyncSession(async_engine) as session:
+            if merchant_id is None:
+                merchant_public_key_cache.clear()
+                merchant_hash_cache.clear()
+
+                return json({'success': True, 'message': 'Merchant key cache cleared'}, 200)
 
             # Get the keys of the merchant
             merchantKeysobj = await session.execute(select(UserKeys).where(
@@ -53,7 +114,12 @@ async def merchantKeys(self, request: Request, merchant_id: int):
             ))
             merchantKeys = merchantKeysobj.scalar()
 
-            return json({'success': True, 'admin_merchant_keys': merchantKeys}, 200)
+            if not merchantKeys:
+                return json({'message': 'Merchant keys not found'}, 404)
+
+            invalidate_merchant_keys(public_key=merchantKeys.public_key, secret_key=merchantKeys.secret_key)
+
+            return json({'success': True, 'message': 'Merchant keys removed from cache'}, 200)
 
     except Exception as e:
         return json({'error': 'Server Error', 'message': f'{str(e)}'}, 500)
\ No newline at end of file
@@ -9,7 +9,7 @@ from sqlmodel import select
 
 
 # Let the admin login into merchant dashboard
-@auth('userauth')
+@auth('admin')
 @get('/api/v6/admin/merchant/login/{user_id}/')
 async def merchant_login_dashboard(request: Request, user_id: int):
     """
@@ -39,18 +39,6 @@ async def merchant_login_dashboard(request: Request, user_id: int):
     try:
         async with AsyncSession(async_engine) as session:
             #Authenticate user ad admin
-            user_identity = request.identity
-            admin_id      = user_identity.claims.get('user_id') if user_identity else None
-
-            admin_user_object = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            admin_user = admin_user_object.scalar()
-
-            if not admin_user.is_admin:
-                return json({'message': 'Admin authorization failed'}, 401)
-            # Admin authentication ends
-
 
             # Get the user
             merchant_user_obj = await session.execute(select(Users).where(
@@ -65,7 +53,7 @@ async def merchant_login_dashboard(request: Request, user_id: int):
             if not merchant_user.is_active:
                 return json({'message': 'Inactiv user'}, 400)
             
-            access_token  = generate_access_token(merchant_user.id)
+            access_token  = generate_access_token(merchant_user.id, merchant_user)
             refresh_token = generate_refresh_token(merchant_user.id)
 
             return json({
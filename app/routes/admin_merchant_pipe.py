@@ -12,7 +12,7 @@ from sqlmodel import select, and_
 
 
 # Assign pipe to Merchant
-@auth('userauth')
+@auth('admin')
 @post('/api/admin/merchant/pipe/assign/')
 async def assign_merchant_pipe(request: Request, schema:  AdminMerchantPipeAssignSchema):
     """
@@ -37,30 +37,11 @@ async def assign_merchant_pipe(request: Request, schema:  AdminMerchantPipeAssig
     """
     try:
         async with AsyncSession(async_engine) as session:
-            adminIdentity = request.identity
-            adminID       = adminIdentity.claims.get('user_id') if adminIdentity else None
-
             merchant_id = schema.merchant_id
             pipe_id     = schema.pipe_id
             fee         = schema.fee
             status      = schema.status
 
-            #Admin Authentication
-            try:
-                is_admin_check_obj = await session.execute(select(Users).where(
-                    Users.id == adminID
-                ))
-                is_admin_check = is_admin_check_obj.scalar()
-                
-                is_admin = is_admin_check.is_admin
-
-                if not is_admin:
-                    return json({'msg': 'Admin authentication failed'}, 401)
-                
-            except Exception as e:
-                return json({'msg': 'Admin check error', 'error': f'{str(e)}'}, 400)
-            #Admin authentication Ends
-
             # Check the requested pipe id exists or not
             try:
                 pipe_obj = await session.execute(select(PIPE).where(
@@ -124,7 +105,7 @@ async def assign_merchant_pipe(request: Request, schema:  AdminMerchantPipeAssig
 
 
 # Update assigned pipe details of Merchant
-@auth('userauth')
+@auth('admin')
 @put('/api/admin/merchant/pipe/update/')
 async def update_merchant_pipe(request: Request, schema:  AdminMerchantPipeUdateSchema):
     """
@@ -153,25 +134,6 @@ async def update_merchant_pipe(request: Request, schema:  AdminMerchantPipeUdate
     """
     try:
         async with AsyncSession(async_engine) as session:
-            adminIdentity = request.identity
-            adminID       = adminIdentity.claims.get('user_id') if adminIdentity else None
-          
-            # Admin Authentication
-            try:
-                is_admin_check_obj = await session.execute(select(Users).where(
-                    Users.id == adminID
-                ))
-                is_admin_check = is_admin_check_obj.scalar()
-                
-                is_admin = is_admin_check.is_admin
-
-                if not is_admin:
-                    return json({'msg': 'Admin authentication failed'}, 401)
-                
-            except Exception as e:
-                return json({'msg': 'Admin check error', 'error': f'{str(e)}'}, 400)
-            # Admin authentication Ends
-
             ### Get the payload data
             merchant_id   = schema.merchant_id
             pipe_id       = schema.pipe_id
@@ -257,7 +219,7 @@ async def update_merchant_pipe(request: Request, schema:  AdminMerchantPipeUdate
 
 
 # View all Merchant assigned pipes
-@auth('userauth')
+@auth('admin')
 @get('/api/admin/merchant/pipes/')
 async def list_all_merchant_assigned_pipes(request: Request):
     """
@@ -286,25 +248,6 @@ async def list_all_merchant_assigned_pipes(request: Request):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            adminIdentity = request.identity
-            adminID       = adminIdentity.claims.get('user_id') if adminIdentity else None
-
-            # Admin Authentication
-            try:
-                is_admin_check_obj = await session.execute(select(Users).where(
-                    Users.id == adminID
-                ))
-                is_admin_check = is_admin_check_obj.scalar()
-                
-                is_admin = is_admin_check.is_admin
-
-                if not is_admin:
-                    return json({'msg': 'Admin authentication failed'}, 401)
-                
-            except Exception as e:
-                return json({'msg': 'Admin check error', 'error': f'{str(e)}'}, 400)
-            # Admin authentication Ends
-
             # Get all the assigned Merchant pipes
             try:
                 merchant_pipe_obj = await session.execute(select(MerchantPIPE))
@@ -321,7 +264,7 @@ async def list_all_merchant_assigned_pipes(request: Request):
 
 
 # View all pipes Merchant wise 
-@auth('userauth')
+@auth('admin')
 @get('/api/admin/merchant/pipe/{id}/')
 async def list_all_merchant_wise_pipes(request: Request, id: int):
     """
@@ -350,27 +293,8 @@ async def list_all_merchant_wise_pipes(request: Request, id: int):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            adminIdentity = request.identity
-            adminID       = adminIdentity.claims.get('user_id') if adminIdentity else None
             combined_data = []
 
-            # Admin Authentication
-            try:
-                is_admin_check_obj = await session.execute(select(Users).where(
-                    Users.id == adminID
-                ))
-                is_admin_check = is_admin_check_obj.scalar()
-                
-                is_admin = is_admin_check.is_admin
-
-                if not is_admin:
-                    return json({'msg': 'Admin authentication failed'}, 401)
-                
-            except Exception as e:
-                return json({'msg': 'Admin check error', 'error': f'{str(e)}'}, 400)
-            # Admin authentication Ends
-
-
             try:
                 stmt = (
                     select(MerchantPIPE, PIPE, Users, Currency)
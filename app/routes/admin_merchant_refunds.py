@@ -13,7 +13,7 @@ from app.dateFormat import get_date_range
 
 
 # Get all the merchant Refund Transactions
-@auth('userauth')
+@auth('admin')
 @get('/api/v6/admin/merchant/refunds/')
 async def Admin_Merchant_Refunds(request: Request, limit: int = 10, offset: int = 0):
     """
@@ -36,21 +36,8 @@ async def Admin_Merchant_Refunds(request: Request, limit: int = 10, offset: int
     """
     try:
         async with AsyncSession(async_engine) as session:
-            # Authenticate user as admin
-            user_identity = request.identity
-            user_id       = user_identity.claims.get('user_id') if user_identity else None
-
             combined_data = []
 
-            adminUserObj = await session.execute(select(Users).where(
-                Users.id == user_id
-            ))
-            adminUser = adminUserObj.scalar()
-
-            if not adminUser.is_admin:
-                return json({'error': 'Admin authentication Failed'}, 401)
-            # Admin authentication ends here
-
             if limit < 0 or offset < 0:
                 return json({"message": "limit and offset value can not be negative"}, 400)
             
@@ -123,7 +110,7 @@ async def Admin_Merchant_Refunds(request: Request, limit: int = 10, offset: int
 
 
 # Update Merchant Refund by Admin
-@auth('userauth')
+@auth('admin')
 @put('/api/v6/admin/merchant/update/refunds/')
 async def MerchantRefundUpdate(request: Request, schema: AdminUpdateMerchantRefundSchema):
     """
@@ -154,17 +141,6 @@ async def MerchantRefundUpdate(request: Request, schema: AdminUpdateMerchantRefu
     """
     try:
         async with AsyncSession(async_engine) as session:
-               # Authenticate user as Admin
-               user_identity = request.identity
-               user_id = user_identity.claims.get('user_id')
-
-               adminUserObj = await session.execute(select(Users).where(Users.id == user_id))
-               adminUser = adminUserObj.scalar()
-
-               if not adminUser.is_admin:
-                    return json({'message': 'Admin authentication failed'}, 401)
-               # Admin authentication Ends
-
                # Get the payload data
                merchantID    = schema.merchant_id
                refundID      = schema.refund_id
@@ -235,7 +211,7 @@ async def MerchantRefundUpdate(request: Request, schema: AdminUpdateMerchantRefu
 
 
 # Export all Merchant Refund Transactions
-@auth('userauth')
+@auth('admin')
 @get('/api/v6/admin/merchant/pg/export/refunds/')
 async def ExportMerchantRefunds(request: Request):
     """
@@ -260,21 +236,8 @@ async def ExportMerchantRefunds(request: Request):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            # Authenticate user as admin
-            user_identity = request.identity
-            user_id       = user_identity.claims.get('user_id') if user_identity else None
-
             combined_data = []
 
-            adminUserObj = await session.execute(select(Users).where(
-                Users.id == user_id
-            ))
-            adminUser = adminUserObj.scalar()
-
-            if not adminUser.is_admin:
-                return json({'error': 'Admin authentication Failed'}, 401)
-            # Admin authentication ends here
-
             # Get all the refunds made by the merchant
             stmt = select(
                 MerchantRefund.id,
@@ -337,7 +300,7 @@ async def ExportMerchantRefunds(request: Request):
 
 
 # Search Merchant Refund Transactions
-@auth('userauth')
+@auth('admin')
 @get('/api/v6/admin/merchant/refund/search/')
 async def SearchMerchantRefunds(request: Request, query: str):
     """
@@ -361,19 +324,6 @@ async def SearchMerchantRefunds(request: Request, query: str):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            # Admin Authentication
-            user_identity = request.identity
-            user_id       = user_identity.claims.get('user_id') if user_identity else None
-
-            admin_user_obj = await session.execute(select(Users).where(
-                Users.id == user_id
-            ))
-            admin_user = admin_user_obj.scalar()
-
-            if not admin_user.is_admin:
-                return json({'error': 'Admin authentication failed'}, 401)
-            # Admin authentication ends
-
             query_date = None
             query_time = None
             query_as_float = None
@@ -509,7 +459,7 @@ async def SearchMerchantRefunds(request: Request, query: str):
 
 
 
-@auth('userauth')
+@auth('admin')
 @post('/api/v6/admin/filter/merchant/refunds/')
 async def filter_merchant_refunds(request: Request, schema: FilterMerchantRefunds, limit: int = 10, offset: int = 0):
     """
@@ -544,19 +494,6 @@ async def filter_merchant_refunds(request: Request, schema: FilterMerchantRefund
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity = request.identity
-            admin_id       = user_identity.claims.get('user_id')
-
-            # Authenticate admin
-            admin_user_obj = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            admin_user = admin_user_obj.scalar()
-
-            if not admin_user.is_admin:
-                return json({'message': 'Admin authorization failed'}, 401)
-            # Admin authentication ends
-
             # Get the payload data
             date_time       = schema.date
             merchant_mail   = schema.email
@@ -1,7 +1,7 @@
 from blacksheep import json, Request, post, put, delete, get
 from blacksheep.server.authorization import auth
 from database.db import AsyncSession, async_engine
-from Models.models import Users, Currency
+from Models.models import Currency
 from Models.models2 import PIPE, PIPEType, PIPETypeAssociation
 from sqlmodel import select, or_, and_, desc, cast, Date, func
 from Models.Admin.PIPE.pipeschema import AdminPipeCreateSchema, AdminPipeUpdateSchema
@@ -10,7 +10,7 @@ from datetime import datetime
 
 
 #Create New Pipe by Admin
-@auth('userauth')
+@auth('admin')
 @post('/api/v5/admin/pipe/new/')
 async def Admin_pipe_create(request: Request, schema: AdminPipeCreateSchema):
     """
@@ -45,22 +45,6 @@ async def Admin_pipe_create(request: Request, schema: AdminPipeCreateSchema):
             if admin_id is None:
                 return json({'msg': 'Unauthorized'}, 401)
             
-            #Authenticate the user as Admin
-            try:
-                is_admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                is_admin_user = is_admin_user_obj.scalar()
-
-                check_admin = is_admin_user.is_admin
-
-                if not check_admin:
-                    return json({'msg': 'Admin authorization failed'}, 403)
-
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            #Admin Authentication ends
-
             if schema.status == 'Active':
                 is_pipe_active = True
             elif schema.status == 'Inactive':
@@ -198,7 +182,7 @@ async def Admin_pipe_create(request: Request, schema: AdminPipeCreateSchema):
 
 
 # Update Pipe by Admin
-@auth('userauth')
+@auth('admin')
 @put('/api/v5/admin/pipe/update/')
 async def Admin_pipe_update(request: Request, schema: AdminPipeUpdateSchema):
     """
@@ -235,22 +219,6 @@ async def Admin_pipe_update(request: Request, schema: AdminPipeUpdateSchema):
             if admin_id is None:
                 return json({'msg': 'Unauthorized'}, 401)
             
-            #Authenticate the user as Admin
-            try:
-                is_admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                is_admin_user = is_admin_user_obj.scalar()
-
-                check_admin = is_admin_user.is_admin
-
-                if not check_admin:
-                    return json({'msg': 'Admin authorization failed'}, 403)
-
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            #Admin Authentication ends
-
             if schema.status == 'Active':
                 is_pipe_active = True
             elif schema.status == 'Inactive':
@@ -385,7 +353,7 @@ async def Admin_pipe_update(request: Request, schema: AdminPipeUpdateSchema):
 
 
 # Delete Pipe by Admin
-@auth('userauth')
+@auth('admin')
 @delete('/api/v5/admin/pipe/delete/')
 async def Admin_pipe_delete(request: Request, query: int):
     """
@@ -422,22 +390,6 @@ async def Admin_pipe_delete(request: Request, query: int):
             if admin_id is None:
                 return json({'msg': 'Unauthorized'}, 401)
             
-            #Authenticate the user as Admin
-            try:
-                is_admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                is_admin_user = is_admin_user_obj.scalar()
-
-                check_admin = is_admin_user.is_admin
-
-                if not check_admin:
-                    return json({'msg': 'Admin authorization failed'}, 403)
-
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            #Admin Authentication ends
-
             #Get the pipe
             try:
                 pipe_obj = await session.execute(select(PIPE).where(
@@ -481,7 +433,7 @@ async def Admin_pipe_delete(request: Request, query: int):
 
 
 # Get all pipe by Admin
-@auth('userauth')
+@auth('admin')
 @get('/api/v5/admin/pipes/')
 async def Admin_pipes(request: Request, limit: int = 15, offset: int = 0):
     """
@@ -525,19 +477,6 @@ async def Admin_pipes(request: Request, limit: int = 15, offset: int = 0):
             if admin_id is None:
                 return json({'msg': 'Unauthorized'}, 401)
             
-            #Authenticate the user as Admin
-            is_admin_user_obj = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            is_admin_user = is_admin_user_obj.scalar()
-
-            check_admin = is_admin_user.is_admin
-
-            if not check_admin:
-                return json({'msg': 'Admin authorization failed'}, 403)
-            #Admin Authentication ends
-
-
             #Get all the available pipe
             pipe_obj = await session.execute(select(PIPE).order_by(desc(PIPE.id)).limit(limit).offset(offset))
             all_pipe     = pipe_obj.scalars().all()
@@ -647,7 +586,7 @@ async def Admin_pipes(request: Request, limit: int = 15, offset: int = 0):
 
 
 #Search pipe by Admin
-@auth('userauth')
+@auth('admin')
 @get('/api/v5/admin/search/pipe/')
 async def admin_pipe_search(request: Request, query: str):
     """
@@ -679,18 +618,6 @@ async def admin_pipe_search(request: Request, query: str):
             if admin_id is None:
                 return json({'msg': 'Unauthorized'}, 401)
             
-            #Authenticate the user as Admin
-            is_admin_user_obj = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            is_admin_user = is_admin_user_obj.scalar()
-
-            check_admin = is_admin_user.is_admin
-
-            if not check_admin:
-                return json({'msg': 'Admin authorization failed'}, 403)
-            #Admin Authentication ends
-
             query_int = None
             query_date = None
             search_query = query
@@ -900,7 +827,7 @@ async def admin_pipe_search(request: Request, query: str):
 
 
 #Get all pipe by Admin
-@auth('userauth')
+@auth('admin')
 @get('/api/v5/admin/pipe/data/')
 async def Admin_pipe(request: Request):
     """
@@ -936,22 +863,6 @@ async def Admin_pipe(request: Request):
             if admin_id is None:
                 return json({'msg': 'Unauthorized'}, 401)
 
-            #Authenticate the user as Admin
-            try:
-                is_admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                is_admin_user = is_admin_user_obj.scalar()
-
-                check_admin = is_admin_user.is_admin
-
-                if not check_admin:
-                    return json({'msg': 'Admin authorization failed'}, 403)
-
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            #Admin Authentication ends
-
             #Get all the available pipe
             try:
                 pipe_obj = await session.execute(select(PIPE))
@@ -977,7 +888,7 @@ async def Admin_pipe(request: Request):
 
 
 # Export All pipe data
-@auth('userauth')
+@auth('admin')
 @get('/api/v5/admin/export/pipe/')
 async def ExportMerchantPipes(request: Request):
     """
@@ -999,21 +910,8 @@ async def ExportMerchantPipes(request: Request):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            # Authenticate Admin
-            user_identity = request.identity
-            admin_id = user_identity.claims.get('user_id')
-
             combined_data = []
 
-            admin_user_obj = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            admin_user = admin_user_obj.scalar()
-
-            if not admin_user.is_admin:
-                return json({'message': 'Admin authorization failed'}, 401)
-            # Admin authentication ends
-
             # Get all the Pipes
             stmt = select(
                 PIPE.id,
@@ -2,7 +2,6 @@ from blacksheep.server.authorization import auth
 from blacksheep import get, post, put, delete, Request, json
 from database.db import AsyncSession, async_engine
 from sqlmodel import select
-from Models.models import Users
 from Models.models2 import PIPEConnectionMode, PIPEType, Country
 from Models.Admin.PIPE.pipeschema import (
     AdminPipeConnectionModeCreateSchema, AdminPipeConnectionModeUpdateSchema,
@@ -14,7 +13,7 @@ from Models.Admin.PIPE.pipeschema import (
 
 
 # Create Pipe Connection mode by Admin
-@auth('userauth')
+@auth('admin')
 @post('/api/v5/admin/pipe/connection/mode/new/')
 async def AdminPipeConnectionModeCreate(request: Request, schema: AdminPipeConnectionModeCreateSchema):
     """
@@ -52,22 +51,6 @@ async def AdminPipeConnectionModeCreate(request: Request, schema: AdminPipeConne
             if admin_id is None:
                 return json({'msg': 'Unauthorized'}, 401)
             
-            #Authenticate the user as Admin
-            try:
-                is_admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                is_admin_user = is_admin_user_obj.scalar()
-
-                check_admin = is_admin_user.is_admin
-
-                if not check_admin:
-                    return json({'msg': 'Admin authorization failed'}, 403)
-
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            #Admin Authentication ends
-
             #Create Pipe connection
             pipe_connection = PIPEConnectionMode(
                 name = pipe_name
@@ -87,7 +70,7 @@ async def AdminPipeConnectionModeCreate(request: Request, schema: AdminPipeConne
 
 
 # Update Pipe Connection mode by Admin
-@auth('userauth')
+@auth('admin')
 @put('/api/v5/admin/pipe/connection/mode/update/')
 async def AdminPipeConnectionModeUpdate(request: Request, schema: AdminPipeConnectionModeUpdateSchema):
     """
@@ -123,22 +106,6 @@ async def AdminPipeConnectionModeUpdate(request: Request, schema: AdminPipeConne
             if admin_id is None:
                 return json({'msg': 'Unauthorized'}, 401)
             
-            #Authenticate the user as Admin
-            try:
-                is_admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                is_admin_user = is_admin_user_obj.scalar()
-
-                check_admin = is_admin_user.is_admin
-
-                if not check_admin:
-                    return json({'msg': 'Admin authorization failed'}, 403)
-
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            #Admin Authentication ends
-
             #Get the Pipe connection
             try:
                 pipe_connection_obj = await session.execute(select(PIPEConnectionMode).where(
@@ -169,7 +136,7 @@ async def AdminPipeConnectionModeUpdate(request: Request, schema: AdminPipeConne
 
 
 # Delete Pipe Connection mode by Admin
-@auth('userauth')
+@auth('admin')
 @delete('/api/v5/admin/pipe/connection/mode/delete/')
 async def AdminPipeConnectionModeDelete(request: Request, query: int):
     """
@@ -203,22 +170,6 @@ async def AdminPipeConnectionModeDelete(request: Request, query: int):
             if admin_id is None:
                 return json({'msg': 'Unauthorized'}, 401)
             
-            #Authenticate the user as Admin
-            try:
-                is_admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                is_admin_user = is_admin_user_obj.scalar()
-
-                check_admin = is_admin_user.is_admin
-
-                if not check_admin:
-                    return json({'msg': 'Admin authorization failed'}, 403)
-
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            #Admin Authentication ends
-
             #Get the Pipe connection
             try:
                 pipe_connection_obj = await session.execute(select(PIPEConnectionMode).where(
@@ -245,7 +196,7 @@ async def AdminPipeConnectionModeDelete(request: Request, query: int):
 
 
 #Get all Pipe Connection mode by Admin
-@auth('userauth')
+@auth('admin')
 @get('/api/v5/admin/pipe/connection/modes/')
 async def AdminPipeConnectionModes(request: Request):
     """
@@ -270,22 +221,6 @@ async def AdminPipeConnectionModes(request: Request):
             if admin_id is None:
                 return json({'msg': 'Unauthorized'}, 401)
             
-            #Authenticate the user as Admin
-            try:
-                is_admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                is_admin_user = is_admin_user_obj.scalar()
-
-                check_admin = is_admin_user.is_admin
-
-                if not check_admin:
-                    return json({'msg': 'Admin authorization failed'}, 403)
-
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            #Admin Authentication ends
-
             #Get the Pipe connection
             try:
                 pipe_connection_obj = await session.execute(select(PIPEConnectionMode))
@@ -307,7 +242,7 @@ async def AdminPipeConnectionModes(request: Request):
 
 
 #Create Country mode by Admin
-@auth('userauth')
+@auth('admin')
 @post('/api/v5/admin/country/new/')
 async def AdminCountryCreate(request: Request, schema: AdminCountryCreateSchema):
     """
@@ -346,22 +281,6 @@ async def AdminCountryCreate(request: Request, schema: AdminCountryCreateSchema)
             if admin_id is None:
                 return json({'msg': 'Unauthorized'}, 401)
             
-            #Authenticate the user as Admin
-            try:
-                is_admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                is_admin_user = is_admin_user_obj.scalar()
-
-                check_admin = is_admin_user.is_admin
-
-                if not check_admin:
-                    return json({'msg': 'Admin authorization failed'}, 403)
-
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            #Admin Authentication ends
-
             #Create Pipe connection
             country = Country(
                 name = pipe_country_name
@@ -380,7 +299,7 @@ async def AdminCountryCreate(request: Request, schema: AdminCountryCreateSchema)
 
 
 #Update Country by Admin
-@auth('userauth')
+@auth('admin')
 @put('/api/v5/admin/country/update/')
 async def AdminCountryUpdate(request: Request, schema: AdminCountryUpdateSchema):
     """
@@ -412,22 +331,6 @@ async def AdminCountryUpdate(request: Request, schema: AdminCountryUpdateSchema)
             if admin_id is None:
                 return json({'msg': 'Unauthorized'}, 401)
             
-            #Authenticate the user as Admin
-            try:
-                is_admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                is_admin_user = is_admin_user_obj.scalar()
-
-                check_admin = is_admin_user.is_admin
-
-                if not check_admin:
-                    return json({'msg': 'Admin authorization failed'}, 403)
-
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            #Admin Authentication ends
-
             #Get the Country
             try:
                 pipe_country_obj = await session.execute(select(Country).where(
@@ -457,7 +360,7 @@ async def AdminCountryUpdate(request: Request, schema: AdminCountryUpdateSchema)
 
 
 #Delete Country by Admin
-@auth('userauth')
+@auth('admin')
 @delete('/api/v5/admin/country/delete/')
 async def AdminCountryDelete(request: Request, query: int):
     """
@@ -491,23 +394,6 @@ async def AdminCountryDelete(request: Request, query: int):
             if admin_id is None:
                 return json({'msg': 'Unauthorized'}, 401)
             
-            #Authenticate the user as Admin
-            try:
-                is_admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                is_admin_user = is_admin_user_obj.scalar()
-
-                check_admin = is_admin_user.is_admin
-
-                if not check_admin:
-                    return json({'msg': 'Admin authorization failed'}, 403)
-
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            #Admin Authentication ends
-
-
             #Get the Pipe connection
             try:
                 pipe_country_obj = await session.execute(select(Country).where(
@@ -534,7 +420,7 @@ async def AdminCountryDelete(request: Request, query: int):
 
 
 #Get all available Country by Admin
-@auth('userauth')
+@auth('admin')
 @get('/api/v5/admin/countries/')
 async def AdminAllCountries(request: Request):
     """
@@ -566,23 +452,6 @@ async def AdminAllCountries(request: Request):
             if admin_id is None:
                 return json({'msg': 'Unauthorized'}, 401)
             
-            #Authenticate the user as Admin
-            try:
-                is_admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                is_admin_user = is_admin_user_obj.scalar()
-
-                check_admin = is_admin_user.is_admin
-
-                if not check_admin:
-                    return json({'msg': 'Admin authorization failed'}, 403)
-
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            #Admin Authentication ends
-
-
             #Get the Pipe connection
             try:
                 pipe_country_obj = await session.execute(select(Country))
@@ -600,7 +469,7 @@ async def AdminAllCountries(request: Request):
 
 
 #Create Pipe type by Admin
-@auth('userauth')
+@auth('admin')
 @post('/api/v5/admin/pipe/type/create/')
 async def AdminPipeTypeCreate(request: Request, schema: AdminPipeTypeCreateSchema):
     """
@@ -633,22 +502,6 @@ async def AdminPipeTypeCreate(request: Request, schema: AdminPipeTypeCreateSchem
             if admin_id is None:
                 return json({'msg': 'Unauthorized'}, 401)
             
-            #Authenticate the user as Admin
-            try:
-                is_admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                is_admin_user = is_admin_user_obj.scalar()
-
-                check_admin = is_admin_user.is_admin
-
-                if not check_admin:
-                    return json({'msg': 'Admin authorization failed'}, 403)
-
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            #Admin Authentication ends
-
             #Create Pipe connection
             pipe_type = PIPEType(
                 name = pipe_type_name
@@ -669,7 +522,7 @@ async def AdminPipeTypeCreate(request: Request, schema: AdminPipeTypeCreateSchem
 
 
 # Update Pipe Type by Admin
-@auth('userauth')
+@auth('admin')
 @put('/api/v5/admin/pipe/type/update/')
 async def AdminPipeTypeUpdate(request: Request, schema: AdminPipeTypeUpdateSchema):
     """
@@ -707,22 +560,6 @@ async def AdminPipeTypeUpdate(request: Request, schema: AdminPipeTypeUpdateSchem
             if admin_id is None:
                 return json({'msg': 'Unauthorized'}, 401)
             
-            #Authenticate the user as Admin
-            try:
-                is_admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                is_admin_user = is_admin_user_obj.scalar()
-
-                check_admin = is_admin_user.is_admin
-
-                if not check_admin:
-                    return json({'msg': 'Admin authorization failed'}, 403)
-
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            #Admin Authentication ends
-
             #Get the Country
             try:
                 pipe_type_obj = await session.execute(select(PIPEType).where(
@@ -754,7 +591,7 @@ async def AdminPipeTypeUpdate(request: Request, schema: AdminPipeTypeUpdateSchem
 
 
 # Delete Pipe Type by Admin
-@auth('userauth')
+@auth('admin')
 @delete('/api/v5/admin/pipe/type/delete/')
 async def AdminPipeTypeDelete(request: Request, query: int):
     """
@@ -788,22 +625,6 @@ async def AdminPipeTypeDelete(request: Request, query: int):
             if admin_id is None:
                 return json({'msg': 'Unauthorized'}, 401)
             
-            #Authenticate the user as Admin
-            try:
-                is_admin_user_obj = await session.execute(select(Users).where(
-                    Users.id == admin_id
-                ))
-                is_admin_user = is_admin_user_obj.scalar()
-
-                check_admin = is_admin_user.is_admin
-
-                if not check_admin:
-                    return json({'msg': 'Admin authorization failed'}, 403)
-
-            except Exception as e:
-                return json({'msg': 'Admin authentication error', 'error': f'{str(e)}'}, 400)
-            #Admin Authentication ends
-
             #Get the Country
             try:
                 pipe_type_obj = await session.execute(select(PIPEType).where(
@@ -1,23 +1,24 @@
-from blacksheep import get, json, Request
+from blacksheep import get, post, json, Request
 from blacksheep.server.authorization import auth
-from Models.models import Users
-from Models.models2 import MerchantProdTransaction, PIPE, MerchantPIPE
 from database.db import AsyncSession, async_engine
-from sqlmodel import select, and_
+from app.settings import Settings
+from app.controllers.PG.revenue import get_pipe_revenues, rebuild_revenue_rollup
 
 
 
 
 # Get all collected Revenues
-@auth('userauth')
+@auth('admin')
 @get('/api/v6/admin/revenues/')
-async def GetAdminRevenues(request: Request):
+async def GetAdminRevenues(request: Request, settings: Settings):
     """
         This API endpoint is used to get total amount related to every currency of all the successful transactions made through each pipe.<br/>
-        This endpoint is only accessible by admin users.<br/><br/>
+        This endpoint is only accessible by admin users.<br/>
+        The totals are computed with a single GROUP BY over the transactions, or read from the daily revenue rollup when it is enabled in the settings.<br/><br/>
 
         Parameters:<br/>
-            - request (Request): The HTTP request object.<br/><br/>
+            - request (Request): The HTTP request object.<br/>
+            - settings (Settings): The application settings.<br/><br/>
 
         Returns:<br/>
             - JSON: A JSON response containing the total amount related to every currency of all the successful transactions made through each pipe.<br/>
@@ -37,60 +38,10 @@ async def GetAdminRevenues(request: Request):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            # Authenticate Admin
-            user_identity = request.identity
-            user_id       = user_identity.claims.get('user_id')
-
             combined_data = []
 
-            adminUserObj = await session.execute(select(Users).where(
-                Users.id == user_id
-            ))
-            adminUser = adminUserObj.scalar()
-
-            if not adminUser.is_admin:
-                return json({'message': 'Unauthorized access'}, 401)
-            # Authentication ends here
-
-            pipe_obj = await session.execute(select(PIPE))
-            pipes    = pipe_obj.scalars().all()
-
-            # Transactions related to every pipe\
-            pipe_revenue_data = []
-
-            for p in pipes:
-                merchant_transaction_obj = await session.execute(select(MerchantProdTransaction).where(
-                    and_(MerchantProdTransaction.pipe_id == p.id,
-                         MerchantProdTransaction.status  == 'PAYMENT_SUCCESS',
-                         MerchantProdTransaction.is_completd == True
-                        )
-                    ))
-                merchant_transactions = merchant_transaction_obj.scalars().all()
-
-                currency_wise_transactions = {}
-                
-                for transaction in merchant_transactions:
-                    currency = transaction.currency 
-                    amount   = transaction.fee_amount if not transaction.is_refunded else -transaction.fee_amount
-
-                    if currency not in currency_wise_transactions:
-                        currency_wise_transactions[currency] = 0
-
-                    currency_wise_transactions[currency] += amount
-
-                # pipe_total_transaction_amount = sum(transaction.amount if not transaction.is_refunded else
-                #                             - transaction.amount for transaction in merchant_transactions)
-
-                total_transaction_amounts = [
-                    {'currency': currency, 'total_amount': total_amount}
-                    for currency, total_amount in currency_wise_transactions.items()
-                ]
-
-                pipe_revenue_data.append({
-                    'pipe_id': p.id,
-                    'pipe_name': p.name,
-                    'total_transaction_amount': total_transaction_amounts
-                })
+            # Revenue of every pipe and currency in one grouped query
+            pipe_revenue_data = await get_pipe_revenues(session, use_rollup=settings.revenue_rollup.enabled)
 
             return json({
                 'success': True,
@@ -103,6 +54,33 @@ async def GetAdminRevenues(request: Request):
 
 
 
+# Rebuild the daily revenue rollup from the transactions
+@auth('admin')
+@post('/api/v6/admin/revenues/rollup/')
+async def RebuildAdminRevenueRollup(request: Request):
+    """
+        This API endpoint recalculates the daily pipe revenue rollup table from all the merchant transactions.<br/>
+        Use it once after enabling the rollup to backfill the table.<br/>
+        This endpoint is only accessible by admin users.<br/><br/>
 
+        Parameters:<br/>
+            - request (Request): The HTTP request object.<br/><br/>
+
+        Returns:<br/>
+            - JSON: A JSON response with the success status.<br/>
+            - HTTP Status Code: 200.<br/>
+            - HTTP Status Code: 401 in case of unauthorized access.<br/>
+            - HTTP Status Code: 500 in case of server errors.<br/>
+    """
+    try:
+        async with AsyncSession(async_engine) as session:
+            await rebuild_revenue_rollup(session)
+            await session.commit()
 
+            return json({
+                'success': True,
+                'message': 'Revenue rollup rebuilt'
+                }, 200)
 
+    except Exception as e:
+        return json({'error': 'Server Error', 'message': f'{str(e)}'}, 500)
@@ -3,14 +3,14 @@ from blacksheep import post
 from database.db import AsyncSession, async_engine
 from blacksheep.server.authorization import auth
 from sqlmodel import select
-from Models.models import Users, Wallet
+from Models.models import Wallet
 from Models.Admin.User.schemas import EachUserWalletSchema
 
 
 
     
  
-@auth('userauth')
+@auth('admin')
 @post('/api/v2/admin/user/wallet/')
 async def user_wallets(self, request: Request, schema: EachUserWalletSchema):
     """
@@ -41,21 +41,6 @@ async def user_wallets(self, request: Request, schema: EachUserWalletSchema):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity   = request.identity
-            userID          = user_identity.claims.get("user_id") if user_identity else None
-
-            #Check the user is admin or Not
-            try:
-                user_obj      = await session.execute(select(Users).where(Users.id == userID))
-                user_obj_data = user_obj.scalar()
-
-                if not user_obj_data.is_admin:
-                    return json({'msg': 'Only admin can view the Transactions'}, 400)
-                
-            except Exception as e:
-                return pretty_json({'msg': 'Unable to get Admin detail', 'error': f'{str(e)}'}, 400)
-            
-
             #Get the wallets related to the user
             try:
                 user_wallet_obj = await session.execute(select(Wallet).where(Wallet.user_id == schema.user_id))
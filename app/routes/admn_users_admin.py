@@ -1,4 +1,4 @@
-from blacksheep import get, Request, json, pretty_json
+from blacksheep import get, Request, json
 from database.db import AsyncSession, async_engine
 from blacksheep.server.authorization import auth
 from sqlmodel import select
@@ -7,7 +7,7 @@ from Models.models import Users
 
 
 
-@auth('userauth')
+@auth('admin')
 @get('/api/admin/all-admin/')
 async def get_all_admin(self, request: Request):
     """
@@ -33,20 +33,6 @@ async def get_all_admin(self, request: Request):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity   = request.identity
-            AdminID         = user_identity.claims.get("user_id") if user_identity else None
-
-            #Check the user is admin or Not
-            try:
-                user_obj = await session.execute(select(Users).where(Users.id == AdminID))
-                user_obj_data = user_obj.scalar()
-
-                if not user_obj_data.is_admin:
-                    return json({'msg': 'Only admin can view the Transactions'}, 400)
-                
-            except Exception as e:
-                return pretty_json({'msg': 'Unable to get Admin detail', 'error': f'{str(e)}'}, 400)
-            
             try:
                 all_admin_users = await session.execute(select(Users).where(Users.is_admin == True))
                 all_admin_user_obj = all_admin_users.scalars().all()
@@ -1,6 +1,6 @@
 from blacksheep import get, Request, json
 from blacksheep.server.authorization import auth
-from database.db import AsyncSession, async_engine
+from database.db import session_for
 from Models.models import Users
 from Models.models2 import MerchantProdTransaction
 from Models.models3 import MerchantRefund, MerchantWithdrawals
@@ -33,7 +33,7 @@ async def DashboardCounts(request: Request):
             - Server Error: If an error occurs during the database operations.<br/>
     """
     try:
-        async with AsyncSession(async_engine) as session:
+        async with session_for('dashboard') as session:
             # Count all the available Merchant
             merchantUserObj = await session.execute(select(func.count(Users.id)).where(Users.is_merchent == True))
             merchantUsers   =  merchantUserObj.scalar()
@@ -4,7 +4,7 @@ from database.db import AsyncSession, async_engine
 from Models.models import Users
 from Models.models2 import (MerchantProdTransaction, MerchantSandBoxTransaction, 
                             MerchantAccountBalance, MerchantPIPE, PIPE)
-from sqlmodel import and_, select, cast, Date, Time, func, desc
+from sqlmodel import and_, select, cast, Time, func, desc
 from Models.PG.schema import AdminMerchantProductionTransactionUpdateSchema
 from datetime import datetime, timedelta
 from app.controllers.PG.merchantTransaction import CalculateMerchantAccountBalance
@@ -16,11 +16,12 @@ import re
 
 
 # Get all the merchant production transactions by Admin
-@auth('userauth')
+@auth('admin')
 @get('/api/v2/admin/merchant/pg/transactions/')
 async def get_merchant_pg_transaction(request: Request, limit : int = 10, offset : int = 0):
     """
-        Get all the merchant production transaction and transfer the Immature balance to Mature balance if settlement period completed.<br/><br/>
+        Get all the merchant production transactions.<br/>
+        Immature balances are moved to Mature balance by the background settlement worker once the settlement period completes.<br/><br/>
         
         Parameters:<br/>
         - request (Request): Request object<br/>
@@ -45,62 +46,8 @@ async def get_merchant_pg_transaction(request: Request, limit : int = 10, offset
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity = request.identity
-            admin_id       = user_identity.claims.get('user_id') if user_identity else None
-
-            currenct_datetime =  datetime.now()
-
             combined_data = []
 
-            # Admin Authentication
-            admin_object = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            admin = admin_object.scalar()
-
-            is_admin_user = admin.is_admin
-
-            if not is_admin_user:
-                return json({'error': 'Unauthorized Access'}, 403)
-            # Admin authentication ends
-
-            # Get all the transactions related to the merchant
-            merchant_prod_transaction_obj = await session.execute(select(MerchantProdTransaction).where(
-                MerchantProdTransaction.status == 'PAYMENT_SUCCESS'
-            ))
-            merchant_prod_transaction = merchant_prod_transaction_obj.scalars().all()
-
-            # Check the which transactions related to merchant has been matured
-            if merchant_prod_transaction:
-                for transaction in merchant_prod_transaction:
-                    if transaction.pg_settlement_date:
-                        if transaction.pg_settlement_date < currenct_datetime and transaction.balance_status == 'Immature':
-                            # Get the account balance of the merchant
-                            merchant_account_balance_Obj = await session.execute(select(MerchantAccountBalance).where(
-                            and_(
-                                MerchantAccountBalance.merchant_id == transaction.merchant_id,
-                                MerchantAccountBalance.currency    == transaction.currency
-                                )
-                            ))
-                            merchant_account_balance = merchant_account_balance_Obj.scalar()
-
-                            charged_fee       = (transaction.amount / 100) * transaction.transaction_fee
-                            merchant__balance = transaction.amount - charged_fee
-                            
-                            if merchant_account_balance:
-                                # Update the mature and immature balance
-                                if merchant_account_balance.immature_balance > 0:
-                                    merchant_account_balance.immature_balance -= merchant__balance
-                                    merchant_account_balance.mature_balance   += merchant__balance
-
-                                transaction.balance_status = 'Mature'
-
-                                session.add(merchant_account_balance)
-                                session.add(transaction)
-                                await session.commit()
-                                await session.refresh(merchant_account_balance)
-                                await session.refresh(transaction)
-            
             # Get all the Production transactions
             merchant_transactions_obj = await session.execute(select(MerchantProdTransaction).order_by(
                 desc(MerchantProdTransaction.id)
@@ -161,7 +108,7 @@ async def get_merchant_pg_transaction(request: Request, limit : int = 10, offset
 
 
 # Update Merchant Production Transaction by Admn
-@auth('userauth')
+@auth('admin')
 @put('/api/admin/merchant/pg/transaction/update/')
 async def update_merchantPGTransaction(request: Request, schema: AdminMerchantProductionTransactionUpdateSchema):
     """
@@ -204,21 +151,6 @@ async def update_merchantPGTransaction(request: Request, schema: AdminMerchantPr
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity = request.identity
-            user_id       = user_identity.claims.get('user_id')
-
-            # Authenticate User
-            admin_obj = await session.execute(select(Users).where(
-                Users.id == user_id
-            ))
-            admin = admin_obj.scalar()
-
-            is_admin = admin.is_admin
-
-            if not is_admin:
-                return json({'error': 'Unauthorized access'}, 403)
-            # Admin authentication ends here
-
             TransactionID = schema.transaction_id
             merchantID    = schema.merchant_id
 
@@ -443,7 +375,8 @@ async def update_merchantPGTransaction(request: Request, schema: AdminMerchantPr
                         merchant_transaction.amount, 
                         merchant_transaction.currency, 
                         merchant_transaction.transaction_fee, 
-                        merchant_transaction.merchant_id
+                        merchant_transaction.merchant_id,
+                        session
                     )
                     session.add(merchant_transaction)
 
@@ -497,7 +430,7 @@ async def update_merchantPGTransaction(request: Request, schema: AdminMerchantPr
 
 
 # Export all Merchant Production Transactions
-@auth('userauth')
+@auth('admin')
 @get('/api/v2/admin/merchant/pg/export/transactions/')
 async def export_merchant_pg_production_transaction(request: Request):
     """
@@ -521,22 +454,8 @@ async def export_merchant_pg_production_transaction(request: Request):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity = request.identity
-            admin_id       = user_identity.claims.get('user_id') if user_identity else None
-
             combined_data = []
 
-            # Admin Authentication
-            admin_object = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            admin = admin_object.scalar()
-
-            is_admin_user = admin.is_admin
-
-            if not is_admin_user:
-                return json({'error': 'Unauthorized Access'}, 403)
-            
             # Get all the Production transactions
             merchant_transactions_obj = await session.execute(select(MerchantProdTransaction).order_by(
                 (MerchantProdTransaction.id).desc()
@@ -582,7 +501,7 @@ async def export_merchant_pg_production_transaction(request: Request):
 
 
 # Export all Merchant Sandbox Transactions
-@auth('userauth')
+@auth('admin')
 @get('/api/v2/admin/merchant/pg/sandbox/export/transactions/')
 async def export_merchant_pg_sandbox_transactions(request: Request):
     """
@@ -604,22 +523,8 @@ async def export_merchant_pg_sandbox_transactions(request: Request):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity = request.identity
-            admin_id       = user_identity.claims.get('user_id') if user_identity else None
-
             combined_data = []
 
-            # Admin Authentication
-            admin_object = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            admin = admin_object.scalar()
-
-            is_admin_user = admin.is_admin
-
-            if not is_admin_user:
-                return json({'error': 'Unauthorized Access'}, 401)
-            
             # Get all the Sandbox transactions
             merchant_transactions_obj = await session.execute(select(MerchantSandBoxTransaction).order_by(
                 (MerchantSandBoxTransaction.id).desc()
@@ -665,7 +570,7 @@ async def export_merchant_pg_sandbox_transactions(request: Request):
 
 
 # Search Merchant Production transaction Transaction by Admin
-@auth('userauth')
+@auth('admin')
 @get('/api/v2/admin/merchant/pg/prod/search/transactions/')
 async def search_merchant_pg_production_transactions(request: Request, query: str):
     """
@@ -694,21 +599,6 @@ async def search_merchant_pg_production_transactions(request: Request, query: st
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity = request.identity
-            admin_id      = user_identity.claims.get('user_id') if user_identity else None
-
-            # Admin Authentication
-            admin_object = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            admin = admin_object.scalar()
-
-            is_admin_user = admin.is_admin
-
-            if not is_admin_user:
-                return json({'error': 'Unauthorized Access'}, 401)
-            # Admin authentication ends here
-
             search_query = query
             combined_data = []
             query_date = None
@@ -774,11 +664,17 @@ async def search_merchant_pg_production_transactions(request: Request, query: st
             ))
             merchant_status = merchant_status_obj.scalars().all()
 
-            # Search Transaction by Date
-            merchant_date_obj = await session.execute(select(MerchantProdTransaction).where(
-                cast(MerchantProdTransaction.createdAt, Date) == query_date
-                    ))
-            merchant_date = merchant_date_obj.scalars().all()
+            # Search Transaction by Date, a range instead of a cast so only its month partition is scanned
+            merchant_date = []
+
+            if query_date:
+                day_start = datetime.combine(query_date, datetime.min.time())
+
+                merchant_date_obj = await session.execute(select(MerchantProdTransaction).where(
+                    MerchantProdTransaction.createdAt >= day_start,
+                    MerchantProdTransaction.createdAt < day_start + timedelta(days=1)
+                        ))
+                merchant_date = merchant_date_obj.scalars().all()
 
             # Search Transaction by Time
             merchant_time_obj = await session.execute(select(MerchantProdTransaction).where(
@@ -864,7 +760,7 @@ async def search_merchant_pg_production_transactions(request: Request, query: st
 
 
 ## Every merchant transactions by Admin
-@auth('userauth')
+@auth('admin')
 @get('/api/v2/admin/merchant/pg/distinct/transactions/')
 async def merchant_pg_transaction(request: Request, query: int, limit: int = 15, offset: int = 0):
     """
@@ -887,22 +783,6 @@ async def merchant_pg_transaction(request: Request, query: int, limit: int = 15,
     """
     try:
         async with AsyncSession(async_engine) as session:
-            # Authenticate admin
-            user_identity = request.identity
-            admin_id       = user_identity.claims.get('user_id') if user_identity else None
-
-            # Admin Authentication
-            admin_object = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            admin = admin_object.scalar()
-
-            is_admin_user = admin.is_admin
-
-            if not is_admin_user:
-                return json({'error': 'Unauthorized Access'}, 401)
-            # Admin authentication ends here
-
             merchant_id    = query
             combined_data  = []
 
@@ -988,7 +868,7 @@ async def merchant_pg_transaction(request: Request, query: int, limit: int = 15,
 
 
 # Filter All production transaction
-@auth('userauth')
+@auth('admin')
 @post('/api/v2/admin/filter/merchant/transaction/')
 async def filter_merchant_pg_production_transaction(request: Request, schema: AllTransactionFilterSchema, limit: int = 10, offset: int = 0):
     """
@@ -1021,16 +901,6 @@ async def filter_merchant_pg_production_transaction(request: Request, schema: Al
             user_identity = request.identity
             user_id       = user_identity.claims.get('user_id')
 
-            # Authenticate Admin
-            admin_user_obj = await session.execute(select(Users).where(
-                Users.id == user_id
-            ))
-            admin_user = admin_user_obj.scalar()
-
-            if not admin_user.is_admin:
-                return json({'message': 'Admin authorization failed'}, 401)
-            # Admin authentication ends
-
             combined_data = []
 
             ### Get The payload data
@@ -13,7 +13,7 @@ from app.dateFormat import get_date_range
 
 
 # Get all the merchant sandbox transactions by Admin
-@auth('userauth')
+@auth('admin')
 @get('/api/v2/admin/merchant/pg/sandbox/transactions/')
 async def get_merchant_pg_sandbox_transaction(request: Request, limit : int = 10, offset : int = 0):
     """
@@ -40,22 +40,8 @@ async def get_merchant_pg_sandbox_transaction(request: Request, limit : int = 10
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity = request.identity
-            admin_id       = user_identity.claims.get('user_id') if user_identity else None
-
             combined_data = []
 
-            # Admin Authentication
-            admin_object = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            admin = admin_object.scalar()
-
-            is_admin_user = admin.is_admin
-
-            if not is_admin_user:
-                return json({'error': 'Unauthorized Access'}, 403)
-            
             # Get all the Production transactions
             merchant_transactions_obj = await session.execute(select(MerchantSandBoxTransaction).order_by(
                 desc(MerchantSandBoxTransaction.id)
@@ -116,7 +102,7 @@ async def get_merchant_pg_sandbox_transaction(request: Request, limit : int = 10
 
 
 # Search Merchant Sandbox transaction Transaction by Admin
-@auth('userauth')
+@auth('admin')
 @get('/api/v2/admin/merchant/pg/sb/search/transactions/')
 async def search_merchant_pg_sandbox_transactions(request: Request, query: str):
     """
@@ -141,21 +127,6 @@ async def search_merchant_pg_sandbox_transactions(request: Request, query: str):
     """
     try:
         async with AsyncSession(async_engine) as session:
-            user_identity = request.identity
-            admin_id       = user_identity.claims.get('user_id') if user_identity else None
-
-            # Admin Authentication
-            admin_object = await session.execute(select(Users).where(
-                Users.id == admin_id
-            ))
-            admin = admin_object.scalar()
-
-            is_admin_user = admin.is_admin
-
-            if not is_admin_user:
-                return json({'error': 'Unauthorized Access'}, 401)
-            # Admin authentication ends here
-
             search_query = query
             combined_data = []
             query_date = None
@@ -316,7 +287,7 @@ async def search_merchant_pg_sandbox_transactions(request: Request, query: str):
 
 
 # Filter Merchant Sandbox Transactions
-@auth('userauth')
+@auth('admin')
 @post('/api/v2/admin/merchant/filter/sandbox/transaction/')
 async def filter_merchant_sandbox_transaction(request: Request, schema: AllSandboxTransactionFilterSchema, limit: int = 10, offset: int = 0):
     """
@@ -354,16 +325,6 @@ async def filter_merchant_sandbox_transaction(request: Request, schema: AllSandb
 
             combined_data = []
 
-            # Admin authentication
-            admin_user_obj = await session.execute(select(Users).where(
-                Users.id == user_id
-            ))
-            admin_user = admin_user_obj.scalar()
-
-            if not admin_user.is_admin:
-                return json({'message': 'Admin authentication failed'}, 401)
-            # Admin authentication ends
-
             # Get the payload data
             date_time          = schema.date
             transactionID      = schema.transaction_id
@@ -3,6 +3,8 @@ from blacksheep.exceptions import BadRequest, HTTPException
 from pathlib import Path
 from blacksheep.cookies import Cookie, CookieSameSiteMode
 from app.auth import generate_access_token, generate_refresh_token
+from database.db import pool_status
+from app.unit_of_work import connection_stats
 
 
 
@@ -10,7 +12,11 @@ from app.auth import generate_access_token, generate_refresh_token
 
 @get('/api/server/status/')
 async def server_status(self):
-    return json({'msg': 'Success'}, 200)
+    return json({
+        'msg': 'Success',
+        'database_pools': pool_status(),
+        'connections_per_request': connection_stats.stats()
+    }, 200)
 
 
 @get('/api/set-cookie/')
@@ -0,0 +1,154 @@
+"""
+Search of the merchant transaction and refund lists.
+
+The search text is parsed once into typed terms (number, date, time, month, status). Every
+field the text can match becomes a `(condition, weight)` predicate and all of them run as
+one OR-combined query, ranked by the weights of the predicates each row matches.
+
+Text fields match exactly or, from `MIN_PARTIAL_LENGTH` characters, as a substring through
+ILIKE, which the pg_trgm GIN indexes on those columns serve.
+"""
+from sqlalchemy import Select, and_, case, desc, extract, or_, cast, Time
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement
+from datetime import date, datetime, time, timedelta
+from functools import reduce
+from Models.models import Currency
+from Models.models2 import MerchantProdTransaction
+from Models.models3 import MerchantRefund
+from app.pagination import Page, PageRequest, count_rows
+import math
+import operator
+
+
+
+MIN_PARTIAL_LENGTH = 3
+
+Predicate = tuple[ColumnElement, int]
+
+
+class SearchTerms:
+    """
+    A search text and the typed values it can be read as.
+    """
+
+    def __init__(self, query: str) -> None:
+        self.text   = query.strip()
+        self.number = None
+        self.day    = None
+        self.time   = None
+        self.month  = None
+
+        try:
+            number = float(self.text)
+            self.number = number if math.isfinite(number) else None
+        except ValueError:
+            pass
+
+        try:
+            self.day = datetime.strptime(self.text, '%d %B %Y').date()
+        except ValueError:
+            pass
+
+        try:
+            self.time = datetime.strptime(self.text, '%H:%M:%S.%f').time()
+        except ValueError:
+            pass
+
+        try:
+            self.month = datetime.strptime(self.text, '%B').month
+        except ValueError:
+            pass
+
+
+    # Status as stored on PG transactions, 'PAYMENT SUCCESS' -> 'PAYMENT_SUCCESS'
+    @property
+    def status(self) -> str:
+        return self.text.upper().replace(' ', '_')
+
+
+
+def text_match(column: ColumnElement, terms: SearchTerms, weight: int) -> list[Predicate]:
+    """
+    Exact match of `column` with `weight` and substring match with half of it.
+    """
+    if not terms.text:
+        return []
+
+    predicates = [(column == terms.text, weight)]
+
+    if len(terms.text) >= MIN_PARTIAL_LENGTH:
+        escaped = terms.text.replace('/', '//').replace('%', '/%').replace('_', '/_')
+        predicates.append((column.ilike(f'%{escaped}%', escape='/'), weight // 2))
+
+    return predicates
+
+
+def day_match(column: ColumnElement, day: date | None, weight: int) -> list[Predicate]:
+    if day is None:
+        return []
+
+    start = datetime.combine(day, time.min)
+
+    # A range instead of a cast so the created index can be used
+    return [(and_(column >= start, column < start + timedelta(days=1)), weight)]
+
+
+def value_match(column: ColumnElement, value, weight: int) -> list[Predicate]:
+    return [] if value is None or value == '' else [(column == value, weight)]
+
+
+
+# Predicates in the order the legacy search tried the fields
+def merchant_transaction_predicates(terms: SearchTerms) -> list[Predicate]:
+    return [
+        *text_match(MerchantProdTransaction.merchantOrderId, terms, 100),
+        *text_match(MerchantProdTransaction.transaction_id, terms, 90),
+        *text_match(MerchantProdTransaction.business_name, terms, 80),
+        *value_match(MerchantProdTransaction.payment_mode, terms.text, 35),
+        *value_match(MerchantProdTransaction.amount, terms.number, 30),
+        *value_match(MerchantProdTransaction.currency, terms.text, 25),
+        *value_match(MerchantProdTransaction.status, terms.status if terms.text else None, 20),
+        *day_match(MerchantProdTransaction.createdAt, terms.day, 15),
+        *value_match(cast(MerchantProdTransaction.createdAt, Time), terms.time, 10),
+        *value_match(extract('month', MerchantProdTransaction.createdAt), terms.month, 5),
+    ]
+
+
+def merchant_refund_predicates(terms: SearchTerms) -> list[Predicate]:
+    return [
+        *text_match(MerchantProdTransaction.transaction_id, terms, 100),
+        *value_match(MerchantRefund.amount, terms.number, 30),
+        *value_match(Currency.name, terms.text, 25),
+        *value_match(MerchantRefund.status, terms.text, 20),
+        *day_match(MerchantRefund.createdAt, terms.day, 15),
+        *value_match(cast(MerchantRefund.createdAt, Time), terms.time, 10),
+    ]
+
+
+
+async def search(
+    session: AsyncSession,
+    statement: Select,
+    predicates: list[Predicate],
+    page: PageRequest,
+    order_columns: list[ColumnElement]
+) -> Page:
+    """
+    Read one page of the rows of `statement` matching any of `predicates`, best ranked
+    first and then by `order_columns`. The rank is exposed as the `search_rank` column.
+    """
+    if not predicates:
+        return Page([], page.limit, None, 0 if page.total != 'none' else None)
+
+    matching = statement.where(or_(*[condition for condition, _ in predicates]))
+    rank     = reduce(operator.add, [case((condition, weight), else_=0) for condition, weight in predicates])
+
+    query = matching.add_columns(rank.label('search_rank')).order_by(None).order_by(
+        desc('search_rank'), *[desc(column) for column in order_columns]
+    ).limit(page.limit).offset(page.offset)
+
+    rows  = (await session.execute(query)).all()
+    total = await count_rows(session, matching, page.total)
+
+    return Page(rows, page.limit, None, total)
@@ -12,6 +12,19 @@ from typing import Tuple
 from rodi import Container
 
 from app.settings import Settings
+from app.controllers.PG.Mastercard.mastercard import MastercardClient
+from app.controllers.PG.settlement import SettlementWorker
+from app.controllers.PG.APILogs import APILogSink
+from app.controllers.PG.webhook import WebhookDispatcher
+from app.controllers.PG.revenue import enable_revenue_rollup
+from app.passwords import PasswordHasher
+from app.mail import MailQueue
+from app.fx import FXRates
+from app.metrics import Metrics
+from app.snowflake import WorkerIdLease
+from app.unit_of_work import request_session
+from database.db import AsyncSession
+from database.partitions import PartitionMaintenance
 
 
 def configure_services(settings: Settings) -> Tuple[Container, Settings]:
@@ -19,4 +32,41 @@ def configure_services(settings: Settings) -> Tuple[Container, Settings]:
 
     container.add_instance(settings)
 
+    # One database session per request, committed or rolled back by unit_of_work_middleware
+    container.add_scoped_by_factory(request_session, AsyncSession)
+
+    # Worker id of the transaction ID generator
+    container.add_instance(WorkerIdLease(settings.ids))
+
+    # One pooled gateway client shared by every card payment
+    container.add_instance(MastercardClient(settings.mastercard))
+
+    # Immature to mature merchant balance settlement
+    container.add_instance(SettlementWorker(settings.settlement))
+
+    # Batched merchant API log writer
+    container.add_instance(APILogSink(settings.api_logs))
+
+    # Merchant webhook outbox delivery
+    container.add_instance(WebhookDispatcher(settings.webhooks))
+
+    # bcrypt hashing on a bounded thread pool
+    container.add_instance(PasswordHasher(settings.passwords))
+
+    # Outbound email over pooled SMTP connections
+    container.add_instance(MailQueue(settings.mail))
+
+    # Cached exchange rate tables for currency conversion
+    container.add_instance(FXRates(settings.fx))
+
+    # Per route request and database metrics
+    container.add_instance(Metrics(settings.monitoring.scrape_token))
+
+    # Future monthly partitions and API log retention
+    container.add_instance(PartitionMaintenance(settings.partitions))
+
+    # Daily pipe revenue rollup, updated on every merchant transaction change
+    if settings.revenue_rollup.enabled:
+        enable_revenue_rollup()
+
     return container, settings
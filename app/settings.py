@@ -33,6 +33,185 @@ class Site(BaseModel):
     copyright: str = "Example"
 
 
+class Database(BaseModel):
+    url: str = config('DATABASE_URL')
+    # Read-only replica, empty to keep every query on the primary
+    replica_url: str = config('DATABASE_REPLICA_URL', default='')
+    # Workloads sent to the replica when there is one
+    replica_workloads: list[str] = ["export", "search", "dashboard"]
+
+    # Connection pool, per engine
+    pool_size: int = 10
+    max_overflow: int = 20
+    # Seconds
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+
+    # asyncpg, set both caches to 0 behind pgbouncer in transaction mode
+    prepared_statement_cache_size: int = 100
+    statement_cache_size: int = 100
+    command_timeout: float = 60.0
+    application_name: str = "ebank-backend"
+    # Extra PostgreSQL settings for every connection, e.g. {"statement_timeout": "30000"}
+    server_settings: dict[str, str] = {}
+
+    echo: bool = False
+
+
+class Mastercard(BaseModel):
+    # Point base_url to the fake gateway (tests/mastercard_fake_gateway.py) for load tests
+    base_url: str = "https://ap-gateway.mastercard.com"
+    api_version: int = 78
+
+    # Connection pool shared by every card payment
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+
+    # Maximum number of in-flight calls to the gateway
+    max_concurrency: int = 50
+
+    # Seconds, per operation
+    connect_timeout: float = 5.0
+    session_timeout: float = 15.0
+    authentication_timeout: float = 30.0
+    pay_timeout: float = 45.0
+    status_timeout: float = 10.0
+
+    # Retry policy for idempotent calls
+    max_retries: int = 3
+    backoff_factor: float = 0.25
+    max_backoff: float = 4.0
+
+
+class Settlement(BaseModel):
+    # Moves matured merchant balances from immature to mature in the background
+    enabled: bool = True
+    interval_seconds: float = 60.0
+    batch_size: int = 1000
+
+
+class APILogs(BaseModel):
+    # Merchant API error logs are written in batches by a background task
+    batch_size: int = 200
+    flush_interval_ms: int = 500
+    max_queue_size: int = 10000
+    # drop: discard new logs while the queue is full, block: wait for room
+    overflow_policy: str = "drop"
+
+
+class Passwords(BaseModel):
+    # bcrypt cost, hashes with another cost are replaced at the next login
+    bcrypt_rounds: int = 12
+    # Threads hashing passwords, bcrypt releases the GIL
+    max_workers: int = 4
+
+
+class Mail(BaseModel):
+    # Outbound email is queued by the handlers and delivered in the background
+    host: str = config('EMAIL_HOST', default='')
+    port: int = config('EMAIL_PORT', default=587, cast=int)
+    username: str = config('EMAIL_USERNAME', default='')
+    password: str = config('EMAIL_PASSWORD', default='')
+    starttls: bool = True
+
+    # Persistent SMTP connections, one per delivery worker
+    pool_size: int = 2
+    max_queue_size: int = 1000
+    # Seconds, connections idle for longer are checked with NOOP before reuse
+    idle_timeout: float = 60.0
+    timeout: float = 30.0
+
+    # Retry policy for temporary failures
+    max_retries: int = 3
+    backoff_factor: float = 1.0
+    max_backoff: float = 30.0
+
+
+class FX(BaseModel):
+    # Exchange rate provider (RapidAPI), one rate table is fetched per base currency
+    api_url: str = config('CURRENCY_CONVERTER_API', default='')
+    api_key: str = config('RAPID_API_KEY', default='')
+    api_host: str = config('RAPID_API_HOST', default='')
+    rates_path: str = "/latest"
+
+    # Seconds a rate table is used before it is fetched again
+    ttl: float = 300.0
+    # Seconds a conversion waits for the provider before falling back to the last known rates,
+    # the fetch itself keeps going in the background for up to fetch_timeout
+    wait_timeout: float = 5.0
+    fetch_timeout: float = 30.0
+    # Seconds the last known rates stay usable while the provider is unavailable
+    max_stale: float = 86400.0
+
+
+class Webhooks(BaseModel):
+    # Merchant webhooks are written to the MerchantWebhook outbox and delivered in the background
+    enabled: bool = True
+    # HMAC-SHA256 key of the X-Webhook-Signature header, unsigned when empty
+    signing_secret: str = config('WEBHOOK_SIGNING_SECRET', default='')
+
+    # Seconds between outbox polls, committed webhooks also wake the dispatcher
+    poll_interval: float = 1.0
+    batch_size: int = 100
+    # Seconds a claimed delivery stays hidden from other dispatchers, renewed when it gets its
+    # host slot, so longer than connect_timeout + timeout
+    lease_seconds: float = 60.0
+
+    # Connection pool shared by every delivery
+    max_connections: int = 200
+    max_keepalive_connections: int = 50
+    keepalive_expiry: float = 30.0
+    # In-flight deliveries in total and per merchant host
+    max_in_flight: int = 200
+    per_host_concurrency: int = 4
+
+    # Seconds, per delivery
+    connect_timeout: float = 5.0
+    timeout: float = 10.0
+
+    # Retry policy, non 2xx answers and network errors are retried
+    max_attempts: int = 8
+    backoff_factor: float = 2.0
+    max_backoff: float = 3600.0
+
+
+class IDs(BaseModel):
+    # Worker id of the ID generator, 0 to 1023 and different for every process,
+    # leased from the database at startup when unset (app.snowflake.WorkerIdLease)
+    worker_id: int | None = None
+
+
+class RevenueRollup(BaseModel):
+    # Maintain the PipeRevenueDaily table and serve the admin revenues from it
+    enabled: bool = False
+
+
+class Monitoring(BaseModel):
+    # Per route request and database metrics, scraped by Prometheus at `metrics_path`.
+    # Off by default, they list every route with its traffic and database time
+    enabled: bool = False
+    metrics_path: str = '/metrics'
+    # Bearer token of the scrapes, the path is open without one,
+    # so leave it empty only when the path cannot be reached from outside
+    scrape_token: str = config('METRICS_SCRAPE_TOKEN', default='')
+
+
+class Partitions(BaseModel):
+    # Monthly createdAt partitions of the merchant transactions and API logs, created ahead in the background
+    enabled: bool = True
+    interval_seconds: float = 3600.0
+    months_ahead: int = 3
+    # Partition DDL gives up instead of queueing behind long transactions
+    lock_timeout_ms: int = 5000
+
+    # API log partitions older than this many months are removed, 0 keeps them all
+    api_logs_retention_months: int = 6
+    # detach: keep them as standalone archive tables, drop: delete them
+    api_logs_retention_policy: str = 'detach'
+
+
 class Settings(BaseSettings):
     # to override info:
     # export app_info='{"title": "x", "version": "0.0.2"}'
@@ -42,6 +221,54 @@ class Settings(BaseSettings):
     # export app_app='{"show_error_details": True}'
     app: App = App()
 
+    # to override database:
+    # export app_database='{"pool_size": 20, "replica_url": "postgresql+asyncpg://..."}'
+    database: Database = Database()
+
+    # to override mastercard:
+    # export app_mastercard='{"base_url": "http://127.0.0.1:44800", "max_concurrency": 200}'
+    mastercard: Mastercard = Mastercard()
+
+    # to override settlement:
+    # export app_settlement='{"interval_seconds": 30, "batch_size": 5000}'
+    settlement: Settlement = Settlement()
+
+    # to override api_logs:
+    # export app_api_logs='{"batch_size": 500, "overflow_policy": "block"}'
+    api_logs: APILogs = APILogs()
+
+    # to override passwords:
+    # export app_passwords='{"bcrypt_rounds": 13, "max_workers": 2}'
+    passwords: Passwords = Passwords()
+
+    # to override mail:
+    # export app_mail='{"pool_size": 4, "starttls": false}'
+    mail: Mail = Mail()
+
+    # to override fx:
+    # export app_fx='{"ttl": 60, "wait_timeout": 2}'
+    fx: FX = FX()
+
+    # to override webhooks:
+    # export app_webhooks='{"per_host_concurrency": 8, "max_attempts": 5}'
+    webhooks: Webhooks = Webhooks()
+
+    # to override ids:
+    # export app_ids='{"worker_id": 7}'
+    ids: IDs = IDs()
+
+    # to override revenue_rollup:
+    # export app_revenue_rollup='{"enabled": true}'
+    revenue_rollup: RevenueRollup = RevenueRollup()
+
+    # to override monitoring:
+    # export app_monitoring='{"enabled": true, "metrics_path": "/internal/metrics"}'
+    monitoring: Monitoring = Monitoring()
+
+    # to override partitions:
+    # export app_partitions='{"months_ahead": 6, "api_logs_retention_policy": "drop"}'
+    partitions: Partitions = Partitions()
+
     model_config = SettingsConfigDict(env_prefix='APP_')
 
 
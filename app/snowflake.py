@@ -0,0 +1,196 @@
+"""
+Collision free IDs generated in process.
+
+`Snowflake` packs the milliseconds since `EPOCH`, a 10 bit worker id and a 12 bit sequence
+into one 63 bit integer, up to 4096 IDs per millisecond and process. Every process has a
+worker id of its own, from the ids settings or leased from the database at startup by
+`WorkerIdLease`, so new IDs never have to be looked up in the database. IDs are only unique
+while no two running processes share a worker id.
+
+When the clock goes backwards (NTP adjustments) the generator keeps counting from the last
+timestamp it issued instead of issuing timestamps twice.
+"""
+from app.settings import IDs, load_settings
+from database.db import async_engine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+import hashlib
+import os
+import socket
+import threading
+import time
+
+
+
+# 2021-06-01 in milliseconds
+EPOCH = 1622505600000
+
+WORKER_BITS   = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+MAX_SEQUENCE  = (1 << SEQUENCE_BITS) - 1
+
+
+
+class Snowflake:
+    def __init__(self, worker_id: int, epoch: int = EPOCH) -> None:
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f'worker_id must be between 0 and {MAX_WORKER_ID}')
+
+        self.worker_id      = worker_id
+        self.epoch          = epoch
+        self.sequence       = 0
+        self.last_timestamp = -1
+        # Times the clock was behind the last issued timestamp
+        self.clock_behind   = 0
+        self._lock          = threading.Lock()
+
+
+    def now(self) -> int:
+        return int(time.time() * 1000)
+
+
+    def generate_id(self) -> int:
+        with self._lock:
+            timestamp = self.now()
+
+            if timestamp < self.last_timestamp:
+                self.clock_behind += 1
+                timestamp = self.last_timestamp
+
+            if timestamp == self.last_timestamp:
+                self.sequence = (self.sequence + 1) & MAX_SEQUENCE
+
+                if self.sequence == 0:
+                    timestamp = self.next_millis(self.last_timestamp)
+            else:
+                self.sequence = 0
+
+            self.last_timestamp = timestamp
+
+            return ((timestamp - self.epoch) << (WORKER_BITS + SEQUENCE_BITS)) | (self.worker_id << SEQUENCE_BITS) | self.sequence
+
+
+    # The sequence of the millisecond is used up, wait for the next one. While the clock is
+    # still behind there is nothing to wait for and the next millisecond is taken right away.
+    def next_millis(self, last_timestamp: int) -> int:
+        timestamp = self.now()
+
+        if timestamp < last_timestamp:
+            return last_timestamp + 1
+
+        while timestamp <= last_timestamp:
+            timestamp = self.now()
+
+        return timestamp
+
+
+
+def process_worker_id(configured: int | None = None) -> int:
+    if configured is not None:
+        return configured
+
+    # Spread the processes over the worker ids by host and pid
+    digest = hashlib.blake2b(f'{socket.gethostname()}:{os.getpid()}'.encode(), digest_size=4).digest()
+
+    return int.from_bytes(digest, 'big') & MAX_WORKER_ID
+
+
+worker_id_setting = load_settings().ids.worker_id
+snowflake         = Snowflake(worker_id_setting) if worker_id_setting is not None else None
+
+
+def use_worker_id(worker_id: int | None) -> None:
+    global snowflake
+    snowflake = Snowflake(worker_id) if worker_id is not None else None
+
+
+# A leased worker id stays with the parent process, forked workers lease their own
+def _after_fork() -> None:
+    use_worker_id(None)
+
+if worker_id_setting is None:
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+
+# Session advisory lock of a worker id, the first key is the same for every worker id
+LEASE_STATEMENT   = text('SELECT pg_try_advisory_lock(:space, :worker_id)')
+RELEASE_STATEMENT = text('SELECT pg_advisory_unlock(:space, :worker_id)')
+LEASE_SPACE       = 16020
+
+
+class WorkerIdLease:
+    """
+        Worker id of the process, leased when the application starts.
+
+        With `ids.worker_id` set it is used as is, and must be different for every process:
+        leave it unset when the server forks several workers. Otherwise the first free worker
+        id is locked with a PostgreSQL session advisory lock, held on a dedicated connection
+        until `release` or the end of the process. Without PostgreSQL (local development) it is
+        derived from the host name and pid, and two processes can share one.
+    """
+
+    def __init__(self, settings: IDs, engine: AsyncEngine | None = None) -> None:
+        self.settings   = settings
+        self.engine     = engine or async_engine
+        self.worker_id: int | None = None
+        self._connection: AsyncConnection | None = None
+
+
+    async def acquire(self) -> int:
+        if self.settings.worker_id is not None:
+            self.worker_id = self.settings.worker_id
+
+        elif self.engine.dialect.name != 'postgresql':
+            self.worker_id = process_worker_id()
+
+        else:
+            self.worker_id = await self._lease()
+
+        use_worker_id(self.worker_id)
+
+        return self.worker_id
+
+
+    async def _lease(self) -> int:
+        connection = await self.engine.connect()
+        first      = process_worker_id()
+
+        for offset in range(MAX_WORKER_ID + 1):
+            worker_id = (first + offset) & MAX_WORKER_ID
+            leased    = (await connection.execute(LEASE_STATEMENT, {'space': LEASE_SPACE, 'worker_id': worker_id})).scalar()
+
+            if leased:
+                # The lock outlives the transaction, do not leave the connection idle in it
+                await connection.commit()
+                self._connection = connection
+
+                return worker_id
+
+        await connection.close()
+
+        raise RuntimeError(f'All {MAX_WORKER_ID + 1} worker ids are leased by other processes')
+
+
+    async def release(self) -> None:
+        use_worker_id(None)
+
+        if self._connection is not None:
+            await self._connection.execute(RELEASE_STATEMENT, {'space': LEASE_SPACE, 'worker_id': self.worker_id})
+            await self._connection.commit()
+            await self._connection.close()
+            self._connection = None
+
+
+
+def new_id() -> str:
+    """
+    New unique transaction ID from the generator of the process, as a string.
+    Only for internal transaction IDs: Snowflake IDs are sequential, so public keys and
+    button IDs come from app.generateID.generate_public_token instead.
+    """
+    if snowflake is None:
+        raise RuntimeError('No worker id, set ids.worker_id or start the application to lease one')
+
+    return str(snowflake.generate_id())
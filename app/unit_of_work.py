@@ -0,0 +1,154 @@
+"""
+One database session per request.
+
+`unit_of_work_middleware` gives every request a lazily opened AsyncSession. Handlers get
+it injected by declaring an `AsyncSession` parameter, or through `use_session()`, and the
+helpers they call reuse it through their `session` argument. Once the handler is done the
+session is committed, or rolled back when the handler failed or answered with an error,
+so a request checks out at most one pooled connection per engine.
+"""
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Awaitable, Callable
+from blacksheep import Request, Response
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from database.db import AsyncSession, async_engine, async_read_engine
+
+
+
+class UnitOfWork:
+    # The unit of work of the running request
+    current: ContextVar['UnitOfWork | None'] = ContextVar('unit_of_work', default=None)
+
+    def __init__(self, engine: AsyncEngine = async_engine) -> None:
+        self.engine    = engine
+        self.checkouts = 0
+        self._session: AsyncSession | None = None
+
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = AsyncSession(self.engine)
+
+        return self._session
+
+
+    async def complete(self, commit: bool) -> None:
+        if self._session is None:
+            return
+
+        try:
+            if commit:
+                await self._session.commit()
+            else:
+                await self._session.rollback()
+        finally:
+            await self._session.close()
+
+
+
+class ConnectionStats:
+    """
+    Pooled connections checked out per request, counted by a pool checkout listener.
+    """
+
+    def __init__(self) -> None:
+        self.requests      = 0
+        self.checkouts     = 0
+        self.max_checkouts = 0
+
+
+    # Only requests that used the database are counted
+    def record(self, checkouts: int) -> None:
+        if not checkouts:
+            return
+
+        self.requests      += 1
+        self.checkouts     += checkouts
+        self.max_checkouts  = max(self.max_checkouts, checkouts)
+
+
+    def stats(self) -> dict:
+        return {
+            'requests': self.requests,
+            'checkouts': self.checkouts,
+            'max_per_request': self.max_checkouts,
+            'avg_per_request': round(self.checkouts / self.requests, 2) if self.requests else 0.0,
+        }
+
+
+connection_stats = ConnectionStats()
+
+
+
+def count_checkouts(engine: AsyncEngine) -> None:
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        unit = UnitOfWork.current.get()
+
+        if unit is not None:
+            unit.checkouts += 1
+
+    event.listen(engine.sync_engine, 'checkout', on_checkout)
+
+
+count_checkouts(async_engine)
+
+if async_read_engine is not async_engine:
+    count_checkouts(async_read_engine)
+
+
+
+async def unit_of_work_middleware(request: Request, handler: Callable[[Request], Awaitable[Response]]) -> Response:
+    unit  = UnitOfWork()
+    token = UnitOfWork.current.set(unit)
+
+    try:
+        try:
+            response = await handler(request)
+        except Exception:
+            await unit.complete(commit=False)
+            raise
+
+        await unit.complete(commit=response.status < 400)
+
+        return response
+
+    finally:
+        UnitOfWork.current.reset(token)
+        connection_stats.record(unit.checkouts)
+
+
+
+# rodi factory, handlers declaring an AsyncSession parameter get the session of the request
+def request_session() -> AsyncSession:
+    unit = UnitOfWork.current.get()
+
+    return unit.session if unit is not None else AsyncSession(async_engine)
+
+
+
+@asynccontextmanager
+async def use_session(session: AsyncSession | None = None, commit: bool = False) -> AsyncIterator[AsyncSession]:
+    """
+    Yield `session` when given, else the session of the running request. Outside of a
+    request (scripts, background tasks) a session of its own is opened and closed, and
+    committed on success when `commit` is set. Shared sessions are never committed here,
+    their owner commits them.
+    """
+    if session is None:
+        unit = UnitOfWork.current.get()
+
+        if unit is not None:
+            session = unit.session
+
+    if session is not None:
+        yield session
+        return
+
+    async with AsyncSession(async_engine) as session:
+        yield session
+
+        if commit:
+            await session.commit()
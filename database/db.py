@@ -1,6 +1,8 @@
 from sqlmodel import create_engine, SQLModel
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine
 from decouple import config
+from app.settings import load_settings, Database
 
 
 
@@ -9,9 +11,88 @@ password='root'
 
 DATABASE_URL = config('DATABASE_URL')
 
+
+def engine_options(settings: Database, url: str, application_name: str) -> dict:
+    options = {
+        'pool_size': settings.pool_size,
+        'max_overflow': settings.max_overflow,
+        'pool_timeout': settings.pool_timeout,
+        'pool_recycle': settings.pool_recycle,
+        'pool_pre_ping': settings.pool_pre_ping,
+        'echo': settings.echo,
+    }
+
+    if make_url(url).get_driver_name() == 'asyncpg':
+        options['connect_args'] = {
+            # SQLAlchemy's cache of prepared statements, then asyncpg's own
+            'prepared_statement_cache_size': settings.prepared_statement_cache_size,
+            'statement_cache_size': settings.statement_cache_size,
+            'command_timeout': settings.command_timeout,
+            'server_settings': {'application_name': application_name, **settings.server_settings},
+        }
+
+    return options
+
+
+def create_engine_from_settings(settings: Database, replica: bool = False) -> AsyncEngine:
+    """
+    Async engine for the primary database, or the replica, with the pool and driver options of `settings`.
+    """
+    url              = settings.replica_url if replica else settings.url
+    application_name = f'{settings.application_name}-replica' if replica else settings.application_name
+
+    return create_async_engine(url, **engine_options(settings, url, application_name))
+
+
+database_settings = load_settings().database
+
 # engine = create_engine(DATABASE_URL)
 
-async_engine = create_async_engine(DATABASE_URL, future=True)
+async_engine = create_engine_from_settings(database_settings)
+
+# Heavy read-only queries go to the replica when there is one
+async_read_engine = create_engine_from_settings(database_settings, replica=True) if database_settings.replica_url else async_engine
+
+
+
+def engine_for(workload: str) -> AsyncEngine:
+    if workload in database_settings.replica_workloads:
+        return async_read_engine
+
+    return async_engine
+
+
+def session_for(workload: str) -> AsyncSession:
+    """
+    Session for a read-only `workload` (export, search, dashboard), opened on the replica
+    when the workload is routed there. The replica can lag slightly behind the primary, so
+    never read through it what the same request has just written.
+    """
+    return AsyncSession(engine_for(workload))
+
+
+async def dispose_engines() -> None:
+    await async_engine.dispose()
+
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+
+
+def pool_status() -> dict:
+    engines = {'primary': async_engine}
+
+    if async_read_engine is not async_engine:
+        engines['replica'] = async_read_engine
+
+    return {
+        name: {
+            'size': engine.pool.size(),
+            'checked_in': engine.pool.checkedin(),
+            'checked_out': engine.pool.checkedout(),
+            'overflow': engine.pool.overflow(),
+        }
+        for name, engine in engines.items()
+    }
 
 
 
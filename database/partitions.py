@@ -0,0 +1,210 @@
+from database.db import async_engine
+from Models.models2 import MerchantProdTransaction
+from Models.models3 import MerchantAPILogs
+from app.settings import Partitions
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from datetime import datetime
+import asyncio
+import logging
+import re
+
+
+
+logger = logging.getLogger(__name__)
+
+
+# Tables range partitioned by month on createdAt (migrations/versions/0003_monthly_partitions)
+TRANSACTION_TABLE = MerchantProdTransaction.__tablename__
+API_LOGS_TABLE    = MerchantAPILogs.__tablename__
+PARTITIONED_TABLES = (TRANSACTION_TABLE, API_LOGS_TABLE)
+
+# <table>_p202610 for a month, <table>_history for the rows older than the migration, <table>_default
+PARTITION_SUFFIX = re.compile(r'_(p\d{6}|history|default)$')
+BOUND_VALUE      = re.compile(r"(FROM|TO) \((?:'([^']+)'|(MINVALUE|MAXVALUE))\)")
+
+
+PARTITIONS_STATEMENT = text('''
+    SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+    FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_class child  ON child.oid  = pg_inherits.inhrelid
+    WHERE parent.relname = :table AND parent.relnamespace = current_schema()::regnamespace
+''')
+
+IS_PARTITIONED_STATEMENT = text('''
+    SELECT EXISTS (
+        SELECT 1 FROM pg_partitioned_table
+        JOIN pg_class ON pg_class.oid = pg_partitioned_table.partrelid
+        WHERE pg_class.relname = :table AND pg_class.relnamespace = current_schema()::regnamespace
+    )
+''')
+
+
+
+def month_start(moment: datetime) -> datetime:
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    year, month_index = divmod(month.year * 12 + month.month - 1 + months, 12)
+
+    return month.replace(year=year, month=month_index + 1, day=1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f'{table}_p{month:%Y%m}'
+
+
+# Partitions and archived partitions, which autogenerate should not try to drop
+def is_partition(name: str) -> bool:
+    suffix = PARTITION_SUFFIX.search(name)
+
+    return suffix is not None and name[:suffix.start()] in PARTITIONED_TABLES
+
+
+def partition_range(bound: str) -> tuple[datetime | None, datetime | None] | None:
+    """
+    Lower and upper createdAt of a partition bound expression, None for an open end,
+    or None for the default partition.
+    """
+    values = {keyword: value for keyword, value, _ in BOUND_VALUE.findall(bound)}
+
+    if not values:
+        return None
+
+    return tuple(datetime.fromisoformat(values[keyword]) if values.get(keyword) else None for keyword in ('FROM', 'TO'))
+
+
+
+async def is_partitioned(connection: AsyncConnection, table: str) -> bool:
+    return bool((await connection.execute(IS_PARTITIONED_STATEMENT, {'table': table})).scalar())
+
+
+async def partition_ranges(connection: AsyncConnection, table: str) -> dict[str, tuple]:
+    result = await connection.execute(PARTITIONS_STATEMENT, {'table': table})
+
+    return {name: partition_range(bound) for name, bound in result.all() if partition_range(bound) is not None}
+
+
+async def set_lock_timeout(connection: AsyncConnection, lock_timeout_ms: int) -> None:
+    await connection.execute(text(f"SET LOCAL lock_timeout = '{int(lock_timeout_ms)}ms'"))
+
+
+
+# Create the monthly partitions following the last one until `until`
+async def create_partitions(table: str, until: datetime, lock_timeout_ms: int = 5000) -> list[str]:
+    async with async_engine.connect() as connection:
+        uppers = [upper for _, upper in (await partition_ranges(connection, table)).values() if upper is not None]
+
+    month   = max(uppers) if uppers else month_start(datetime.now())
+    created = []
+
+    while month < until:
+        name       = partition_name(table, month)
+        next_month = add_months(month, 1)
+
+        # One transaction per partition, the parent is locked while it is created
+        async with async_engine.begin() as connection:
+            await set_lock_timeout(connection, lock_timeout_ms)
+            await connection.execute(text(
+                f'''CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '''
+                f'''FOR VALUES FROM ('{month.isoformat(' ')}') TO ('{next_month.isoformat(' ')}')'''
+            ))
+
+        created.append(name)
+        month = next_month
+
+    return created
+
+
+# Detach, and drop with the `drop` policy, the partitions ending on or before `cutoff`
+async def expire_partitions(table: str, cutoff: datetime, policy: str = 'detach', lock_timeout_ms: int = 5000) -> list[str]:
+    if policy not in ('detach', 'drop'):
+        raise ValueError(f'Unsupported retention policy {policy}')
+
+    async with async_engine.connect() as connection:
+        expired = sorted(
+            name for name, (_, upper) in (await partition_ranges(connection, table)).items()
+            if upper is not None and upper <= cutoff
+        )
+
+    for name in expired:
+        async with async_engine.begin() as connection:
+            await set_lock_timeout(connection, lock_timeout_ms)
+            await connection.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+
+            if policy == 'drop':
+                await connection.execute(text(f'DROP TABLE "{name}"'))
+
+    return expired
+
+
+
+# Background worker which keeps the future partitions created and applies the API log retention
+class PartitionMaintenance:
+    def __init__(self, settings: Partitions) -> None:
+        self.settings = settings
+        self._task: asyncio.Task | None = None
+
+
+    async def maintain(self, now: datetime | None = None) -> None:
+        if async_engine.dialect.name != 'postgresql':
+            return
+
+        current_month = month_start(now or datetime.now())
+
+        for table in PARTITIONED_TABLES:
+            async with async_engine.connect() as connection:
+                # Not migrated yet
+                if not await is_partitioned(connection, table):
+                    continue
+
+            created = await create_partitions(
+                table, add_months(current_month, self.settings.months_ahead + 1), self.settings.lock_timeout_ms
+            )
+
+            if created:
+                logger.info('Created partitions %s', ', '.join(created))
+
+            if table == API_LOGS_TABLE and self.settings.api_logs_retention_months > 0:
+                expired = await expire_partitions(
+                    table,
+                    add_months(current_month, -self.settings.api_logs_retention_months),
+                    self.settings.api_logs_retention_policy,
+                    self.settings.lock_timeout_ms
+                )
+
+                if expired:
+                    logger.info('Expired partitions %s (%s)', ', '.join(expired), self.settings.api_logs_retention_policy)
+
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.maintain()
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception:
+                logger.exception('Partition maintenance failed')
+
+            await asyncio.sleep(self.settings.interval_seconds)
+
+
+    def start(self) -> None:
+        if self.settings.enabled and self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+            self._task = None
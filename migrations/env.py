@@ -11,6 +11,8 @@ from Models.models4 import *
 from Models.crypto import *
 from Models.fee import *
 from Models.card import *
+from app.settings import load_settings
+from database.partitions import is_partition
 from alembic import context
 
 
@@ -24,12 +26,22 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# Migrate the database of the application settings unless the ini file names one
+if not config.get_main_option("sqlalchemy.url"):
+    config.set_main_option("sqlalchemy.url", load_settings().database.url)
+
 # add your model's MetaData object here
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
 target_metadata = SQLModel.metadata
 
+
+# The monthly partitions are managed by database.partitions, not by the models
+def include_object(object, name, type_, reflected, compare_to):
+    return not (type_ == 'table' and reflected and compare_to is None and is_partition(name))
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -52,6 +64,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -61,7 +74,7 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
 
     with context.begin_transaction():
         context.run_migrations()
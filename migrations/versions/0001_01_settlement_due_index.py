@@ -0,0 +1,39 @@
+"""Settlement due index
+
+Partial index of the transactions waiting for the settlement worker, built with CREATE INDEX
+CONCURRENTLY so the table stays writable while it builds.
+
+Revision ID: 0001_01_settlement_due_index
+Revises: 0001_baseline
+Create Date: 2026-10-18 10:01:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_01_settlement_due_index'
+down_revision: Union[str, None] = '0001_baseline'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_merchantprodtransaction_settlement_due', 'merchantprodtransaction', ['pg_settlement_date'],
+            unique=False, if_not_exists=True, postgresql_concurrently=True,
+            postgresql_where=sa.text("balance_status = 'Immature' AND status = 'PAYMENT_SUCCESS'")
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_merchantprodtransaction_settlement_due', table_name='merchantprodtransaction',
+            if_exists=True, postgresql_concurrently=True
+        )
@@ -0,0 +1,92 @@
+"""Unique merchant balances and collected fees
+
+The balance ledger credits merchantaccountbalance per (merchant_id, currency) and
+collectedfees per currency with INSERT ... ON CONFLICT, which needs a unique constraint on
+each. Duplicate rows are merged first into the one with the lowest id, their balances and
+amounts summed. The tables are locked against writes while they are merged and constrained.
+
+The downgrade only drops the constraints, merged rows stay merged.
+
+Revision ID: 0001_02_unique_balances
+Revises: 0001_01_settlement_due_index
+Create Date: 2026-10-18 10:02:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_02_unique_balances'
+down_revision: Union[str, None] = '0001_01_settlement_due_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MERGE_BALANCES = '''
+    WITH merged AS (
+        SELECT min(id) AS id,
+               sum(coalesce(mature_balance, 0))   AS mature_balance,
+               sum(coalesce(immature_balance, 0)) AS immature_balance,
+               sum(coalesce(frozen_balance, 0))   AS frozen_balance,
+               sum(coalesce(account_balance, 0))  AS account_balance,
+               max(last_updated)                  AS last_updated
+        FROM merchantaccountbalance
+        GROUP BY merchant_id, currency
+        HAVING count(*) > 1
+    )
+    UPDATE merchantaccountbalance b
+    SET mature_balance   = merged.mature_balance,
+        immature_balance = merged.immature_balance,
+        frozen_balance   = merged.frozen_balance,
+        account_balance  = merged.account_balance,
+        last_updated     = merged.last_updated
+    FROM merged
+    WHERE b.id = merged.id
+'''
+
+DELETE_MERGED_BALANCES = '''
+    DELETE FROM merchantaccountbalance b
+    USING merchantaccountbalance kept
+    WHERE kept.merchant_id = b.merchant_id AND kept.currency = b.currency AND kept.id < b.id
+'''
+
+MERGE_FEES = '''
+    WITH merged AS (
+        SELECT min(id) AS id, sum(amount) AS amount
+        FROM collectedfees
+        GROUP BY currency
+        HAVING count(*) > 1
+    )
+    UPDATE collectedfees f
+    SET amount = merged.amount
+    FROM merged
+    WHERE f.id = merged.id
+'''
+
+DELETE_MERGED_FEES = '''
+    DELETE FROM collectedfees f
+    USING collectedfees kept
+    WHERE kept.currency = f.currency AND kept.id < f.id
+'''
+
+
+def upgrade() -> None:
+    # No new duplicate between the merge and the constraint
+    op.execute('LOCK TABLE merchantaccountbalance, collectedfees IN SHARE ROW EXCLUSIVE MODE')
+
+    op.execute(MERGE_BALANCES)
+    op.execute(DELETE_MERGED_BALANCES)
+    op.execute(MERGE_FEES)
+    op.execute(DELETE_MERGED_FEES)
+
+    op.create_unique_constraint(
+        'uq_merchantaccountbalance_merchant_currency', 'merchantaccountbalance', ['merchant_id', 'currency']
+    )
+    op.create_unique_constraint('uq_collectedfees_currency', 'collectedfees', ['currency'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_collectedfees_currency', 'collectedfees', type_='unique')
+    op.drop_constraint('uq_merchantaccountbalance_merchant_currency', 'merchantaccountbalance', type_='unique')
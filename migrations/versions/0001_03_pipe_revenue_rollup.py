@@ -0,0 +1,44 @@
+"""Daily pipe revenue rollup
+
+The piperevenuedaily table, filled by POST /api/v6/admin/revenues/rollup/ once the rollup
+is enabled in the settings.
+
+Revision ID: 0001_03_pipe_revenue_rollup
+Revises: 0001_02_unique_balances
+Create Date: 2026-10-18 10:03:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_03_pipe_revenue_rollup'
+down_revision: Union[str, None] = '0001_02_unique_balances'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('piperevenuedaily',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('pipe_id', sa.Integer(), nullable=False),
+    sa.Column('currency', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.Column('transactions', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['pipe_id'], ['pipe.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day', 'pipe_id', 'currency', name='uq_piperevenuedaily_day_pipe_currency')
+    )
+    op.create_index(op.f('ix_piperevenuedaily_day'), 'piperevenuedaily', ['day'], unique=False)
+    op.create_index(op.f('ix_piperevenuedaily_pipe_id'), 'piperevenuedaily', ['pipe_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_piperevenuedaily_pipe_id'), table_name='piperevenuedaily')
+    op.drop_index(op.f('ix_piperevenuedaily_day'), table_name='piperevenuedaily')
+    op.drop_table('piperevenuedaily')
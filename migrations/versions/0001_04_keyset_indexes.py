@@ -0,0 +1,45 @@
+"""Keyset pagination indexes
+
+Indexes matching the (createdAt, id) order of the keyset paginated listings, built with
+CREATE INDEX CONCURRENTLY so the tables stay writable while they build. A CONCURRENTLY build
+that fails leaves an INVALID index behind: drop it and upgrade again.
+
+Revision ID: 0001_04_keyset_indexes
+Revises: 0001_03_pipe_revenue_rollup
+Create Date: 2026-10-18 10:04:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_04_keyset_indexes'
+down_revision: Union[str, None] = '0001_03_pipe_revenue_rollup'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Name, table and columns of the indexes added by this revision
+INDEXES = [
+    ('ix_merchantprodtransaction_merchant_created', 'merchantprodtransaction', ['merchant_id', 'createdAt', 'id']),
+    ('ix_merchantwithdrawals_merchant_created', 'merchantwithdrawals', ['merchant_id', 'createdAt', 'id']),
+    ('ix_merchantrefund_merchant_created', 'merchantrefund', ['merchant_id', 'createdAt', 'id']),
+    ('ix_deposittransaction_created', 'deposittransaction', ['created_At', 'id']),
+    ('ix_cryptoswap_created', 'cryptoswap', ['created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
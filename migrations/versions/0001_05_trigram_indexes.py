@@ -0,0 +1,49 @@
+"""Trigram search indexes
+
+GIN trigram indexes for the substring search of the merchant transactions, built with
+CREATE INDEX CONCURRENTLY. Creating the pg_trgm extension needs a role allowed to, or the
+extension created beforehand by the database owner.
+
+Revision ID: 0001_05_trigram_indexes
+Revises: 0001_04_keyset_indexes
+Create Date: 2026-10-18 10:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_05_trigram_indexes'
+down_revision: Union[str, None] = '0001_04_keyset_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Name and column of the merchantprodtransaction indexes added by this revision
+INDEXES = [
+    ('ix_merchantprodtransaction_order_id_trgm', 'merchantOrderId'),
+    ('ix_merchantprodtransaction_transaction_id_trgm', 'transaction_id'),
+    ('ix_merchantprodtransaction_business_name_trgm', 'business_name'),
+]
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, column in INDEXES:
+            op.create_index(
+                name, 'merchantprodtransaction', [column], unique=False, if_not_exists=True,
+                postgresql_concurrently=True, postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+            )
+
+
+def downgrade() -> None:
+    # The extension is left in place, other objects may use it
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='merchantprodtransaction', if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,35 @@
+"""Exchange rate tables
+
+The fxratetable table, the last rate table fetched per base currency, used while the
+provider is unavailable.
+
+Revision ID: 0001_06_fx_rate_table
+Revises: 0001_05_trigram_indexes
+Create Date: 2026-10-18 10:06:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_06_fx_rate_table'
+down_revision: Union[str, None] = '0001_05_trigram_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('fxratetable',
+    sa.Column('base', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('rates', sa.JSON(), nullable=True),
+    sa.Column('fetched_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('base')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('fxratetable')
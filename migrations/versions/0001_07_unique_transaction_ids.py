@@ -0,0 +1,56 @@
+"""Unique crypto swap and exchange transaction ids
+
+transaction_id becomes unique on cryptoswap and cryptoexchange. Empty ids, rows which never
+got one, become NULL. The unique index is built CONCURRENTLY and then attached as the
+constraint, so the tables stay writable. The upgrade stops when other duplicate ids remain:
+they have to be renamed by hand first.
+
+Revision ID: 0001_07_unique_transaction_ids
+Revises: 0001_06_fx_rate_table
+Create Date: 2026-10-18 10:07:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_07_unique_transaction_ids'
+down_revision: Union[str, None] = '0001_06_fx_rate_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ('cryptoswap', 'cryptoexchange')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.execute(f"UPDATE {table} SET transaction_id = NULL WHERE transaction_id = ''")
+
+        # Not checked when only the SQL is generated (--sql)
+        if op.get_context().as_sql:
+            continue
+
+        duplicates = op.get_bind().execute(sa.text(
+            f'SELECT transaction_id FROM {table} WHERE transaction_id IS NOT NULL '
+            f'GROUP BY transaction_id HAVING count(*) > 1 LIMIT 10'
+        )).scalars().all()
+
+        if duplicates:
+            raise RuntimeError(f'Duplicate {table}.transaction_id values, rename them first: {", ".join(duplicates)}')
+
+    # CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.execute(f'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {table}_transaction_id_key ON {table} (transaction_id)')
+
+    for table in TABLES:
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_transaction_id_key UNIQUE USING INDEX {table}_transaction_id_key')
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_constraint(f'{table}_transaction_id_key', table, type_='unique')
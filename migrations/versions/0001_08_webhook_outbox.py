@@ -0,0 +1,62 @@
+"""Merchant webhook outbox
+
+The merchantwebhook outbox, written in the transaction of the payment, and the
+merchantwebhookattempt log of every delivery attempt.
+
+Revision ID: 0001_08_webhook_outbox
+Revises: 0001_07_unique_transaction_ids
+Create Date: 2026-10-18 10:08:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_08_webhook_outbox'
+down_revision: Union[str, None] = '0001_07_unique_transaction_ids'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('merchantwebhook',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('merchant_id', sa.Integer(), nullable=True),
+    sa.Column('url', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=True),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('last_status_code', sa.Integer(), nullable=True),
+    sa.Column('last_error', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('createdAt', sa.DateTime(), nullable=False),
+    sa.Column('delivered_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['merchant_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_merchantwebhook_merchant_id'), 'merchantwebhook', ['merchant_id'], unique=False)
+    op.create_index('ix_merchantwebhook_status_next_attempt', 'merchantwebhook', ['status', 'next_attempt_at'], unique=False)
+    op.create_table('merchantwebhookattempt',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('webhook_id', sa.Integer(), nullable=False),
+    sa.Column('attempt', sa.Integer(), nullable=False),
+    sa.Column('status_code', sa.Integer(), nullable=True),
+    sa.Column('error', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('duration_ms', sa.Float(), nullable=False),
+    sa.Column('createdAt', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['webhook_id'], ['merchantwebhook.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_merchantwebhookattempt_webhook_id'), 'merchantwebhookattempt', ['webhook_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_merchantwebhookattempt_webhook_id'), table_name='merchantwebhookattempt')
+    op.drop_table('merchantwebhookattempt')
+    op.drop_index('ix_merchantwebhook_status_next_attempt', table_name='merchantwebhook')
+    op.drop_index(op.f('ix_merchantwebhook_merchant_id'), table_name='merchantwebhook')
+    op.drop_table('merchantwebhook')
@@ -0,0 +1,159 @@
+"""Monthly partitions of merchant transactions and API logs
+
+merchantprodtransaction and merchantapilogs become tables range partitioned by month on
+"createdAt", so the date range filters of the listings, exports and dashboards only scan the
+months they ask for, and old API logs can be detached instead of deleted row by row.
+
+The existing rows are not copied: the table is renamed to <table>_history and attached as the
+partition of everything before the next month, after a validated CHECK constraint and a unique
+(id, "createdAt") index built CONCURRENTLY, so the switch itself does not scan it. Run it away
+from the end of the month, the CHECK constraint rejects rows of the next month until the switch.
+
+Primary keys become (id, "createdAt"), ids still come from the table sequence. A foreign key
+cannot reference id alone anymore, so merchantrefund.transaction_id loses its constraint.
+The following partitions are created by database.partitions.PartitionMaintenance.
+
+Revision ID: 0003_monthly_partitions
+Revises: 0002_hot_indexes
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_monthly_partitions'
+down_revision: Union[str, None] = '0002_hot_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Partitions created ahead by the migration, the maintenance task creates the rest
+MONTHS_AHEAD = 3
+
+
+def trigram(column: str) -> dict:
+    return {'postgresql_using': 'gin', 'postgresql_ops': {column: 'gin_trgm_ops'}}
+
+
+# Foreign keys and indexes of each table, created on the partitioned table
+TABLES = {
+    'merchantprodtransaction': {
+        'foreign_keys': [('merchant_id', 'users'), ('pipe_id', 'pipe')],
+        'indexes': [
+            ('ix_merchantprodtransaction_merchant_id', ['merchant_id'], {}),
+            ('ix_merchantprodtransaction_pipe_id', ['pipe_id'], {}),
+            ('ix_merchantprodtransaction_status', ['status'], {}),
+            ('ix_merchantprodtransaction_transaction_id', ['transaction_id'], {}),
+            ('ix_merchantprodtransaction_settlement_due', ['pg_settlement_date'],
+             {'postgresql_where': sa.text("balance_status = 'Immature' AND status = 'PAYMENT_SUCCESS'")}),
+            ('ix_merchantprodtransaction_merchant_created', ['merchant_id', 'createdAt', 'id'], {}),
+            ('ix_merchantprodtransaction_merchant_order', ['merchant_id', 'merchantOrderId'], {}),
+            ('ix_merchantprodtransaction_order_id_trgm', ['merchantOrderId'], trigram('merchantOrderId')),
+            ('ix_merchantprodtransaction_transaction_id_trgm', ['transaction_id'], trigram('transaction_id')),
+            ('ix_merchantprodtransaction_business_name_trgm', ['business_name'], trigram('business_name')),
+        ],
+    },
+    'merchantapilogs': {
+        'foreign_keys': [('merchant_id', 'users')],
+        'indexes': [
+            ('ix_merchantapilogs_merchant_id', ['merchant_id', 'id'], {}),
+        ],
+    },
+}
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    year, month_index = divmod(month.year * 12 + month.month - 1 + months, 12)
+
+    return month.replace(year=year, month=month_index + 1, day=1)
+
+
+def create_foreign_keys_and_indexes(table: str) -> None:
+    for column, referred in TABLES[table]['foreign_keys']:
+        op.create_foreign_key(f'{table}_{column}_fkey', table, referred, [column], ['id'])
+
+    for name, columns, options in TABLES[table]['indexes']:
+        op.create_index(name, table, columns, unique=False, **options)
+
+
+def upgrade() -> None:
+    this_month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    cutover    = add_months(this_month, 1)
+
+    # Prepare the existing tables without blocking writes
+    with op.get_context().autocommit_block():
+        op.execute('''UPDATE merchantprodtransaction SET "createdAt" = '1970-01-01' WHERE "createdAt" IS NULL''')
+
+        for table in TABLES:
+            op.execute(f'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {table}_id_created ON {table} (id, "createdAt")')
+            op.execute(
+                f'''ALTER TABLE {table} ADD CONSTRAINT {table}_history_bound '''
+                f'''CHECK ("createdAt" IS NOT NULL AND "createdAt" < '{cutover.isoformat(' ')}') NOT VALID'''
+            )
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {table}_history_bound')
+
+    op.execute('ALTER TABLE merchantrefund DROP CONSTRAINT IF EXISTS merchantrefund_transaction_id_fkey')
+
+    for table in TABLES:
+        history = f'{table}_history'
+
+        # The validated CHECK constraint spares the scans of SET NOT NULL and ATTACH PARTITION
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN "createdAt" SET NOT NULL')
+        op.execute(f'ALTER TABLE {table} DROP CONSTRAINT {table}_pkey')
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {history}_pkey PRIMARY KEY USING INDEX {table}_id_created')
+        op.execute(f'ALTER TABLE {table} RENAME TO {history}')
+
+        # Free the index names for the partitioned table
+        op.execute(f'''
+            DO $$
+            DECLARE index_name text;
+            BEGIN
+                FOR index_name IN SELECT indexname FROM pg_indexes
+                                  WHERE schemaname = current_schema() AND tablename = '{history}'
+                                    AND indexname <> '{history}_pkey'
+                LOOP
+                    EXECUTE format('ALTER INDEX %I RENAME TO %I', index_name, left(index_name, 55) || '_history');
+                END LOOP;
+            END $$
+        ''')
+
+        op.execute(f'CREATE TABLE {table} (LIKE {history} INCLUDING DEFAULTS) PARTITION BY RANGE ("createdAt")')
+        op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+        op.create_primary_key(f'{table}_pkey', table, ['id', 'createdAt'])
+
+        # The indexes of the history partition match and are attached instead of built again
+        op.execute(f'''ALTER TABLE {table} ATTACH PARTITION {history} FOR VALUES FROM (MINVALUE) TO ('{cutover.isoformat(' ')}')''')
+        op.execute(f'ALTER TABLE {history} DROP CONSTRAINT {table}_history_bound')
+        create_foreign_keys_and_indexes(table)
+
+        month = cutover
+
+        while month <= add_months(this_month, MONTHS_AHEAD):
+            op.execute(
+                f'''CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} '''
+                f'''FOR VALUES FROM ('{month.isoformat(' ')}') TO ('{add_months(month, 1).isoformat(' ')}')'''
+            )
+            month = add_months(month, 1)
+
+        # Rows past the created months, when the maintenance task is not running
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+
+def downgrade() -> None:
+    # Copies the rows back into plain tables, detached API log partitions are left as they are
+    for table in TABLES:
+        op.execute(f'CREATE TABLE {table}_plain (LIKE {table} INCLUDING DEFAULTS)')
+        op.execute(f'INSERT INTO {table}_plain SELECT * FROM {table}')
+        op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}_plain.id')
+        op.execute(f'DROP TABLE {table}')
+        op.execute(f'ALTER TABLE {table}_plain RENAME TO {table}')
+        op.create_primary_key(f'{table}_pkey', table, ['id'])
+        create_foreign_keys_and_indexes(table)
+
+    op.alter_column('merchantprodtransaction', 'createdAt', existing_type=sa.DateTime(), nullable=True)
+    op.create_foreign_key('merchantrefund_transaction_id_fkey', 'merchantrefund', 'merchantprodtransaction', ['transaction_id'], ['id'])
@@ -1,34 +0,0 @@
-import time
-
-class Snowflake:
-    def __init__(self, worker_id, epoch=1622505600):
-        self.worker_id = worker_id
-        self.epoch = epoch
-        self.sequence = 0
-        self.last_timestamp = -1
-
-    def generate_id(self):
-        timestamp = int(time.time() * 1000)
-
-        if timestamp == self.last_timestamp:
-            self.sequence = (self.sequence + 1) & 4095
-            if self.sequence == 0:
-                timestamp = self.wait_next_millis(self.last_timestamp)
-        else:
-            self.sequence = 0
-
-        self.last_timestamp = timestamp
-
-        return ((timestamp - self.epoch) << 22) | (self.worker_id << 12) | self.sequence
-
-    def wait_next_millis(self, last_timestamp):
-        timestamp = int(time.time() * 1000)
-        while timestamp <= last_timestamp:
-            timestamp = int(time.time() * 1000)
-        return timestamp
-    
-
-
-snowflake = Snowflake(worker_id=10)
-for _ in range(1):
-    print(snowflake.generate_id())
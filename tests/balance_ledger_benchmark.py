@@ -0,0 +1,96 @@
+"""
+Concurrency benchmark for the merchant balance ledger.
+
+Fires thousands of parallel successful-payment credits for a single merchant
+through `CalculateMerchantAccountBalance` against the database configured in
+DATABASE_URL (PostgreSQL) and verifies that no update was lost.
+
+    python -m tests.balance_ledger_benchmark --credits 5000 --concurrency 200
+
+The benchmark creates its own merchant and currency code and removes them when done.
+"""
+from database.db import AsyncSession, async_engine
+from Models.models import Users
+from Models.models2 import MerchantAccountBalance, CollectedFees
+from app.controllers.PG.merchantTransaction import CalculateMerchantAccountBalance
+from sqlmodel import select, delete, and_
+import argparse
+import asyncio
+import math
+import time
+import uuid
+
+
+
+async def main(args: argparse.Namespace) -> None:
+    currency = f'B{uuid.uuid4().hex[:6].upper()}'
+
+    async with AsyncSession(async_engine) as session:
+        merchant = Users(
+            first_name = 'Ledger',
+            lastname   = 'Benchmark',
+            email      = f'ledger-benchmark-{uuid.uuid4().hex}@example.com',
+            phoneno    = '0000000000',
+            password   = '-'
+        )
+        session.add(merchant)
+        await session.commit()
+        await session.refresh(merchant)
+        merchant_id = merchant.id
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def credit() -> None:
+        async with semaphore:
+            error = await CalculateMerchantAccountBalance(args.amount, currency, args.fee, merchant_id)
+
+            if error:
+                raise RuntimeError(error)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(credit() for _ in range(args.credits)))
+    elapsed = time.perf_counter() - started
+
+    expected_fee     = args.credits * (args.amount / 100) * args.fee
+    expected_balance = args.credits * args.amount - expected_fee
+
+    try:
+        async with AsyncSession(async_engine) as session:
+            balance = (await session.execute(select(MerchantAccountBalance).where(
+                and_(MerchantAccountBalance.merchant_id == merchant_id, MerchantAccountBalance.currency == currency)
+            ))).scalar_one()
+
+            fees = (await session.execute(select(CollectedFees).where(
+                CollectedFees.currency == currency
+            ))).scalar_one()
+
+        print(f'credits:          {args.credits}')
+        print(f'concurrency:      {args.concurrency}')
+        print(f'elapsed:          {elapsed:.2f}s')
+        print(f'credits/sec:      {args.credits / elapsed:.1f}')
+        print(f'immature balance: {balance.immature_balance:.2f} (expected {expected_balance:.2f})')
+        print(f'collected fees:   {fees.amount:.2f} (expected {expected_fee:.2f})')
+
+        assert math.isclose(balance.immature_balance, expected_balance, rel_tol=1e-9), 'Lost merchant balance updates'
+        assert math.isclose(balance.account_balance, expected_balance, rel_tol=1e-9), 'Lost account balance updates'
+        assert math.isclose(fees.amount, expected_fee, rel_tol=1e-9), 'Lost collected fee updates'
+
+    finally:
+        async with AsyncSession(async_engine) as session:
+            await session.execute(delete(MerchantAccountBalance).where(MerchantAccountBalance.merchant_id == merchant_id))
+            await session.execute(delete(CollectedFees).where(CollectedFees.currency == currency))
+            await session.execute(delete(Users).where(Users.id == merchant_id))
+            await session.commit()
+
+        await async_engine.dispose()
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Merchant balance ledger concurrency benchmark')
+    parser.add_argument('--credits', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--amount', type=float, default=100.0)
+    parser.add_argument('--fee', type=float, default=2.5)
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,80 @@
+"""
+Pooled connections checked out by one payment request.
+
+Runs the lookups a payment request makes (handler query, merchant secret key) against the
+database configured in DATABASE_URL (PostgreSQL), once the way the helpers used to work,
+each on a session of its own, and once inside
+`app.unit_of_work.unit_of_work_middleware` where they share the session of the request.
+Reports the connections checked out per request and the latency of both modes.
+
+    python -m tests.connection_checkout_benchmark --requests 200
+"""
+from blacksheep import Response
+from database.db import async_engine
+from sqlalchemy import event, text
+from app.auth import decrypt_merchant_secret_key, merchant_hash_cache
+from app.unit_of_work import unit_of_work_middleware, use_session
+import argparse
+import asyncio
+import statistics
+import time
+
+
+
+checkouts = 0
+
+def on_checkout(dbapi_connection, connection_record, connection_proxy):
+    global checkouts
+    checkouts += 1
+
+event.listen(async_engine.sync_engine, 'checkout', on_checkout)
+
+
+
+async def payment_lookups() -> None:
+    merchant_hash_cache.clear()
+
+    async with use_session() as session:
+        await session.execute(text('SELECT 1'))
+
+        await decrypt_merchant_secret_key('benchmark-hash')
+
+
+async def run(mode: str, args: argparse.Namespace) -> None:
+    global checkouts
+    checkouts = 0
+    latencies = []
+
+    async def handler(request):
+        await payment_lookups()
+        return Response(200)
+
+    for _ in range(args.requests):
+        started = time.perf_counter()
+
+        if mode == 'per-helper':
+            # Outside of a request every helper opens a session of its own, as they all used to
+            await payment_lookups()
+        else:
+            await unit_of_work_middleware(None, handler)
+
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    print(f'{mode:<10} connections per request {checkouts / args.requests:5.2f}   '
+          f'p50 {statistics.median(latencies):7.2f} ms   max {max(latencies):7.2f} ms')
+
+
+async def main(args: argparse.Namespace) -> None:
+    try:
+        for mode in ('per-helper', 'request'):
+            await run(mode, args)
+    finally:
+        await async_engine.dispose()
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Connections checked out per payment request')
+    parser.add_argument('--requests', type=int, default=200)
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,166 @@
+"""
+Regression benchmark for the user and admin FIAT transaction listings.
+
+The listings used to load the whole Users and Currency tables on every request, so their
+latency grew with the number of users. This benchmark measures the endpoints, seeds 500k
+extra users into the database configured in DATABASE_URL (PostgreSQL), measures again and
+fails if any endpoint got slower than `--max-ratio` times its baseline.
+
+    python -m tests.enrichment_benchmark --users 500000
+
+Everything the benchmark creates is removed when it finishes.
+"""
+from blacksheep.testing import TestClient
+from database.db import AsyncSession, async_engine
+from Models.models import Users, Currency
+from Models.models4 import DepositTransaction, TransferTransaction
+from app.auth import generate_access_token
+from sqlalchemy import text, delete, or_
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+
+
+SEED_USERS_STATEMENT = text('''
+    INSERT INTO users (first_name, lastname, full_name, email, phoneno, password, picture,
+                       is_merchent, is_verified, is_active, is_kyc_submitted, is_admin, is_suspended,
+                       ipaddress, login_count, minimum_withdrawal_amount, settlement_period)
+    SELECT 'Seed', 'User', 'Seed User', :prefix || g || '@example.com', '0000000000', '-', '',
+           false, true, true, false, false, false, '0.0.0.0', 0, 0, ''
+    FROM generate_series(1, :users) g
+''')
+
+
+def endpoints(user_id: int) -> list[tuple[str, dict]]:
+    return [
+        ('/api/v4/users/fiat/transactions/', {'limit': 10, 'offset': 0}),
+        ('/api/v4/users/fiat/recent/transactions/', {}),
+        ('/api/v4/admin/fiat/transactions/', {'limit': 10, 'offset': 0}),
+        ('/api/v4/admin/user/fiat/transactions/', {'query': user_id, 'limit': 10, 'offset': 0}),
+        ('/api/v1/admin/transfer/transactions/', {'limit': 15, 'offset': 0}),
+    ]
+
+
+async def create_fixtures(run: str) -> dict:
+    async with AsyncSession(async_engine) as session:
+        def user(name: str, is_admin: bool = False) -> Users:
+            return Users(
+                first_name = name,
+                lastname   = 'Benchmark',
+                full_name  = f'{name} Benchmark',
+                email      = f'enrichment-{run}-{name.lower()}@example.com',
+                phoneno    = '0000000000',
+                password   = '-',
+                is_admin   = is_admin
+            )
+
+        admin, sender, receiver = user('Admin', True), user('Sender'), user('Receiver')
+        currency = Currency(name=f'B{run[:5].upper()}', symbol='B', decimal_places=2)
+
+        session.add_all([admin, sender, receiver, currency])
+        await session.commit()
+
+        for i in range(20):
+            session.add(DepositTransaction(
+                user_id        = sender.id,
+                transaction_id = f'ENR-D-{run}-{i}',
+                amount         = 100,
+                currency       = currency.id,
+                payment_mode   = 'Bank'
+            ))
+            session.add(TransferTransaction(
+                user_id        = sender.id,
+                receiver       = receiver.id,
+                transaction_id = f'ENR-T-{run}-{i}',
+                amount         = 10,
+                currency       = currency.id,
+                payment_mode   = 'Wallet'
+            ))
+
+        await session.commit()
+
+        return {'admin': admin.id, 'sender': sender.id, 'receiver': receiver.id, 'currency': currency.id}
+
+
+async def remove_fixtures(run: str, fixtures: dict) -> None:
+    async with AsyncSession(async_engine) as session:
+        await session.execute(delete(DepositTransaction).where(DepositTransaction.transaction_id.like(f'ENR-D-{run}-%')))
+        await session.execute(delete(TransferTransaction).where(TransferTransaction.transaction_id.like(f'ENR-T-{run}-%')))
+        await session.execute(delete(Currency).where(Currency.id == fixtures['currency']))
+        await session.execute(delete(Users).where(or_(
+            Users.email.like(f'enrichment-{run}-%'),
+            Users.email.like(f'enrichment-seed-{run}-%')
+        )))
+        await session.commit()
+
+
+async def measure(client: TestClient, fixtures: dict, requests: int) -> dict[str, float]:
+    sender_headers = {'Authorization': f'Bearer {generate_access_token(fixtures["sender"])}'}
+    admin_headers  = {'Authorization': f'Bearer {generate_access_token(fixtures["admin"])}'}
+    timings        = {}
+
+    for path, query in endpoints(fixtures['sender']):
+        headers = admin_headers if '/admin/' in path else sender_headers
+        samples = []
+
+        for _ in range(requests):
+            started  = time.perf_counter()
+            response = await client.get(path, headers=headers, query=query)
+            samples.append(time.perf_counter() - started)
+
+            assert response.status == 200, f'{path} returned {response.status}: {await response.text()}'
+
+        timings[path] = statistics.median(samples) * 1000
+
+    return timings
+
+
+async def main(args: argparse.Namespace) -> None:
+    from app.main import app
+
+    run = uuid.uuid4().hex[:8]
+
+    await app.start()
+    client   = TestClient(app)
+    fixtures = await create_fixtures(run)
+
+    try:
+        baseline = await measure(client, fixtures, args.requests)
+
+        async with AsyncSession(async_engine) as session:
+            started = time.perf_counter()
+            await session.execute(SEED_USERS_STATEMENT, {'prefix': f'enrichment-seed-{run}-', 'users': args.users})
+            await session.commit()
+            print(f'seeded {args.users} users in {time.perf_counter() - started:.1f}s')
+
+        seeded = await measure(client, fixtures, args.requests)
+
+        failures = []
+
+        for path, before in baseline.items():
+            after = seeded[path]
+            print(f'{path:<75} {before:8.2f} ms -> {after:8.2f} ms')
+
+            if after > before * args.max_ratio + args.slack_ms:
+                failures.append(path)
+
+        assert not failures, f'Listings grew with the user count: {failures}'
+
+    finally:
+        await remove_fixtures(run, fixtures)
+        await app.stop()
+        await async_engine.dispose()
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Transaction listing enrichment benchmark')
+    parser.add_argument('--users', type=int, default=500_000)
+    parser.add_argument('--requests', type=int, default=20)
+    parser.add_argument('--max-ratio', type=float, default=1.5)
+    parser.add_argument('--slack-ms', type=float, default=5.0)
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,176 @@
+"""
+Plans of the hot queries, before and after the index pack (migrations/versions/0002_hot_indexes).
+
+Runs EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) on the queries the index pack targets against
+the database configured in DATABASE_URL (PostgreSQL), with the busiest merchant and user of
+the database as parameters, and reports the scans, the indexes used and the time of each:
+
+    python -m tests.explain_hot_queries --output before.json
+    alembic upgrade head
+    python -m tests.explain_hot_queries --output after.json
+    python -m tests.explain_hot_queries --compare before.json after.json
+
+The queries only read, they run in a transaction that is rolled back.
+"""
+from sqlalchemy import desc, func, select, text
+from sqlalchemy.dialects import postgresql
+from Models.models import Kycdetails, Wallet
+from Models.models2 import MerchantProdTransaction
+from Models.models3 import MerchantAPILogs, MerchantRefund, MerchantWithdrawals
+from Models.models4 import DepositTransaction, TransferTransaction
+import argparse
+import asyncio
+import json
+
+
+
+PAGE_SIZE = 15
+
+
+def hot_queries(sample: dict) -> dict:
+    merchant_id, user_id = sample['merchant_id'], sample['user_id']
+
+    return {
+        'merchant pending withdrawals': select(MerchantWithdrawals).where(
+            MerchantWithdrawals.merchant_id == merchant_id, MerchantWithdrawals.status == 'Pending'
+        ).order_by(desc(MerchantWithdrawals.id)),
+        'admin withdrawals by status': select(MerchantWithdrawals).where(
+            MerchantWithdrawals.status == 'Pending'
+        ).order_by(desc(MerchantWithdrawals.createdAt)).limit(PAGE_SIZE),
+        'refund of a transaction': select(MerchantRefund).where(MerchantRefund.transaction_id == sample['transaction_id']),
+        'user deposits': select(DepositTransaction).where(
+            DepositTransaction.user_id == user_id
+        ).order_by(desc(DepositTransaction.id)).limit(PAGE_SIZE),
+        'user deposit count': select(func.count(DepositTransaction.id)).where(DepositTransaction.user_id == user_id),
+        'user transfers': select(TransferTransaction).where(
+            TransferTransaction.user_id == user_id
+        ).order_by(desc(TransferTransaction.id)).limit(PAGE_SIZE),
+        'received transfers': select(TransferTransaction).where(
+            TransferTransaction.receiver == user_id
+        ).order_by(desc(TransferTransaction.id)).limit(PAGE_SIZE),
+        'user wallet': select(Wallet).where(Wallet.user_id == user_id, Wallet.currency_id == sample['currency_id']),
+        'duplicate order check': select(MerchantProdTransaction).where(
+            MerchantProdTransaction.merchantOrderId == sample['order_id'], MerchantProdTransaction.merchant_id == merchant_id
+        ),
+        'merchant transaction page': select(MerchantProdTransaction).where(
+            MerchantProdTransaction.merchant_id == merchant_id
+        ).order_by(desc(MerchantProdTransaction.createdAt), desc(MerchantProdTransaction.id)).limit(PAGE_SIZE),
+        'merchant api logs': select(MerchantAPILogs).where(
+            MerchantAPILogs.merchant_id == merchant_id
+        ).order_by(desc(MerchantAPILogs.id)).limit(PAGE_SIZE),
+        'user kyc': select(Kycdetails).where(Kycdetails.user_id == user_id),
+    }
+
+
+# Busiest merchant and user of the database, and one of their rows of each kind
+SAMPLE_STATEMENTS = {
+    'merchant_id': 'SELECT merchant_id FROM merchantprodtransaction GROUP BY merchant_id ORDER BY count(*) DESC LIMIT 1',
+    'user_id': 'SELECT user_id FROM deposittransaction GROUP BY user_id ORDER BY count(*) DESC LIMIT 1',
+    'transaction_id': 'SELECT transaction_id FROM merchantrefund ORDER BY id DESC LIMIT 1',
+    'order_id': 'SELECT "merchantOrderId" FROM merchantprodtransaction WHERE merchant_id = :merchant_id ORDER BY id DESC LIMIT 1',
+    'currency_id': 'SELECT currency_id FROM wallet WHERE user_id = :user_id LIMIT 1',
+}
+
+SAMPLE_DEFAULTS = {'merchant_id': 0, 'user_id': 0, 'transaction_id': 0, 'order_id': '', 'currency_id': 0}
+
+
+
+def plan_nodes(plan: dict):
+    yield plan
+
+    for child in plan.get('Plans', ()):
+        yield from plan_nodes(child)
+
+
+def summarize(explained: dict) -> dict:
+    plan  = explained['Plan']
+    nodes = list(plan_nodes(plan))
+
+    return {
+        'execution_ms': explained.get('Execution Time'),
+        'planning_ms': explained.get('Planning Time'),
+        'total_cost': plan['Total Cost'],
+        'seq_scans': sorted({node['Relation Name'] for node in nodes if node['Node Type'] == 'Seq Scan'}),
+        'indexes': sorted({node['Index Name'] for node in nodes if 'Index Name' in node}),
+        'shared_blocks': plan.get('Shared Read Blocks', 0) + plan.get('Shared Hit Blocks', 0),
+        'nodes': [node['Node Type'] for node in nodes],
+    }
+
+
+async def explain(args: argparse.Namespace) -> dict:
+    from database.db import async_engine
+
+    async with async_engine.connect() as connection:
+        sample = dict(SAMPLE_DEFAULTS)
+
+        for name, statement in SAMPLE_STATEMENTS.items():
+            value = (await connection.execute(text(statement), sample)).scalar()
+
+            if value is not None:
+                sample[name] = value
+
+        report = {'sample': sample, 'queries': {}}
+
+        for name, statement in hot_queries(sample).items():
+            sql    = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}))
+            result = await connection.execute(text(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}'))
+            plan   = result.scalar()
+
+            # asyncpg returns the json column as text
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+
+            report['queries'][name] = summarize(plan[0])
+
+        await connection.rollback()
+
+    await async_engine.dispose()
+
+    return report
+
+
+def print_report(report: dict) -> None:
+    for name, summary in report['queries'].items():
+        scans = ', '.join(summary['seq_scans']) or '-'
+        print(f'{name:<30} {summary["execution_ms"]:10.3f} ms   seq scans: {scans:<25} indexes: {", ".join(summary["indexes"]) or "-"}')
+
+
+def compare(before_path: str, after_path: str) -> None:
+    with open(before_path) as before_file, open(after_path) as after_file:
+        before, after = json.load(before_file), json.load(after_file)
+
+    for name, old in before['queries'].items():
+        new = after['queries'].get(name)
+
+        if new is None:
+            continue
+
+        changed = 'plan changed' if (old['nodes'], old['indexes']) != (new['nodes'], new['indexes']) else 'same plan'
+        print(f'{name:<30} {old["execution_ms"]:10.3f} ms -> {new["execution_ms"]:10.3f} ms   '
+              f'seq scans {len(old["seq_scans"])} -> {len(new["seq_scans"])}   {changed}')
+
+        if new['indexes'] != old['indexes']:
+            print(f'{"":<30} indexes {", ".join(old["indexes"]) or "-"} -> {", ".join(new["indexes"]) or "-"}')
+
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = await explain(args)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2, default=str)
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='EXPLAIN ANALYZE of the hot queries')
+    parser.add_argument('--output', default='', help='JSON report path')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help='compare two JSON reports')
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,117 @@
+"""
+Memory benchmark for the streaming export engine.
+
+Exports 1M synthetic transaction rows through `app.export` and reports the peak RSS of the
+process, next to the old approach of building the whole list of dicts and one JSON body.
+
+    python -m tests.export_benchmark --rows 1000000
+    python -m tests.export_benchmark --rows 1000000 --source database
+
+With `--source database` the rows come from generate_series on the database configured
+in DATABASE_URL (PostgreSQL) through the same server-side cursor the endpoints use.
+Every mode runs in a fresh process so the peak RSS figures do not influence each other.
+"""
+from datetime import datetime, timedelta
+import argparse
+import asyncio
+import resource
+import subprocess
+import sys
+import time
+
+
+
+COLUMNS = ['id', 'transaction_id', 'amount', 'currency', 'status', 'created_At']
+
+
+def synthetic_row(i: int) -> tuple:
+    return (i, f'TXN{i:012d}', i % 1000 + 0.5, 'USD', 'Approved', datetime(2026, 1, 1) + timedelta(seconds=i))
+
+
+async def synthetic_partitions(rows: int, chunk_size: int):
+    for start in range(0, rows, chunk_size):
+        yield [synthetic_row(i) for i in range(start, min(start + chunk_size, rows))]
+
+
+def database_partitions(rows: int, chunk_size: int):
+    from sqlalchemy import text
+    from app.export import stream_partitions
+
+    statement = text('''
+        SELECT g AS id, 'TXN' || lpad(g::text, 12, '0') AS transaction_id, (g % 1000) + 0.5 AS amount,
+               'USD' AS currency, 'Approved' AS status, TIMESTAMP '2026-01-01' + g * INTERVAL '1 second' AS "created_At"
+        FROM generate_series(0, :rows - 1) g
+    ''').bindparams(rows=rows)
+
+    return stream_partitions(statement, chunk_size)
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def run_streamed(args: argparse.Namespace) -> int:
+    from app.export import ExportParams, export_response
+
+    if args.source == 'database':
+        partitions = database_partitions(args.rows, args.chunk_size)
+    else:
+        partitions = synthetic_partitions(args.rows, args.chunk_size)
+
+    response = export_response(partitions, COLUMNS, ExportParams(args.format), 'export_data', 'benchmark')
+    written  = 0
+
+    async for chunk in response.content.generator():
+        written += len(chunk)
+
+    return written
+
+
+async def run_legacy(args: argparse.Namespace) -> int:
+    from blacksheep import json
+
+    combined_data = []
+
+    async for partition in synthetic_partitions(args.rows, args.chunk_size):
+        for row in partition:
+            combined_data.append(dict(zip(COLUMNS, row)))
+
+    response = json({'success': True, 'export_data': combined_data}, 200)
+
+    return len(response.content.body)
+
+
+def run_mode(args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    written = asyncio.run(run_legacy(args) if args.mode == 'legacy' else run_streamed(args))
+    elapsed = time.perf_counter() - started
+
+    print(f'{args.mode:<10} {args.format:<7} {args.source:<10} {args.rows:>9} rows  '
+          f'{written / 1024 / 1024:8.1f} MB out  {elapsed:6.2f}s  peak RSS {peak_rss_mb():7.1f} MB')
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Streaming export memory benchmark')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--source', choices=['synthetic', 'database'], default='synthetic')
+    parser.add_argument('--mode', choices=['streamed', 'legacy'])
+    parser.add_argument('--format', choices=['json', 'csv', 'ndjson'])
+    args = parser.parse_args()
+
+    if args.mode:
+        args.format = args.format or 'json'
+        run_mode(args)
+        sys.exit(0)
+
+    # Run every mode in its own process
+    modes = [('legacy', 'json')] if args.source == 'synthetic' else []
+    modes += [('streamed', 'json'), ('streamed', 'csv'), ('streamed', 'ndjson')]
+
+    for mode, export_format in modes:
+        subprocess.run([
+            sys.executable, '-m', 'tests.export_benchmark',
+            '--rows', str(args.rows), '--chunk-size', str(args.chunk_size),
+            '--source', args.source, '--mode', mode, '--format', export_format
+        ], check=True)
@@ -0,0 +1,81 @@
+"""
+Cost of converting the amounts of a batch of deposit approvals.
+
+Converts `--amounts` amounts across a few currency pairs against a fake rate provider
+answering after `--latency-ms`, once the way the handlers used to do it, one provider
+call with a new client per amount, and once through `app.fx.FXRates`. Reports the total
+time and the number of provider calls of both modes.
+
+    python -m tests.fx_benchmark --amounts 200 --latency-ms 150
+"""
+from app.fx import FXRates, RateTable
+from app.settings import FX
+import argparse
+import asyncio
+import httpx
+import random
+import time
+
+
+
+CURRENCIES = ['USD', 'EUR', 'GBP', 'INR']
+
+
+class FakeProvider:
+    def __init__(self, latency_ms: float) -> None:
+        self.latency_ms = latency_ms
+        self.calls      = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        await asyncio.sleep(self.latency_ms / 1000)
+
+        if request.url.path == '/convert':
+            return httpx.Response(200, json={'result': float(request.url.params['amount']) * 1.1})
+
+        return httpx.Response(200, json={'rates': {currency: 1.1 for currency in CURRENCIES}})
+
+
+class BenchmarkFXRates(FXRates):
+    # No database here, keep the last known rates in memory only
+    async def store(self, table: RateTable) -> None:
+        pass
+
+
+async def run(mode: str, args: argparse.Namespace, conversions: list[tuple]) -> None:
+    provider  = FakeProvider(args.latency_ms)
+    transport = httpx.MockTransport(provider)
+    rates     = BenchmarkFXRates(FX(api_url='https://rates.test'), transport)
+    started   = time.perf_counter()
+
+    if mode == 'per-amount':
+        # What the handlers did before, one approval after the other
+        for source, quote, amount in conversions:
+            async with httpx.AsyncClient(transport=transport) as client:
+                response = await client.get(f'https://rates.test/convert?from={source}&to={quote}&amount={amount}')
+                response.json()['result']
+    else:
+        for source, quote, amount in conversions:
+            await rates.convert_many([(source, quote, amount)])
+
+    elapsed = time.perf_counter() - started
+    await rates.stop()
+
+    print(f'{mode:<10} {elapsed * 1000:9.1f} ms   provider calls {provider.calls:4}')
+
+
+async def main(args: argparse.Namespace) -> None:
+    random.seed(1)
+    conversions = [(*random.sample(CURRENCIES, 2), random.randint(10, 10000)) for _ in range(args.amounts)]
+
+    for mode in ('per-amount', 'cached'):
+        await run(mode, args, conversions)
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Currency conversion cost per batch of approvals')
+    parser.add_argument('--amounts', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=150.0)
+
+    asyncio.run(main(parser.parse_args()))
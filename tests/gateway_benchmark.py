@@ -0,0 +1,442 @@
+"""
+Offline end-to-end benchmark of the payment gateway.
+
+Boots `app.main:app` against the database configured in DATABASE_URL (PostgreSQL), seeds
+`--merchants` synthetic merchants with active keys, a card pipe and `--transactions`
+transactions each, and replaces every external service with an in-process fake:
+
+    Mastercard   tests.mastercard_fake_gateway, answering after `--gateway-latency-ms`
+    RapidAPI     a local rate provider for `app.fx.FXRates`
+    SMTP         tests.smtp_stand_in
+    Webhooks     tests.webhook_receiver as the merchant callback URL
+    Fireblocks   an in-memory vault client in place of `app.FireBlock.fireblocks`
+
+Then runs every scenario `--requests` times at `--concurrency` and writes one JSON report
+with the p50/p95/p99 latency, the throughput and the DB queries per request of each
+scenario, so runs can be diffed across commits:
+
+    python -m tests.gateway_benchmark --requests 500 --concurrency 50 --output before.json
+
+The DB queries per request come from the application metrics (`app.metrics`), the
+statements of the background workers are reported apart. Everything the benchmark creates
+is removed when it finishes.
+"""
+from datetime import datetime, timedelta
+from blacksheep import Application, json as json_response
+from blacksheep.contents import JSONContent
+from blacksheep.testing import TestClient
+from sqlalchemy import delete, insert, select
+from tests.mastercard_fake_gateway import create_fake_gateway
+from tests.smtp_stand_in import SMTPStandIn, free_port
+from tests.webhook_receiver import WebhookReceiver
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+import uvicorn
+
+
+
+SCENARIOS = ('pay', 'mastercard', 'sandbox', 'dashboard', 'export')
+
+PAY_ENDPOINT     = '/api/pg/prod/v1/pay/'
+SANDBOX_ENDPOINT = '/api/pg/sandbox/v1/pay/'
+
+CARD = {'cardNumber': '5123450000000008', 'cardExpiry': '01/39', 'cardCvv': '100', 'cardHolderName': 'Benchmark'}
+
+
+
+class FakeFireblocks:
+    # The vault calls of app.FireBlock, answered from memory
+    def __init__(self) -> None:
+        self.vaults = 0
+
+    def create_vault_account(self, name: str) -> dict:
+        self.vaults += 1
+        return {'id': str(self.vaults), 'name': name}
+
+    def create_vault_asset(self, vault_account_id: str, asset_id: str) -> dict:
+        return {'id': f'{vault_account_id}-{asset_id}', 'address': uuid.uuid4().hex}
+
+
+def create_fake_rates() -> Application:
+    app = Application()
+
+    @app.router.get('/latest')
+    async def latest():
+        return json_response({'rates': {'USD': 1.0, 'EUR': 0.92, 'GBP': 0.79, 'INR': 83.1}})
+
+    return app
+
+
+async def serve(app: Application, port: int) -> tuple[uvicorn.Server, asyncio.Task]:
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='warning'))
+    task   = asyncio.create_task(server.serve())
+
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    return server, task
+
+
+
+class Fakes:
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.ports    = {name: free_port() for name in ('mastercard', 'rates', 'webhooks')}
+        self.receiver = WebhookReceiver()
+        self.smtp     = SMTPStandIn()
+        self.servers  = []
+        self.apps     = {
+            'mastercard': create_fake_gateway(args.gateway_latency_ms),
+            'rates': create_fake_rates(),
+            'webhooks': self.receiver.app,
+        }
+
+    @property
+    def callback_url(self) -> str:
+        return f'http://127.0.0.1:{self.ports["webhooks"]}/callback'
+
+    # Settings overrides pointing the application to the fakes, read when app.main is imported
+    def environment(self) -> dict[str, str]:
+        return {
+            'APP_MASTERCARD': json.dumps({'base_url': f'http://127.0.0.1:{self.ports["mastercard"]}'}),
+            'APP_FX': json.dumps({'api_url': f'http://127.0.0.1:{self.ports["rates"]}'}),
+            'APP_MAIL': json.dumps({'host': '127.0.0.1', 'port': self.smtp.port, 'starttls': False}),
+            'APP_MONITORING': json.dumps({'enabled': True}),
+        }
+
+    async def start(self) -> None:
+        self.smtp.start()
+
+        for name, app in self.apps.items():
+            self.servers.append(await serve(app, self.ports[name]))
+
+    async def stop(self) -> None:
+        for server, task in self.servers:
+            server.should_exit = True
+            await task
+
+        self.smtp.stop()
+
+
+
+async def create_fixtures(run: str, args: argparse.Namespace) -> dict:
+    from database.db import AsyncSession, async_engine
+    from Models.models import Currency, UserKeys, Users
+    from Models.models2 import MerchantPIPE, MerchantProdTransaction, PIPE
+
+    # The rows are used after their commits, to sign requests and issue tokens
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        usd = (await session.execute(select(Currency).where(Currency.name == 'USD'))).scalars().first()
+        created_currency = usd is None
+
+        if created_currency:
+            usd = Currency(name='USD', symbol='$', decimal_places=2)
+            session.add(usd)
+            await session.commit()
+
+        pipe = PIPE(name=f'Benchmark {run}', status='Active', is_active=True, payment_medium='Card',
+                    process_mode='live', process_curr=usd.id, settlement_period='T+2')
+
+        def user(name: str, **flags) -> Users:
+            return Users(first_name=name, lastname='Benchmark', email=f'gateway-{run}-{name.lower()}@example.com',
+                         phoneno='0000000000', password='-', is_active=True, is_verified=True, **flags)
+
+        admin     = user('Admin', is_admin=True)
+        merchants = [user(f'Merchant{i}', is_merchent=True) for i in range(args.merchants)]
+
+        session.add_all([pipe, admin, *merchants])
+        await session.commit()
+
+        keys = [
+            UserKeys(user_id=merchant.id, public_key=f'GB{run}-{i}-PUBLIC', secret_key=f'GB{run}-{i}-SECRET', is_active=True)
+            for i, merchant in enumerate(merchants)
+        ]
+        session.add_all(keys)
+        session.add_all([MerchantPIPE(merchant=merchant.id, pipe=pipe.id, fee=2.5, is_active=True) for merchant in merchants])
+        await session.commit()
+
+        random.seed(run)
+        now = datetime.now()
+
+        for merchant in merchants:
+            await session.execute(insert(MerchantProdTransaction), [{
+                'merchant_id': merchant.id,
+                'pipe_id': pipe.id,
+                'transaction_id': f'GB-{run}-{merchant.id}-{i}',
+                'merchantOrderId': f'GB-{run}-{merchant.id}-{i}',
+                'currency': 'USD',
+                'amount': random.randint(1, 1000),
+                'status': random.choice(('PAYMENT_SUCCESS', 'PAYMENT_SUCCESS', 'PAYMENT_FAILED')),
+                'payment_mode': 'Card',
+                'is_completd': True,
+                'createdAt': now - timedelta(minutes=random.randint(0, 90 * 24 * 60)),
+                'balance_status': 'Mature',
+            } for i in range(args.transactions)])
+
+        await session.commit()
+
+        return {
+            'currency': usd.id if created_currency else None,
+            'pipe': pipe.id,
+            'admin': (admin.id, admin),
+            'merchants': [(merchant.id, merchant) for merchant in merchants],
+            'keys': [{'public_key': key.public_key, 'secret_key': key.secret_key} for key in keys],
+        }
+
+
+async def remove_fixtures(run: str, fixtures: dict) -> None:
+    from database.db import AsyncSession, async_engine
+    from Models.models import Currency, UserKeys, Users
+    from Models.models2 import (
+        MerchantAccountBalance, MerchantPIPE, MerchantProdTransaction, MerchantSandBoxTransaction, PIPE, PipeRevenueDaily
+    )
+    from Models.models3 import MerchantAPILogs, MerchantWebhook, MerchantWebhookAttempt
+
+    merchant_ids = [merchant_id for merchant_id, _ in fixtures['merchants']]
+
+    async with AsyncSession(async_engine) as session:
+        webhooks = select(MerchantWebhook.id).where(MerchantWebhook.merchant_id.in_(merchant_ids))
+
+        await session.execute(delete(MerchantWebhookAttempt).where(MerchantWebhookAttempt.webhook_id.in_(webhooks)))
+
+        for model in (MerchantWebhook, MerchantAPILogs, MerchantAccountBalance, MerchantProdTransaction, MerchantSandBoxTransaction):
+            await session.execute(delete(model).where(model.merchant_id.in_(merchant_ids)))
+
+        await session.execute(delete(PipeRevenueDaily).where(PipeRevenueDaily.pipe_id == fixtures['pipe']))
+        await session.execute(delete(MerchantPIPE).where(MerchantPIPE.merchant.in_(merchant_ids)))
+        await session.execute(delete(UserKeys).where(UserKeys.user_id.in_(merchant_ids)))
+        await session.execute(delete(Users).where(Users.email.like(f'gateway-{run}-%')))
+        await session.execute(delete(PIPE).where(PIPE.id == fixtures['pipe']))
+
+        if fixtures['currency']:
+            await session.execute(delete(Currency).where(Currency.id == fixtures['currency']))
+
+        await session.commit()
+
+
+
+class Scenarios:
+    def __init__(self, client: TestClient, fixtures: dict, fakes: Fakes) -> None:
+        from app.auth import generate_access_token
+
+        self.client   = client
+        self.fixtures = fixtures
+        self.fakes    = fakes
+        self.orders   = 0
+
+        admin_id, admin       = fixtures['admin']
+        self.admin_headers    = {'Authorization': f'Bearer {generate_access_token(admin_id, admin)}'}
+        self.merchant_headers = [
+            {'Authorization': f'Bearer {generate_access_token(merchant_id, merchant)}'}
+            for merchant_id, merchant in fixtures['merchants']
+        ]
+
+    def signed_order(self, endpoint: str) -> tuple[JSONContent, dict]:
+        from app.controllers.PG.input_format import base64_encode, calculate_sha256_string
+
+        self.orders += 1
+        key = self.fixtures['keys'][self.orders % len(self.fixtures['keys'])]
+
+        payload = base64_encode({
+            'merchantPublicKey': key['public_key'],
+            'merchantSecretKey': key['secret_key'],
+            'merchantOrderId': f'GBO-{uuid.uuid4().hex}',
+            'currency': 'USD',
+            'amount': random.randint(100, 100000),
+            'redirectUrl': 'https://merchant.test/redirect',
+            'callbackUrl': self.fakes.callback_url,
+            'mobileNumber': '9999999999',
+            'paymentInstrument': {'type': 'PAY_PAGE'},
+        })
+        checksum = calculate_sha256_string(payload + endpoint + key['secret_key']) + '****1'
+
+        return JSONContent({'request': payload}), {'X-AUTH': checksum}
+
+    # Every flow returns the HTTP requests it made and whether they all succeeded
+    async def pay(self) -> tuple[int, bool]:
+        content, headers = self.signed_order(PAY_ENDPOINT)
+        response = await self.client.post(PAY_ENDPOINT, headers=headers, content=content)
+
+        return 1, response.status == 200
+
+    async def mastercard(self) -> tuple[int, bool]:
+        from app.controllers.PG.input_format import base64_encode
+
+        content, headers = self.signed_order(PAY_ENDPOINT)
+        response = await self.client.post(PAY_ENDPOINT, headers=headers, content=content)
+
+        if response.status != 200:
+            return 1, False
+
+        transaction_id = (await response.json())['data']['transactionID']
+        card_payload   = base64_encode({**CARD, 'MerchantTransactionId': transaction_id})
+        response       = await self.client.post('/api/pg/prod/v1/pay/mc/', content=JSONContent({'request': card_payload}))
+
+        return 2, response.status == 200
+
+    async def sandbox(self) -> tuple[int, bool]:
+        content, headers = self.signed_order(SANDBOX_ENDPOINT)
+        response = await self.client.post(SANDBOX_ENDPOINT, headers=headers, content=content)
+
+        return 1, response.status == 200
+
+    async def dashboard(self) -> tuple[int, bool]:
+        headers = random.choice(self.merchant_headers)
+        stats   = await self.client.get('/api/v6/merchant/dash/stats/USD', headers=headers)
+        recent  = await self.client.get('/api/v6/merchant/recent/transactions/', headers=headers)
+
+        return 2, stats.status == 200 and recent.status == 200
+
+    async def export(self) -> tuple[int, bool]:
+        response = await self.client.get('/api/v2/admin/merchant/pg/export/transactions/', headers=self.admin_headers)
+        await response.read()
+
+        return 1, response.status == 200
+
+
+
+def percentile(samples: list[float], p: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+# Requests handled, statements run by them and by the background workers so far
+def query_totals(metrics) -> tuple[int, int, int]:
+    requests = sum(stats.latency.count for stats in metrics.routes.values())
+    queries  = sum(stats.queries.sum for stats in metrics.routes.values())
+
+    return requests, int(queries), metrics.queries
+
+
+async def run_scenario(name: str, flow, metrics, args: argparse.Namespace) -> dict:
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def run_one() -> tuple[float, int, bool]:
+        async with semaphore:
+            started = time.perf_counter()
+
+            try:
+                requests, succeeded = await flow()
+            except Exception:
+                requests, succeeded = 1, False
+
+            return time.perf_counter() - started, requests, succeeded
+
+    before  = query_totals(metrics)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(run_one() for _ in range(args.requests)))
+    elapsed = time.perf_counter() - started
+    after   = query_totals(metrics)
+
+    latencies = sorted(latency * 1000 for latency, _, _ in results)
+    requests  = after[0] - before[0]
+    queries   = after[1] - before[1]
+
+    report = {
+        'flows': len(results),
+        'requests': requests,
+        'failed_flows': sum(1 for _, _, succeeded in results if not succeeded),
+        'elapsed_s': round(elapsed, 3),
+        'flows_per_s': round(len(results) / elapsed, 1),
+        'requests_per_s': round(requests / elapsed, 1),
+        'latency_ms': {
+            'p50': round(percentile(latencies, 0.50), 2),
+            'p95': round(percentile(latencies, 0.95), 2),
+            'p99': round(percentile(latencies, 0.99), 2),
+            'max': round(latencies[-1], 2),
+        },
+        'db_queries_per_request': round(queries / requests, 2) if requests else 0,
+        'db_queries_background': (after[2] - before[2]) - queries,
+    }
+
+    print(f'{name:<11} {report["flows_per_s"]:8.1f} flows/s   p50 {report["latency_ms"]["p50"]:8.2f} ms   '
+          f'p99 {report["latency_ms"]["p99"]:8.2f} ms   {report["db_queries_per_request"]:6.2f} queries/request   '
+          f'{report["failed_flows"]} failed', file=sys.stderr)
+
+    return report
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+
+async def main(args: argparse.Namespace) -> None:
+    fakes = Fakes(args)
+    await fakes.start()
+
+    os.environ.update(fakes.environment())
+
+    from app import FireBlock
+    from app.main import app
+    from app.metrics import Metrics
+    from database.db import dispose_engines
+
+    FireBlock.fireblocks = FakeFireblocks()
+
+    run      = uuid.uuid4().hex[:8]
+    fixtures = await create_fixtures(run, args)
+
+    await app.start()
+    client    = TestClient(app)
+    metrics   = app.services.resolve(Metrics)
+    scenarios = Scenarios(client, fixtures, fakes)
+    report    = {
+        'commit': git_commit(),
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'config': vars(args),
+        'scenarios': {},
+    }
+
+    try:
+        for name in args.scenarios:
+            report['scenarios'][name] = await run_scenario(name, getattr(scenarios, name), metrics, args)
+
+        report['webhooks_received'] = fakes.receiver.requests
+        report['emails_received']   = len(fakes.smtp.messages)
+
+    finally:
+        await app.stop()
+        await remove_fixtures(run, fixtures)
+        await dispose_engines()
+        await fakes.stop()
+
+    output = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Offline end-to-end payment gateway benchmark')
+    parser.add_argument('--scenarios', type=lambda value: value.split(','), default=list(SCENARIOS),
+                        help=f'comma separated, of {",".join(SCENARIOS)}')
+    parser.add_argument('--requests', type=int, default=200, help='flows run per scenario')
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--merchants', type=int, default=20)
+    parser.add_argument('--transactions', type=int, default=500, help='seeded transactions per merchant')
+    parser.add_argument('--gateway-latency-ms', type=float, default=20.0)
+    parser.add_argument('--output', default='', help='JSON report path, stdout when empty')
+
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+
+    if unknown:
+        parser.error(f'unknown scenarios: {", ".join(sorted(unknown))}')
+
+    asyncio.run(main(args))
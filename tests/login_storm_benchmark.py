@@ -0,0 +1,86 @@
+"""
+Payment latency under a login storm.
+
+Runs a steady stream of simulated payment requests (a few milliseconds of awaited I/O
+each) while `--logins` concurrent logins verify bcrypt passwords, once with bcrypt on the
+event loop as the handlers used to do and once through `app.passwords.PasswordHasher`.
+Reports the payment latency percentiles and the login throughput of both modes.
+
+    python -m tests.login_storm_benchmark --logins 200 --rounds 12
+"""
+from app.passwords import PasswordHasher
+from app.settings import Passwords
+import argparse
+import asyncio
+import bcrypt
+import statistics
+import time
+
+
+
+async def payments(stop: asyncio.Event, io_ms: float, interval_ms: float) -> list[float]:
+    latencies = []
+    pending   = set()
+
+    async def payment():
+        started = time.perf_counter()
+        await asyncio.sleep(io_ms / 1000)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    while not stop.is_set():
+        task = asyncio.create_task(payment())
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+        await asyncio.sleep(interval_ms / 1000)
+
+    await asyncio.gather(*pending)
+    return latencies
+
+
+async def run(mode: str, args: argparse.Namespace, hashed: bytes) -> None:
+    hasher = PasswordHasher(Passwords(bcrypt_rounds=args.rounds, max_workers=args.workers))
+    hasher.start()
+
+    async def login():
+        if mode == 'inline':
+            # What the login handlers did before
+            await asyncio.sleep(0)
+            bcrypt.checkpw(b'benchmark-password', hashed)
+        else:
+            await hasher.verify('benchmark-password', hashed.decode())
+
+    stop    = asyncio.Event()
+    probe   = asyncio.create_task(payments(stop, args.io_ms, args.interval_ms))
+    started = time.perf_counter()
+
+    await asyncio.gather(*[login() for _ in range(args.logins)])
+
+    elapsed = time.perf_counter() - started
+    stop.set()
+    latencies = sorted(await probe)
+    hasher.stop()
+
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+
+    print(f'{mode:<9} {args.logins / elapsed:7.1f} logins/s   payments {len(latencies):5}   '
+          f'p50 {statistics.median(latencies):8.1f} ms   p99 {percentile(0.99):8.1f} ms   max {latencies[-1]:8.1f} ms')
+
+
+async def main(args: argparse.Namespace) -> None:
+    hashed = bcrypt.hashpw(b'benchmark-password', bcrypt.gensalt(args.rounds))
+
+    for mode in ('inline', 'executor'):
+        await run(mode, args, hashed)
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Payment latency during a login storm')
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=12)
+    parser.add_argument('--workers', type=int, default=Passwords().max_workers)
+    parser.add_argument('--io-ms', type=float, default=5.0)
+    parser.add_argument('--interval-ms', type=float, default=2.0)
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,76 @@
+"""
+Email sending cost seen by the handlers.
+
+Sends `--messages` emails to the local SMTP stand-in (with `--handshake-delay` seconds
+added to every EHLO to mimic a remote provider), once the way the handlers used to do it,
+a fresh connection and login per email on the event loop, and once through
+`app.mail.MailQueue`. Reports the time the handler spends per email and the time until
+every email is delivered.
+
+    python -m tests.mail_benchmark --messages 200 --handshake-delay 0.05
+"""
+from app.mail import MailMessage, MailQueue, SMTPConnection
+from app.settings import Mail
+from tests.smtp_stand_in import SMTPStandIn
+import argparse
+import asyncio
+import statistics
+import time
+
+
+
+async def run(mode: str, args: argparse.Namespace, settings: Mail, server: SMTPStandIn) -> None:
+    server.messages.clear()
+    queue = MailQueue(settings)
+    queue.start()
+
+    latencies = []
+    started   = time.perf_counter()
+
+    for i in range(args.messages):
+        message = MailMessage(f'user{i}@example.com', 'Benchmark', '<b>Hello</b>')
+        sent_at = time.perf_counter()
+
+        if mode == 'per-email':
+            # What the handlers did before
+            connection = SMTPConnection(settings)
+            connection.send(message)
+            connection.close()
+        else:
+            queue.enqueue(message)
+
+        latencies.append((time.perf_counter() - sent_at) * 1000)
+        await asyncio.sleep(0)
+
+    await queue.stop()
+    server.wait_for(args.messages)
+    elapsed = time.perf_counter() - started
+
+    print(f'{mode:<9} handler p50 {statistics.median(latencies):8.3f} ms   max {max(latencies):8.3f} ms   '
+          f'delivered {len(server.messages):5} in {elapsed:6.2f} s ({len(server.messages) / elapsed:7.1f}/s)')
+
+
+async def main(args: argparse.Namespace) -> None:
+    with SMTPStandIn(handshake_delay=args.handshake_delay) as server:
+        settings = Mail(
+            host           = '127.0.0.1',
+            port           = server.port,
+            username       = 'noreply@example.com',
+            password       = 'benchmark',
+            starttls       = False,
+            pool_size      = args.pool_size,
+            max_queue_size = args.messages,
+        )
+
+        for mode in ('per-email', 'queued'):
+            await run(mode, args, settings, server)
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Email sending cost per handler')
+    parser.add_argument('--messages', type=int, default=200)
+    parser.add_argument('--handshake-delay', type=float, default=0.05)
+    parser.add_argument('--pool-size', type=int, default=Mail().pool_size)
+
+    asyncio.run(main(parser.parse_args()))
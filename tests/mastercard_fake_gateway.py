@@ -0,0 +1,119 @@
+"""
+Local stand-in for the Mastercard gateway REST API.
+
+Implements the session, authentication, pay and status operations used by
+`MastercardClient` with a configurable artificial latency, so the client can be
+load tested without reaching the real gateway.
+
+    python -m tests.mastercard_fake_gateway --port 44800 --latency-ms 80
+
+Then point the application to it:
+
+    export APP_MASTERCARD='{"base_url": "http://127.0.0.1:44800"}'
+"""
+from blacksheep import Application, Request, json
+import argparse
+import asyncio
+import uuid
+import uvicorn
+
+
+
+API_PREFIX = '/api/rest/version/{version}/merchant/{merchant_id}'
+
+
+def create_fake_gateway(latency_ms: float = 0, fail_every: int = 0) -> Application:
+    """
+        Returns an ASGI app emulating the gateway.
+        `fail_every` makes every n-th request answer 503, to exercise retries.
+    """
+    app     = Application()
+    counter = {'requests': 0}
+
+
+    async def delay() -> bool:
+        counter['requests'] += 1
+
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+
+        return bool(fail_every) and counter['requests'] % fail_every == 0
+
+
+    @app.router.post(f'{API_PREFIX}/session')
+    async def create_session(version: int, merchant_id: str):
+        if await delay():
+            return json({'error': {'cause': 'SERVER_BUSY'}}, 503)
+
+        return json({
+            'merchant': merchant_id,
+            'result': 'SUCCESS',
+            'session': {'aes256Key': '', 'authenticationLimit': 25, 'id': f'SESSION{uuid.uuid4().hex}', 'updateStatus': 'NO_UPDATE', 'version': '1'}
+        }, 201)
+
+
+    @app.router.put(f'{API_PREFIX}/session/{{session_id}}')
+    async def update_session(version: int, merchant_id: str, session_id: str):
+        if await delay():
+            return json({'error': {'cause': 'SERVER_BUSY'}}, 503)
+
+        return json({
+            'merchant': merchant_id,
+            'session': {'id': session_id, 'updateStatus': 'SUCCESS', 'version': '2'}
+        }, 200)
+
+
+    @app.router.put(f'{API_PREFIX}/order/{{order_id}}/transaction/{{transaction_id}}')
+    async def order_transaction(request: Request, version: int, merchant_id: str, order_id: str, transaction_id: str):
+        if await delay():
+            return json({'error': {'cause': 'SERVER_BUSY'}}, 503)
+
+        payload = await request.json()
+
+        if payload.get('apiOperation') == 'INITIATE_AUTHENTICATION':
+            return json({
+                'merchant': merchant_id,
+                'order': {'id': order_id, 'status': 'AUTHENTICATION_INITIATED'},
+                'response': {'gatewayCode': 'AUTHENTICATION_IN_PROGRESS', 'gatewayRecommendation': 'PROCEED'},
+                'result': 'SUCCESS'
+            }, 201)
+
+        return json({
+            'merchant': merchant_id,
+            'order': {'id': order_id, 'status': 'CAPTURED'},
+            'response': {'acquirerCode': '00', 'acquirerMessage': 'Approved', 'gatewayCode': 'APPROVED'},
+            'result': 'SUCCESS',
+            'transaction': {'id': transaction_id, 'type': 'PAYMENT'}
+        }, 200)
+
+
+    @app.router.get(f'{API_PREFIX}/order/{{order_id}}/transaction/{{transaction_id}}')
+    async def transaction_status(version: int, merchant_id: str, order_id: str, transaction_id: str):
+        if await delay():
+            return json({'error': {'cause': 'SERVER_BUSY'}}, 503)
+
+        return json({
+            'merchant': merchant_id,
+            'order': {'id': order_id, 'status': 'CAPTURED'},
+            'response': {'acquirerCode': '00', 'acquirerMessage': 'Approved', 'gatewayCode': 'APPROVED'},
+            'result': 'SUCCESS'
+        }, 200)
+
+    return app
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Fake Mastercard gateway')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=44800)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--fail-every', type=int, default=0)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_fake_gateway(args.latency_ms, args.fail_every),
+        host      = args.host,
+        port      = args.port,
+        log_level = 'warning'
+    )
@@ -0,0 +1,97 @@
+"""
+Offline throughput test of `MastercardClient` against the fake gateway.
+
+Starts `tests.mastercard_fake_gateway` on a local port and runs complete card
+flows (create session, update session, initiate authentication, pay, status)
+at the requested concurrency.
+
+    python -m tests.mastercard_load --payments 2000 --concurrency 200 --latency-ms 50
+"""
+from app.settings import Mastercard
+from app.controllers.PG.Mastercard.mastercard import MastercardClient
+from tests.mastercard_fake_gateway import create_fake_gateway
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+import uvicorn
+
+
+
+# Returns the flow latency and whether every step succeeded
+async def card_flow(client: MastercardClient) -> tuple[float, bool]:
+    started        = time.perf_counter()
+    transaction_id = uuid.uuid4().hex
+
+    session = await client.create_session()
+
+    if session.get('result') != 'SUCCESS':
+        return time.perf_counter() - started, False
+
+    session_id = session['session']['id']
+
+    await client.update_session(session_id, transaction_id, '5123450000000008', '100', '01/39', 'USD', 1000, 'http://localhost')
+    initiate_auth = await client.initiate_authentication(transaction_id, session_id, 'USD')
+    deduct        = await client.deduct_amount(transaction_id, session_id)
+    status        = await client.transaction_status(transaction_id)
+
+    succeeded = all(step.get('result') == 'SUCCESS' for step in (initiate_auth, deduct, status))
+
+    return time.perf_counter() - started, succeeded
+
+
+
+async def main(args: argparse.Namespace) -> None:
+    server = uvicorn.Server(uvicorn.Config(
+        create_fake_gateway(args.latency_ms, args.fail_every),
+        host='127.0.0.1', port=args.port, log_level='warning'
+    ))
+    server_task = asyncio.create_task(server.serve())
+
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    client = MastercardClient(Mastercard(
+        base_url        = f'http://127.0.0.1:{args.port}',
+        max_connections = args.concurrency,
+        max_concurrency = args.concurrency,
+        backoff_factor  = 0.01
+    ), merchant_id='LOADTEST')
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def run_one() -> tuple[float, bool]:
+        async with semaphore:
+            return await card_flow(client)
+
+    started   = time.perf_counter()
+    results   = await asyncio.gather(*(run_one() for _ in range(args.payments)))
+    elapsed   = time.perf_counter() - started
+    latencies = sorted(latency for latency, _ in results)
+    failed    = sum(1 for _, succeeded in results if not succeeded)
+
+    await client.close()
+    server.should_exit = True
+    await server_task
+
+    print(f'payments:        {args.payments}')
+    print(f'failed flows:    {failed}')
+    print(f'concurrency:     {args.concurrency}')
+    print(f'elapsed:         {elapsed:.2f}s')
+    print(f'payments/sec:    {args.payments / elapsed:.1f}')
+    print(f'gateway calls/s: {args.payments * 5 / elapsed:.1f}')
+    print(f'p50 flow:        {statistics.median(latencies) * 1000:.1f}ms')
+    print(f'p95 flow:        {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f}ms')
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Mastercard client load test')
+    parser.add_argument('--payments', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--fail-every', type=int, default=0)
+    parser.add_argument('--port', type=int, default=44801)
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,122 @@
+"""
+Query profiler for tests, counts the SQL statements run while handling requests.
+
+Many handlers used to run a query per row of a listing (N+1), which only shows once the
+listing grows. The profiler listens to the statements run on the engines and groups them
+by shape, the statement with its literals and parameters replaced, so the same query run
+for every row of a listing is caught with a handful of rows:
+
+    class TestListing(QueryBudgetMixin, unittest.IsolatedAsyncioTestCase):
+        query_engines = (async_engine,)
+
+        async def test_listing(self):
+            with self.assertQueryBudget(max_queries=3):
+                response = await self.client.get('/api/listing/')
+
+Every statement run on the engines while the block is open is counted, background tasks
+of the application included.
+"""
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+import re
+
+
+
+# Times the same statement shape may run in a request before it is reported as N+1
+MAX_REPEATS = 2
+
+SHAPE_PATTERNS = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),                      # string literals
+    (re.compile(r'%\(\w+\)s|\$\d+|(?<!:):\w+|%s'), '?'),        # bound parameters
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),                    # numbers
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)'), '(?)'),         # expanded IN lists
+    (re.compile(r'\s+'), ' '),
+)
+
+
+
+def statement_shape(statement: str) -> str:
+    """
+    The statement with its literals, parameters and IN lists replaced by `?`.
+    """
+    for pattern, replacement in SHAPE_PATTERNS:
+        statement = pattern.sub(replacement, statement)
+
+    return statement.strip()
+
+
+
+class QueryProfile:
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+    def shapes(self) -> Counter:
+        return Counter(statement_shape(statement) for statement in self.statements)
+
+
+    def repeated(self, max_repeats: int = MAX_REPEATS) -> dict[str, int]:
+        """
+        Statement shapes run more than `max_repeats` times, with the times they ran.
+        """
+        return {shape: count for shape, count in self.shapes().items() if count > max_repeats}
+
+
+    def report(self) -> str:
+        return '\n'.join(f'{count:4d} x {shape}' for shape, count in self.shapes().most_common())
+
+
+
+class QueryProfiler:
+    def __init__(self, *engines: Engine | AsyncEngine) -> None:
+        # Statements of async engines run on their sync engine
+        self.engines = [engine.sync_engine if isinstance(engine, AsyncEngine) else engine for engine in engines]
+
+
+    @contextmanager
+    def capture(self) -> Iterator[QueryProfile]:
+        profile = QueryProfile()
+
+        def record(conn, cursor, statement, parameters, context, executemany) -> None:
+            profile.statements.append(statement)
+
+        for engine in self.engines:
+            event.listen(engine, 'before_cursor_execute', record)
+
+        try:
+            yield profile
+
+        finally:
+            for engine in self.engines:
+                event.remove(engine, 'before_cursor_execute', record)
+
+
+
+class QueryBudgetMixin:
+    """
+    Query budget assertions for `unittest.TestCase`, profiling the engines in `query_engines`.
+    """
+    query_engines: tuple = ()
+
+    @contextmanager
+    def assertQueryBudget(self, max_queries: int | None = None, max_repeats: int = MAX_REPEATS) -> Iterator[QueryProfile]:
+        with QueryProfiler(*self.query_engines).capture() as profile:
+            yield profile
+
+        if max_queries is not None and profile.count > max_queries:
+            self.fail(f'{profile.count} queries run, the budget is {max_queries}:\n{profile.report()}')
+
+        repeated = profile.repeated(max_repeats)
+
+        if repeated:
+            shapes = '\n'.join(f'{count:4d} x {shape}' for shape, count in repeated.items())
+            self.fail(f'Statements run more than {max_repeats} times, likely N+1 queries:\n{shapes}')
@@ -0,0 +1,111 @@
+"""
+Local SMTP server standing in for the mail provider in tests and benchmarks.
+
+Accepts any login without TLS, keeps the delivered messages in memory, can fail the next
+messages with a temporary error and can delay the handshake to mimic a remote server.
+Its dependencies are in requirements-dev.txt.
+
+    python -m tests.smtp_stand_in --port 8025
+"""
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+import argparse
+import asyncio
+import email
+import socket
+import time
+
+
+
+class StandInHandler:
+    def __init__(self, handshake_delay: float = 0.0) -> None:
+        self.handshake_delay = handshake_delay
+        self.messages        = []
+        self.sessions        = set()
+        self.fail_next       = 0
+
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        await asyncio.sleep(self.handshake_delay)
+        session.host_name = hostname
+        return responses
+
+
+    async def handle_DATA(self, server, session, envelope):
+        self.sessions.add(id(session))
+
+        if self.fail_next > 0:
+            self.fail_next -= 1
+            return '451 Try again later'
+
+        self.messages.append(email.message_from_bytes(envelope.original_content))
+        return '250 Message accepted for delivery'
+
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def accept_any_login(server, session, envelope, mechanism, auth_data):
+    return AuthResult(success=True)
+
+
+
+class SMTPStandIn:
+    def __init__(self, port: int = 0, handshake_delay: float = 0.0) -> None:
+        self.handler    = StandInHandler(handshake_delay)
+        self.controller = Controller(
+            self.handler,
+            hostname         = '127.0.0.1',
+            port             = port or free_port(),
+            authenticator    = accept_any_login,
+            auth_require_tls = False,
+        )
+
+    @property
+    def port(self) -> int:
+        return self.controller.port
+
+    @property
+    def messages(self) -> list:
+        return self.handler.messages
+
+    def start(self) -> None:
+        self.controller.start()
+
+    def stop(self) -> None:
+        self.controller.stop()
+
+    def wait_for(self, count: int, timeout: float = 10.0) -> None:
+        deadline = time.monotonic() + timeout
+
+        while len(self.messages) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def __enter__(self) -> 'SMTPStandIn':
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Local SMTP stand-in')
+    parser.add_argument('--port', type=int, default=8025)
+    parser.add_argument('--handshake-delay', type=float, default=0.0)
+    args = parser.parse_args()
+
+    with SMTPStandIn(args.port, args.handshake_delay) as server:
+        print(f'SMTP stand-in listening on 127.0.0.1:{server.port}')
+
+        try:
+            while True:
+                time.sleep(1)
+                print(f'{len(server.messages)} messages received', end='\r')
+        except KeyboardInterrupt:
+            pass
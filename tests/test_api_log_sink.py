@@ -0,0 +1,98 @@
+import asyncio
+import unittest
+from sqlalchemy.exc import IntegrityError, OperationalError
+from app.settings import APILogs
+from app.controllers.PG.APILogs import APILogSink, createNewAPILogs
+
+
+
+class RecordingSink(APILogSink):
+    def __init__(self, settings: APILogs) -> None:
+        super().__init__(settings)
+        self.batches = []
+
+    async def write(self, batch: list[dict]) -> None:
+        self.batches.append(batch)
+
+
+
+class RejectingSink(RecordingSink):
+    """
+    Sink over a database which rejects the INSERT of any batch with a record of a missing
+    merchant, or every INSERT while it is down.
+    """
+
+    def __init__(self, settings: APILogs, down: bool = False) -> None:
+        super().__init__(settings)
+        self.down     = down
+        self.attempts = 0
+
+    async def write(self, batch: list[dict]) -> None:
+        self.attempts += 1
+
+        if self.down:
+            raise OperationalError('INSERT', {}, ConnectionRefusedError())
+
+        if any(record['merchant_id'] is None for record in batch):
+            raise IntegrityError('INSERT', {}, Exception('violates foreign key constraint'))
+
+        await super().write(batch)
+
+
+
+class TestAPILogSink(unittest.IsolatedAsyncioTestCase):
+    async def test_logs_are_written_in_batches(self):
+        sink = RecordingSink(APILogs(batch_size=10, flush_interval_ms=50))
+        sink.start()
+
+        for i in range(25):
+            await createNewAPILogs(i, 'error', '/api/pg/prod/v1/pay/', '', '', '', '')
+
+        await sink.stop()
+
+        self.assertEqual([len(batch) for batch in sink.batches], [10, 10, 5])
+        self.assertIsNone(APILogSink.current)
+
+    async def test_partial_batch_is_flushed_after_interval(self):
+        sink = RecordingSink(APILogs(batch_size=100, flush_interval_ms=20))
+        sink.start()
+
+        await createNewAPILogs(1, 'error', '/api/pg/prod/v1/pay/', '', '', '', '')
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(sink.written, 1)
+        await sink.stop()
+
+    async def test_full_queue_drops_new_logs(self):
+        sink = RecordingSink(APILogs(max_queue_size=2, overflow_policy='drop'))
+        sink.start()
+
+        # The writer has not run yet, so the queue only has room for two logs
+        for i in range(5):
+            await sink.submit({'merchant_id': i})
+
+        self.assertEqual(sink.dropped, 3)
+
+        await sink.stop()
+        self.assertEqual(sink.written, 2)
+
+    async def test_bad_record_only_drops_itself(self):
+        sink  = RejectingSink(APILogs())
+        batch = [{'merchant_id': i} for i in range(8)]
+        batch[5]['merchant_id'] = None
+
+        with self.assertLogs('app.controllers.PG.APILogs', 'ERROR'):
+            await sink.flush(batch)
+
+        written = [record for written_batch in sink.batches for record in written_batch]
+
+        self.assertEqual(written, batch[:5] + batch[6:])
+        self.assertEqual((sink.written, sink.failed), (7, 1))
+
+    async def test_unreachable_database_is_not_retried_per_record(self):
+        sink = RejectingSink(APILogs(), down=True)
+
+        with self.assertLogs('app.controllers.PG.APILogs', 'ERROR'):
+            await sink.flush([{'merchant_id': i} for i in range(8)])
+
+        self.assertEqual((sink.attempts, sink.written, sink.failed), (1, 0, 8))
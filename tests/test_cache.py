@@ -0,0 +1,49 @@
+import unittest
+from app.cache import TTLCache
+
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+
+class TestTTLCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = TTLCache(maxsize=2, ttl=10, clock=self.clock)
+
+    def test_hit_and_miss_counters(self):
+        self.cache.set('key', 1)
+
+        self.assertEqual(self.cache.get('key'), 1)
+        self.assertIsNone(self.cache.get('other'))
+        self.assertEqual(self.cache.stats()['hits'], 1)
+        self.assertEqual(self.cache.stats()['misses'], 1)
+
+    def test_entries_expire(self):
+        self.cache.set('key', 1)
+        self.clock.now = 10
+
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_least_recently_used_is_evicted(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_pop_invalidates(self):
+        self.cache.set('key', 1)
+
+        self.assertEqual(self.cache.pop('key'), 1)
+        self.assertIsNone(self.cache.get('key'))
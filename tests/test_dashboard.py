@@ -0,0 +1,137 @@
+import unittest
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session
+from Models.models3 import MerchantRefund
+from app import dashboard
+from app.dashboard import (
+    bucket_starts, invalidate_merchant_dashboard, merchant_chart, merchant_chart_statement, merchant_stats,
+    window_start
+)
+
+
+
+class FakeResult:
+    def __init__(self, rows: list) -> None:
+        self.rows = rows
+
+    def all(self) -> list:
+        return self.rows
+
+    def one(self):
+        return self.rows[0]
+
+
+class FakeRow(tuple):
+    def _asdict(self) -> dict:
+        return dict(self.fields)
+
+
+class FakeSession:
+    def __init__(self, rows: list) -> None:
+        self.rows       = rows
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return FakeResult(self.rows)
+
+
+
+class TestBuckets(unittest.TestCase):
+    def test_window_start(self):
+        now = datetime(2024, 2, 14, 15, 30)
+
+        self.assertEqual(window_start('day', 3, now), datetime(2024, 2, 12))
+        # 2024-02-14 is a Wednesday, weeks start on Monday like date_trunc
+        self.assertEqual(window_start('week', 2, now), datetime(2024, 2, 5))
+        self.assertEqual(window_start('month', 3, now), datetime(2023, 12, 1))
+
+    def test_bucket_starts(self):
+        starts = bucket_starts('month', datetime(2023, 11, 1), datetime(2024, 1, 20))
+
+        self.assertEqual(starts, [datetime(2023, 11, 1), datetime(2023, 12, 1), datetime(2024, 1, 1)])
+
+    def test_chart_is_one_grouped_statement(self):
+        statement = merchant_chart_statement(5, 'USD', 'week', datetime(2024, 1, 1))
+        sql       = str(statement.compile(dialect=postgresql.dialect()))
+
+        self.assertEqual(sql.count('UNION ALL'), 5)
+        self.assertIn('''GROUP BY date_trunc('week', merchantrefund."createdAt")''', sql)
+
+
+
+class TestMerchantChart(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        dashboard.dashboard_cache.clear()
+
+    async def test_series_and_totals(self):
+        since = window_start('month', 2, datetime.now())
+        session = FakeSession([
+            ('success_transaction', None, 500.0, 4),
+            ('success_transaction', since, 120.0, 2),
+            ('refund_amount', None, 30.0, 1),
+        ])
+
+        chart = await merchant_chart(session, 1, 'USD', 'month', 2)
+
+        self.assertEqual(chart['success_transaction'], 500.0)
+        self.assertEqual(chart['withdrawal_amount'], 0)
+        self.assertEqual(chart['refund_amount'], 30.0)
+        self.assertEqual(len(chart['series']), 2)
+        self.assertEqual(chart['series'][0]['success_transaction'], 120.0)
+        self.assertEqual(chart['series'][0]['success_transaction_count'], 2)
+        self.assertEqual(chart['series'][1]['success_transaction'], 0)
+
+    async def test_results_are_cached_until_the_merchant_changes(self):
+        session = FakeSession([('success_transaction', None, 10.0, 1)])
+
+        await merchant_chart(session, 2)
+        await merchant_chart(session, 2)
+        self.assertEqual(len(session.statements), 1)
+
+        invalidate_merchant_dashboard(2)
+        await merchant_chart(session, 2)
+        self.assertEqual(len(session.statements), 2)
+
+    async def test_unknown_currency(self):
+        row        = FakeRow(())
+        row.fields = {'currency_id': None, 'merchant_refunds': 0}
+
+        self.assertIsNone(await merchant_stats(FakeSession([row]), 3, 'XYZ'))
+
+
+
+class TestInvalidation(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        MerchantRefund.__table__.create(self.engine)
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def generation(self, merchant_id: int) -> int:
+        return dashboard._generations.get(merchant_id, 0)
+
+    def test_committed_writes_invalidate_the_merchant(self):
+        before = self.generation(7)
+
+        with Session(self.engine) as session:
+            session.add(MerchantRefund(merchant_id=7, transaction_id=1, amount=10, currency=1, comment='', createdAt=datetime.now()))
+            session.flush()
+            self.assertEqual(self.generation(7), before)
+
+            session.commit()
+
+        self.assertEqual(self.generation(7), before + 1)
+
+    def test_rolled_back_writes_do_not(self):
+        before = self.generation(8)
+
+        with Session(self.engine) as session:
+            session.add(MerchantRefund(merchant_id=8, transaction_id=1, amount=10, currency=1, comment='', createdAt=datetime.now()))
+            session.flush()
+            session.rollback()
+
+        self.assertEqual(self.generation(8), before)
@@ -0,0 +1,49 @@
+import unittest
+from types import SimpleNamespace
+from app import enrichment
+from app.enrichment import fetch_users
+
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalars(self):
+        return iter(self.rows)
+
+
+class FakeSession:
+    """Answers `id IN (...)` queries from the ids bound to the statement."""
+    def __init__(self):
+        self.queries = []
+
+    async def execute(self, statement):
+        ids = statement.compile().params['id_1']
+        self.queries.append(ids)
+        return FakeResult([SimpleNamespace(id=id) for id in ids])
+
+
+
+class TestFetchByIds(unittest.IsolatedAsyncioTestCase):
+    async def test_only_referenced_ids_are_loaded(self):
+        session = FakeSession()
+        users   = await fetch_users(session, [3, None, 1, 3])
+
+        self.assertEqual(sorted(users), [1, 3])
+        self.assertEqual(session.queries, [[1, 3]])
+
+    async def test_no_query_without_ids(self):
+        session = FakeSession()
+
+        self.assertEqual(await fetch_users(session, [None]), {})
+        self.assertEqual(session.queries, [])
+
+    async def test_ids_are_queried_in_chunks(self):
+        session = FakeSession()
+        chunk   = enrichment.IN_CHUNK_SIZE
+
+        users = await fetch_users(session, range(chunk * 2 + 1))
+
+        self.assertEqual(len(users), chunk * 2 + 1)
+        self.assertEqual([len(ids) for ids in session.queries], [chunk, chunk, 1])
@@ -0,0 +1,83 @@
+import json
+import unittest
+from datetime import datetime
+from blacksheep import Request
+from app.export import ExportParams, export_response
+
+
+
+async def partitions(rows, size=2):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+async def read_body(response) -> bytes:
+    body = b''
+
+    async for chunk in response.content.generator():
+        body += chunk
+
+    return body
+
+
+ROWS = [
+    (1, 'USD', datetime(2026, 1, 1, 10, 30)),
+    (2, 'EUR', None),
+    (3, 'INR', datetime(2026, 1, 2)),
+]
+
+COLUMNS = ['id', 'currency', 'created_At']
+
+
+
+class TestExportParams(unittest.TestCase):
+    def test_defaults_to_json(self):
+        params = ExportParams.from_request(Request('GET', b'/export/', None), COLUMNS)
+
+        self.assertEqual(params.format, 'json')
+        self.assertIsNone(params.columns)
+        self.assertIsNone(params.start)
+
+    def test_columns_and_inclusive_date_range(self):
+        request = Request('GET', b'/export/?format=csv&columns=id,currency&date_from=2026-01-01&date_to=2026-01-31', None)
+        params  = ExportParams.from_request(request, COLUMNS)
+
+        self.assertEqual(params.columns, ['id', 'currency'])
+        self.assertEqual(params.start, datetime(2026, 1, 1))
+        self.assertEqual(params.end, datetime(2026, 2, 1))
+
+    def test_rejects_unknown_column_and_format(self):
+        with self.assertRaises(ValueError):
+            ExportParams.from_request(Request('GET', b'/export/?columns=password', None), COLUMNS)
+
+        with self.assertRaises(ValueError):
+            ExportParams.from_request(Request('GET', b'/export/?format=xlsx', None), COLUMNS)
+
+
+
+class TestExportResponse(unittest.IsolatedAsyncioTestCase):
+    async def test_json_keeps_the_legacy_body(self):
+        response = export_response(partitions(ROWS), COLUMNS, ExportParams(), 'export_data', 'data')
+        body     = json.loads(await read_body(response))
+
+        self.assertTrue(body['success'])
+        self.assertEqual(len(body['export_data']), 3)
+        self.assertEqual(body['export_data'][0], {'id': 1, 'currency': 'USD', 'created_At': '2026-01-01T10:30:00'})
+
+    async def test_json_without_rows(self):
+        response = export_response(partitions([]), COLUMNS, ExportParams(), 'export_data', 'data')
+
+        self.assertEqual(json.loads(await read_body(response)), {'success': True, 'export_data': []})
+
+    async def test_csv(self):
+        response = export_response(partitions(ROWS), COLUMNS, ExportParams('csv'), 'export_data', 'data')
+        lines    = (await read_body(response)).decode().splitlines()
+
+        self.assertEqual(lines, ['id,currency,created_At', '1,USD,2026-01-01T10:30:00', '2,EUR,', '3,INR,2026-01-02T00:00:00'])
+        self.assertIn(b'data.csv', response.get_first_header(b'Content-Disposition'))
+
+    async def test_ndjson(self):
+        response = export_response(partitions(ROWS), COLUMNS, ExportParams('ndjson'), 'export_data', 'data')
+        lines    = (await read_body(response)).decode().splitlines()
+
+        self.assertEqual([json.loads(line)['id'] for line in lines], [1, 2, 3])
@@ -0,0 +1,119 @@
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+import httpx
+from app.fx import FXRates, FXRateError, RateTable, convert_amounts
+from app.settings import FX
+
+
+
+RATES = {
+    'USD': {'EUR': 0.9, 'INR': 83.0},
+    'EUR': {'USD': 1.1},
+}
+
+
+class FakeProvider:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay    = delay
+        self.requests = []
+        self.failing  = False
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        base = request.url.params['from']
+        self.requests.append(base)
+
+        await asyncio.sleep(self.delay)
+
+        if self.failing:
+            return httpx.Response(503)
+
+        return httpx.Response(200, json={'success': True, 'base': base, 'rates': RATES[base]})
+
+
+
+class MemoryFXRates(FXRates):
+    def __init__(self, settings: FX, transport: httpx.AsyncBaseTransport) -> None:
+        super().__init__(settings, transport)
+        self.stored = {}
+
+    async def load(self, base: str) -> RateTable | None:
+        return self.stored.get(base)
+
+    async def store(self, table: RateTable) -> None:
+        self.stored[table.base] = table
+
+
+
+class TestFXRates(unittest.IsolatedAsyncioTestCase):
+    def fx_rates(self, provider: FakeProvider, **settings) -> MemoryFXRates:
+        rates = MemoryFXRates(FX(api_url='https://rates.test', **settings), httpx.MockTransport(provider))
+        rates.start()
+        return rates
+
+    async def test_bulk_conversion_fetches_each_base_once(self):
+        provider = FakeProvider()
+        rates    = self.fx_rates(provider)
+
+        converted = await convert_amounts([('USD', 'EUR', 100), ('usd', 'INR', 2), ('EUR', 'USD', 10), ('INR', 'INR', 5)])
+        await convert_amounts([('USD', 'EUR', 1)])
+        await rates.stop()
+
+        self.assertEqual(converted, [90.0, 166.0, 11.0, 5.0])
+        self.assertEqual(sorted(provider.requests), ['EUR', 'USD'])
+        self.assertIsNone(FXRates.current)
+
+    async def test_concurrent_refreshes_share_one_fetch(self):
+        provider = FakeProvider(delay=0.05)
+        rates    = self.fx_rates(provider)
+
+        results = await asyncio.gather(*[rates.convert_many([('USD', 'EUR', i)]) for i in range(50)])
+        await rates.stop()
+
+        self.assertEqual(provider.requests, ['USD'])
+        self.assertEqual(results[10], [9.0])
+
+    async def test_expired_table_is_fetched_again(self):
+        provider = FakeProvider()
+        rates    = self.fx_rates(provider, ttl=60)
+
+        await rates.convert_many([('USD', 'EUR', 1)])
+        rates._tables['USD'].fetched_at -= timedelta(seconds=61)
+        await rates.convert_many([('USD', 'EUR', 1)])
+        await rates.stop()
+
+        self.assertEqual(provider.requests, ['USD', 'USD'])
+
+    async def test_slow_provider_falls_back_to_stored_rates(self):
+        provider = FakeProvider(delay=1)
+        rates    = self.fx_rates(provider, wait_timeout=0.05)
+        rates.stored['USD'] = RateTable('USD', {'EUR': 0.8}, datetime.now() - timedelta(hours=1))
+
+        self.assertEqual(await rates.convert_many([('USD', 'EUR', 10)]), [8.0])
+        self.assertEqual(rates.fallbacks, 1)
+        await rates.stop()
+
+    async def test_failing_provider_uses_last_known_rates_until_max_stale(self):
+        provider = FakeProvider()
+        rates    = self.fx_rates(provider, ttl=60, max_stale=3600)
+
+        await rates.convert_many([('USD', 'EUR', 1)])
+        provider.failing = True
+        rates._tables['USD'].fetched_at -= timedelta(seconds=120)
+
+        self.assertEqual(await rates.convert_many([('USD', 'EUR', 10)]), [9.0])
+
+        rates._tables['USD'].fetched_at -= timedelta(hours=2)
+
+        with self.assertRaises(FXRateError):
+            await rates.convert_many([('USD', 'EUR', 10)])
+
+        await rates.stop()
+
+    async def test_unknown_quote_raises(self):
+        rates = self.fx_rates(FakeProvider())
+
+        with self.assertRaises(FXRateError):
+            await rates.convert_many([('USD', 'JPY', 1)])
+
+        await rates.stop()
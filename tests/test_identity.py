@@ -0,0 +1,156 @@
+import time
+import unittest
+import jwt
+from blacksheep import Request
+from guardpost.authorization import AuthorizationContext
+from sqlalchemy import create_engine
+from sqlmodel import Session
+from Models.models import Users
+from app import auth
+from app.auth import (
+    AdminRequirement, SECRET_KEY, UserAuthHandler, USER_IDENTITY_CACHE_TTL, generate_access_token, get_user_identity,
+    invalidate_user_identity
+)
+
+
+
+class FakeResult:
+    def __init__(self, row) -> None:
+        self.row = row
+
+    def first(self):
+        return self.row
+
+
+class FakeSession:
+    def __init__(self, row=None) -> None:
+        self.row        = row
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return FakeResult(self.row)
+
+
+class FakeUser:
+    def __init__(self, is_admin: bool = False, is_merchent: bool = False, is_suspended: bool = False) -> None:
+        self.is_admin     = is_admin
+        self.is_merchent  = is_merchent
+        self.is_suspended = is_suspended
+
+
+def claims(user_id: int, issued: float, **extra) -> dict:
+    return {'user_id': user_id, 'iat': int(issued), 'type': 'access', **extra}
+
+
+
+class TestUserIdentity(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        auth.user_identity_cache.clear()
+        auth._identity_changed_at.clear()
+
+    async def test_fresh_token_claims_are_trusted(self):
+        session = FakeSession()
+
+        identity = await get_user_identity(claims(1, time.time(), role='admin', is_suspended=False), session)
+
+        self.assertEqual(identity, {'role': 'admin', 'is_suspended': False})
+        self.assertEqual(session.statements, [])
+
+    async def test_old_token_is_checked_against_the_database(self):
+        session = FakeSession(FakeUser(is_merchent=True, is_suspended=True))
+        issued  = time.time() - USER_IDENTITY_CACHE_TTL - 1
+
+        identity = await get_user_identity(claims(2, issued, role='admin'), session)
+
+        self.assertEqual(identity, {'role': 'merchant', 'is_suspended': True})
+        self.assertEqual(len(session.statements), 1)
+
+        # Then served from the cache
+        await get_user_identity(claims(2, issued), session)
+        self.assertEqual(len(session.statements), 1)
+
+    async def test_unknown_user(self):
+        self.assertIsNone(await get_user_identity(claims(3, time.time()), FakeSession(None)))
+
+    async def test_tokens_issued_before_a_change_are_not_trusted(self):
+        invalidate_user_identity(4)
+        session = FakeSession(FakeUser())
+
+        identity = await get_user_identity(claims(4, time.time() - 1, role='admin'), session)
+
+        self.assertEqual(identity['role'], 'user')
+        self.assertEqual(len(session.statements), 1)
+
+    async def test_handler_sets_the_role_claim(self):
+        token   = generate_access_token(5, FakeUser(is_admin=True))
+        request = Request('GET', b'/', [(b'Authorization', f'Bearer {token}'.encode())])
+
+        identity = await UserAuthHandler().authenticate(request)
+
+        self.assertEqual(identity.claims['user_id'], 5)
+        self.assertEqual(identity.claims['role'], 'admin')
+        self.assertEqual(jwt.decode(token, SECRET_KEY, algorithms=['HS256'])['role'], 'admin')
+
+        requirement = AdminRequirement()
+        context     = AuthorizationContext(identity, [requirement])
+        requirement.handle(context)
+        self.assertTrue(context.has_succeeded)
+
+    async def test_suspended_admin_is_denied(self):
+        token   = generate_access_token(6, FakeUser(is_admin=True, is_suspended=True))
+        request = Request('GET', b'/', [(b'Authorization', f'Bearer {token}'.encode())])
+
+        identity = await UserAuthHandler().authenticate(request)
+
+        self.assertEqual(identity.claims['role'], 'admin')
+        self.assertTrue(identity.claims['is_suspended'])
+
+        requirement = AdminRequirement()
+        context     = AuthorizationContext(identity, [requirement])
+        requirement.handle(context)
+        self.assertFalse(context.has_succeeded)
+
+
+
+class TestRevocation(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        Users.__table__.create(self.engine)
+        auth.user_identity_cache.clear()
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def add_user(self, session: Session) -> Users:
+        user = Users(email='admin@example.com', phoneno='1', password='x', is_admin=True)
+        session.add(user)
+        session.commit()
+        auth.user_identity_cache.set(user.id, {'role': 'admin', 'is_suspended': False})
+
+        return user
+
+    def test_role_change_drops_the_cached_identity(self):
+        with Session(self.engine) as session:
+            user    = self.add_user(session)
+            user_id = user.id
+
+            user.is_admin = False
+            session.add(user)
+            session.flush()
+            self.assertIsNotNone(auth.user_identity_cache.get(user_id))
+
+            session.commit()
+
+        self.assertIsNone(auth.user_identity_cache.get(user_id))
+
+    def test_other_changes_keep_it(self):
+        with Session(self.engine) as session:
+            user    = self.add_user(session)
+            user_id = user.id
+
+            user.login_count = 3
+            session.add(user)
+            session.commit()
+
+        self.assertIsNotNone(auth.user_identity_cache.get(user_id))
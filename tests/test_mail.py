@@ -0,0 +1,85 @@
+import unittest
+from app.mail import MailMessage, MailQueue, render_template
+from app.settings import Mail
+from tests.smtp_stand_in import SMTPStandIn
+
+
+
+class TestRenderTemplate(unittest.TestCase):
+    def test_values_are_escaped(self):
+        body = render_template('welcome.html', first_name='<script>', last_name='Doe', link='https://example.com/?a=1&b=2')
+
+        self.assertIn('Dear &lt;script&gt; Doe', body)
+        self.assertIn('href="https://example.com/?a=1&amp;b=2"', body)
+
+    def test_missing_value_raises(self):
+        with self.assertRaises(KeyError):
+            render_template('email_otp.html')
+
+
+
+class TestMailQueue(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = SMTPStandIn()
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def mail_queue(self, **settings) -> MailQueue:
+        return MailQueue(Mail(
+            host           = '127.0.0.1',
+            port           = self.server.port,
+            username       = 'noreply@example.com',
+            password       = 'secret',
+            starttls       = False,
+            backoff_factor = 0.01,
+            **settings
+        ))
+
+    async def test_messages_share_the_pooled_connections(self):
+        queue = self.mail_queue(pool_size=2)
+        queue.start()
+
+        for i in range(20):
+            queue.enqueue(MailMessage(f'user{i}@example.com', 'Welcome', '<b>Hello</b>'))
+
+        await queue.stop()
+
+        self.assertEqual(queue.sent, 20)
+        self.assertEqual(len(self.server.messages), 20)
+        self.assertEqual(sum(connection.opened for connection in queue.connections), 2)
+        self.assertEqual(self.server.messages[0]['Subject'], 'Welcome')
+
+    async def test_temporary_failures_are_retried(self):
+        queue = self.mail_queue(pool_size=1)
+        queue.start()
+
+        self.server.handler.fail_next = 2
+        queue.enqueue(MailMessage('user@example.com', 'Reset', 'body'))
+
+        await queue.stop()
+
+        self.assertEqual((queue.sent, queue.retried, queue.failed), (1, 2, 0))
+        self.assertEqual(len(self.server.messages), 1)
+
+    async def test_gives_up_after_max_retries(self):
+        queue = self.mail_queue(pool_size=1, max_retries=1)
+        queue.start()
+
+        self.server.handler.fail_next = 5
+        queue.enqueue(MailMessage('user@example.com', 'Reset', 'body'))
+
+        await queue.stop()
+
+        self.assertEqual((queue.sent, queue.retried, queue.failed), (0, 1, 1))
+
+    async def test_full_queue_drops(self):
+        queue = self.mail_queue(pool_size=1, max_queue_size=1)
+        queue.start()
+
+        results = [queue.enqueue(MailMessage('user@example.com', 'Hi', 'body')) for _ in range(3)]
+        await queue.stop()
+
+        self.assertEqual(results, [True, False, False])
+        self.assertEqual(queue.dropped, 2)
@@ -0,0 +1,44 @@
+import unittest
+import httpx
+from app.settings import Mastercard
+from app.controllers.PG.Mastercard.mastercard import MastercardClient
+
+
+
+class TestMastercardClient(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.calls = []
+
+    def client(self, status_code: int, body: dict, max_retries: int = 2) -> MastercardClient:
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.calls.append((request.method, request.url.path))
+            return httpx.Response(status_code, json=body)
+
+        return MastercardClient(
+            Mastercard(base_url='http://gateway.test', max_retries=max_retries, backoff_factor=0),
+            merchant_id='TEST', transport=httpx.MockTransport(handler)
+        )
+
+    async def test_create_session_success(self):
+        client = self.client(201, {'result': 'SUCCESS', 'session': {'id': 'S1'}})
+        result = await client.create_session()
+        await client.close()
+
+        self.assertEqual(result['session']['id'], 'S1')
+        self.assertEqual(self.calls, [('POST', '/api/rest/version/78/merchant/TEST/session')])
+
+    async def test_idempotent_call_is_retried(self):
+        client = self.client(503, {'error': {'cause': 'SERVER_BUSY'}})
+        result = await client.transaction_status('T1')
+        await client.close()
+
+        self.assertEqual(result['status_code'], 503)
+        self.assertEqual(len(self.calls), 3)
+
+    async def test_pay_is_not_retried(self):
+        client = self.client(503, {'error': {'cause': 'SERVER_BUSY'}})
+        result = await client.deduct_amount('T1', 'S1')
+        await client.close()
+
+        self.assertEqual(result['status_code'], 503)
+        self.assertEqual(self.calls, [('PUT', '/api/rest/version/78/merchant/TEST/order/T1/transaction/T1A')])
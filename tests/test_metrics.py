@@ -0,0 +1,111 @@
+import unittest
+from types import SimpleNamespace
+from blacksheep import Application, json
+from blacksheep.exceptions import NotFound
+from blacksheep.server.routing import Router
+from blacksheep.testing import TestClient
+from rodi import Container
+from sqlalchemy import create_engine, text
+from app.metrics import Histogram, Metrics, metrics_endpoint
+
+
+
+class TestHistogram(unittest.TestCase):
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram((1, 5))
+
+        for value in (0.5, 1, 3, 7):
+            histogram.observe(value)
+
+        samples = list(histogram.samples('latency', 'route="/"'))
+
+        self.assertEqual(samples, [
+            'latency_bucket{route="/",le="1"} 2',
+            'latency_bucket{route="/",le="5"} 3',
+            'latency_bucket{route="/",le="+Inf"} 4',
+            'latency_sum{route="/"} 11.5',
+            'latency_count{route="/"} 4',
+        ])
+
+
+
+class TestInstrumentation(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.metrics = Metrics()
+        self.engine  = create_engine('sqlite://')
+
+        # Only the sync engine of an AsyncEngine is listened to
+        self.metrics.instrument_engine(SimpleNamespace(sync_engine=self.engine))
+
+        services = Container()
+        services.add_instance(self.metrics)
+
+        # Not the default router shared by the applications
+        app = Application(router=Router(), services=services)
+
+        @app.router.get('/items/{item_id}')
+        async def get_item(item_id: int):
+            if item_id == 0:
+                raise NotFound()
+
+            with self.engine.connect() as connection:
+                for _ in range(item_id):
+                    connection.execute(text('SELECT 1'))
+
+            return json({'id': item_id})
+
+        app.router.add_get('/metrics', metrics_endpoint)
+
+        async def instrument(application: Application) -> None:
+            self.metrics.instrument_routes(application)
+
+        app.after_start += instrument
+
+        await app.start()
+        self.client = TestClient(app)
+
+    async def asyncTearDown(self):
+        self.engine.dispose()
+
+    async def test_requests_are_recorded_per_route(self):
+        await self.client.get('/items/1')
+        await self.client.get('/items/2')
+        await self.client.get('/items/0')
+
+        stats = self.metrics.routes[('GET', '/items/{item_id}')]
+
+        self.assertEqual(stats.statuses, {200: 2, 404: 1})
+        self.assertEqual(stats.latency.count, 3)
+        self.assertEqual(stats.in_flight, 0)
+        self.assertEqual(stats.queries.sum, 3)
+        self.assertGreater(stats.db_time.sum, 0)
+        self.assertEqual(self.metrics.queries, 3)
+
+    async def test_queries_outside_of_requests_are_not_attributed(self):
+        with self.engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+
+        self.assertEqual(self.metrics.queries, 1)
+        self.assertEqual(self.metrics.routes[('GET', '/items/{item_id}')].queries.count, 0)
+
+    async def test_prometheus_exposition(self):
+        await self.client.get('/items/1')
+
+        response = await self.client.get('/metrics')
+        body     = await response.text()
+
+        self.assertEqual(response.status, 200)
+        self.assertTrue(response.content_type().startswith(b'text/plain'))
+        self.assertIn('http_requests_total{method="GET",route="/items/{item_id}",status="200"} 1', body)
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+        self.assertIn('http_request_db_queries_sum{method="GET",route="/items/{item_id}"} 1', body)
+        self.assertIn('db_queries_total 1', body)
+
+    async def test_scrape_token(self):
+        self.metrics.scrape_token = 'scrape-secret'
+
+        self.assertEqual((await self.client.get('/metrics')).status, 401)
+        self.assertEqual((await self.client.get('/metrics', headers={'Authorization': 'Bearer wrong'})).status, 401)
+
+        response = await self.client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'})
+        self.assertEqual(response.status, 200)
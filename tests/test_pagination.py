@@ -0,0 +1,107 @@
+import unittest
+from datetime import datetime
+from sqlalchemy.dialects import postgresql
+from sqlmodel import select
+from Models.models3 import MerchantRefund
+from app import pagination
+from app.pagination import PageRequest, decode_cursor, encode_cursor, paginate
+
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Returns `rows` for every page query and `total` for every count."""
+    def __init__(self, rows, total=0):
+        self.rows    = rows
+        self.total   = total
+        self.queries = []
+        self.counts  = 0
+
+    async def execute(self, statement):
+        self.queries.append(str(statement.compile(dialect=postgresql.dialect())))
+        return FakeResult(self.rows)
+
+    async def scalar(self, statement):
+        self.counts += 1
+        return self.total
+
+
+
+def refund_rows(count):
+    # (entity, cursor created, cursor id) as returned for select(MerchantRefund)
+    return [('refund', datetime(2026, 1, 1, 12, 0, i), 100 - i) for i in range(count)]
+
+
+def refunds_statement():
+    return select(MerchantRefund).where(MerchantRefund.merchant_id == 1)
+
+
+
+class TestCursor(unittest.TestCase):
+    def test_round_trip(self):
+        created_at = datetime(2026, 3, 1, 10, 30, 15, 250)
+
+        self.assertEqual(decode_cursor(encode_cursor(created_at, 42)), (created_at, 42))
+        self.assertEqual(decode_cursor(encode_cursor(None, 7)), (None, 7))
+
+    def test_invalid_cursor(self):
+        for cursor in ['not-a-cursor', encode_cursor(None, 1)[:-2], 'WyJ4IiwxXQ']:
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+    def test_page_request_validation(self):
+        with self.assertRaises(ValueError):
+            PageRequest(0)
+
+        with self.assertRaises(ValueError):
+            PageRequest(10, -1)
+
+        with self.assertRaises(ValueError):
+            PageRequest(10, total='all')
+
+
+
+class TestPaginate(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        pagination.page_total_cache.clear()
+
+    async def test_next_cursor_points_at_last_row(self):
+        session = FakeSession(refund_rows(3), total=25)
+        page    = await paginate(session, refunds_statement(), PageRequest(2), MerchantRefund.id, MerchantRefund.createdAt)
+
+        self.assertEqual(page.scalars(), ['refund', 'refund'])
+        self.assertEqual(decode_cursor(page.next_cursor), (datetime(2026, 1, 1, 12, 0, 1), 99))
+        self.assertEqual(page.page_count, 12.5)
+
+    async def test_last_page_has_no_cursor(self):
+        session = FakeSession(refund_rows(2))
+        page    = await paginate(session, refunds_statement(), PageRequest(2, total='none'), MerchantRefund.id, MerchantRefund.createdAt)
+
+        self.assertIsNone(page.next_cursor)
+        self.assertIsNone(page.page_count)
+        self.assertEqual(session.counts, 0)
+
+    async def test_cursor_replaces_offset(self):
+        session = FakeSession([])
+        cursor  = encode_cursor(datetime(2026, 1, 1), 50)
+
+        await paginate(session, refunds_statement(), PageRequest(10, 30, cursor), MerchantRefund.id, MerchantRefund.createdAt)
+
+        self.assertIn('(merchantrefund."createdAt", merchantrefund.id) <', session.queries[0])
+        self.assertNotIn('OFFSET', session.queries[0])
+
+    async def test_exact_total_is_cached(self):
+        session = FakeSession([], total=5)
+
+        for _ in range(3):
+            page = await paginate(session, refunds_statement(), PageRequest(10), MerchantRefund.id, MerchantRefund.createdAt)
+
+        self.assertEqual(page.total, 5)
+        self.assertEqual(session.counts, 1)
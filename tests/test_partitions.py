@@ -0,0 +1,167 @@
+"""
+Monthly partition helpers, and partition pruning of the date range filters against the
+database configured in DATABASE_URL, migrated to head:
+
+    PARTITION_PRUNING=1 DATABASE_URL=postgresql+asyncpg://... python -m pytest tests/test_partitions.py
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, desc, select, text
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session, SQLModel
+from Models.models import Group, Users
+from Models.models2 import PIPE, MerchantProdTransaction
+from Models.models3 import MerchantAPILogs, MerchantRefund
+from database.partitions import add_months, is_partition, month_start, partition_name, partition_range
+import json
+import os
+import time
+import unittest
+
+
+
+class TestPartitionHelpers(unittest.TestCase):
+    def test_months(self):
+        self.assertEqual(month_start(datetime(2026, 10, 18, 13, 45, 1, 7)), datetime(2026, 10, 1))
+        self.assertEqual(add_months(datetime(2026, 11, 1), 2), datetime(2027, 1, 1))
+        self.assertEqual(add_months(datetime(2026, 1, 1), -1), datetime(2025, 12, 1))
+        self.assertEqual(partition_name('merchantapilogs', datetime(2027, 1, 1)), 'merchantapilogs_p202701')
+
+    def test_partition_names(self):
+        self.assertTrue(is_partition('merchantprodtransaction_p202610'))
+        self.assertTrue(is_partition('merchantapilogs_history'))
+        self.assertTrue(is_partition('merchantapilogs_default'))
+        self.assertFalse(is_partition('merchantprodtransaction'))
+        self.assertFalse(is_partition('merchantrefund_p202610'))
+
+    def test_partition_ranges(self):
+        self.assertEqual(
+            partition_range("FOR VALUES FROM ('2026-11-01 00:00:00') TO ('2026-12-01 00:00:00')"),
+            (datetime(2026, 11, 1), datetime(2026, 12, 1))
+        )
+        self.assertEqual(
+            partition_range("FOR VALUES FROM (MINVALUE) TO ('2026-11-01 00:00:00')"),
+            (None, datetime(2026, 11, 1))
+        )
+        self.assertIsNone(partition_range('DEFAULT'))
+
+
+
+class TestPartitionKey(unittest.TestCase):
+    # createdAt picks the partition, so it is the time of the insert and not of the import
+    def test_created_at_is_the_insert_time(self):
+        engine = create_engine('sqlite://')
+        SQLModel.metadata.create_all(engine, tables=[
+            model.__table__ for model in (Group, Users, PIPE, MerchantProdTransaction, MerchantAPILogs, MerchantRefund)
+        ])
+
+        # The columns without a usable default
+        values = {MerchantProdTransaction: {}, MerchantAPILogs: {}, MerchantRefund: {'comment': ''}}
+
+        for model, extra in values.items():
+            with self.subTest(model=model.__name__):
+                with Session(engine) as session:
+                    first = model(merchant_id=1, **extra)
+                    session.add(first)
+                    session.commit()
+
+                    time.sleep(0.01)
+
+                    second = model(merchant_id=1, **extra)
+                    session.add(second)
+                    session.commit()
+
+                    rows = session.exec(select(model.createdAt).order_by(model.id)).scalars().all()
+
+                self.assertEqual(len(rows), 2)
+                self.assertLess(rows[0], rows[1])
+
+        engine.dispose()
+
+
+
+@unittest.skipUnless(os.environ.get('PARTITION_PRUNING'), 'set PARTITION_PRUNING=1 to run against a migrated DATABASE_URL')
+class TestPartitionPruning(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        from database.db import async_engine
+        from database.partitions import partition_ranges
+
+        self.engine = async_engine
+
+        async with self.engine.connect() as connection:
+            self.ranges = {
+                table: await partition_ranges(connection, table)
+                for table in (MerchantProdTransaction.__tablename__, MerchantAPILogs.__tablename__)
+            }
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    async def scanned_partitions(self, statement) -> set[str]:
+        sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}))
+
+        async with self.engine.connect() as connection:
+            plan = (await connection.execute(text(f'EXPLAIN (FORMAT JSON) {sql}'))).scalar()
+
+        plan    = json.loads(plan) if isinstance(plan, str) else plan
+        nodes   = [plan[0]['Plan']]
+        scanned = set()
+
+        while nodes:
+            node = nodes.pop()
+            nodes.extend(node.get('Plans', ()))
+
+            if 'Relation Name' in node:
+                scanned.add(node['Relation Name'])
+
+        return scanned
+
+    def overlapping(self, table: str, start: datetime, end: datetime) -> set[str]:
+        return {
+            name for name, (lower, upper) in self.ranges[table].items()
+            if (lower is None or lower <= end) and (upper is None or upper > start)
+        }
+
+    async def assertPruned(self, model, statement, start: datetime, end: datetime):
+        scanned = await self.scanned_partitions(statement)
+
+        self.assertTrue(scanned)
+        self.assertLessEqual(scanned, self.overlapping(model.__tablename__, start, end))
+
+    async def test_merchant_transaction_date_filters(self):
+        from app.controllers.merchant_transactions import FilterMerchantTransactionController
+
+        for date_range in ('Today', 'Yesterday', 'ThisWeek', 'ThisMonth', 'PreviousMonth'):
+            with self.subTest(date_range=date_range):
+                start, end = FilterMerchantTransactionController.get_date_range(date_range)
+
+                statement = select(MerchantProdTransaction).where(
+                    MerchantProdTransaction.merchant_id == 1,
+                    MerchantProdTransaction.createdAt >= start,
+                    MerchantProdTransaction.createdAt <= end
+                ).order_by(desc(MerchantProdTransaction.id)).limit(10)
+
+                await self.assertPruned(MerchantProdTransaction, statement, start, end)
+
+    async def test_custom_range_and_day_search(self):
+        start = month_start(datetime.now())
+
+        for end in (start + timedelta(days=1), add_months(start, 1) - timedelta(days=1)):
+            with self.subTest(end=end):
+                statement = select(MerchantProdTransaction).where(
+                    MerchantProdTransaction.createdAt >= start,
+                    MerchantProdTransaction.createdAt < end
+                ).order_by(desc(MerchantProdTransaction.id)).limit(10)
+
+                await self.assertPruned(MerchantProdTransaction, statement, start, end)
+
+    async def test_api_log_date_range(self):
+        start = add_months(month_start(datetime.now()), -1)
+        end   = month_start(datetime.now())
+
+        statement = select(MerchantAPILogs).where(
+            MerchantAPILogs.merchant_id == 1,
+            MerchantAPILogs.createdAt >= start,
+            MerchantAPILogs.createdAt < end
+        ).order_by(desc(MerchantAPILogs.id))
+
+        await self.assertPruned(MerchantAPILogs, statement, start, end)
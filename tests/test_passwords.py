@@ -0,0 +1,58 @@
+import asyncio
+import time
+import unittest
+import bcrypt
+from app.passwords import PasswordHasher, verify_password
+from app.settings import Passwords
+
+
+
+class TestPasswordHasher(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.hasher = PasswordHasher(Passwords(bcrypt_rounds=4, max_workers=2))
+        self.hasher.start()
+
+    def tearDown(self):
+        self.hasher.stop()
+
+    async def test_hash_and_verify(self):
+        hashed = await self.hasher.hash('secret')
+
+        self.assertTrue(hashed.startswith('$2b$04$'))
+        self.assertTrue(await self.hasher.verify('secret', hashed))
+        self.assertFalse(await self.hasher.verify('wrong', hashed))
+
+    async def test_needs_rehash_when_cost_changes(self):
+        old_hash = bcrypt.hashpw(b'secret', bcrypt.gensalt(5)).decode()
+
+        self.assertTrue(self.hasher.needs_rehash(old_hash))
+        self.assertFalse(self.hasher.needs_rehash(await self.hasher.hash('secret')))
+        self.assertFalse(self.hasher.needs_rehash('not-a-bcrypt-hash'))
+
+    async def test_verify_password_returns_rehash(self):
+        old_hash = bcrypt.hashpw(b'secret', bcrypt.gensalt(5)).decode()
+
+        valid, new_hash = await verify_password('secret', old_hash)
+        self.assertTrue(valid)
+        self.assertTrue(new_hash.startswith('$2b$04$'))
+
+        self.assertEqual(await verify_password('wrong', old_hash), (False, None))
+        self.assertEqual(await verify_password('secret', new_hash), (True, None))
+
+    async def test_hashing_does_not_block_the_loop(self):
+        hasher = PasswordHasher(Passwords(bcrypt_rounds=10, max_workers=1))
+        hasher.start()
+
+        try:
+            hashing = asyncio.ensure_future(hasher.hash('secret'))
+            gaps    = []
+
+            while not hashing.done():
+                started = time.perf_counter()
+                await asyncio.sleep(0.001)
+                gaps.append(time.perf_counter() - started)
+
+            await hashing
+            self.assertLess(max(gaps), 0.04)
+        finally:
+            hasher.stop()
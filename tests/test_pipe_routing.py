@@ -0,0 +1,110 @@
+import unittest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session
+from Models.models2 import MerchantPIPE
+from app import pipe_routing
+from app.pipe_routing import PipeRoute, invalidate_pipe_routes, merchant_routes, merchant_routes_statement, pick_route
+
+
+
+class FakeResult:
+    def __init__(self, rows: list) -> None:
+        self.rows = rows
+
+    def all(self) -> list:
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, rows: list) -> None:
+        self.rows       = rows
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return FakeResult(self.rows)
+
+
+ROWS = [
+    (1, 10, 'Small card', 'Card', 'USD', 2.5, 'T+2', 0, 100),
+    (2, 11, 'Large card', 'Card', 'USD', 1.5, 'T+5', 100, 0),
+    (3, 12, 'Euro UPI', 'UPI', 'EUR', 3.0, None, None, None),
+]
+
+
+
+class TestRoutingTable(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        pipe_routing.pipe_routes_cache.clear()
+
+    def test_one_joined_statement(self):
+        sql = str(merchant_routes_statement(5).compile(dialect=postgresql.dialect()))
+
+        self.assertEqual(sql.count('SELECT'), 1)
+        self.assertIn('JOIN pipe ON', sql)
+        self.assertIn('LEFT OUTER JOIN currency ON', sql)
+
+    async def test_pick_route_by_amount_currency_and_medium(self):
+        session = FakeSession(ROWS)
+
+        self.assertEqual((await pick_route(session, 1, 50, 'USD')).pipe_id, 10)
+        self.assertEqual((await pick_route(session, 1, 500, 'USD')).pipe_id, 11)
+        self.assertEqual((await pick_route(session, 1, 500, 'EUR', 'upi')).pipe_id, 12)
+        self.assertIsNone(await pick_route(session, 1, 50, 'GBP'))
+
+        # Loaded once
+        self.assertEqual(len(session.statements), 1)
+
+    async def test_changes_reload_the_table(self):
+        session = FakeSession(ROWS)
+
+        await merchant_routes(session, 2)
+        invalidate_pipe_routes(2)
+        await merchant_routes(session, 2)
+        self.assertEqual(len(session.statements), 2)
+
+        invalidate_pipe_routes()
+        await merchant_routes(session, 2)
+        self.assertEqual(len(session.statements), 3)
+
+    def test_checkout_fields(self):
+        route = PipeRoute(*ROWS[2])
+
+        self.assertEqual(route.as_checkout(), {'pipe_name': 'Euro UPI', 'payment_medium': 'UPI', 'payment_currency': 'EUR'})
+        self.assertEqual(route.settlement_period, '')
+
+
+
+class TestInvalidation(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        MerchantPIPE.__table__.create(self.engine)
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def generation(self, merchant_id: int) -> int:
+        return pipe_routing._generations.get(merchant_id, 0)
+
+    def test_committed_assignment_invalidates_the_merchant(self):
+        before = self.generation(7)
+
+        with Session(self.engine) as session:
+            session.add(MerchantPIPE(merchant=7, pipe=1, fee=2.0, is_active=True))
+            session.flush()
+            self.assertEqual(self.generation(7), before)
+
+            session.commit()
+
+        self.assertEqual(self.generation(7), before + 1)
+
+    def test_rolled_back_assignment_does_not(self):
+        before = self.generation(8)
+
+        with Session(self.engine) as session:
+            session.add(MerchantPIPE(merchant=8, pipe=1, fee=2.0, is_active=True))
+            session.flush()
+            session.rollback()
+
+        self.assertEqual(self.generation(8), before)
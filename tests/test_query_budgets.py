@@ -0,0 +1,123 @@
+"""
+Query budgets of the listing endpoints, against the database configured in DATABASE_URL.
+
+The tables are created when missing and a few merchants are seeded, so run them against an
+ephemeral database only:
+
+    QUERY_BUDGETS=1 DATABASE_URL=postgresql+asyncpg://.../budgets python -m pytest tests/test_query_budgets.py
+
+Endpoints known to run a query per row are checked to still fail their budget, so the table
+is updated when they are fixed. The background workers are disabled, their polling would count
+in the budgets. The application is started once, it cannot be started again.
+"""
+from blacksheep.testing import TestClient
+from sqlalchemy import delete
+from sqlmodel import SQLModel
+from database.db import AsyncSession, async_engine, async_read_engine
+from Models.models import Group, Users
+from Models.models3 import MerchantPaymentButton
+from app.auth import generate_access_token
+from tests.query_profiler import QueryBudgetMixin
+import os
+import unittest
+import uuid
+
+
+
+MERCHANTS = 5
+BUTTONS   = 5
+
+# Path, query, user, max queries, and whether the endpoint still runs a query per row
+ENDPOINT_BUDGETS = [
+    ('/api/v6/admin/revenues/', {}, 'admin', 2, False),
+    # A Group and a Kycdetails query per merchant
+    ('/api/v1/user/kyc', {'limit': 15}, 'admin', 3, True),
+    # A Group and a Kycdetails query per merchant found
+    ('/api/v1/admin/user/search/', {'query': 'active'}, 'admin', 2, True),
+    # A transaction query per button
+    ('/api/merchant/payment/button/', {}, 'merchant', 2, True),
+]
+
+# Failure messages of QueryBudgetMixin.assertQueryBudget
+BUDGET_FAILURE = r'the budget is|likely N\+1 queries'
+
+# Background workers polling the profiled engines, disabled before the application is loaded
+BACKGROUND_WORKERS = ('settlement', 'webhooks', 'partitions')
+
+
+
+@unittest.skipUnless(os.environ.get('QUERY_BUDGETS'), 'set QUERY_BUDGETS=1 to run against an ephemeral DATABASE_URL')
+class TestEndpointQueryBudgets(QueryBudgetMixin, unittest.IsolatedAsyncioTestCase):
+    query_engines = (async_engine, async_read_engine)
+
+    async def asyncSetUp(self):
+        for section in BACKGROUND_WORKERS:
+            os.environ[f'APP_{section.upper()}'] = '{"enabled": false}'
+
+        from app.main import app
+
+        self.app = app
+        self.run = uuid.uuid4().hex[:8]
+
+        async with async_engine.begin() as connection:
+            await connection.run_sync(SQLModel.metadata.create_all)
+
+        async with AsyncSession(async_engine) as session:
+            group = Group(name='Merchant Regular')
+            session.add(group)
+            await session.commit()
+
+            def user(name: str, **flags) -> Users:
+                return Users(email=f'budget-{self.run}-{name}@example.com', phoneno='0000000000', password='-',
+                             is_active=True, is_verified=True, group=group.id, **flags)
+
+            admin     = user('admin', is_admin=True)
+            merchants = [user(f'merchant{i}', is_merchent=True) for i in range(MERCHANTS)]
+
+            session.add_all([admin, *merchants])
+            await session.commit()
+
+            session.add_all([
+                MerchantPaymentButton(merchant_id=merchants[0].id, button_id=f'QB-{self.run}-{i}', button_title=f'Button {i}')
+                for i in range(BUTTONS)
+            ])
+            await session.commit()
+
+            self.group  = group.id
+            self.tokens = {
+                'admin': generate_access_token(admin.id, admin),
+                'merchant': generate_access_token(merchants[0].id, merchants[0]),
+            }
+
+        await self.app.start()
+        self.client = TestClient(self.app)
+
+    async def asyncTearDown(self):
+        await self.app.stop()
+
+        async with AsyncSession(async_engine) as session:
+            await session.execute(delete(MerchantPaymentButton).where(MerchantPaymentButton.button_id.like(f'QB-{self.run}-%')))
+            await session.execute(delete(Users).where(Users.email.like(f'budget-{self.run}-%')))
+            await session.execute(delete(Group).where(Group.id == self.group))
+            await session.commit()
+
+        await async_engine.dispose()
+
+    async def test_endpoint_budgets(self):
+        for path, query, user, max_queries, known_n_plus_one in ENDPOINT_BUDGETS:
+            with self.subTest(path=path):
+                if known_n_plus_one:
+                    # Update the table once the endpoint is fixed
+                    with self.assertRaisesRegex(AssertionError, BUDGET_FAILURE):
+                        with self.assertQueryBudget(max_queries=max_queries):
+                            response = await self.get(path, query, user)
+                else:
+                    with self.assertQueryBudget(max_queries=max_queries):
+                        response = await self.get(path, query, user)
+
+                self.assertEqual(response.status, 200, await response.text())
+
+    async def get(self, path: str, query: dict, user: str):
+        headers = {'Authorization': f'Bearer {self.tokens[user]}'}
+
+        return await self.client.get(path, headers=headers, query=query)
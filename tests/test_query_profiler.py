@@ -0,0 +1,100 @@
+import unittest
+from blacksheep import Application, json
+from blacksheep.server.routing import Router
+from blacksheep.testing import TestClient
+from sqlalchemy import create_engine, select
+from sqlmodel import Session
+from Models.models import Group, Users
+from tests.query_profiler import QueryBudgetMixin, statement_shape
+
+
+
+class TestStatementShape(unittest.TestCase):
+    def test_literals_and_parameters_are_replaced(self):
+        self.assertEqual(
+            statement_shape("SELECT * FROM users WHERE id = $1 AND email = 'a@b.c' LIMIT 10"),
+            'SELECT * FROM users WHERE id = ? AND email = ? LIMIT ?'
+        )
+        self.assertEqual(
+            statement_shape('SELECT id FROM "group" WHERE id = %(id_1)s'),
+            statement_shape('SELECT id FROM "group"\n  WHERE id = :id_1')
+        )
+
+    def test_in_lists_of_any_length_have_one_shape(self):
+        self.assertEqual(
+            statement_shape('SELECT * FROM users WHERE id IN (?, ?, ?)'),
+            statement_shape('SELECT * FROM users WHERE id IN ($1, $2)')
+        )
+
+    def test_casts_are_kept(self):
+        self.assertEqual(statement_shape('SELECT $1::INTEGER'), 'SELECT ?::INTEGER')
+
+
+
+class TestQueryBudget(QueryBudgetMixin, unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.engine        = create_engine('sqlite://')
+        self.query_engines = (self.engine,)
+
+        Group.__table__.create(self.engine)
+        Users.__table__.create(self.engine)
+
+        with Session(self.engine) as session:
+            group = Group(name='Merchant Regular')
+            session.add(group)
+            session.commit()
+
+            for i in range(5):
+                session.add(Users(email=f'merchant{i}@example.com', phoneno='1', password='x', group=group.id))
+
+            session.commit()
+
+        app = Application(router=Router())
+
+        # Group of every user loaded one at a time
+        @app.router.get('/n-plus-one/')
+        async def n_plus_one():
+            with Session(self.engine) as session:
+                users = session.exec(select(Users)).scalars().all()
+
+                return json([session.get(Group, user.group).name for user in users])
+
+        @app.router.get('/joined/')
+        async def joined():
+            with Session(self.engine) as session:
+                rows = session.exec(select(Users.id, Group.name).join(Group, Group.id == Users.group)).all()
+
+                return json([name for _, name in rows])
+
+        await app.start()
+        self.client = TestClient(app)
+
+    async def asyncTearDown(self):
+        self.engine.dispose()
+
+    async def test_joined_listing_within_budget(self):
+        with self.assertQueryBudget(max_queries=1) as profile:
+            response = await self.client.get('/joined/')
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(profile.count, 1)
+
+    async def test_repeated_statements_are_flagged(self):
+        with self.assertRaisesRegex(AssertionError, 'N\\+1') as raised:
+            with self.assertQueryBudget(max_queries=10):
+                await self.client.get('/n-plus-one/')
+
+        self.assertIn('5 x SELECT', str(raised.exception))
+
+    async def test_budget_exceeded(self):
+        with self.assertRaisesRegex(AssertionError, '6 queries run, the budget is 2'):
+            with self.assertQueryBudget(max_queries=2, max_repeats=10):
+                await self.client.get('/n-plus-one/')
+
+    async def test_only_statements_inside_the_block_are_counted(self):
+        await self.client.get('/joined/')
+
+        with self.assertQueryBudget() as profile:
+            pass
+
+        self.assertEqual(profile.count, 0)
@@ -0,0 +1,216 @@
+import importlib
+import json
+import unittest
+from collections import defaultdict
+from datetime import date, datetime
+from unittest.mock import patch
+from sqlalchemy import create_engine, event, orm, select
+from sqlmodel import Session, SQLModel
+from Models.models import Group, Users
+from Models.models2 import PIPE, MerchantProdTransaction, PipeRevenueDaily
+from app.controllers.PG.revenue import enable_revenue_rollup, get_pipe_revenues, track_revenue_changes
+from app.settings import Settings
+from blacksheep.server.routing import router as default_router
+
+
+
+# Importing the routes registers them on the default router, which the applications of the
+# other tests must not find, so they are removed again after the module
+def setUpModule():
+    global admin_revenue, default_routes
+
+    default_routes = {method: list(routes) for method, routes in default_router.routes.items()}
+    admin_revenue  = importlib.import_module('app.routes.admin_revenue')
+
+
+def tearDownModule():
+    default_router.routes = defaultdict(list, default_routes)
+
+
+
+class SyncAsyncSession:
+    """
+    AsyncSession interface over a sqlite Session, there is no async sqlite driver.
+    """
+
+    def __init__(self, engine) -> None:
+        self.session = Session(engine)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.session.close()
+
+    async def execute(self, statement):
+        return self.session.execute(statement)
+
+    async def commit(self) -> None:
+        self.session.commit()
+
+
+
+class RevenueTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        SQLModel.metadata.create_all(self.engine, tables=[
+            model.__table__ for model in (Group, Users, PIPE, MerchantProdTransaction, PipeRevenueDaily)
+        ])
+
+        with Session(self.engine) as session:
+            session.add_all([
+                PIPE(id=id, name=name, process_curr=1) for id, name in ((1, 'Card'), (2, 'UPI'), (3, 'Unused'))
+            ])
+            session.commit()
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def add_transactions(self, *transactions: MerchantProdTransaction) -> list[int]:
+        with Session(self.engine) as session:
+            session.add_all(transactions)
+            session.commit()
+
+            return [transaction.id for transaction in transactions]
+
+    def rollup(self) -> dict[tuple, tuple]:
+        with Session(self.engine) as session:
+            rows = session.exec(select(PipeRevenueDaily)).scalars().all()
+
+        return {(row.day, row.pipe_id, row.currency): (row.revenue, row.transactions) for row in rows}
+
+    async def pipe_revenues(self, use_rollup: bool) -> list[dict]:
+        async with SyncAsyncSession(self.engine) as session:
+            return await get_pipe_revenues(session, use_rollup=use_rollup)
+
+
+def success(pipe_id: int = 1, fee: float = 2.0, currency: str = 'USD', **values) -> MerchantProdTransaction:
+    values = {'status': 'PAYMENT_SUCCESS', 'is_completd': True, 'createdAt': datetime(2026, 10, 18, 12), **values}
+
+    return MerchantProdTransaction(merchant_id=1, pipe_id=pipe_id, fee_amount=fee, currency=currency, **values)
+
+
+
+class TestPipeRevenues(RevenueTestCase):
+    async def test_group_by_transactions(self):
+        self.add_transactions(
+            success(fee=2.0), success(fee=3.0), success(fee=1.5, is_refunded=True), success(currency='EUR', fee=4.0),
+            success(pipe_id=2, fee=1.0),
+            # Not counted
+            success(pipe_id=2, fee=9.0, is_completd=False),
+            MerchantProdTransaction(merchant_id=1, pipe_id=2, fee_amount=9.0, currency='USD', status='PAYMENT_FAILED', is_completd=True)
+        )
+
+        self.assertEqual(await self.pipe_revenues(use_rollup=False), [
+            {'pipe_id': 1, 'pipe_name': 'Card', 'total_transaction_amount': [
+                {'currency': 'EUR', 'total_amount': 4.0}, {'currency': 'USD', 'total_amount': 3.5}
+            ]},
+            {'pipe_id': 2, 'pipe_name': 'UPI', 'total_transaction_amount': [{'currency': 'USD', 'total_amount': 1.0}]},
+            {'pipe_id': 3, 'pipe_name': 'Unused', 'total_transaction_amount': []},
+        ])
+
+    async def test_rollup_matches_the_group_by(self):
+        self.add_transactions(success(fee=2.0), success(fee=1.5, is_refunded=True), success(pipe_id=2, currency='EUR'))
+
+        with Session(self.engine) as session:
+            session.add(PipeRevenueDaily(day=date(2026, 10, 18), pipe_id=3, currency='USD', revenue=7.0, transactions=1))
+            session.commit()
+
+        with patch('app.routes.admin_revenue.AsyncSession', lambda engine: SyncAsyncSession(self.engine)):
+            response = await admin_revenue.RebuildAdminRevenueRollup(None)
+            self.assertEqual(response.status, 200)
+
+            settings = Settings(revenue_rollup={'enabled': True})
+            response = await admin_revenue.GetAdminRevenues(None, settings)
+            self.assertEqual(response.status, 200)
+
+        self.assertEqual(self.rollup(), {
+            (date(2026, 10, 18), 1, 'USD'): (0.5, 2),
+            (date(2026, 10, 18), 2, 'EUR'): (2.0, 1),
+        })
+        self.assertEqual(
+            json.loads(response.content.body)['pipe_wise_transaction'],
+            await self.pipe_revenues(use_rollup=False)
+        )
+
+
+
+class TestRevenueRollupListener(RevenueTestCase):
+    day = date(2026, 10, 18)
+
+    def setUp(self):
+        super().setUp()
+        enable_revenue_rollup()
+
+    def tearDown(self):
+        event.remove(orm.Session, 'before_flush', track_revenue_changes)
+        super().tearDown()
+
+    def update(self, id: int, **values) -> None:
+        with Session(self.engine) as session:
+            transaction = session.get(MerchantProdTransaction, id)
+
+            for name, value in values.items():
+                setattr(transaction, name, value)
+
+            session.commit()
+
+    def test_insert(self):
+        self.add_transactions(success(fee=2.0), success(fee=3.0), success(fee=5.0, is_completd=False))
+
+        self.assertEqual(self.rollup(), {(self.day, 1, 'USD'): (5.0, 2)})
+
+    def test_status_change(self):
+        id, = self.add_transactions(success(fee=2.0, status='PAYMENT_PENDING', is_completd=False))
+        self.assertEqual(self.rollup(), {})
+
+        self.update(id, status='PAYMENT_SUCCESS', is_completd=True)
+        self.assertEqual(self.rollup(), {(self.day, 1, 'USD'): (2.0, 1)})
+
+        self.update(id, status='PAYMENT_FAILED')
+        self.assertEqual(self.rollup(), {(self.day, 1, 'USD'): (0.0, 0)})
+
+    def test_refund(self):
+        id, _ = self.add_transactions(success(fee=2.0), success(fee=3.0))
+
+        self.update(id, is_refunded=True)
+
+        self.assertEqual(self.rollup(), {(self.day, 1, 'USD'): (1.0, 2)})
+
+    def test_delete(self):
+        id, _ = self.add_transactions(success(fee=2.0), success(fee=3.0))
+
+        with Session(self.engine) as session:
+            session.delete(session.get(MerchantProdTransaction, id))
+            session.commit()
+
+        self.assertEqual(self.rollup(), {(self.day, 1, 'USD'): (3.0, 1)})
+
+    def test_expired_attribute_assigned_without_loading(self):
+        with Session(self.engine) as session:
+            transaction = success(fee=2.0)
+            session.add(transaction)
+            session.commit()
+
+            # Expired by the commit, the old status is never loaded
+            transaction.status = 'PAYMENT_FAILED'
+            session.commit()
+
+            transaction.pipe_id = 2
+            transaction.status  = 'PAYMENT_SUCCESS'
+            session.commit()
+
+        self.assertEqual(self.rollup(), {(self.day, 1, 'USD'): (0.0, 0), (self.day, 2, 'USD'): (2.0, 1)})
+
+    def test_rollup_matches_the_group_by(self):
+        ids = self.add_transactions(success(fee=2.0), success(fee=3.0, currency='EUR'), success(pipe_id=2, fee=4.0))
+
+        self.update(ids[0], is_refunded=True)
+        self.update(ids[2], pipe_id=1)
+
+        totals = {}
+
+        for (_, pipe_id, currency), (revenue, _) in self.rollup().items():
+            totals[pipe_id, currency] = totals.get((pipe_id, currency), 0) + revenue
+
+        self.assertEqual(totals, {(1, 'USD'): 2.0, (1, 'EUR'): 3.0, (2, 'USD'): 0.0})
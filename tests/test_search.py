@@ -0,0 +1,48 @@
+import unittest
+from datetime import date, time
+from sqlalchemy.dialects import postgresql
+from app.search import SearchTerms, merchant_transaction_predicates, text_match
+from Models.models2 import MerchantProdTransaction
+
+
+
+def compiled(condition):
+    return condition.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}).string
+
+
+
+class TestSearchTerms(unittest.TestCase):
+    def test_typed_values(self):
+        self.assertEqual(SearchTerms(' 12.5 ').number, 12.5)
+        self.assertEqual(SearchTerms('12 March 2026').day, date(2026, 3, 12))
+        self.assertEqual(SearchTerms('10:15:30.5').time, time(10, 15, 30, 500000))
+        self.assertEqual(SearchTerms('March').month, 3)
+        self.assertEqual(SearchTerms('PAYMENT SUCCESS').status, 'PAYMENT_SUCCESS')
+
+    def test_text_is_not_a_number(self):
+        for query in ['ORD-1', 'nan', 'inf']:
+            self.assertIsNone(SearchTerms(query).number)
+
+
+
+class TestPredicates(unittest.TestCase):
+    def test_short_text_only_matches_exactly(self):
+        predicates = text_match(MerchantProdTransaction.transaction_id, SearchTerms('AB'), 10)
+
+        self.assertEqual(len(predicates), 1)
+
+    def test_like_wildcards_are_escaped(self):
+        _, (partial, weight) = text_match(MerchantProdTransaction.transaction_id, SearchTerms('50%_off'), 10)
+
+        self.assertEqual(weight, 5)
+        self.assertIn("ILIKE '%%50/%%/_off%%' ESCAPE '/'", compiled(partial))
+
+    def test_only_applicable_fields_are_searched(self):
+        columns = [compiled(condition) for condition, _ in merchant_transaction_predicates(SearchTerms('ORD-1'))]
+
+        self.assertFalse(any('amount' in column for column in columns))
+        self.assertFalse(any('createdAt' in column for column in columns))
+        self.assertTrue(any('"merchantOrderId" =' in column for column in columns))
+
+    def test_blank_query_has_no_predicates(self):
+        self.assertEqual(merchant_transaction_predicates(SearchTerms('  ')), [])
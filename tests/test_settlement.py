@@ -0,0 +1,156 @@
+"""
+Settlement batch statement against the database configured in DATABASE_URL (PostgreSQL).
+
+The tables are created when missing and two merchants are seeded with their transactions,
+removed again after every test, so run it against an ephemeral database only:
+
+    SETTLEMENT_DB=1 DATABASE_URL=postgresql+asyncpg://.../settlement python -m pytest tests/test_settlement.py
+
+The seeded transactions were due in January 2000 and the statement runs with that date as
+`now`, so the rows of other merchants are never due.
+"""
+from datetime import datetime
+from sqlalchemy import delete, select
+from sqlmodel import SQLModel
+from Models.models import Group, Users
+from Models.models2 import MerchantAccountBalance, MerchantProdTransaction
+import asyncio
+import os
+import unittest
+import uuid
+
+
+
+NOW = datetime(2000, 1, 10)
+
+# Amount and fee percentage of every seeded transaction, 98 settled each
+AMOUNT = 100.0
+FEE    = 2.0
+NET    = 98.0
+
+
+
+@unittest.skipUnless(os.environ.get('SETTLEMENT_DB'), 'set SETTLEMENT_DB=1 to run against an ephemeral DATABASE_URL')
+class TestSettleBatchStatement(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        from database.db import AsyncSession, async_engine
+
+        self.engine  = async_engine
+        self.session = lambda: AsyncSession(async_engine)
+        self.run     = uuid.uuid4().hex[:8]
+
+        async with async_engine.begin() as connection:
+            await connection.run_sync(SQLModel.metadata.create_all)
+
+        async with self.session() as session:
+            group = Group(name='Merchant Regular')
+            session.add(group)
+            await session.commit()
+
+            merchants = [
+                Users(email=f'settlement-{self.run}-{i}@example.com', phoneno='0000000000', password='-',
+                      is_active=True, is_verified=True, is_merchent=True, group=group.id)
+                for i in range(2)
+            ]
+            session.add_all(merchants)
+            await session.commit()
+
+            self.group     = group.id
+            self.merchants = [merchant.id for merchant in merchants]
+
+            session.add_all([
+                MerchantAccountBalance(merchant_id=merchant_id, currency='USD', immature_balance=1000.0, mature_balance=0.0)
+                for merchant_id in self.merchants
+            ])
+            await session.commit()
+
+    async def asyncTearDown(self):
+        async with self.session() as session:
+            for model in (MerchantProdTransaction, MerchantAccountBalance):
+                await session.execute(delete(model).where(model.merchant_id.in_(self.merchants)))
+
+            await session.execute(delete(Users).where(Users.id.in_(self.merchants)))
+            await session.execute(delete(Group).where(Group.id == self.group))
+            await session.commit()
+
+        await self.engine.dispose()
+
+    async def add_transactions(self, merchant_id: int, due_days: list[int], **values) -> None:
+        values = {'status': 'PAYMENT_SUCCESS', 'balance_status': 'Immature', 'currency': 'USD', **values}
+
+        async with self.session() as session:
+            session.add_all([
+                MerchantProdTransaction(merchant_id=merchant_id, amount=AMOUNT, transaction_fee=FEE,
+                                        pg_settlement_date=datetime(2000, 1, day), **values)
+                for day in due_days
+            ])
+            await session.commit()
+
+    async def settle_batch(self, session, batch_size: int) -> int:
+        from app.controllers.PG.settlement import SETTLE_BATCH_STATEMENT
+
+        result = await session.execute(SETTLE_BATCH_STATEMENT, {'now': NOW, 'batch_size': batch_size})
+
+        return int(result.scalar() or 0)
+
+    async def balance_statuses(self, merchant_id: int) -> dict[str, int]:
+        async with self.session() as session:
+            rows = (await session.execute(
+                select(MerchantProdTransaction.balance_status).where(MerchantProdTransaction.merchant_id == merchant_id)
+            )).scalars().all()
+
+        return {status: rows.count(status) for status in set(rows)}
+
+    async def balance(self, merchant_id: int) -> tuple[float, float]:
+        async with self.session() as session:
+            balance = (await session.execute(select(MerchantAccountBalance).where(
+                MerchantAccountBalance.merchant_id == merchant_id, MerchantAccountBalance.currency == 'USD'
+            ))).scalars().one()
+
+        return balance.immature_balance, balance.mature_balance
+
+    async def test_partial_batch(self):
+        merchant_id = self.merchants[0]
+
+        await self.add_transactions(merchant_id, [1, 2, 3, 4, 5])
+        # Not due, not successful, and without a balance row in their currency
+        await self.add_transactions(merchant_id, [20])
+        await self.add_transactions(merchant_id, [1], status='PAYMENT_FAILED')
+        await self.add_transactions(merchant_id, [1], currency='EUR')
+
+        settled = []
+
+        for _ in range(3):
+            async with self.session() as session:
+                settled.append(await self.settle_batch(session, batch_size=3))
+                await session.commit()
+
+        self.assertEqual(settled, [3, 2, 0])
+        self.assertEqual(await self.balance_statuses(merchant_id), {'Mature': 5, 'Immature': 3})
+        self.assertEqual(await self.balance(merchant_id), (1000.0 - 5 * NET, 5 * NET))
+
+    async def test_concurrent_workers_claim_different_rows(self):
+        first, second = self.merchants
+
+        # The first batch of 3 takes the transactions of the first merchant, the earliest due
+        await self.add_transactions(first, [1, 2, 3])
+        await self.add_transactions(second, [4, 5])
+
+        async with self.session() as first_worker, self.session() as second_worker:
+            self.assertEqual(await self.settle_batch(first_worker, batch_size=3), 3)
+
+            # The rows of the first worker stay locked until it commits, the second one
+            # skips them instead of waiting
+            settled = await asyncio.wait_for(self.settle_batch(second_worker, batch_size=3), timeout=10)
+            self.assertEqual(settled, 2)
+
+            await second_worker.commit()
+            await first_worker.commit()
+
+            self.assertEqual(await self.settle_batch(second_worker, batch_size=3), 0)
+            await second_worker.commit()
+
+        self.assertEqual(await self.balance_statuses(first), {'Mature': 3})
+        self.assertEqual(await self.balance_statuses(second), {'Mature': 2})
+        self.assertEqual(await self.balance(first), (1000.0 - 3 * NET, 3 * NET))
+        self.assertEqual(await self.balance(second), (1000.0 - 2 * NET, 2 * NET))
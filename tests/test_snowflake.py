@@ -0,0 +1,136 @@
+import os
+import threading
+import unittest
+from types import SimpleNamespace
+from app.generateID import generate_public_token
+from app.settings import IDs
+from app.snowflake import EPOCH, MAX_SEQUENCE, Snowflake, WorkerIdLease, new_id, process_worker_id, use_worker_id
+
+
+
+class ManualClock(Snowflake):
+    def __init__(self, worker_id: int, times: list[int]) -> None:
+        super().__init__(worker_id)
+        self.times = times
+
+    def now(self) -> int:
+        return self.times.pop(0) if len(self.times) > 1 else self.times[0]
+
+
+
+def parts(snowflake_id: int) -> tuple[int, int, int]:
+    return (snowflake_id >> 22) + EPOCH, (snowflake_id >> 12) & 1023, snowflake_id & 4095
+
+
+
+class TestSnowflake(unittest.TestCase):
+    def test_layout(self):
+        generator = ManualClock(7, [EPOCH + 1000])
+
+        self.assertEqual(parts(generator.generate_id()), (EPOCH + 1000, 7, 0))
+        self.assertEqual(parts(generator.generate_id()), (EPOCH + 1000, 7, 1))
+
+    def test_unique_across_threads(self):
+        generator = Snowflake(1)
+        ids       = []
+
+        def generate():
+            ids.extend(generator.generate_id() for _ in range(5000))
+
+        threads = [threading.Thread(target=generate) for _ in range(8)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(set(ids)), 40000)
+
+    def test_clock_going_backwards_never_repeats_ids(self):
+        generator = ManualClock(3, [EPOCH + 5000, EPOCH + 4000, EPOCH + 4001])
+
+        first, second, third = (generator.generate_id() for _ in range(3))
+
+        self.assertLess(first, second)
+        self.assertLess(second, third)
+        self.assertEqual(parts(third)[0], EPOCH + 5000)
+        self.assertEqual(generator.clock_behind, 2)
+
+    def test_exhausted_sequence_moves_to_the_next_millisecond(self):
+        generator = ManualClock(3, [EPOCH + 10] * (MAX_SEQUENCE + 2) + [EPOCH + 11])
+
+        ids = [generator.generate_id() for _ in range(MAX_SEQUENCE + 2)]
+
+        self.assertEqual(len(set(ids)), MAX_SEQUENCE + 2)
+        self.assertEqual(parts(ids[-1]), (EPOCH + 11, 3, 0))
+
+    def test_worker_ids(self):
+        self.assertEqual(process_worker_id(12), 12)
+        self.assertTrue(0 <= process_worker_id() <= 1023)
+
+        with self.assertRaises(ValueError):
+            Snowflake(1024)
+
+    def test_new_id(self):
+        use_worker_id(5)
+        self.addCleanup(use_worker_id, None)
+
+        self.assertTrue(new_id().isdigit())
+
+    def test_public_identifiers_are_not_snowflakes(self):
+        tokens = {generate_public_token('button_') for _ in range(1000)}
+
+        self.assertEqual(len(tokens), 1000)
+        self.assertTrue(all(token.startswith('button_') and len(token) == 39 for token in tokens))
+
+
+
+class TestWorkerIdLease(unittest.IsolatedAsyncioTestCase):
+    async def asyncTearDown(self):
+        use_worker_id(None)
+
+    async def test_no_worker_id_no_ids(self):
+        use_worker_id(None)
+
+        with self.assertRaisesRegex(RuntimeError, 'No worker id'):
+            new_id()
+
+    async def test_configured_worker_id(self):
+        lease = WorkerIdLease(IDs(worker_id=12))
+
+        self.assertEqual(await lease.acquire(), 12)
+        self.assertEqual(parts(int(new_id()))[1], 12)
+
+        await lease.release()
+
+        with self.assertRaises(RuntimeError):
+            new_id()
+
+    async def test_derived_without_postgresql(self):
+        lease = WorkerIdLease(IDs(), engine=SimpleNamespace(dialect=SimpleNamespace(name='sqlite')))
+
+        self.assertEqual(await lease.acquire(), process_worker_id())
+
+
+
+@unittest.skipUnless(os.environ.get('WORKER_ID_LEASES'), 'set WORKER_ID_LEASES=1 to lease worker ids from DATABASE_URL')
+class TestDatabaseWorkerIdLease(unittest.IsolatedAsyncioTestCase):
+    async def asyncTearDown(self):
+        from database.db import async_engine
+
+        use_worker_id(None)
+        await async_engine.dispose()
+
+    async def test_processes_lease_different_worker_ids(self):
+        leases = [WorkerIdLease(IDs()) for _ in range(3)]
+        leased = [await lease.acquire() for lease in leases]
+
+        self.assertEqual(len(set(leased)), 3)
+
+        # A released worker id can be leased again
+        await leases[0].release()
+        leases[0] = WorkerIdLease(IDs())
+        self.assertEqual(await leases[0].acquire(), leased[0])
+
+        for lease in leases:
+            await lease.release()
@@ -0,0 +1,117 @@
+import types
+import unittest
+from blacksheep import Response
+from sqlalchemy import create_engine
+from app.unit_of_work import (
+    UnitOfWork, ConnectionStats, count_checkouts, request_session, unit_of_work_middleware, use_session
+)
+
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.calls = []
+
+    async def commit(self) -> None:
+        self.calls.append('commit')
+
+    async def rollback(self) -> None:
+        self.calls.append('rollback')
+
+    async def close(self) -> None:
+        self.calls.append('close')
+
+
+
+def handler_using_session(status: int, fail: bool = False):
+    session = FakeSession()
+
+    async def handler(request):
+        unit = UnitOfWork.current.get()
+        unit._session = session
+
+        # Helpers and injected parameters get the same session
+        async with use_session() as helper_session:
+            assert helper_session is session
+
+        assert request_session() is session
+
+        if fail:
+            raise RuntimeError('boom')
+
+        return Response(status)
+
+    return handler, session
+
+
+
+class TestUnitOfWorkMiddleware(unittest.IsolatedAsyncioTestCase):
+    async def test_commits_successful_requests(self):
+        handler, session = handler_using_session(200)
+
+        response = await unit_of_work_middleware(None, handler)
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(session.calls, ['commit', 'close'])
+        self.assertIsNone(UnitOfWork.current.get())
+
+    async def test_rolls_back_error_responses(self):
+        handler, session = handler_using_session(400)
+
+        await unit_of_work_middleware(None, handler)
+
+        self.assertEqual(session.calls, ['rollback', 'close'])
+
+    async def test_rolls_back_when_the_handler_raises(self):
+        handler, session = handler_using_session(200, fail=True)
+
+        with self.assertRaises(RuntimeError):
+            await unit_of_work_middleware(None, handler)
+
+        self.assertEqual(session.calls, ['rollback', 'close'])
+
+    async def test_requests_without_database_open_no_session(self):
+        async def handler(request):
+            return Response(204)
+
+        response = await unit_of_work_middleware(None, handler)
+
+        self.assertEqual(response.status, 204)
+
+    async def test_explicit_session_wins(self):
+        session = FakeSession()
+
+        async with use_session(session) as used:
+            self.assertIs(used, session)
+
+        self.assertEqual(session.calls, [])
+
+
+class TestConnectionCounting(unittest.IsolatedAsyncioTestCase):
+    async def test_checkouts_are_counted_per_request(self):
+        engine = create_engine('sqlite://')
+        count_checkouts(types.SimpleNamespace(sync_engine=engine))
+
+        units = []
+
+        async def handler(request):
+            units.append(UnitOfWork.current.get())
+
+            for _ in range(3):
+                with engine.connect():
+                    pass
+
+            return Response(200)
+
+        await unit_of_work_middleware(None, handler)
+
+        self.assertEqual(units[0].checkouts, 3)
+        engine.dispose()
+
+    def test_stats(self):
+        stats = ConnectionStats()
+
+        for checkouts in (0, 1, 5, 2):
+            stats.record(checkouts)
+
+        self.assertEqual(stats.stats(), {'requests': 3, 'checkouts': 8, 'max_per_request': 5, 'avg_per_request': 2.67})
@@ -0,0 +1,209 @@
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+import httpx
+from sqlalchemy import create_engine
+from sqlmodel import Session
+from app.controllers.PG.webhook import (
+    WEBHOOKS_QUEUED, DeliveryResult, WebhookDispatcher, WebhookJob, WebhookPayload, send_webhook_response
+)
+from app.settings import Webhooks
+from tests.webhook_receiver import WebhookReceiver
+
+
+
+class MemoryDispatcher(WebhookDispatcher):
+    """
+    Dispatcher over an in-memory outbox, the database is not involved.
+    """
+
+    def __init__(self, settings: Webhooks, transport: httpx.AsyncBaseTransport, jobs: list[WebhookJob]) -> None:
+        super().__init__(settings, transport)
+        self.jobs    = jobs
+        self.results = []
+
+    async def claim_due(self, limit: int) -> list[WebhookJob]:
+        claimed, self.jobs = self.jobs[:limit], self.jobs[limit:]
+        return claimed
+
+    async def renew_lease(self, job: WebhookJob) -> bool:
+        return True
+
+    async def record(self, result: DeliveryResult) -> None:
+        self.results.append(result)
+
+
+
+class LeasingDispatcher(WebhookDispatcher):
+    """
+    Dispatcher over an in-memory outbox shared with other dispatchers, with the claim and
+    lease rules of the MerchantWebhook table.
+    """
+
+    def __init__(self, settings: Webhooks, transport: httpx.AsyncBaseTransport, outbox: dict[int, dict]) -> None:
+        super().__init__(settings, transport)
+        self.outbox = outbox
+
+    async def claim_due(self, limit: int) -> list[WebhookJob]:
+        now          = datetime.now()
+        leased_until = now + timedelta(seconds=self.settings.lease_seconds)
+        due          = [id for id, row in self.outbox.items() if row['status'] == 'Pending' and row['next_attempt_at'] <= now]
+
+        for id in due[:limit]:
+            self.outbox[id]['next_attempt_at'] = leased_until
+
+        return [WebhookJob(id, self.outbox[id]['url'], {}, 0, leased_until) for id in due[:limit]]
+
+    async def renew_lease(self, job: WebhookJob) -> bool:
+        row = self.outbox[job.id]
+
+        if row['status'] != 'Pending' or row['next_attempt_at'] != job.leased_until:
+            return False
+
+        job.leased_until = row['next_attempt_at'] = datetime.now() + timedelta(seconds=self.settings.lease_seconds)
+        return True
+
+    async def record(self, result: DeliveryResult) -> None:
+        self.outbox[result.job.id]['status'] = 'Delivered'
+
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.added = []
+        self.info  = {}
+
+    def add(self, instance) -> None:
+        self.added.append(instance)
+
+
+
+class TestDelivery(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.receiver = WebhookReceiver(latency_ms=20, secret='shh')
+        await self.receiver.app.start()
+        self.transport = httpx.ASGITransport(app=self.receiver.app)
+
+    async def asyncTearDown(self):
+        await self.receiver.app.stop()
+
+    async def dispatch(self, settings: Webhooks, jobs: list[WebhookJob]) -> MemoryDispatcher:
+        dispatcher = MemoryDispatcher(settings, self.transport, jobs)
+
+        while dispatcher.jobs:
+            await dispatcher.dispatch_due()
+
+        await asyncio.gather(*dispatcher._in_flight)
+        await dispatcher.stop()
+
+        return dispatcher
+
+    async def test_signed_deliveries_respect_the_per_host_limit(self):
+        jobs = [WebhookJob(i, f'http://merchant{i % 2}.test/hook', {'n': i}, 0) for i in range(20)]
+
+        dispatcher = await self.dispatch(Webhooks(signing_secret='shh', per_host_concurrency=3, batch_size=5), jobs)
+
+        self.assertEqual(len(self.receiver.deliveries), 20)
+        self.assertEqual(self.receiver.bad_signatures, 0)
+        self.assertTrue(all(result.delivered for result in dispatcher.results))
+        self.assertEqual(self.receiver.max_in_flight, {'merchant0.test': 3, 'merchant1.test': 3})
+
+    async def test_wrong_secret_is_not_delivered(self):
+        dispatcher = await self.dispatch(Webhooks(signing_secret='other'), [WebhookJob(1, 'http://merchant.test/hook', {}, 0)])
+
+        self.assertEqual(dispatcher.results[0].status_code, 401)
+        self.assertFalse(dispatcher.results[0].delivered)
+
+    async def test_network_errors_are_results(self):
+        def refuse(request):
+            raise httpx.ConnectError('refused', request=request)
+
+        dispatcher = MemoryDispatcher(Webhooks(), httpx.MockTransport(refuse), [])
+        result     = await dispatcher.deliver(WebhookJob(1, 'http://merchant.test/hook', {}, 0))
+        await dispatcher.stop()
+
+        self.assertIsNone(result.status_code)
+        self.assertIn('ConnectError', result.error)
+
+
+    async def test_slow_host_longer_than_the_lease_delivers_once(self):
+        posted = []
+
+        async def slow_merchant(request):
+            posted.append(int(request.headers['X-Webhook-Id']))
+            await asyncio.sleep(0.05)
+            return httpx.Response(204)
+
+        # Six webhooks one at a time take twice the lease, the last ones wait past it
+        outbox    = {id: {'url': 'http://slow.test/hook', 'status': 'Pending', 'next_attempt_at': datetime.now()} for id in range(6)}
+        settings  = Webhooks(lease_seconds=0.15, per_host_concurrency=1)
+        transport = httpx.MockTransport(slow_merchant)
+        first, second = LeasingDispatcher(settings, transport, outbox), LeasingDispatcher(settings, transport, outbox)
+
+        async with asyncio.timeout(5):
+            while any(row['status'] == 'Pending' for row in outbox.values()):
+                await first.dispatch_due()
+                await second.dispatch_due()
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*first._in_flight, *second._in_flight)
+        await first.stop()
+        await second.stop()
+
+        self.assertEqual(sorted(posted), list(range(6)))
+
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        self.dispatcher = WebhookDispatcher(Webhooks(max_attempts=3, backoff_factor=10, max_backoff=30))
+        self.now        = datetime(2024, 1, 1)
+
+    def test_delivered(self):
+        values = self.dispatcher.outcome(DeliveryResult(WebhookJob(1, 'http://m.test', {}, 0), 204, None, 5), self.now)
+
+        self.assertEqual(values['status'], 'Delivered')
+        self.assertEqual(values['attempts'], 1)
+
+    def test_retry_with_jittered_backoff(self):
+        values = self.dispatcher.outcome(DeliveryResult(WebhookJob(1, 'http://m.test', {}, 1), 500, None, 5), self.now)
+        delay  = (values['next_attempt_at'] - self.now).total_seconds()
+
+        self.assertNotIn('status', values)
+        # 10 * 2 ** 2 capped at 30, jittered down to half
+        self.assertTrue(15 <= delay <= 30)
+
+    def test_gives_up_after_max_attempts(self):
+        values = self.dispatcher.outcome(DeliveryResult(WebhookJob(1, 'http://m.test', {}, 2), None, 'timeout', 5), self.now)
+
+        self.assertEqual(values['status'], 'Failed')
+
+
+
+class TestOutbox(unittest.IsolatedAsyncioTestCase):
+    async def test_webhooks_are_queued_on_the_session_of_the_caller(self):
+        session = FakeSession()
+        payload = WebhookPayload(True, 'PAYMENT_SUCCESS', 'Transaction Successful', {'merchantOrderId': 'A1'})
+
+        response = await send_webhook_response(payload, 'http://merchant.test/hook', session, 42)
+
+        self.assertEqual(response, {'message': 'Webhook queued'})
+        self.assertEqual(session.added[0].merchant_id, 42)
+        self.assertEqual(session.added[0].payload['status'], 'PAYMENT_SUCCESS')
+        self.assertTrue(session.info[WEBHOOKS_QUEUED])
+
+    async def test_commit_wakes_the_dispatcher(self):
+        dispatcher = WebhookDispatcher(Webhooks(poll_interval=60))
+        dispatcher._wake = asyncio.Event()
+        WebhookDispatcher.current = dispatcher
+        engine = create_engine('sqlite://')
+
+        try:
+            with Session(engine) as session:
+                session.info[WEBHOOKS_QUEUED] = True
+                session.commit()
+        finally:
+            WebhookDispatcher.current = None
+            engine.dispose()
+
+        self.assertTrue(dispatcher._wake.is_set())
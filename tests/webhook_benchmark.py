@@ -0,0 +1,94 @@
+"""
+Merchant webhook delivery throughput.
+
+Starts the local webhook receiver on `--hosts` ports (one merchant host each) answering
+after `--latency-ms`, then delivers `--webhooks` webhooks spread over the hosts, once the
+way the payment handlers used to do it, one new client per webhook awaited inline, and
+once through `app.controllers.PG.webhook.WebhookDispatcher` over an in-memory outbox.
+Reports the deliveries per second of both modes.
+
+    python -m tests.webhook_benchmark --webhooks 1000 --hosts 10 --latency-ms 50
+"""
+from app.controllers.PG.webhook import DeliveryResult, WebhookDispatcher, WebhookJob
+from app.settings import Webhooks
+from tests.webhook_receiver import WebhookReceiver
+import argparse
+import asyncio
+import httpx
+import time
+import uvicorn
+
+
+
+class BenchmarkDispatcher(WebhookDispatcher):
+    # No database here, the outbox is a list
+    def __init__(self, settings: Webhooks, jobs: list[WebhookJob]) -> None:
+        super().__init__(settings)
+        self.jobs = jobs
+
+    async def claim_due(self, limit: int) -> list[WebhookJob]:
+        claimed, self.jobs = self.jobs[:limit], self.jobs[limit:]
+        return claimed
+
+    async def renew_lease(self, job: WebhookJob) -> bool:
+        return True
+
+    async def record(self, result: DeliveryResult) -> None:
+        if result.delivered:
+            self.delivered += 1
+
+
+async def run(mode: str, args: argparse.Namespace, receiver: WebhookReceiver) -> None:
+    receiver.deliveries.clear()
+    jobs    = [WebhookJob(i, f'http://127.0.0.1:{args.port + i % args.hosts}/hook', {'n': i}, 0) for i in range(args.webhooks)]
+    started = time.perf_counter()
+
+    if mode == 'inline':
+        # What the payment handlers did before
+        for job in jobs:
+            async with httpx.AsyncClient() as client:
+                await client.post(job.url, json=job.payload)
+    else:
+        dispatcher = BenchmarkDispatcher(Webhooks(per_host_concurrency=args.per_host), jobs)
+
+        while dispatcher.jobs:
+            await dispatcher.dispatch_due()
+
+        await asyncio.gather(*dispatcher._in_flight)
+        await dispatcher.stop()
+
+    elapsed = time.perf_counter() - started
+
+    print(f'{mode:<10} delivered {len(receiver.deliveries):6} in {elapsed:7.2f} s   '
+          f'{len(receiver.deliveries) / elapsed:8.1f}/s')
+
+
+async def main(args: argparse.Namespace) -> None:
+    receiver = WebhookReceiver(args.latency_ms)
+    servers  = [uvicorn.Server(uvicorn.Config(receiver.app, host='127.0.0.1', port=args.port + i, log_level='warning'))
+                for i in range(args.hosts)]
+    tasks    = [asyncio.create_task(server.serve()) for server in servers]
+
+    while not all(server.started for server in servers):
+        await asyncio.sleep(0.05)
+
+    try:
+        for mode in ('inline', 'dispatcher'):
+            await run(mode, args, receiver)
+    finally:
+        for server in servers:
+            server.should_exit = True
+
+        await asyncio.gather(*tasks)
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Merchant webhook deliveries per second')
+    parser.add_argument('--webhooks', type=int, default=1000)
+    parser.add_argument('--hosts', type=int, default=10)
+    parser.add_argument('--latency-ms', type=float, default=50.0)
+    parser.add_argument('--per-host', type=int, default=4)
+    parser.add_argument('--port', type=int, default=45800)
+
+    asyncio.run(main(parser.parse_args()))
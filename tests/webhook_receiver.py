@@ -0,0 +1,82 @@
+"""
+Local merchant endpoint receiving webhooks in tests and benchmarks.
+
+Accepts every POST with a configurable artificial latency, checks the X-Webhook-Signature
+header when a secret is given, keeps the deliveries in memory and tracks the concurrent
+requests per Host header. `fail_every` makes every n-th request answer 503, to exercise
+the retries.
+
+    python -m tests.webhook_receiver --port 45800 --latency-ms 50
+"""
+from blacksheep import Application, Request, Response, json
+from app.controllers.PG.webhook import sign_webhook
+import argparse
+import asyncio
+import hmac
+import uvicorn
+
+
+
+class WebhookReceiver:
+    def __init__(self, latency_ms: float = 0, fail_every: int = 0, secret: str = '') -> None:
+        self.latency_ms     = latency_ms
+        self.fail_every     = fail_every
+        self.secret         = secret
+        self.requests       = 0
+        self.deliveries     = []
+        self.bad_signatures = 0
+        self.in_flight      = {}
+        self.max_in_flight  = {}
+        self.app            = self.create_app()
+
+
+    def create_app(self) -> Application:
+        app = Application()
+
+        @app.router.post('*')
+        async def receive(request: Request) -> Response:
+            host = request.host
+            body = await request.read()
+
+            self.requests += 1
+            request_number = self.requests
+
+            self.in_flight[host]     = self.in_flight.get(host, 0) + 1
+            self.max_in_flight[host] = max(self.max_in_flight.get(host, 0), self.in_flight[host])
+
+            try:
+                if self.latency_ms:
+                    await asyncio.sleep(self.latency_ms / 1000)
+
+                if self.fail_every and request_number % self.fail_every == 0:
+                    return json({'error': 'busy'}, 503)
+
+                if self.secret:
+                    timestamp = (request.get_first_header(b'X-Webhook-Timestamp') or b'').decode()
+                    signature = (request.get_first_header(b'X-Webhook-Signature') or b'').decode()
+
+                    if not hmac.compare_digest(signature, sign_webhook(self.secret, timestamp, body)):
+                        self.bad_signatures += 1
+                        return json({'error': 'invalid signature'}, 401)
+
+                self.deliveries.append((host, (request.get_first_header(b'X-Webhook-Id') or b'').decode(), body))
+
+                return json({'received': True})
+
+            finally:
+                self.in_flight[host] -= 1
+
+        return app
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Local merchant webhook endpoint')
+    parser.add_argument('--port', type=int, default=45800)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--fail-every', type=int, default=0)
+    parser.add_argument('--secret', default='')
+    args = parser.parse_args()
+
+    receiver = WebhookReceiver(args.latency_ms, args.fail_every, args.secret)
+    uvicorn.run(receiver.app, host='127.0.0.1', port=args.port, log_level='warning')